@@ -21,11 +21,12 @@ from app.config import (
     AI_RESPONSES_DIR,
     DEFAULT_DESTINATION_DIR,
     JSON_ENCODING,
-    JSON_ENSURE_ASCII,
-    JSON_INDENT,
     SOURCE_DATA_DIR,
 )
+from app.json_output import write_json
 from app.narrator_registry import NarratorRegistry
+from app.translation_bundles import BUNDLE_KIND
+from app.verse_pack import restore_packed_files
 
 logger = logging.getLogger(__name__)
 
@@ -341,8 +342,7 @@ def _write_verse_detail_split(file_path: str, doc: dict, per_lang: Dict[str, dic
     is in `AI_LANGUAGES` but not in the new per_lang map. This keeps the
     on-disk set in sync when a language is dropped from a verse.
     """
-    with open(file_path, "w", encoding=JSON_ENCODING) as f:
-        json.dump(doc, f, ensure_ascii=JSON_ENSURE_ASCII, indent=JSON_INDENT, sort_keys=True)
+    write_json(file_path, doc)
 
     if not file_path.endswith(".json"):
         return
@@ -357,8 +357,7 @@ def _write_verse_detail_split(file_path: str, doc: dict, per_lang: Dict[str, dic
             "path": verse_path,
         }
         sister_path = f"{base_no_ext}.{lang}.json"
-        with open(sister_path, "w", encoding=JSON_ENCODING) as f:
-            json.dump(sister_doc, f, ensure_ascii=JSON_ENSURE_ASCII, indent=JSON_INDENT, sort_keys=True)
+        write_json(sister_path, sister_doc, kind="verse_detail_lang")
 
     for lang in AI_LANGUAGES:
         if lang in per_lang:
@@ -648,8 +647,8 @@ def merge_ai_into_file(file_path: str, ai_lookup: Dict[str, dict]) -> int:
             _write_verse_detail_split(file_path, doc, per_lang)
             return merge_count
 
-    elif kind == "chapter_list":
-        # No verses to merge
+    elif kind in ("chapter_list", BUNDLE_KIND):
+        # No verses to merge (translation bundles map verse path -> text)
         return 0
 
     else:
@@ -661,8 +660,7 @@ def merge_ai_into_file(file_path: str, ai_lookup: Dict[str, dict]) -> int:
                     merge_count += 1
 
     if merge_count > 0:
-        with open(file_path, "w", encoding=JSON_ENCODING) as f:
-            json.dump(doc, f, ensure_ascii=JSON_ENSURE_ASCII, indent=JSON_INDENT, sort_keys=True)
+        write_json(file_path, doc)
 
     return merge_count
 
@@ -711,8 +709,7 @@ def merge_ai_into_complete_file(file_path: str, ai_lookup: Dict[str, dict]) -> i
     merge_count = _walk_complete_book(data, ai_lookup)
 
     if merge_count > 0:
-        with open(file_path, "w", encoding=JSON_ENCODING) as f:
-            json.dump(doc, f, ensure_ascii=JSON_ENSURE_ASCII, indent=JSON_INDENT, sort_keys=True)
+        write_json(file_path, doc, kind="complete_book")
 
     return merge_count
 
@@ -742,8 +739,7 @@ def update_translations_index(dest_dir: Optional[str] = None):
             added += 1
 
     if added > 0:
-        with open(translations_path, "w", encoding=JSON_ENCODING) as f:
-            json.dump(translations, f, ensure_ascii=JSON_ENSURE_ASCII, indent=JSON_INDENT, sort_keys=True)
+        write_json(translations_path, translations, kind="index")
         logger.info("Added %d AI translation entries to translations.json", added)
 
 
@@ -822,7 +818,11 @@ def merge_ai_content(report=None):
     total_merged = 0
     errors = []
 
-    # Step 2-3: Walk books/ directory for regular JSON files
+    # Step 2-3: Walk books/ directory for regular JSON files. Detail files
+    # removed into a pack are restored first so the walk finds them.
+    restored = sum(restore_packed_files(dest_dir, verse_path) for verse_path in ai_lookup)
+    if restored:
+        logger.info("Restored %d packed verse_detail files for merging", restored)
     books_dir = os.path.join(dest_dir, "books")
     if os.path.isdir(books_dir):
         for root, _dirs, files in os.walk(books_dir):
@@ -860,9 +860,10 @@ def merge_ai_content(report=None):
     update_translations_index(dest_dir)
 
     # Step 6: Build AI indexes (topics + phrases)
+    from app.ai_pipeline import load_key_phrases_dictionary
     from app.build_ai_indexes import build_topics_index, build_phrases_index
     build_topics_index(dest_dir)
-    build_phrases_index(dest_dir)
+    build_phrases_index(dest_dir, phrases_dict=load_key_phrases_dictionary())
 
     # Step 7: Report
     logger.info(
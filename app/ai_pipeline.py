@@ -35,6 +35,7 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
 from app.config import AI_CONTENT_DIR, AI_CONTENT_SUBDIR, AI_PIPELINE_DATA_DIR, AI_RESPONSES_DIR, DEFAULT_DESTINATION_DIR, JSON_ENCODING, JSON_ENSURE_ASCII, JSON_INDENT, SOURCE_DATA_DIR
+from app.translation_bundles import BUNDLE_KIND
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -1660,6 +1661,9 @@ def generate_corpus_manifest(
                     data = json.load(f)
             except (json.JSONDecodeError, OSError):
                 continue
+            # Translation bundles map verse path -> text, no verse dicts.
+            if data.get("kind") == BUNDLE_KIND:
+                continue
 
             content = data.get("data", data)
             file_verses = content.get("verses", [])
@@ -25,8 +25,9 @@ Usage:
     # Generate batch request file (JSONL for Claude Batch API)
     python -m app.ai_translation generate --book al-kafi --lang ur tr fa
 
-    # Process batch results and write translation files
-    python -m app.ai_translation ingest --input results.jsonl
+    # Process batch results and write translation files (per-file timings
+    # as JSONL with --timings)
+    python -m app.ai_translation ingest --input results.jsonl --workers 8 --timings ingest.jsonl
 
     # Generate sample translations (no API call needed)
     python -m app.ai_translation sample --book al-kafi --lang ur --count 5
@@ -36,10 +37,15 @@ import json
 import logging
 import os
 import sys
+import time
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 
-from app.lib_db import get_dest_path, load_json
+from app.config import INGEST_WORKERS
+from app.json_output import write_json_if_changed
+from app.lib_db import get_dest_path, get_destination_dir, index_from_path, load_json
+from app.translation_bundles import BUNDLE_KIND, base_translation_ids, bundle_docs, bundles_enabled
+from app.verse_pack import restore_packed_files
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -380,21 +386,12 @@ def parse_batch_results(results_path: str) -> List[TranslationResult]:
     return results
 
 
-def ingest_translations(
+def _group_by_chapter(
     results: List[TranslationResult],
-    dry_run: bool = False,
-) -> Dict[str, int]:
-    """Ingest translated text into existing verse data files.
-
-    For each successful translation, updates the verse's chapter JSON
-    to include the new translation under the AI translator ID.
-
-    Returns dict of counters: {"ingested": N, "skipped": N, "errors": N}
-    """
-    counters = {"ingested": 0, "skipped": 0, "errors": 0}
-
-    # Group results by chapter path for efficient file I/O
-    by_chapter: Dict[str, List[TranslationResult]] = {}
+    counters: Dict[str, int],
+) -> Dict[str, Dict[str, Dict[str, list]]]:
+    """Group successful results as {chapter_path: {verse_path: {translator_id: text}}}."""
+    by_chapter: Dict[str, Dict[str, Dict[str, list]]] = {}
     for result in results:
         if not result.success:
             counters["errors"] += 1
@@ -407,59 +404,159 @@ def ingest_translations(
             counters["errors"] += 1
             continue
 
-        chapter_path = parts[0]
-        if chapter_path not in by_chapter:
-            by_chapter[chapter_path] = []
-        by_chapter[chapter_path].append(result)
-
-    for chapter_path, chapter_results in by_chapter.items():
-        try:
-            chapter_data = load_json(chapter_path)
-        except FileNotFoundError:
-            logger.warning("Chapter not found: %s", chapter_path)
-            counters["errors"] += len(chapter_results)
+        verses = by_chapter.setdefault(parts[0], {})
+        verses.setdefault(result.verse_path, {})[make_translator_id(result.target_lang)] = [result.translated_text]
+    return by_chapter
+
+
+def _add_translation_ids(data: dict, translator_ids: List[str]) -> None:
+    vt = data.get("verse_translations", [])
+    for translator_id in translator_ids:
+        if translator_id not in vt:
+            vt.append(translator_id)
+    data["verse_translations"] = vt
+
+
+def _load_doc(path: str) -> Optional[dict]:
+    try:
+        return load_json(path)
+    except FileNotFoundError:
+        return None
+
+
+def _ingest_chapter(task: Tuple[str, Dict[str, Dict[str, list]], bool]) -> dict:
+    """Apply one chapter's translations to every file they touch.
+
+    Each file is loaded, updated with all of its translations and written
+    once (skipped when unchanged):
+
+    - the chapter's ``verse_list`` file: ``verse_translations`` (and the
+      inline verses of legacy, pre-shell files);
+    - each verse's ``verse_detail`` file: ``verse.translations`` and
+      ``verse_translations``;
+    - for books with translation bundles, one
+      ``{chapter}/translations/{translator_id}`` bundle per translation,
+      which holds the text instead of the verse_detail files.
+
+    Returns the chapter's counters and a timing record per file.
+    """
+    chapter_path, updates, dry_run = task
+    outcome = {"ingested": 0, "skipped": 0, "errors": 0, "files": []}
+
+    def finish(path: str, kind: str, doc: dict, started: float) -> None:
+        status = "dry_run"
+        if not dry_run:
+            written = write_json_if_changed(get_dest_path(path), doc)
+            status = "unchanged" if written is None else "written"
+        outcome["files"].append({"path": path, "kind": kind, "status": status,
+                                 "seconds": round(time.perf_counter() - started, 6)})
+
+    started = time.perf_counter()
+    chapter_doc = _load_doc(chapter_path)
+    if chapter_doc is None:
+        logger.warning("Chapter not found: %s", chapter_path)
+        outcome["errors"] += len(updates)
+        return outcome
+
+    data = chapter_doc.get("data", chapter_doc)
+    translator_ids = sorted({tid for translations in updates.values() for tid in translations})
+    default_ids = data.get("default_verse_translation_ids")
+    bundled = bundles_enabled(chapter_path, default_ids)
+    keep_ids = base_translation_ids(default_ids)
+
+    found = set()
+    for verse in data.get("verses", []):  # legacy format: inline verses
+        translations = updates.get(verse.get("path", ""))
+        if translations:
+            verse["translations"] = {**verse.get("translations", {}), **translations}
+            found.add(verse["path"])
+    _add_translation_ids(data, translator_ids)
+    finish(chapter_path, "verse_list", chapter_doc, started)
+
+    moved = []
+    for verse_path, translations in sorted(updates.items()):
+        started = time.perf_counter()
+        if not dry_run:
+            restore_packed_files(get_destination_dir(), verse_path)
+        detail_doc = _load_doc(verse_path)
+        if detail_doc is None:
             continue
+        detail = detail_doc.get("data", detail_doc)
+        verse = detail.get("verse", detail)
+        inline = translations
+        if bundled:
+            inline = {tid: text for tid, text in translations.items() if tid in keep_ids}
+            moved.append((verse_path, {tid: text for tid, text in translations.items() if tid not in keep_ids}))
+        if inline:
+            verse["translations"] = {**verse.get("translations", {}), **inline}
+        _add_translation_ids(detail, translator_ids)
+        finish(verse_path, "verse_detail", detail_doc, started)
+        found.add(verse_path)
+
+    for path, bundle in bundle_docs(chapter_path, index_from_path(chapter_path), moved).items():
+        started = time.perf_counter()
+        existing = _load_doc(path)
+        if existing is not None:
+            bundle["data"]["verses"] = {**existing["data"]["verses"], **bundle["data"]["verses"]}
+        finish(path, BUNDLE_KIND, bundle, started)
+
+    for verse_path, translations in updates.items():
+        if verse_path in found:
+            outcome["ingested"] += len(translations)
+        else:
+            logger.warning("Verse not found in chapter: %s", verse_path)
+            outcome["skipped"] += len(translations)
+    return outcome
 
-        data = chapter_data.get("data", chapter_data)
-        verses = data.get("verses", [])
-
-        # Build path->verse lookup
-        verse_by_path = {}
-        for v in verses:
-            vpath = v.get("path", "")
-            if vpath:
-                verse_by_path[vpath] = v
-
-        modified = False
-        for result in chapter_results:
-            verse = verse_by_path.get(result.verse_path)
-            if not verse:
-                logger.warning("Verse not found in chapter: %s", result.verse_path)
-                counters["skipped"] += 1
-                continue
 
-            translator_id = make_translator_id(result.target_lang)
-            translations = verse.get("translations", {})
-            translations[translator_id] = [result.translated_text]
-            verse["translations"] = translations
-            modified = True
-            counters["ingested"] += 1
-
-        if modified and not dry_run:
-            # Update verse_translations list in chapter if needed
-            for result in chapter_results:
-                translator_id = make_translator_id(result.target_lang)
-                vt = data.get("verse_translations", [])
-                if translator_id not in vt:
-                    vt.append(translator_id)
-                    data["verse_translations"] = vt
-
-            # Write back
-            dest_path = get_dest_path(chapter_path)
-            with open(dest_path, "w", encoding="utf-8") as f:
-                json.dump(chapter_data, f, ensure_ascii=False, indent=2, sort_keys=True)
-
-    logger.info("Ingestion complete: %s", counters)
+def ingest_translations(
+    results: List[TranslationResult],
+    dry_run: bool = False,
+    workers: Optional[int] = None,
+) -> Dict[str, object]:
+    """Ingest translated text into existing verse data files.
+
+    Results are grouped per chapter and each chapter is one task (see
+    :func:`_ingest_chapter`), so every file is read and written once however
+    many languages the batch carries. Tasks run in ``workers`` processes
+    (default: ``INGEST_WORKERS`` env, 1). Files whose content would not
+    change are left untouched, so re-ingesting a batch is cheap.
+
+    Returns counters {"ingested", "skipped", "errors", "files_written",
+    "files_unchanged"} plus "files": one {"path", "kind", "status",
+    "seconds"} record per file touched, sorted by path.
+    """
+    counters = {"ingested": 0, "skipped": 0, "errors": 0}
+    by_chapter = _group_by_chapter(results, counters)
+    tasks = [(chapter_path, updates, dry_run) for chapter_path, updates in sorted(by_chapter.items())]
+
+    if workers is None:
+        workers = INGEST_WORKERS
+    if workers > 1 and len(tasks) > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(min(workers, len(tasks)))
+        outcomes = pool.imap_unordered(_ingest_chapter, tasks)
+        logger.info("Ingesting %d chapters with %d workers", len(tasks), workers)
+    else:
+        pool = None
+        outcomes = map(_ingest_chapter, tasks)
+
+    files = []
+    try:
+        for outcome in outcomes:
+            for key in ("ingested", "skipped", "errors"):
+                counters[key] += outcome[key]
+            files.extend(outcome["files"])
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    files.sort(key=lambda f: f["path"])
+    counters["files_written"] = sum(1 for f in files if f["status"] == "written")
+    counters["files_unchanged"] = sum(1 for f in files if f["status"] == "unchanged")
+    logger.info("Ingestion complete: %s (%.2fs in file updates)", counters, sum(f["seconds"] for f in files))
+    counters["files"] = files
     return counters
 
 
@@ -657,8 +754,15 @@ def main():
             print("Error: --input is required")
             sys.exit(1)
         dry_run = "--dry-run" in sys.argv
+        workers = int(_get_arg("--workers", "0")) or None
+        timings_path = _get_arg("--timings", "")
         results = parse_batch_results(input_path)
-        counters = ingest_translations(results, dry_run=dry_run)
+        counters = ingest_translations(results, dry_run=dry_run, workers=workers)
+        files = counters.pop("files")
+        if timings_path:
+            with open(timings_path, "w", encoding="utf-8") as f:
+                for record in files:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
         print(json.dumps(counters, indent=2))
         return
 
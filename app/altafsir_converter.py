@@ -4,23 +4,45 @@ Reads JSON files from ThaqalaynDataSources/scraped/altafsir_com/{tafsir_id}/
 and writes per-surah files to ThaqalaynTafsirData/{edition_id}/
 following the same block-reference format as tafsir_converter.py.
 
-Also updates editions.json to include the altafsir-sourced editions.
+A surah file holds the commentary for every ayah, so showing the tafsir of
+one ayah of al-Baqarah meant downloading all 286. Next to each surah file the
+converter therefore also writes an ayah index and ayah-window chunk files:
+
+    {edition_id}/{surah}/index.json
+        {"window": 1,
+         "ayahs": {"1": {"block": 0, "chunk": 1}, ...},   # ayah -> block, chunk
+         "blocks": [[1, 3], [4, 4], ...],                 # block -> ayah range
+         "chunks": {"1": [1, 1], ...}}                    # chunk -> ayah range
+    {edition_id}/{surah}/{chunk}.json
+        {"chunk": 1, "ayahs": [{"ayah": 1, "block": 0}],
+         "blocks": {"0": "<div ...>"}}                    # only the blocks used
+
+Chunk ``n`` covers ayahs ``(n-1)*window+1 .. n*window`` (``--window``,
+default ``DEFAULT_TAFSIR_AYAH_WINDOW``, 1 = one file per ayah), so a client
+can fetch the right chunk without the index. Block numbers are the surah
+file's, so references are the same at every granularity.
+
+Editions can be converted in parallel (``--workers``, default
+``TAFSIR_WORKERS`` env, 1). editions.json includes the altafsir-sourced
+editions and advertises their granularity.
 
 Usage:
     python app/altafsir_converter.py
     python app/altafsir_converter.py --tafsir 38    # Only al-Qummi
+    python app/altafsir_converter.py --window 5 --workers 4
     python app/altafsir_converter.py --dry-run
 """
 
 import argparse
 import json
+import multiprocessing
 import os
 import sys
 
 sys.stdout.reconfigure(encoding="utf-8")
 
-from config import SOURCE_DATA_DIR, DEFAULT_DESTINATION_DIR, JSON_ENSURE_ASCII, JSON_INDENT
-from scrapers.scrape_altafsir import SHIA_TAFSIRS
+from config import (SOURCE_DATA_DIR, DEFAULT_DESTINATION_DIR, DEFAULT_TAFSIR_AYAH_WINDOW,
+                    JSON_ENSURE_ASCII, JSON_INDENT, TAFSIR_WORKERS)
 
 ALTAFSIR_SOURCE_DIR = os.path.join(SOURCE_DATA_DIR, "scraped", "altafsir_com")
 # DESTINATION_DIR is the tafsir repo root (ThaqalaynTafsirData/). Files go:
@@ -29,6 +51,7 @@ ALTAFSIR_SOURCE_DIR = os.path.join(SOURCE_DATA_DIR, "scraped", "altafsir_com")
 DESTINATION_DIR = os.environ.get("DESTINATION_DIR", DEFAULT_DESTINATION_DIR)
 TAFSIR_OUTPUT_DIR = DESTINATION_DIR
 EDITIONS_FILE = os.path.join(TAFSIR_OUTPUT_DIR, "editions.json")
+INDEX_FILENAME = "index.json"
 
 
 def text_to_html(text: str) -> str:
@@ -44,21 +67,94 @@ def text_to_html(text: str) -> str:
     return f'<div class="tafsir-arabic" lang="ar" dir="rtl">{wrapped}</div>'
 
 
-def convert_tafsir(tafsir_id: int, tafsir_info: dict, dry_run: bool = False) -> dict:
+def write_json(path: str, data) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=JSON_ENSURE_ASCII, indent=JSON_INDENT)
+
+
+def chunk_number(ayah: int, window: int) -> int:
+    """Chunk file holding ``ayah`` for the given window size (1-based)."""
+    return (ayah - 1) // window + 1
+
+
+def _extend(span: list[int] | None, ayah: int) -> list[int]:
+    return [ayah, ayah] if span is None else [min(span[0], ayah), max(span[1], ayah)]
+
+
+def build_ayah_index(ayahs: list[dict], block_count: int, window: int) -> dict:
+    """Ayah -> block/chunk, block -> ayah range and chunk -> ayah range."""
+    by_ayah = {}
+    block_ranges: list = [None] * block_count
+    chunk_ranges: dict[str, list[int]] = {}
+    for entry in sorted(ayahs, key=lambda a: a["ayah"]):
+        ayah, block = entry["ayah"], entry["block"]
+        chunk = str(chunk_number(ayah, window))
+        by_ayah[str(ayah)] = {"block": block, "chunk": int(chunk)}
+        block_ranges[block] = _extend(block_ranges[block], ayah)
+        chunk_ranges[chunk] = _extend(chunk_ranges.get(chunk), ayah)
+    return {
+        "window": window,
+        "ayahs": by_ayah,
+        "blocks": block_ranges,
+        "chunks": chunk_ranges,
+    }
+
+
+def build_chunks(blocks: list[str], ayahs: list[dict], window: int) -> dict[int, dict]:
+    """Split a surah into ayah-window chunks carrying only the blocks they use."""
+    chunks: dict[int, dict] = {}
+    for entry in sorted(ayahs, key=lambda a: a["ayah"]):
+        chunk = chunks.setdefault(chunk_number(entry["ayah"], window), {"ayahs": [], "blocks": {}})
+        chunk["ayahs"].append(entry)
+        chunk["blocks"][str(entry["block"])] = blocks[entry["block"]]
+    return chunks
+
+
+def write_surah_chunks(output_dir: str, edition_id: str, surah: int,
+                       blocks: list[str], ayahs: list[dict], window: int) -> int:
+    """Write ``{surah}/index.json`` and the chunk files; returns the chunk count.
+
+    Chunk files left over from a run with a different window are removed.
+    """
+    surah_dir = os.path.join(output_dir, str(surah))
+    os.makedirs(surah_dir, exist_ok=True)
+    for name in os.listdir(surah_dir):
+        if name.endswith(".json"):
+            os.remove(os.path.join(surah_dir, name))
+
+    index = {"edition": edition_id, "surah": surah, **build_ayah_index(ayahs, len(blocks), window)}
+    write_json(os.path.join(surah_dir, INDEX_FILENAME), index)
+
+    chunks = build_chunks(blocks, ayahs, window)
+    for number, chunk in chunks.items():
+        write_json(os.path.join(surah_dir, f"{number}.json"), {
+            "edition": edition_id,
+            "surah": surah,
+            "chunk": number,
+            "window": window,
+            **chunk,
+        })
+    return len(chunks)
+
+
+def convert_tafsir(tafsir_id: int, tafsir_info: dict, dry_run: bool = False,
+                   window: int = DEFAULT_TAFSIR_AYAH_WINDOW) -> dict:
     """Convert one tafsir's scraped JSON files to ThaqalaynData format.
 
-    Returns stats dict.
+    Writes the per-surah file plus its ayah index and ``window``-ayah
+    chunk files. Returns stats dict.
     """
     source_dir = os.path.join(ALTAFSIR_SOURCE_DIR, str(tafsir_id))
     if not os.path.isdir(source_dir):
         print(f"  SKIP {tafsir_id}: no source dir at {source_dir}")
-        return {"surah_count": 0, "ayah_count": 0, "block_count": 0}
+        return {"surah_count": 0, "ayah_count": 0, "block_count": 0, "chunk_count": 0}
 
     edition_id = tafsir_info["edition_id"]
     output_dir = os.path.join(TAFSIR_OUTPUT_DIR, edition_id)
 
     total_ayahs = 0
     total_blocks = 0
+    total_chunks = 0
     surah_count = 0
 
     # Source JSON files are named {surah}.json
@@ -89,9 +185,9 @@ def convert_tafsir(tafsir_id: int, tafsir_info: dict, dry_run: bool = False) ->
 
         if not dry_run:
             os.makedirs(output_dir, exist_ok=True)
-            out_path = os.path.join(output_dir, filename)
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(out_data, f, ensure_ascii=JSON_ENSURE_ASCII, indent=JSON_INDENT)
+            write_json(os.path.join(output_dir, filename), out_data)
+            total_chunks += write_surah_chunks(output_dir, edition_id, data["surah"],
+                                               html_blocks, data["ayahs"], window)
 
         total_ayahs += len(data["ayahs"])
         total_blocks += len(html_blocks)
@@ -101,22 +197,42 @@ def convert_tafsir(tafsir_id: int, tafsir_info: dict, dry_run: bool = False) ->
         "surah_count": surah_count,
         "ayah_count": total_ayahs,
         "block_count": total_blocks,
+        "chunk_count": total_chunks,
+    }
+
+
+def _convert_task(task: tuple) -> tuple:
+    tafsir_id, info, dry_run, window = task
+    return tafsir_id, info, convert_tafsir(tafsir_id, info, dry_run=dry_run, window=window)
+
+
+def granularity(window: int) -> dict:
+    """editions.json fields describing which files exist for an edition."""
+    return {
+        "granularity": ["surah", "ayah" if window == 1 else "window"],
+        "ayah_window": window,
     }
 
 
 def update_editions_index(processed_editions: list[tuple[int, dict]],
-                          dry_run: bool = False) -> None:
-    """Merge altafsir editions into the existing editions.json."""
+                          dry_run: bool = False,
+                          window: int = DEFAULT_TAFSIR_AYAH_WINDOW) -> None:
+    """Merge altafsir editions into the existing editions.json.
+
+    Each processed edition is tagged with the granularity just written;
+    editions already listed keep their entry but get the new granularity.
+    """
     existing = []
     if os.path.exists(EDITIONS_FILE):
         with open(EDITIONS_FILE, encoding="utf-8") as f:
             existing = json.load(f)
 
-    existing_ids = {e["id"] for e in existing}
+    by_id = {e["id"]: e for e in existing}
 
     for tafsir_id, info in processed_editions:
         eid = info["edition_id"]
-        if eid in existing_ids:
+        if eid in by_id:
+            by_id[eid].update(granularity(window))
             continue
         language = "ar"  # altafsir.com only has Arabic
         existing.append({
@@ -128,23 +244,32 @@ def update_editions_index(processed_editions: list[tuple[int, dict]],
             "language": language,
             "source": "altafsir.com",
             "death": info.get("death", ""),
+            **granularity(window),
         })
-        existing_ids.add(eid)
+        by_id[eid] = existing[-1]
 
     # Sort by language then name
     existing.sort(key=lambda e: (e["language"], e["name_en"]))
 
     if not dry_run:
-        with open(EDITIONS_FILE, "w", encoding="utf-8") as f:
-            json.dump(existing, f, ensure_ascii=JSON_ENSURE_ASCII, indent=JSON_INDENT)
+        write_json(EDITIONS_FILE, existing)
         print(f"  Updated {EDITIONS_FILE} ({len(existing)} editions total)")
 
 
 def main():
+    # The scraper module needs requests; the conversion itself does not.
+    from scrapers.scrape_altafsir import SHIA_TAFSIRS
+
     parser = argparse.ArgumentParser(description="Convert altafsir JSON to ThaqalaynData tafsir format")
     parser.add_argument("--tafsir", type=int, help="Specific tafsir ID")
     parser.add_argument("--dry-run", action="store_true", help="Don't write files")
+    parser.add_argument("--window", type=int, default=DEFAULT_TAFSIR_AYAH_WINDOW,
+                        help="Ayahs per chunk file (default: %(default)s, one file per ayah)")
+    parser.add_argument("--workers", type=int, default=TAFSIR_WORKERS,
+                        help="Editions converted in parallel (default: TAFSIR_WORKERS env, 1)")
     args = parser.parse_args()
+    if args.window < 1:
+        parser.error("--window must be at least 1")
 
     tafsirs = {args.tafsir: SHIA_TAFSIRS[args.tafsir]} if args.tafsir else SHIA_TAFSIRS
 
@@ -152,26 +277,43 @@ def main():
     print(f"  Source: {ALTAFSIR_SOURCE_DIR}")
     print(f"  Output: {TAFSIR_OUTPUT_DIR}")
     print(f"  Tafsirs: {len(tafsirs)}")
+    print(f"  Ayah window: {args.window}")
     if args.dry_run:
         print(f"  DRY RUN")
     print()
 
-    processed = []
+    tasks = []
     for tid, info in tafsirs.items():
         source_path = os.path.join(ALTAFSIR_SOURCE_DIR, str(tid))
         if not os.path.isdir(source_path):
             print(f"  [{tid}] {info['name_en']} — no source dir, skipping")
             continue
+        tasks.append((tid, info, args.dry_run, args.window))
 
-        print(f"  [{tid}] {info['name_en']} ({info['edition_id']})...")
-        stats = convert_tafsir(tid, info, dry_run=args.dry_run)
-        print(f"    {stats['surah_count']} surahs, {stats['ayah_count']} ayahs, "
-              f"{stats['block_count']} blocks")
-        if stats["surah_count"] > 0:
-            processed.append((tid, info))
+    if args.workers > 1 and len(tasks) > 1:
+        pool = multiprocessing.Pool(min(args.workers, len(tasks)))
+        results = pool.imap_unordered(_convert_task, tasks)
+    else:
+        pool = None
+        results = map(_convert_task, tasks)
 
+    processed = []
+    try:
+        for tid, info, stats in results:
+            print(f"  [{tid}] {info['name_en']} ({info['edition_id']}): "
+                  f"{stats['surah_count']} surahs, {stats['ayah_count']} ayahs, "
+                  f"{stats['block_count']} blocks, {stats['chunk_count']} chunks")
+            if stats["surah_count"] > 0:
+                processed.append((tid, info))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    # Workers finish in any order; keep editions.json updates deterministic
+    processed.sort(key=lambda p: p[0])
     if processed:
-        update_editions_index(processed, dry_run=args.dry_run)
+        update_editions_index(processed, dry_run=args.dry_run, window=args.window)
 
     print(f"\nDone. Processed {len(processed)} editions.")
 
@@ -7,8 +7,6 @@ import logging
 import os
 from typing import Dict, List, Optional
 
-import fastapi.encoders
-
 from app.lib_db import insert_chapter, write_file
 from app.lib_index import add_translation, collect_indexes, update_index_files
 from app.lib_model import ProcessingReport, set_index
@@ -86,11 +84,10 @@ def publish_book(
     # Step 3: Write complete book file
     book_name = book.path.replace('/books/', '')
     complete_path = f'/books/complete/{book_name}'
-    complete_data = fastapi.encoders.jsonable_encoder(book)
     write_file(complete_path, {
         'index': book_name,
         'kind': 'complete_book',
-        'data': complete_data,
+        'data': book,
     })
     logger.info("Published complete book: %s", complete_path)
 
@@ -20,6 +20,7 @@ from app.config import (
     JSON_ENSURE_ASCII,
     JSON_INDENT,
 )
+from app.phrase_matcher import PhraseMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -163,51 +164,68 @@ def build_topics_index(dest_dir: Optional[str] = None) -> dict:
     return pruned
 
 
-def build_phrases_index(dest_dir: Optional[str] = None) -> dict:
+def _add_phrase(index: Dict[str, dict], phrase: dict, verse_path: str) -> None:
+    """Add ``verse_path`` under the normalized key of ``phrase``."""
+    phrase_ar = phrase.get("phrase_ar", "")
+    if not phrase_ar:
+        return
+
+    # Normalize Arabic for key (strip diacritics to avoid duplicates)
+    normalized_key = _normalize_arabic(phrase_ar)
+    if not normalized_key:
+        return
+
+    if normalized_key not in index:
+        index[normalized_key] = {
+            "phrase_ar": phrase_ar,  # Keep original with diacritics for display
+            "phrase_en": phrase.get("phrase_en", ""),
+            "category": phrase.get("category", ""),
+            "paths": [],
+        }
+
+    # Dedup paths
+    if verse_path not in index[normalized_key]["paths"]:
+        index[normalized_key]["paths"].append(verse_path)
+
+
+def build_phrases_index(dest_dir: Optional[str] = None, phrases_dict: Optional[dict] = None) -> dict:
     """Walk all merged JSON files, collect verse.ai.key_phrases, build inverted index.
 
+    If ``phrases_dict`` (the key phrases dictionary) is given, verses with
+    AI content also get the dictionary phrases found in their Arabic text,
+    filtered exactly as Phase 2's ``enrich_key_phrases`` does (valid
+    categories only) with one :class:`~app.phrase_matcher.PhraseMatcher`
+    compiled for the whole walk. Verses without AI content are never
+    indexed.
+
     Returns the index dict (also written to index/phrases.json).
     """
     if dest_dir is None:
         dest_dir = os.environ.get("DESTINATION_DIR", DEFAULT_DESTINATION_DIR)
 
+    matcher = None
+    if phrases_dict:
+        from app.pipeline_cli.programmatic_enrichment import enrich_key_phrases
+        matcher = PhraseMatcher.from_dictionary(phrases_dict)
     index: Dict[str, dict] = {}
 
     books_dir = os.path.join(dest_dir, "books")
     if os.path.isdir(books_dir):
         for file_path in _walk_json_files(books_dir):
             for verse in _extract_verses(file_path):
-                ai = verse.get("ai")
-                if not ai:
-                    continue
-                key_phrases = ai.get("key_phrases", [])
-                if not key_phrases:
-                    continue
                 verse_path = verse.get("path", "")
                 if not verse_path:
                     continue
 
-                for kp in key_phrases:
-                    phrase_ar = kp.get("phrase_ar", "")
-                    if not phrase_ar:
-                        continue
-
-                    # Normalize Arabic for key (strip diacritics to avoid duplicates)
-                    normalized_key = _normalize_arabic(phrase_ar)
-                    if not normalized_key:
-                        continue
+                ai = verse.get("ai") or {}
+                for kp in ai.get("key_phrases") or []:
+                    _add_phrase(index, kp, verse_path)
 
-                    if normalized_key not in index:
-                        index[normalized_key] = {
-                            "phrase_ar": phrase_ar,  # Keep original with diacritics for display
-                            "phrase_en": kp.get("phrase_en", ""),
-                            "category": kp.get("category", ""),
-                            "paths": [],
-                        }
-
-                    # Dedup paths
-                    if verse_path not in index[normalized_key]["paths"]:
-                        index[normalized_key]["paths"].append(verse_path)
+                if matcher is not None and ai:
+                    text = verse.get("text") or []
+                    if text and isinstance(text[0], str):
+                        for phrase in enrich_key_phrases(text[0], phrases_dict, matcher=matcher):
+                            _add_phrase(index, phrase, verse_path)
 
     # Sort paths within each phrase for stable output
     for entry in index.values():
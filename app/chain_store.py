@@ -0,0 +1,138 @@
+"""Corpus-level store of narrator chains with interned integer IDs.
+
+Narrator processing used to build every narrator's ``subchains`` as it went:
+the full-chain key string and a ``Set[str]`` of verse paths were duplicated
+on each narrator in the chain, and ``link_chains.collect_shared_chains``
+then had to re-dedup those keys across all narrators. With ~25K narrators
+and every book added that is the bulk of the process's memory.
+
+:class:`ChainStore` records each chain once:
+
+- verse paths are interned to ints (``paths[verse_id]``),
+- each distinct chain (full chain or direct pair, see
+  :func:`app.kafi_narrators.getCombinations`) is interned to a chain id
+  holding its narrator ids and an ``array`` of verse ids,
+- each narrator keeps an ``array`` of the verse ids it appears in.
+
+Per-narrator ``subchains`` / ``verse_paths`` are materialized one narrator
+at a time when files are written (:meth:`ChainStore.fill_narrator`), and
+shared-chain groups come straight from the chain table
+(:meth:`ChainStore.chain_groups`).
+"""
+
+from array import array
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from app.models.people import ChainVerses, Narrator
+
+
+def _append_unique(ids: array, value: int) -> None:
+    # All appends for one verse are contiguous, so checking the tail is
+    # enough to keep repeated narrators in a chain from adding it twice.
+    if not ids or ids[-1] != value:
+        ids.append(value)
+
+
+def chain_key(narrator_ids: Sequence[int]) -> str:
+    """Return the ``"1-2-3"`` key used for ``Narrator.subchains``."""
+    return '-'.join(str(n) for n in narrator_ids)
+
+
+class ChainStore:
+    """Interned chains → verse ids, and narrators → verse ids."""
+
+    def __init__(self):
+        self.paths: List[str] = []
+        self._path_ids: Dict[str, int] = {}
+        self.chains: List[Tuple[int, ...]] = []
+        self._chain_ids: Dict[Tuple[int, ...], int] = {}
+        self.chain_verses: List[array] = []
+        self.narrator_verses: Dict[int, array] = {}
+        self._narrator_chains: Optional[Dict[int, List[int]]] = None
+
+    def _intern_path(self, verse_path: str) -> int:
+        verse_id = self._path_ids.get(verse_path)
+        if verse_id is None:
+            verse_id = len(self.paths)
+            self._path_ids[verse_path] = verse_id
+            self.paths.append(verse_path)
+        return verse_id
+
+    def _intern_chain(self, narrator_ids: Tuple[int, ...]) -> int:
+        chain_id = self._chain_ids.get(narrator_ids)
+        if chain_id is None:
+            chain_id = len(self.chains)
+            self._chain_ids[narrator_ids] = chain_id
+            self.chains.append(narrator_ids)
+            self.chain_verses.append(array('i'))
+        return chain_id
+
+    def add(self, verse_path: str, canonical_ids: Sequence[int]) -> None:
+        """Record one verse's linked chain (full chain plus direct pairs)."""
+        verse_id = self._intern_path(verse_path)
+        for cid in canonical_ids:
+            if cid not in self.narrator_verses:
+                self.narrator_verses[cid] = array('i')
+            _append_unique(self.narrator_verses[cid], verse_id)
+
+        full = tuple(canonical_ids)
+        subchains = []
+        if len(full) > 1:
+            subchains.append(full)
+        for i in range(len(full) - 1):
+            pair = full[i:i + 2]
+            if pair != full:
+                subchains.append(pair)
+        for ids in subchains:
+            _append_unique(self.chain_verses[self._intern_chain(ids)], verse_id)
+        self._narrator_chains = None
+
+    def __len__(self) -> int:
+        return len(self.chains)
+
+    def narrator_chains(self, narrator_id: int) -> List[int]:
+        """Chain ids containing ``narrator_id`` (built once, on first use)."""
+        if self._narrator_chains is None:
+            index: Dict[int, List[int]] = {}
+            for chain_id, ids in enumerate(self.chains):
+                for cid in dict.fromkeys(ids):
+                    index.setdefault(cid, []).append(chain_id)
+            self._narrator_chains = index
+        return self._narrator_chains.get(narrator_id, [])
+
+    def verse_paths(self, verse_ids: Sequence[int]) -> Set[str]:
+        paths = self.paths
+        return {paths[v] for v in verse_ids}
+
+    def subchains(self, narrator_id: int) -> Dict[str, ChainVerses]:
+        """Materialize ``Narrator.subchains`` for one narrator."""
+        result: Dict[str, ChainVerses] = {}
+        for chain_id in self.narrator_chains(narrator_id):
+            ids = self.chains[chain_id]
+            cv = ChainVerses()
+            cv.narrator_ids = list(ids)
+            cv.verse_paths = self.verse_paths(self.chain_verses[chain_id])
+            result[chain_key(ids)] = cv
+        return result
+
+    def fill_narrator(self, narrator: Narrator) -> Narrator:
+        """Populate ``verse_paths`` and ``subchains`` on ``narrator``."""
+        narrator.verse_paths = self.verse_paths(self.narrator_verses.get(narrator.index, ()))
+        narrator.subchains = self.subchains(narrator.index)
+        return narrator
+
+    def chain_groups(
+        self,
+        min_length: int,
+        min_group: int,
+        max_group: int,
+    ) -> Dict[str, Set[str]]:
+        """Chains of ``min_length``+ narrators found in ``min_group``..``max_group`` verses."""
+        groups: Dict[str, Set[str]] = {}
+        for chain_id, ids in enumerate(self.chains):
+            if len(ids) < min_length:
+                continue
+            verse_ids = set(self.chain_verses[chain_id])
+            if min_group <= len(verse_ids) <= max_group:
+                groups[chain_key(ids)] = {self.paths[v] for v in verse_ids}
+        return groups
@@ -53,6 +53,54 @@ JSON_ENCODING = "utf-8"
 JSON_ENSURE_ASCII = False
 JSON_INDENT = 2
 
+# Data file profile when JSON_OUTPUT_PROFILE is unset: "pretty" (indent=2,
+# for review) or "compact" (production). JSON_PRECOMPRESS=gz,br adds
+# precompressed siblings. See app/json_output.py.
+DEFAULT_JSON_OUTPUT_PROFILE = "pretty"
+
+# Books whose verse_detail files keep only the default translations, with
+# the rest in per-chapter translation bundles (TRANSLATION_BUNDLE_BOOKS,
+# comma-separated slugs, e.g. "quran"). See app/translation_bundles.py.
+DEFAULT_TRANSLATION_BUNDLE_BOOKS = ""
+
+# Ayahs per tafsir chunk file written next to each per-surah tafsir file
+# (1 = one file per ayah). See app/altafsir_converter.py.
+DEFAULT_TAFSIR_AYAH_WINDOW = 1
+
+# Worker processes for altafsir_converter, one edition per task (1 = serial)
+TAFSIR_WORKERS = int(os.environ.get("TAFSIR_WORKERS", "1"))
+
+# Worker processes for narrator linking across books (1 = serial)
+NARRATOR_WORKERS = int(os.environ.get("NARRATOR_WORKERS", "1"))
+
+# Raw LLM response archive layout (RAW_ARCHIVE_BACKEND): "files" writes one
+# {verse_id}.{suffix}.raw.txt per response, "segments" appends to rotating
+# gzip segments of about RAW_ARCHIVE_SEGMENT_BYTES with a deduplicating
+# index. See app/pipeline_cli/raw_archive.py.
+DEFAULT_RAW_ARCHIVE_BACKEND = "files"
+DEFAULT_RAW_ARCHIVE_SEGMENT_BYTES = 64 * 1024 * 1024
+
+# Pipeline LLM dispatch: a worker slot that frees up goes to the next request
+# sharing the prompt prefix that just ran (so the provider's prompt cache is
+# still warm) for at most this many grants in a row while other prefixes
+# wait. See app/pipeline_cli/prompt_cache.py.
+DEFAULT_PROMPT_CACHE_MAX_RUN = 64
+
+# Shared httpx connection pool behind every AsyncOpenAI client, one per
+# endpoint (OPENAI_MAX_CONNECTIONS / OPENAI_MAX_KEEPALIVE override). Sized for
+# hundreds of concurrent Spark vLLM calls: httpx's default of 20 keep-alive
+# connections closes most connections after each request at that
+# concurrency. See app/pipeline_cli/openai_clients.py.
+DEFAULT_OPENAI_MAX_CONNECTIONS = 512
+DEFAULT_OPENAI_MAX_KEEPALIVE = 512
+DEFAULT_OPENAI_KEEPALIVE_EXPIRY = 120.0
+
+# Worker processes for ai_translation ingest, one chapter per task (1 = serial)
+INGEST_WORKERS = int(os.environ.get("INGEST_WORKERS", "1"))
+
+# Worker processes postprocessing `pipeline batch download` results (1 = serial)
+BATCH_POSTPROCESS_WORKERS = int(os.environ.get("BATCH_POSTPROCESS_WORKERS", "1"))
+
 # ThaqalaynAPI scraper settings
 THAQALAYN_API_BASE_URL = "https://www.thaqalayn-api.net/api/v2"
 THAQALAYN_API_DELAY_SECONDS = 0.5
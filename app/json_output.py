@@ -0,0 +1,405 @@
+"""One serializer for the generated data files, with a configurable profile.
+
+Every writer of ThaqalaynData files (``lib_db.write_file``,
+``shellify_complete_books``, the AI merger, ``link_books`` patching, ...)
+goes through :func:`write_json`, so the on-disk format is chosen in one
+place:
+
+- ``pretty`` (default): ``indent=2, sort_keys=True`` — byte-identical to
+  the historical output, for reviewing diffs of the data repo.
+- ``compact``: ``separators=(",", ":"), sort_keys=True`` — roughly half
+  the size for Arabic-heavy content, for production builds.
+
+``JSON_PRECOMPRESS`` (comma-separated ``gz`` and/or ``br``) additionally
+writes precompressed ``{file}.gz`` / ``{file}.br`` siblings for static
+hosting; stale siblings of a disabled format are removed on rewrite (each
+directory is scanned once for siblings, so plain runs issue no failing
+``os.remove`` calls). Brotli
+needs the optional ``brotli`` package and is skipped with a warning when it
+is missing.
+
+Both settings are read from the environment at call time (like
+``DESTINATION_DIR``) so pool workers follow the parent's profile.
+:data:`output_stats` accumulates written bytes per document ``kind`` for
+the end-of-run size report.
+
+Encoding is the other half of the cost. ``jsonable_encoder`` calls
+``model_dump`` and then re-walks the whole result in Python, and
+``clean_nones`` rebuilds it once more. :func:`to_jsonable` uses
+pydantic-core's ``model_dump(mode="json", exclude_none=True)`` (so the
+models' ``field_serializer``s still sort relation sets) and strips the
+remaining nested ``None``s in place. That pruning is only for
+``lib_db.write_file`` (``prune=True``), which always applied
+``clean_nones``; other writers pass plain dicts whose ``None``s are data
+(the index-aligned ``None`` placeholders of a sister file's ``chunks``)
+and get them written unchanged, with any models inside encoded by
+:func:`to_jsonable`. :func:`dumps` uses ``orjson`` when it
+is installed — with ``OPT_SORT_KEYS`` (and ``OPT_INDENT_2`` for ``pretty``)
+its output matches ``json.dumps`` byte for byte for strings, ints, bools
+and ``None``, the only scalars the models carry — and falls back to
+``json`` for anything orjson rejects (e.g. non-str dict keys, which
+``json`` sorts numerically). Floats are not covered: orjson writes some
+exponents differently (``1e-05`` as ``0.00001``, ``1e+16`` as ``1e16``)
+and NaN/Infinity as ``null`` where ``json`` writes ``NaN``, so plain data
+with floats may not round-trip identically between the two encoders.
+
+:func:`write_json` streams: a complete book (a ``Chapter`` tree, bare or in
+a wrapper dict) is encoded and written one chapter at a time
+(:func:`iter_json`), so peak memory holds the model tree plus one chapter
+rather than a full dict copy of the book. :func:`write_json_if_changed`
+is the variant for patch steps that rewrite existing files: it skips the
+write when the file already holds the same bytes.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from enum import Enum
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from app.config import DEFAULT_JSON_OUTPUT_PROFILE, JSON_ENCODING, JSON_ENSURE_ASCII, JSON_INDENT
+from app.models.quran import Chapter
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PRETTY = "pretty"
+PROFILE_COMPACT = "compact"
+PROFILES = (PROFILE_PRETTY, PROFILE_COMPACT)
+
+COMPRESS_FORMATS = ("gz", "br")
+
+try:
+    import brotli
+except ImportError:  # optional: only needed for JSON_PRECOMPRESS=br
+    brotli = None
+
+try:
+    import orjson
+except ImportError:  # optional: json.dumps is used instead
+    orjson = None
+
+_warned_no_brotli = False
+
+# Directory -> compressed formats that have (or had) a sibling file in it.
+# Filled by one scan per directory and by our own writes.
+_sibling_formats: Dict[str, Set[str]] = {}
+
+
+def get_profile() -> str:
+    profile = os.environ.get("JSON_OUTPUT_PROFILE", DEFAULT_JSON_OUTPUT_PROFILE)
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown JSON_OUTPUT_PROFILE {profile!r} (expected one of {PROFILES})")
+    return profile
+
+
+def get_precompress() -> Tuple[str, ...]:
+    raw = os.environ.get("JSON_PRECOMPRESS", "")
+    formats = tuple(f.strip() for f in raw.split(",") if f.strip())
+    unknown = [f for f in formats if f not in COMPRESS_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown JSON_PRECOMPRESS format(s) {unknown} (expected {COMPRESS_FORMATS})")
+    return formats
+
+
+def prune_nones(value):
+    """Drop ``None`` dict values and list items, in place; return ``value``.
+
+    Same result as ``lib_db.clean_nones`` but without copying, for freshly
+    dumped data nobody else holds.
+    """
+    if isinstance(value, dict):
+        dead = [key for key, val in value.items() if val is None]
+        for key in dead:
+            del value[key]
+        for val in value.values():
+            if isinstance(val, (dict, list)):
+                prune_nones(val)
+    elif isinstance(value, list):
+        if None in value:
+            value[:] = [x for x in value if x is not None]
+        for val in value:
+            if isinstance(val, (dict, list)):
+                prune_nones(val)
+    return value
+
+
+def to_jsonable(obj, exclude=None):
+    """JSON-ready data for a model (or a list/dict of models), ``None``s removed.
+
+    Equivalent to ``clean_nones(jsonable_encoder(obj, exclude=exclude))``.
+    """
+    if isinstance(obj, BaseModel):
+        return prune_nones(obj.model_dump(mode="json", exclude_none=True, exclude=exclude))
+    if isinstance(obj, dict):
+        return {key: to_jsonable(val) for key, val in obj.items() if val is not None}
+    if isinstance(obj, (list, tuple)):
+        return [to_jsonable(val) for val in obj if val is not None]
+    if isinstance(obj, Enum):
+        return obj.value
+    return obj
+
+
+def _default(obj):
+    """Encode models met inside plain data (``json``/``orjson`` ``default`` hook)."""
+    if isinstance(obj, BaseModel):
+        return to_jsonable(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumpb(obj, profile: Optional[str] = None) -> bytes:
+    """Serialize ``obj`` to UTF-8 bytes with the given (or configured) profile.
+
+    orjson and ``json`` agree on everything but some float spellings and
+    NaN/Infinity (``null`` under orjson); see the module docstring.
+    """
+    compact = (profile or get_profile()) == PROFILE_COMPACT
+    if orjson is not None and JSON_INDENT == 2 and not JSON_ENSURE_ASCII:
+        option = orjson.OPT_SORT_KEYS if compact else orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=_default, option=option)
+        except TypeError:
+            pass
+    if compact:
+        text = json.dumps(obj, ensure_ascii=JSON_ENSURE_ASCII, separators=(",", ":"), sort_keys=True,
+                          default=_default)
+    else:
+        text = json.dumps(obj, ensure_ascii=JSON_ENSURE_ASCII, indent=JSON_INDENT, sort_keys=True,
+                          default=_default)
+    return text.encode(JSON_ENCODING)
+
+
+def dumps(obj, profile: Optional[str] = None) -> str:
+    """Serialize ``obj`` with the given (or configured) output profile."""
+    return dumpb(obj, profile).decode(JSON_ENCODING)
+
+
+class OutputSizeStats:
+    """Files and bytes written per document kind (raw and precompressed)."""
+
+    def __init__(self):
+        self.kinds: Dict[str, Dict[str, int]] = {}
+
+    def record(self, kind: str, raw: int, gz: int = 0, br: int = 0) -> None:
+        entry = self.kinds.setdefault(kind, {"files": 0, "bytes": 0, "gz_bytes": 0, "br_bytes": 0})
+        entry["files"] += 1
+        entry["bytes"] += raw
+        entry["gz_bytes"] += gz
+        entry["br_bytes"] += br
+
+    def reset(self) -> None:
+        self.kinds.clear()
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        return {kind: dict(entry) for kind, entry in sorted(self.kinds.items())}
+
+    def log_summary(self) -> None:
+        if not self.kinds:
+            return
+        logger.info("JSON output (%s profile):", get_profile())
+        for kind, entry in self.summary().items():
+            extra = "".join(
+                f", {fmt} {entry[f'{fmt}_bytes'] / 1e6:.1f} MB"
+                for fmt in COMPRESS_FORMATS if entry[f"{fmt}_bytes"]
+            )
+            logger.info("  %-16s %8d files %10.1f MB%s", kind, entry["files"], entry["bytes"] / 1e6, extra)
+
+
+output_stats = OutputSizeStats()
+
+
+_INDENT = b" " * JSON_INDENT
+
+
+def _chunks(value, depth: int, profile: str, prune: bool, clean: bool = False) -> Iterator[bytes]:
+    """Serialized pieces of ``value``; ``Chapter`` trees are walked node by node.
+
+    ``clean``: ``value`` is already model-dumped and pruned.
+    """
+    if isinstance(value, Chapter):
+        items = to_jsonable(value, exclude={"chapters"})
+        if value.chapters is not None:
+            items["chapters"] = value.chapters
+        yield from _dict_chunks(items, depth, profile, prune, clean=True)
+    elif isinstance(value, dict) and any(isinstance(v, Chapter) for v in value.values()):
+        items = {k: v for k, v in value.items() if v is not None} if prune else value
+        yield from _dict_chunks(items, depth, profile, prune, clean)
+    elif isinstance(value, list) and value and all(isinstance(v, Chapter) for v in value):
+        yield from _list_chunks(value, depth, profile, prune)
+    else:
+        data = dumpb(to_jsonable(value) if prune and not clean else value, profile)
+        if depth and profile == PROFILE_PRETTY:
+            data = data.replace(b"\n", b"\n" + _INDENT * depth)
+        yield data
+
+
+def _dict_chunks(items: dict, depth: int, profile: str, prune: bool, clean: bool) -> Iterator[bytes]:
+    if not items:
+        yield b"{}"
+        return
+    pretty = profile == PROFILE_PRETTY
+    sep = b": " if pretty else b":"
+    yield b"{"
+    for i, key in enumerate(sorted(items)):
+        prefix = (b"," if i else b"") + (b"\n" + _INDENT * (depth + 1) if pretty else b"")
+        yield prefix + dumpb(key, profile) + sep
+        yield from _chunks(items[key], depth + 1, profile, prune, clean)
+    yield (b"\n" + _INDENT * depth if pretty else b"") + b"}"
+
+
+def _list_chunks(chapters: list, depth: int, profile: str, prune: bool) -> Iterator[bytes]:
+    pretty = profile == PROFILE_PRETTY
+    yield b"["
+    for i, chapter in enumerate(chapters):
+        yield (b"," if i else b"") + (b"\n" + _INDENT * (depth + 1) if pretty else b"")
+        yield from _chunks(chapter, depth + 1, profile, prune)
+    yield (b"\n" + _INDENT * depth if pretty else b"") + b"]"
+
+
+def iter_json(obj, profile: Optional[str] = None, prune: bool = False) -> Iterator[bytes]:
+    """Serialize ``obj`` incrementally; ``b"".join`` equals ``dumpb(obj)``.
+
+    With ``prune`` it equals ``dumpb(to_jsonable(obj))`` instead: ``None``
+    values and list items are dropped from plain data too. A complete book
+    (a ``Chapter``, or a wrapper dict holding one) is encoded one chapter at
+    a time, so the full dict copy of the tree that ``to_jsonable`` would
+    build never exists.
+    """
+    yield from _chunks(obj, 0, profile or get_profile(), prune)
+
+
+class _Sibling:
+    """Incremental writer for one precompressed sibling file."""
+
+    def __init__(self, fmt: str, file_path: str):
+        self._raw = open(f"{file_path}.{fmt}", "wb")
+        self._gz = None
+        self._br = None
+        if fmt == "gz":
+            # mtime=0 and no filename keep the output deterministic across runs
+            self._gz = gzip.GzipFile(filename="", mode="wb", fileobj=self._raw, compresslevel=9, mtime=0)
+        else:
+            self._br = brotli.Compressor()
+
+    def write(self, chunk: bytes) -> None:
+        if self._gz is not None:
+            self._gz.write(chunk)
+        else:
+            self._raw.write(self._br.process(chunk))
+
+    def close(self) -> int:
+        if self._gz is not None:
+            self._gz.close()
+        else:
+            self._raw.write(self._br.finish())
+        size = self._raw.tell()
+        self._raw.close()
+        return size
+
+
+def _enabled_formats() -> Tuple[str, ...]:
+    global _warned_no_brotli
+    enabled = get_precompress()
+    if "br" in enabled and brotli is None:
+        if not _warned_no_brotli:
+            logger.warning("JSON_PRECOMPRESS includes 'br' but the brotli package is not installed")
+            _warned_no_brotli = True
+        enabled = tuple(fmt for fmt in enabled if fmt != "br")
+    return enabled
+
+
+def write_json(file_path: str, obj, kind: Optional[str] = None, profile: Optional[str] = None,
+               prune: bool = False) -> int:
+    """Write ``obj`` to ``file_path`` (plus any precompressed siblings).
+
+    ``obj`` may be plain data or models (see :func:`to_jsonable`); it is
+    streamed to disk with :func:`iter_json`. Plain data is written as is
+    unless ``prune`` drops its ``None``s like ``clean_nones``. ``kind``
+    labels the file in :data:`output_stats`; it defaults to the document's
+    ``kind`` field. Returns the number of bytes written to ``file_path``.
+    """
+    return _write_chunks(file_path, iter_json(obj, profile, prune), _kind_of(obj, kind))
+
+
+def write_json_if_changed(file_path: str, obj, kind: Optional[str] = None,
+                          profile: Optional[str] = None, prune: bool = False) -> Optional[int]:
+    """:func:`write_json`, skipped when ``file_path`` already holds this content.
+
+    The document is encoded in memory and its SHA-256 compared with the file
+    on disk (after a size check), so re-running a patch step leaves
+    unchanged files — and their mtimes and precompressed siblings — alone.
+    Meant for the small per-verse files; complete books should keep
+    streaming through :func:`write_json`. Returns the bytes written, or
+    ``None`` when the write was skipped.
+    """
+    encoded = b"".join(iter_json(obj, profile, prune))
+    if _same_content(file_path, encoded):
+        return None
+    return _write_chunks(file_path, (encoded,), _kind_of(obj, kind))
+
+
+def _same_content(file_path: str, encoded: bytes) -> bool:
+    try:
+        if os.path.getsize(file_path) != len(encoded):
+            return False
+        with open(file_path, "rb") as f:
+            on_disk = hashlib.sha256(f.read()).digest()
+    except OSError:
+        return False
+    if on_disk != hashlib.sha256(encoded).digest():
+        return False
+    # A sibling format enabled since the last write still has to be produced
+    return all(os.path.exists(f"{file_path}.{fmt}") for fmt in _enabled_formats())
+
+
+def _kind_of(obj, kind: Optional[str]) -> str:
+    if kind is None:
+        kind = (obj.get("kind") if isinstance(obj, dict) else None) or "other"
+    return kind
+
+
+def _formats_in_dir(directory: str) -> Set[str]:
+    present = _sibling_formats.get(directory)
+    if present is None:
+        present = set()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    fmt = entry.name.rpartition(".")[2]
+                    if fmt in COMPRESS_FORMATS:
+                        present.add(fmt)
+        except FileNotFoundError:
+            pass
+        _sibling_formats[directory] = present
+    return present
+
+
+def _write_chunks(file_path: str, chunks, kind: str) -> int:
+    enabled = _enabled_formats()
+    present = _formats_in_dir(os.path.dirname(os.path.abspath(file_path)))
+    siblings = {}
+    for fmt in COMPRESS_FORMATS:
+        if fmt in enabled:
+            siblings[fmt] = _Sibling(fmt, file_path)
+            present.add(fmt)
+        elif fmt in present:
+            try:
+                os.remove(f"{file_path}.{fmt}")
+            except FileNotFoundError:
+                pass
+
+    with open(file_path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+            for sibling in siblings.values():
+                sibling.write(chunk)
+        size = f.tell()
+    sizes = {fmt: sibling.close() for fmt, sibling in siblings.items()}
+
+    output_stats.record(kind, size, sizes.get("gz", 0), sizes.get("br", 0))
+    return size
@@ -8,7 +8,6 @@ import xml.etree.ElementTree
 from pprint import pprint
 from typing import Dict, List
 
-import fastapi
 from bs4 import BeautifulSoup, NavigableString, Tag
 
 # make sure all SQL Alchemy models are imported before initializing DB
@@ -518,7 +517,7 @@ def init_kafi(report: ProcessingReport = None):
 
 	insert_chapter(book)
 
-	write_file("/books/complete/al-kafi", fastapi.encoders.jsonable_encoder(book))
+	write_file("/books/complete/al-kafi", book)
 
 	report.print_summary()
 	return book
@@ -1,10 +1,10 @@
 import logging
 import os
 import re
-from typing import Dict, List, Set
-
-from fastapi.encoders import jsonable_encoder
+from typing import Dict, List, Optional, Set, Tuple
 
+from app.config import NARRATOR_WORKERS
+from app.chain_store import ChainStore
 from app.lib_bs4 import get_contents, is_rtl_tag
 from app.lib_db import (delete_folder, insert_chapter, load_chapter, load_json,
                         write_file)
@@ -235,7 +235,7 @@ def insert_narrators(narrators: Dict[int, Narrator]):
         obj = {
             "index": narrator.index,
             "kind": "person_content",
-            'data': jsonable_encoder(narrator)
+            'data': narrator
         }
         logger.info(f"Inserting /people/narrators/{narrator.index}")
         write_file(f"/people/narrators/{narrator.index}", obj)
@@ -289,7 +289,7 @@ def kafi_narrators(report: ProcessingReport = None):
     insert_narrators(narrators)
     insert_narrator_index(narrator_index, narrators)
     insert_chapter(kafi)
-    write_file("/books/complete/al-kafi", jsonable_encoder(kafi))
+    write_file("/books/complete/al-kafi", kafi)
 
 
 # ── New unified narrator processing using NarratorRegistry ──────────────
@@ -307,14 +307,31 @@ def _process_book_with_registry(
 
     Walks the book recursively, extracting and linking narrators for each verse.
     """
+    chains: List[Tuple[str, List[int]]] = []
+    _link_book_chains(book, registry, report, chains, use_undiacritized)
+    for verse_path, canonical_ids in chains:
+        _record_chain(verse_path, canonical_ids, registry, narrators, narrator_id_name)
+
+
+def _link_book_chains(
+    book: Chapter,
+    registry: NarratorRegistry,
+    report: ProcessingReport,
+    chains: List[Tuple[str, List[int]]],
+    use_undiacritized: bool = False,
+):
+    """Link narrator chains in place and collect ``(verse_path, canonical_ids)``.
+
+    This is the per-book "map" half of narrator processing: it only touches
+    the book itself, so books can be linked independently (and in parallel)
+    before :func:`_record_chain` folds the chains into the narrator set.
+    """
     chapters = get_chapters(book)
     verses = get_verses(book)
 
     if chapters:
         for chapter in chapters:
-            _process_book_with_registry(
-                chapter, registry, narrators, narrator_id_name, report, use_undiacritized
-            )
+            _link_book_chains(chapter, registry, report, chains, use_undiacritized)
     elif verses:
         for hadith in verses:
             if not hadith.text or len(hadith.text) < 1:
@@ -330,28 +347,121 @@ def _process_book_with_registry(
                 )
                 if not canonical_ids:
                     report.narrations_without_narrators += 1
-
-                # Update narrator tracking (verse_paths, subchains)
-                for cid in canonical_ids:
-                    narrator = _get_or_create_narrator(cid, registry, narrators, narrator_id_name)
-                    narrator.verse_paths.add(hadith.path)
-
-                # Build subchains
-                narrator_id_to_subchain_ids = getCombinations(canonical_ids)
-                for cid in canonical_ids:
-                    narrator = narrators[cid]
-                    if cid in narrator_id_to_subchain_ids:
-                        for (subchain_key, subchain_ids) in narrator_id_to_subchain_ids[cid]:
-                            if subchain_key not in narrator.subchains:
-                                cv = ChainVerses()
-                                cv.narrator_ids = subchain_ids
-                                cv.verse_paths = set()
-                                narrator.subchains[subchain_key] = cv
-                            narrator.subchains[subchain_key].verse_paths.add(hadith.path)
+                chains.append((hadith.path, canonical_ids))
             except Exception as e:
                 logger.error("Narrator extraction error at %s: %s", hadith.path, e)
 
 
+def _record_chain(
+    verse_path: str,
+    canonical_ids: List[int],
+    registry: NarratorRegistry,
+    narrators: Dict[int, Narrator],
+    narrator_id_name: Dict[int, str],
+):
+    """Fold one verse's linked chain into narrator verse_paths and subchains."""
+    # Update narrator tracking (verse_paths, subchains)
+    for cid in canonical_ids:
+        narrator = _get_or_create_narrator(cid, registry, narrators, narrator_id_name)
+        narrator.verse_paths.add(verse_path)
+
+    # Build subchains
+    narrator_id_to_subchain_ids = getCombinations(canonical_ids)
+    for cid in canonical_ids:
+        narrator = narrators[cid]
+        if cid in narrator_id_to_subchain_ids:
+            for (subchain_key, subchain_ids) in narrator_id_to_subchain_ids[cid]:
+                if subchain_key not in narrator.subchains:
+                    cv = ChainVerses()
+                    cv.narrator_ids = subchain_ids
+                    cv.verse_paths = set()
+                    narrator.subchains[subchain_key] = cv
+                narrator.subchains[subchain_key].verse_paths.add(verse_path)
+
+
+# Per-process registry for map workers (loaded once by _init_narrator_worker).
+_worker_registry: Optional[NarratorRegistry] = None
+
+
+def _init_narrator_worker():
+    global _worker_registry
+    _worker_registry = NarratorRegistry()
+
+
+def _load_linked_book(book_slug: str, registry: NarratorRegistry, report: ProcessingReport,
+                      chains: List[Tuple[str, List[int]]]) -> Chapter:
+    """Load one complete book and link its chains in place.
+
+    Al-Kafi is well diacritized; other books may be less so and use the
+    undiacritized fallback.
+    """
+    book = load_chapter(f"/books/complete/{book_slug}")
+    _link_book_chains(
+        book, registry, report, chains,
+        use_undiacritized=(book_slug != "al-kafi"),
+    )
+    return book
+
+
+def _link_book_task(book_slug: str, registry: Optional[NarratorRegistry] = None):
+    """Map step: load one complete book and link its chains.
+
+    Returns ``(book_slug, book, chains, report)``, or None if the book could
+    not be processed.
+
+    In a worker process (no ``registry`` passed) nothing is written and the
+    linked book is dropped, so only the ``(verse_path, chain)`` list and
+    the report travel back to the parent; ``book`` is then None and the
+    save step loads and links it again.
+    """
+    in_worker = registry is None
+    registry = registry or _worker_registry
+    report = ProcessingReport()
+    chains: List[Tuple[str, List[int]]] = []
+    try:
+        book = _load_linked_book(book_slug, registry, report, chains)
+    except Exception as e:
+        logger.error("Failed to process %s narrators: %s", book_slug, e)
+        return None
+    logger.info("Linked %s: %d chains", book_slug, len(chains))
+    return book_slug, None if in_worker else book, chains, report
+
+
+def _save_book_task(item) -> None:
+    """Write step: apply this book's shared-chain relations and re-save it.
+
+    ``book`` is None when a worker linked it; the unchanged complete file
+    is then loaded and linked again (the map step wrote nothing), so each
+    book is still written once.
+    """
+    from app.link_chains import apply_shared_chain_relations
+    book_slug, book, verse_relations = item
+    try:
+        if book is None:
+            book = _load_linked_book(book_slug, _worker_registry, ProcessingReport(), [])
+        apply_shared_chain_relations([book], verse_relations)
+        insert_chapter(book)
+        write_file(f"/books/complete/{book_slug}", book)
+    except Exception as e:
+        logger.error("Failed to re-save %s: %s", book_slug, e)
+
+
+def _narrator_book_slugs() -> List[str]:
+    """Al-Kafi first, then every other complete book (Quran excluded)."""
+    slugs = ["al-kafi"]
+    dest_dir = os.environ.get("DESTINATION_DIR", "../ThaqalaynData/")
+    complete_dir = os.path.join(dest_dir, "books", "complete")
+    if os.path.isdir(complete_dir):
+        for filename in sorted(os.listdir(complete_dir)):
+            if not filename.endswith(".json"):
+                continue
+            book_slug = filename[:-5]  # Remove .json
+            if book_slug in ("al-kafi", "quran"):
+                continue  # Already processed or skip Quran
+            slugs.append(book_slug)
+    return slugs
+
+
 def _get_or_create_narrator(
     canonical_id: int,
     registry: NarratorRegistry,
@@ -383,15 +493,44 @@ def _get_or_create_narrator(
     return narrator
 
 
+def _insert_narrators_from_store(
+    narrators: Dict[int, Narrator],
+    narrator_id_name: Dict[int, str],
+    store: ChainStore,
+) -> Dict[int, dict]:
+    """Write each narrator file from the chain store; return index metadata.
+
+    ``verse_paths``/``subchains`` are filled in for one narrator at a time
+    and dropped again once written, so only the compact store stays live.
+    """
+    metadata = {}
+    for cid, narrator in narrators.items():
+        store.fill_narrator(narrator)
+        insert_narrators({cid: narrator})
+        name = narrator_id_name.get(cid, narrator.titles.get(Language.AR.value, ""))
+        metadata[cid] = compose_narrator_metadata(name, narrator)
+        narrator.verse_paths = None
+        narrator.subchains = None
+    return metadata
+
+
 def _insert_narrator_index_registry(
     narrators: Dict[int, Narrator],
     narrator_id_name: Dict[int, str],
+    metadata: Optional[Dict[int, dict]] = None,
 ):
-    """Write narrator index using canonical names."""
+    """Write narrator index using canonical names.
+
+    ``metadata`` (from :func:`_insert_narrators_from_store`) is used when
+    the narrators' subchains are no longer held in memory.
+    """
     narrators_with_metadata = {}
     for cid, narrator in narrators.items():
-        name = narrator_id_name.get(cid, narrator.titles.get(Language.AR.value, ""))
-        narrators_with_metadata[cid] = compose_narrator_metadata(name, narrator)
+        if metadata is not None:
+            narrators_with_metadata[cid] = metadata[cid]
+        else:
+            name = narrator_id_name.get(cid, narrator.titles.get(Language.AR.value, ""))
+            narrators_with_metadata[cid] = compose_narrator_metadata(name, narrator)
         # Add English name to metadata if available
         en_name = narrator.titles.get(Language.EN.value)
         if en_name:
@@ -465,7 +604,7 @@ def _collect_verse_samples(node, out: list, target: int = 8) -> None:
                     return
 
 
-def process_all_narrators(report: ProcessingReport = None):
+def process_all_narrators(report: ProcessingReport = None, workers: Optional[int] = None):
     """Process narrators across ALL books using the canonical narrator registry.
 
     Replaces kafi_narrators() in the pipeline. Uses NarratorRegistry for
@@ -478,6 +617,16 @@ def process_all_narrators(report: ProcessingReport = None):
     4. Extract and link narrators for each verse
     5. Write narrator files + narrator index
     6. Re-save complete book files with updated narrator_chain.parts
+
+    With ``workers`` > 1 (default: ``NARRATOR_WORKERS`` env, 1) steps 3-4
+    and 6 run map-reduce style: each book is linked in its own worker
+    process, which returns only its ``(verse_path, chain)`` list and
+    report; the parent merges chains into narrators before shared-chain
+    linking, then the workers load, re-link and save each book once.
+
+    Chains are reduced into a :class:`~app.chain_store.ChainStore` (verse
+    paths and chains interned as ints); narrator subchains and the shared
+    chain relations are both derived from it.
     """
     if report is None:
         report = get_default_report()
@@ -514,69 +663,73 @@ def process_all_narrators(report: ProcessingReport = None):
 
     narrators: Dict[int, Narrator] = {}
     narrator_id_name: Dict[int, str] = {}
-
-    # Process Al-Kafi (well-diacritized, no undiacritized fallback needed)
-    try:
-        kafi = load_chapter("/books/complete/al-kafi")
-        _process_book_with_registry(kafi, registry, narrators, narrator_id_name, report, use_undiacritized=False)
-        logger.info("Al-Kafi: processed, %d narrators found so far", len(narrators))
-    except Exception as e:
-        logger.error("Failed to process Al-Kafi narrators: %s", e)
-
-    # Process other complete books (thaqalayn_api + ghbook)
-    dest_dir = os.environ.get("DESTINATION_DIR", "../ThaqalaynData/")
-    complete_dir = os.path.join(dest_dir, "books", "complete")
-    complete_books = {}
-
-    if os.path.isdir(complete_dir):
-        for filename in sorted(os.listdir(complete_dir)):
-            if not filename.endswith(".json"):
-                continue
-            book_slug = filename[:-5]  # Remove .json
-            if book_slug in ("al-kafi", "quran"):
-                continue  # Already processed or skip Quran
-
-            try:
-                book = load_chapter(f"/books/complete/{book_slug}")
-                _process_book_with_registry(
-                    book, registry, narrators, narrator_id_name, report,
-                    use_undiacritized=True,  # Non-Kafi books may have less diacritization
-                )
-                complete_books[book_slug] = book
-                logger.info("Processed %s, %d narrators total", book_slug, len(narrators))
-            except Exception as e:
-                logger.error("Failed to process %s narrators: %s", book_slug, e)
+    store = ChainStore()
+
+    # Map: link each book's chains independently — in worker processes
+    # (registry loaded once per worker) when workers > 1.
+    if workers is None:
+        workers = NARRATOR_WORKERS
+    book_slugs = _narrator_book_slugs()
+    pool = None
+    if workers > 1 and len(book_slugs) > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(min(workers, len(book_slugs)), initializer=_init_narrator_worker)
+        linked = pool.imap(_link_book_task, book_slugs)
+        logger.info("Linking narrators across %d books with %d workers", len(book_slugs), workers)
+    else:
+        linked = (_link_book_task(book_slug, registry) for book_slug in book_slugs)
+
+    # Reduce: fold every book's chains into the corpus chain store (book
+    # order preserved, so the result matches a serial walk). Narrators only
+    # carry their titles until their files are written.
+    books: Dict[str, Optional[Chapter]] = {}
+    for result in linked:
+        if result is None:
+            continue
+        book_slug, book, chains, book_report = result
+        for verse_path, canonical_ids in chains:
+            for cid in canonical_ids:
+                _get_or_create_narrator(cid, registry, narrators, narrator_id_name)
+            store.add(verse_path, canonical_ids)
+        report.merge(book_report)
+        books[book_slug] = book
+        logger.info("Processed %s, %d narrators total", book_slug, len(narrators))
 
     logger.info("Total narrators found across all books: %d", len(narrators))
     logger.info("Narrations without narrators: %d", report.narrations_without_narrators)
 
     # Add shared chain relations before writing files
-    from app.link_chains import collect_shared_chains, build_verse_relations, apply_shared_chain_relations
-    chain_groups = collect_shared_chains(narrators)
+    from app.link_chains import collect_store_chains, build_verse_relations
+    logger.info("Chain store: %d verses, %d distinct chains", len(store.paths), len(store))
+    chain_groups = collect_store_chains(store)
     logger.info("Found %d shared chains (3+ narrators, 2-20 occurrences)", len(chain_groups))
     verse_relations = build_verse_relations(chain_groups)
-    all_books = [kafi] + list(complete_books.values())
-    updated = apply_shared_chain_relations(all_books, verse_relations)
-    logger.info("Added 'Shared Chain' relations to %d verses", updated)
-
-    # Write narrator files
-    insert_narrators(narrators)
-    _insert_narrator_index_registry(narrators, narrator_id_name)
-
-    # Re-save Al-Kafi with updated narrator_chain.parts
-    try:
-        insert_chapter(kafi)
-        write_file("/books/complete/al-kafi", jsonable_encoder(kafi))
-    except Exception as e:
-        logger.error("Failed to re-save Al-Kafi: %s", e)
-
-    # Re-save other complete books
-    for book_slug, book in complete_books.items():
-        try:
-            insert_chapter(book)
-            write_file(f"/books/complete/{book_slug}", jsonable_encoder(book))
-        except Exception as e:
-            logger.error("Failed to re-save %s: %s", book_slug, e)
+    del chain_groups
+
+    # Write narrator files, materializing each narrator's subchains from
+    # the store only while it is written.
+    metadata = _insert_narrators_from_store(narrators, narrator_id_name, store)
+    _insert_narrator_index_registry(narrators, narrator_id_name, metadata)
+    del store
+
+    # Re-save complete books with updated narrator_chain.parts + relations.
+    # Each book only receives the relations for its own verses.
+    relations_by_book: Dict[str, Dict[str, Set[str]]] = {slug: {} for slug in books}
+    for verse_path, related in verse_relations.items():
+        book_slug = verse_path.replace("/books/", "").split(":")[0]
+        if book_slug in relations_by_book:
+            relations_by_book[book_slug][verse_path] = related
+    logger.info("Adding 'Shared Chain' relations to %d verses",
+                sum(len(r) for r in relations_by_book.values()))
+    save_items = [(slug, book, relations_by_book[slug]) for slug, book in books.items()]
+    if pool is not None:
+        for _ in pool.imap_unordered(_save_book_task, save_items):
+            pass
+        pool.close()
+        pool.join()
+    else:
+        for item in save_items:
+            _save_book_task(item)
 
     generate_featured_narrators()
 
@@ -6,7 +6,6 @@ import re
 from pprint import pprint
 
 from bs4 import BeautifulSoup, NavigableString, Tag
-from fastapi.encoders import jsonable_encoder
 
 from app import config
 from app.lib_bs4 import get_contents, is_rtl_tag
@@ -269,6 +268,6 @@ def add_kafi_sarwar(report: ProcessingReport = None):
 
 	set_index(kafi, [0, 0, 0, 0], 0, report)
 	insert_chapter(kafi)
-	write_file("/books/complete/al-kafi", jsonable_encoder(kafi))
+	write_file("/books/complete/al-kafi", kafi)
 
 	report.print_summary()
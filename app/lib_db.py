@@ -3,13 +3,23 @@ import json
 import logging
 import os
 import shutil
+from typing import Union
 
 import jsons
-from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
 
+from app.json_output import to_jsonable, write_json
+from app.run_profile import record_read, record_write
 from app.lib_model import get_chapters, get_verses
 from app.models import Chapter, Language, Translation, Verse
 from app.models.enums import PartType
+from app.translation_bundles import (
+	base_translation_ids,
+	bundle_docs,
+	bundle_path,
+	bundles_enabled,
+	split_translations,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -33,7 +43,7 @@ def insert_chapter(chapter: Chapter):
 		insert_chapter_content(chapter)
 
 def insert_chapters_list(chapter: Chapter) -> None:
-	chapter_data = jsonable_encoder(chapter,
+	chapter_data = to_jsonable(chapter,
 		exclude={'chapters': {'__all__': {
 			'chapters',
 			'verses',
@@ -56,13 +66,13 @@ def insert_chapters_list(chapter: Chapter) -> None:
 		insert_chapter(subchapter)
 
 def insert_chapter_content(chapter: Chapter) -> None:
-	chapter_data = jsonable_encoder(chapter, exclude={'verses', 'chapters'})
+	chapter_data = to_jsonable(chapter, exclude={'verses', 'chapters'})
 
 	verse_refs = []
 	for verse in get_verses(chapter):
 		ref = {"local_index": verse.local_index, "part_type": verse.part_type.value if verse.part_type else None}
 		if verse.part_type == PartType.Heading:
-			ref["inline"] = jsonable_encoder(verse)
+			ref["inline"] = to_jsonable(verse)
 		else:
 			ref["path"] = verse.path
 		verse_refs.append(ref)
@@ -90,6 +100,10 @@ def insert_verse_details(chapter: Chapter) -> None:
 	if not addressable_verses:
 		return
 
+	bundled = bundles_enabled(chapter.path, chapter.default_verse_translation_ids)
+	keep_ids = base_translation_ids(chapter.default_verse_translation_ids)
+	moved = []
+
 	for i, verse in enumerate(addressable_verses):
 		if not verse.path:
 			continue
@@ -101,7 +115,7 @@ def insert_verse_details(chapter: Chapter) -> None:
 			nav["next"] = addressable_verses[i + 1].path
 		nav["up"] = chapter.path
 
-		verse_data = jsonable_encoder(verse)
+		verse_data = to_jsonable(verse)
 		detail_data = {
 			"verse": verse_data,
 			"chapter_path": chapter.path,
@@ -112,6 +126,10 @@ def insert_verse_details(chapter: Chapter) -> None:
 		if hasattr(chapter, 'verse_translations') and chapter.verse_translations:
 			detail_data["verse_translations"] = chapter.verse_translations
 
+		if bundled:
+			moved.append((verse.path, split_translations(verse_data, keep_ids)))
+			detail_data["translation_bundle"] = bundle_path(chapter.path)
+
 		if verse.gradings:
 			detail_data["gradings"] = verse.gradings
 		if verse.source_url:
@@ -125,6 +143,11 @@ def insert_verse_details(chapter: Chapter) -> None:
 		result = write_file(verse.path, obj_in)
 		logger.debug("Inserted verse detail ID %s with index %s", result.id, result.index)
 
+	if bundled:
+		for path, doc in bundle_docs(chapter.path, index_from_path(chapter.path), moved).items():
+			write_file(path, doc)
+		logger.debug("Wrote translation bundles for %s", chapter.path)
+
 def get_dest_path(filename: str) -> str:
 	sanitised_file = filename.replace(":", "/")
 	if sanitised_file.startswith("/"):
@@ -137,30 +160,36 @@ def ensure_dir(file_path: str) -> str:
 		os.makedirs(directory)
 	return file_path
 
-def write_file(path: str, obj: dict) -> InsertedObj:
+def write_file(path: str, obj: Union[dict, BaseModel]) -> InsertedObj:
 	result = InsertedObj()
 	result.path = path
-	if 'index' in obj:
+	if isinstance(obj, BaseModel):
+		result.index = getattr(obj, "index", None)
+	elif 'index' in obj:
 		result.index = obj["index"]
 
-	clean_obj = clean_nones(obj)
-
-	with open(ensure_dir(get_dest_path(path)), 'w', encoding='utf-8') as f:
-		json.dump(clean_obj, f, ensure_ascii=False, indent=2, sort_keys=True)
-		result.id = f.name
+	# Models (also nested in dicts) are dumped by pydantic-core and complete
+	# books are streamed chapter by chapter; plain data gets the same None
+	# removal as clean_nones.
+	dest = ensure_dir(get_dest_path(path))
+	record_write(write_json(dest, obj, prune=True))
+	result.id = dest
 	
 	return result
 
 def load_chapter(path: str) -> Chapter :
 	with open(ensure_dir(get_dest_path(path)), 'r', encoding='utf-8') as f:
 		json_chapter = json.load(f)
+		record_read(f.tell())
 		if 'data' in json_chapter:
 			json_chapter = json_chapter['data']
 		return Chapter(**json_chapter)
 
 def load_json(path: str) -> dict:
 	with open(ensure_dir(get_dest_path(path)), 'r', encoding='utf-8') as f:
-		return json.load(f)
+		data = json.load(f)
+		record_read(f.tell())
+		return data
 
 def delete_file(path: str) -> None:
 	filename = get_dest_path(path)
@@ -227,8 +256,7 @@ def shellify_complete_books() -> int:
 		data = doc.get("data", doc)
 		converted = _shellify_node(data)
 		if converted > 0:
-			with open(file_path, "w", encoding="utf-8") as f:
-				json.dump(doc, f, ensure_ascii=False, indent=2, sort_keys=True)
+			write_json(file_path, doc, kind="complete_book")
 			total_converted += converted
 			logger.info("Shellified %d chapters in %s", converted, filename)
 
@@ -1,6 +1,5 @@
 import os
 import json
-import fastapi
 from app.lib_db import write_file, load_json, get_dest_path
 from app.models.translation import Translation
 
@@ -27,12 +26,12 @@ def update_index_files(index_maps):
         else:
             existing = {}
         merged = {**existing, **idx}
-        write_file(f"/index/books.{lang}", fastapi.encoders.jsonable_encoder(merged))
+        write_file(f"/index/books.{lang}", merged)
     
 def add_translation(translation: Translation):
     try:
         translations = load_json("/index/translations")
     except Exception:
         translations = {}
-    translations[translation.id] = fastapi.encoders.jsonable_encoder(translation.model_dump())
-    write_file("/index/translations", fastapi.encoders.jsonable_encoder(translations))
+    translations[translation.id] = translation.model_dump(mode="json")
+    write_file("/index/translations", translations)
@@ -28,6 +28,14 @@ class ProcessingReport:
 	def add_sequence_error(self, msg: str):
 		self.sequence_errors.append(msg)
 
+	def merge(self, other: "ProcessingReport"):
+		"""Fold in the counters and errors of a report filled elsewhere (e.g. a worker process)."""
+		self.sequence_errors.extend(other.sequence_errors)
+		self.narrations_without_narrators += other.narrations_without_narrators
+		self.ai_verses_merged += other.ai_verses_merged
+		self.ai_verses_available += other.ai_verses_available
+		self.ai_merge_errors.extend(other.ai_merge_errors)
+
 	def print_summary(self):
 		if self.sequence_errors:
 			logger.info("Sequence errors (%d):", len(self.sequence_errors))
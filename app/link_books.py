@@ -19,9 +19,12 @@ from typing import Dict, List, Optional, Set, Tuple
 from fastapi.encoders import jsonable_encoder
 
 from app.book_registry import BOOK_REGISTRY
-from app.lib_db import get_dest_path, load_chapter, write_file
+from app.json_output import write_json
+from app.lib_db import get_dest_path, get_destination_dir, load_chapter, write_file
 from app.lib_model import get_chapters, get_verses
 from app.models import Chapter, PartType, Verse
+from app.translation_bundles import split_translations
+from app.verse_pack import restore_packed_files
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -130,7 +133,7 @@ def link_all_books_to_quran() -> None:
             total_refs += book_refs
 
         # Write back the book with updated relations
-        write_file(complete_path, jsonable_encoder(book))
+        write_file(complete_path, book)
 
         # Propagate to modular files (verse_list + verse_detail)
         patched = _propagate_to_modular_files(book)
@@ -139,7 +142,7 @@ def link_all_books_to_quran() -> None:
             total_patched += patched
 
     # Write back the Quran with all accumulated "Mentioned In" relations
-    write_file("/books/complete/quran", jsonable_encoder(quran))
+    write_file("/books/complete/quran", quran)
 
     # Propagate Quran "Mentioned In" to modular Quran files
     quran_patched = _propagate_to_modular_files(quran)
@@ -190,6 +193,7 @@ def _patch_modular_file(file_path: str, verse_updates: Dict[str, dict]) -> int:
     and verse_detail files (single hadith pages).
     Returns count of patched verses.
     """
+    restore_packed_files(get_destination_dir(), file_path)
     dest = get_dest_path(file_path)
     try:
         with open(dest, 'r', encoding='utf-8') as f:
@@ -222,12 +226,16 @@ def _patch_modular_file(file_path: str, verse_updates: Dict[str, dict]) -> int:
             if 'relations' in update:
                 verse['relations'] = update['relations']
             if 'translations' in update:
+                # A bundled file keeps only the translations it already
+                # carries inline; the rest live in its translation bundles.
+                inline = set(verse.get('translations') or {})
                 verse['translations'] = update['translations']
+                if 'translation_bundle' in data['data']:
+                    split_translations(verse, inline)
             patched += 1
 
     if patched > 0:
-        with open(dest, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+        write_json(dest, data)
 
     return patched
 
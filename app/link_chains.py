@@ -47,6 +47,15 @@ def collect_shared_chains(narrators) -> Dict[str, Set[str]]:
     return chain_groups
 
 
+def collect_store_chains(store) -> Dict[str, Set[str]]:
+    """Same groups as :func:`collect_shared_chains`, read from a ``ChainStore``.
+
+    Each chain is interned once in the store, so no cross-narrator dedup
+    is needed.
+    """
+    return store.chain_groups(MIN_CHAIN_LENGTH, MIN_GROUP_SIZE, MAX_GROUP_SIZE)
+
+
 def build_verse_relations(chain_groups: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
     """Build verse_path -> set of related verse_paths from chain groups."""
     relations: Dict[str, Set[str]] = {}
@@ -17,8 +17,6 @@ import re
 from collections import defaultdict
 from typing import Dict, List, Set, Tuple
 
-from fastapi.encoders import jsonable_encoder
-
 from app.book_registry import BOOK_REGISTRY
 from app.lib_db import load_chapter, write_file
 from app.lib_model import get_chapters, get_verses
@@ -235,7 +233,7 @@ def link_fuzzy_quran() -> None:
             total_linked += linked
 
             # Write back with updated relations
-            write_file(complete_path, jsonable_encoder(book))
+            write_file(complete_path, book)
 
             # Propagate to modular files
             patched = _propagate_to_modular_files(book)
@@ -243,7 +241,7 @@ def link_fuzzy_quran() -> None:
                 total_patched += patched
 
     # Write back Quran with accumulated "Quoted In"
-    write_file("/books/complete/quran", jsonable_encoder(quran))
+    write_file("/books/complete/quran", quran)
     quran_patched = _propagate_to_modular_files(quran)
     total_patched += quran_patched
 
@@ -2,8 +2,6 @@ import logging
 import re
 from typing import Set
 
-from fastapi.encoders import jsonable_encoder
-
 from app.lib_bs4 import get_contents, is_rtl_tag
 from app.lib_db import insert_chapter, load_chapter, write_file
 from app.lib_model import get_chapters, get_verses
@@ -72,6 +70,6 @@ def link_quran_kafi():
 
     insert_chapter(kafi)
     insert_chapter(quran) 
-    write_file("/books/complete/al-kafi", jsonable_encoder(kafi))
-    write_file("/books/complete/quran", jsonable_encoder(quran))
+    write_file("/books/complete/al-kafi", kafi)
+    write_file("/books/complete/quran", quran)
 
@@ -19,7 +19,9 @@ from app.ghbook import init_ghbook_books
 from app.ai_content_merger import merge_ai_content
 from app.create_indices import create_indices
 from app.link_chapters import link_related_chapters
+from app.json_output import output_stats
 from app.lib_db import write_file, shellify_complete_books
+from app.run_profile import profiler
 from app.verse_counts import write_manifest as write_verse_counts
 
 logging.basicConfig(level=logging.INFO)
@@ -28,24 +30,33 @@ logger = logging.getLogger(__name__)
 
 def init():
     report = ProcessingReport()
-    init_books()
-    init_quran()
-    init_kafi(report)
-    add_kafi_sarwar(report)
-    link_quran_kafi()
-    init_all_thaqalayn_api_books()
-    init_ghbook_books()
-    link_all_books_to_quran()
-    link_fuzzy_quran()
-    process_all_narrators(report)   # Replaces kafi_narrators(); runs after all books loaded
-    create_indices()
-    link_related_chapters()
-    merge_ai_content(report)
-    shellify_complete_books()
-    _write_verse_counts()
-    _write_narrator_analysis()
-    _write_data_version()
+    profiler.reset()
+    stages = [
+        ("init_books", init_books),
+        ("init_quran", init_quran),
+        ("init_kafi", lambda: init_kafi(report)),
+        ("add_kafi_sarwar", lambda: add_kafi_sarwar(report)),
+        ("link_quran_kafi", link_quran_kafi),
+        ("init_all_thaqalayn_api_books", init_all_thaqalayn_api_books),
+        ("init_ghbook_books", init_ghbook_books),
+        ("link_all_books_to_quran", link_all_books_to_quran),
+        ("link_fuzzy_quran", link_fuzzy_quran),
+        # Replaces kafi_narrators(); runs after all books loaded
+        ("process_all_narrators", lambda: process_all_narrators(report)),
+        ("create_indices", create_indices),
+        ("link_related_chapters", link_related_chapters),
+        ("merge_ai_content", lambda: merge_ai_content(report)),
+        ("shellify_complete_books", shellify_complete_books),
+        ("write_verse_counts", _write_verse_counts),
+        ("write_narrator_analysis", _write_narrator_analysis),
+        ("write_data_version", _write_data_version),
+    ]
+    for name, run in stages:
+        with profiler.stage(name):
+            run()
     report.print_summary()
+    output_stats.log_summary()
+    profiler.finish({"output": output_stats.summary()})
 
 
 def _write_data_version():
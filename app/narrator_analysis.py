@@ -35,6 +35,8 @@ import statistics
 from collections import Counter, defaultdict
 from pathlib import Path
 
+from app.verse_pack import VerseDetailSource, iter_verse_details
+
 SKIP_DIRS = {"complete"}  # books/complete/ holds aggregated full-text dumps
 CHAIN_PART_TYPES = {"Hadith", "Verse"}
 
@@ -507,19 +509,17 @@ def _chapter_verse_paths(shell: dict) -> list[str]:
 
 
 def build_profile(data_root: Path) -> NarratorProfile:
-    """Pass A: scan every verse_detail to classify narrators corpus-wide."""
+    """Pass A: scan every verse_detail to classify narrators corpus-wide.
+
+    Reads each book's verse pack when it has one (see ``app.verse_pack``),
+    else its per-file verse_detail files.
+    """
     profile = NarratorProfile()
     books_dir = data_root / "books"
     for book_dir in sorted(books_dir.iterdir()):
         if not book_dir.is_dir() or book_dir.name in SKIP_DIRS:
             continue
-        for jp in book_dir.rglob("*.json"):
-            # only base verse_detail files (skip *.en.json etc. and shells)
-            if jp.name.count(".") > 1:
-                continue
-            doc = _load(jp)
-            if not doc or doc.get("kind") != "verse_detail":
-                continue
+        for doc in iter_verse_details(str(data_root), book_dir.name):
             verse = (doc.get("data") or {}).get("verse") or {}
             for entry in _chain_from_verse(verse):
                 profile.observe(entry)
@@ -541,39 +541,49 @@ def build_chapter_sidecars(
             continue
         if only_book and book_dir.name != only_book:
             continue
-        for shell_path in book_dir.rglob("*.json"):
-            if shell_path.name.count(".") > 1:  # skip lang variants/sidecars
-                continue
-            shell = _load(shell_path)
-            if not shell or shell.get("kind") != "verse_list":
-                continue
-            verse_paths = _chapter_verse_paths(shell)
-            if not verse_paths:
-                continue
-            verses = []
-            for vp in verse_paths:
-                doc = _load(books_dir / _verse_path_to_relpath(vp))
-                if doc and doc.get("kind") == "verse_detail":
-                    data = doc.get("data") or {}
-                    verse = data.get("verse") or {}
-                    # gradings live at data-level (data.verse mirrors it, but
-                    # not for every book) — surface it onto the verse so the
-                    # grading-mix insight sees it.
-                    if not verse.get("gradings") and data.get("gradings"):
-                        verse = {**verse, "gradings": data["gradings"]}
-                    verses.append(verse)
-            if not verses:
-                continue
-            analysis = analyze_chapter(verses, profile)
-            out = {
-                "index": shell.get("index"),
-                "kind": "narrator_analysis",
-                "data": analysis,
-            }
-            out_path = shell_path.with_name(shell_path.stem + ".narrators.json")
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(out, f, ensure_ascii=False, separators=(",", ":"))
-            written.append(out_path)
+        with VerseDetailSource(str(data_root), book_dir.name) as details:
+            written.extend(_book_sidecars(book_dir, details, profile))
+    return written
+
+
+def _book_sidecars(
+    book_dir: Path, details: VerseDetailSource, profile: NarratorProfile
+) -> list[Path]:
+    """Write the narrator sidecars for one book's shells."""
+    written: list[Path] = []
+    for shell_path in book_dir.rglob("*.json"):
+        if shell_path.name.count(".") > 1:  # skip lang variants/sidecars
+            continue
+        shell = _load(shell_path)
+        if not shell or shell.get("kind") != "verse_list":
+            continue
+        verse_paths = _chapter_verse_paths(shell)
+        if not verse_paths:
+            continue
+        verses = []
+        for vp in verse_paths:
+            doc = details.load(vp)
+            if doc and doc.get("kind") == "verse_detail":
+                data = doc.get("data") or {}
+                verse = data.get("verse") or {}
+                # gradings live at data-level (data.verse mirrors it, but
+                # not for every book) — surface it onto the verse so the
+                # grading-mix insight sees it.
+                if not verse.get("gradings") and data.get("gradings"):
+                    verse = {**verse, "gradings": data["gradings"]}
+                verses.append(verse)
+        if not verses:
+            continue
+        analysis = analyze_chapter(verses, profile)
+        out = {
+            "index": shell.get("index"),
+            "kind": "narrator_analysis",
+            "data": analysis,
+        }
+        out_path = shell_path.with_name(shell_path.stem + ".narrators.json")
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump(out, f, ensure_ascii=False, separators=(",", ":"))
+        written.append(out_path)
     return written
 
 
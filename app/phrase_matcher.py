@@ -0,0 +1,113 @@
+"""Compiled multi-phrase matcher for the key phrases dictionary.
+
+``enrich_key_phrases`` used to test every dictionary phrase against every
+verse (two substring searches plus a fresh ``strip_tashkeel`` per phrase),
+which is linear in dictionary size per verse. :class:`PhraseMatcher` builds
+two Aho–Corasick automata once — one over the diacritized phrases, one over
+their tashkeel-stripped forms — and finds every phrase in a single pass
+over the verse text (and its stripped form).
+
+Matching semantics are those of the original loop: a phrase matches if
+``phrase_ar in text`` or ``strip_tashkeel(phrase_ar) in strip_tashkeel(text)``.
+Results come back in dictionary order. Callers that match verse after
+verse build one matcher when the dictionary is loaded and reuse it.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.arabic_normalization import strip_tashkeel
+
+
+class _Automaton:
+    """Aho–Corasick automaton mapping patterns to sets of phrase indexes."""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+    def add(self, pattern: str, value: int) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(value)
+
+    def build(self) -> None:
+        """Compute failure links (BFS) and merge outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def search(self, text: str, found: Set[int]) -> None:
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+
+
+class PhraseMatcher:
+    """Find every key-dictionary phrase occurring in a text in one pass."""
+
+    def __init__(self, phrases: Iterable[dict]):
+        self.phrases: List[dict] = []
+        self._raw = _Automaton()
+        self._stripped = _Automaton()
+        # A phrase made only of tashkeel strips to "" and matches any text.
+        self._always: Set[int] = set()
+        for phrase in phrases:
+            if not isinstance(phrase, dict):
+                continue
+            phrase_ar = phrase.get("phrase_ar", "")
+            if not phrase_ar:
+                continue
+            idx = len(self.phrases)
+            self.phrases.append(phrase)
+            self._raw.add(phrase_ar, idx)
+            stripped = strip_tashkeel(phrase_ar)
+            if stripped:
+                self._stripped.add(stripped, idx)
+            else:
+                self._always.add(idx)
+        self._raw.build()
+        self._stripped.build()
+
+    @classmethod
+    def from_dictionary(cls, phrases_dict: Optional[dict]) -> "PhraseMatcher":
+        """Build from a ``{"phrases": [...]}`` dictionary (as loaded from JSON)."""
+        phrases = (phrases_dict or {}).get("phrases")
+        if not isinstance(phrases, list):
+            phrases = []
+        return cls(phrases)
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def find(self, text: Optional[str]) -> List[dict]:
+        """Return the dictionary phrases found in ``text``, in dictionary order."""
+        if not text or not self.phrases:
+            return []
+        found: Set[int] = set(self._always)
+        self._raw.search(text, found)
+        self._stripped.search(strip_tashkeel(text), found)
+        return [self.phrases[i] for i in sorted(found)]
+
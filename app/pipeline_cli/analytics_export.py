@@ -0,0 +1,491 @@
+"""Columnar export of AI pipeline responses and per-verse stats.
+
+Analysis scripts (``scripts/analyse_run.py``, ``pipeline_status --audit``,
+the coverage reports, ...) each re-parse tens of thousands of
+``responses/{verse_id}.json`` and ``stats/{verse_id}.stats.json`` files to
+compute a handful of aggregates. This stage flattens both once into four
+tables:
+
+- ``verses``: one row per verse (response and/or stats), attribution,
+  content counts and the generation/fix/quality stats;
+- ``narrators``: one row per narrator occurrence in ``isnad_matn``;
+- ``chunks``: one row per chunk;
+- ``translations``: one row per chunk translation and per verse summary,
+  with the text length (not the text).
+
+With ``pyarrow`` installed each table is a Parquet file
+(``{table}.parquet``). Without it, each table is a directory of typed
+NumPy ``.npy`` column files, written with the standard library so no
+dependency is needed to export, readable with ``numpy.load`` (or
+:func:`load_table`). String columns are int32 codes into one shared
+``strings.json`` table, which also dictionary-encodes the Parquet columns.
+``manifest.json`` records the format, row counts and column types.
+
+Usage:
+    python -m app.pipeline_cli.analytics_export [--responses-dir DIR] [--output DIR]
+        [--format auto|parquet|npy] [--workers N]
+
+    from app.pipeline_cli.analytics_export import load_table
+    verses = load_table("ai-content/corpus/analytics", "verses")
+    verses["gen_cost_usd"][verses["status"] == "pass"].sum()  # with numpy
+"""
+
+import argparse
+import array
+import ast
+import json
+import logging
+import os
+import struct
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.config import AI_RESPONSES_DIR
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional: the npy column format is used instead
+    pyarrow = None
+
+try:
+    import numpy
+except ImportError:  # optional: load_table falls back to array/list columns
+    numpy = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_VERSION = 1
+MANIFEST_FILENAME = "manifest.json"
+STRINGS_FILENAME = "strings.json"
+FORMATS = ("auto", "parquet", "npy")
+
+# (column, type); "str" columns hold codes into the shared string table
+TABLES: Dict[str, List[Tuple[str, str]]] = {
+    "verses": [
+        ("verse_id", "str"), ("verse_path", "str"), ("book", "str"),
+        ("has_response", "bool"), ("has_stats", "bool"),
+        ("pipeline_version", "str"), ("model", "str"), ("generation_method", "str"),
+        ("generated_date", "str"), ("content_type", "str"), ("has_chain", "bool"),
+        ("narrator_count", "i4"), ("chunk_count", "i4"), ("word_count", "i4"),
+        ("tag_count", "i4"), ("related_quran_count", "i4"),
+        ("status", "str"), ("gen_cost_usd", "f8"), ("gen_output_tokens", "i8"),
+        ("gen_elapsed_s", "f8"), ("gen_turns", "i4"),
+        ("fix_needed", "bool"), ("fix_cost_usd", "f8"), ("fix_elapsed_s", "f8"),
+        ("warnings_high", "i4"), ("warnings_medium", "i4"), ("warnings_low", "i4"),
+        ("validation_error_count", "i4"), ("failure_count", "i4"),
+    ],
+    "narrators": [
+        ("verse_id", "str"), ("position", "i4"), ("role", "str"),
+        ("name_ar", "str"), ("name_en", "str"), ("identity_confidence", "str"),
+        ("canonical_id", "i4"), ("word_start", "i4"), ("word_end", "i4"),
+    ],
+    "chunks": [
+        ("verse_id", "str"), ("chunk_index", "i4"), ("chunk_type", "str"),
+        ("word_start", "i4"), ("word_end", "i4"), ("arabic_chars", "i4"),
+        ("translation_count", "i4"),
+    ],
+    "translations": [
+        ("verse_id", "str"), ("chunk_index", "i4"), ("field", "str"),
+        ("lang", "str"), ("chars", "i4"),
+    ],
+}
+
+# type -> (array typecode, npy descr)
+_NPY_TYPES = {
+    "str": ("i", "<i4"),
+    "i4": ("i", "<i4"),
+    "i8": ("q", "<i8"),
+    "f8": ("d", "<f8"),
+    "bool": ("B", "|b1"),
+}
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+
+
+class StringTable:
+    """Interns strings to int32 codes shared by every string column."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        value = "" if value is None else str(value)
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+
+class TableBuilder:
+    """Appends rows into one typed ``array.array`` per column."""
+
+    def __init__(self, name: str, strings: StringTable):
+        self.name = name
+        self.schema = TABLES[name]
+        self.strings = strings
+        self.columns = {col: array.array(_NPY_TYPES[kind][0]) for col, kind in self.schema}
+        self.rows = 0
+
+    def append(self, row: dict) -> None:
+        for col, kind in self.schema:
+            value = row.get(col)
+            if kind == "str":
+                value = self.strings.code(value)
+            else:
+                value = _number(value, float if kind == "f8" else int)
+            self.columns[col].append(value)
+        self.rows += 1
+
+
+# ---------------------------------------------------------------------------
+# Flattening
+# ---------------------------------------------------------------------------
+
+def _number(value, cast):
+    """``cast(value)``, with 0 for missing or malformed AI output."""
+    try:
+        return cast(value or 0)
+    except (TypeError, ValueError):
+        return cast(0)
+
+
+def _count(value) -> int:
+    return len(value) if isinstance(value, (list, dict)) else 0
+
+
+def _book_of(verse_path: str) -> str:
+    return verse_path.replace("/books/", "").split(":", 1)[0] if verse_path else ""
+
+
+def _load(path: Optional[str]) -> Optional[dict]:
+    if not path:
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError) as e:
+        logger.warning("Could not read %s: %s", path, e)
+        return None
+
+
+def flatten_verse(verse_id: str, wrapper: Optional[dict], stats: Optional[dict]) -> Dict[str, List[dict]]:
+    """Rows for one verse: ``{table: [row, ...]}``."""
+    result = (wrapper or {}).get("result") or {}
+    attribution = (wrapper or {}).get("ai_attribution") or {}
+    isnad = result.get("isnad_matn") or {}
+    narrators = isnad.get("narrators") or []
+    chunks = result.get("chunks") or []
+    stats = stats or {}
+    generation = stats.get("generation") or {}
+    fix = stats.get("fix") or {}
+    quality = stats.get("quality") or {}
+    verse_path = (wrapper or {}).get("verse_path") or stats.get("verse_path") or ""
+
+    verse = {
+        "verse_id": verse_id,
+        "verse_path": verse_path,
+        "book": _book_of(verse_path),
+        "has_response": wrapper is not None,
+        "has_stats": bool(stats),
+        "pipeline_version": attribution.get("pipeline_version") or stats.get("pipeline_version"),
+        "model": attribution.get("model") or stats.get("model"),
+        "generation_method": attribution.get("generation_method"),
+        "generated_date": attribution.get("generated_date"),
+        "content_type": result.get("content_type") or (stats.get("content") or {}).get("content_type"),
+        "has_chain": isnad.get("has_chain", (stats.get("content") or {}).get("has_chain")),
+        "narrator_count": len(narrators),
+        "chunk_count": len(chunks),
+        "word_count": _count(result.get("word_analysis")) or stats.get("word_count"),
+        "tag_count": _count(result.get("tags")),
+        "related_quran_count": _count(result.get("related_quran")),
+        "status": stats.get("status"),
+        "gen_cost_usd": generation.get("cost_usd"),
+        "gen_output_tokens": generation.get("output_tokens"),
+        "gen_elapsed_s": generation.get("elapsed_s"),
+        "gen_turns": generation.get("turns"),
+        "fix_needed": fix.get("needed"),
+        "fix_cost_usd": fix.get("cost_usd"),
+        "fix_elapsed_s": fix.get("elapsed_s"),
+        "warnings_high": quality.get("warnings_high"),
+        "warnings_medium": quality.get("warnings_medium"),
+        "warnings_low": quality.get("warnings_low"),
+        "validation_error_count": _count(quality.get("validation_errors")),
+        "failure_count": stats.get("failure_count"),
+    }
+
+    narrator_rows = []
+    for narrator in narrators:
+        if not isinstance(narrator, dict):
+            continue
+        ranges = [r for r in narrator.get("word_ranges") or [] if isinstance(r, dict)] or [{}]
+        canonical_id = narrator.get("canonical_id")
+        narrator_rows.append({
+            "verse_id": verse_id,
+            "position": narrator.get("position"),
+            "role": narrator.get("role"),
+            "name_ar": narrator.get("name_ar"),
+            "name_en": narrator.get("name_en"),
+            "identity_confidence": narrator.get("identity_confidence"),
+            "canonical_id": -1 if canonical_id is None else canonical_id,
+            "word_start": ranges[0].get("word_start", -1),
+            "word_end": ranges[-1].get("word_end", -1),
+        })
+
+    chunk_rows = []
+    translation_rows = []
+    for index, chunk in enumerate(chunks):
+        if not isinstance(chunk, dict):
+            continue
+        translations = chunk.get("translations") or {}
+        chunk_rows.append({
+            "verse_id": verse_id,
+            "chunk_index": index,
+            "chunk_type": chunk.get("chunk_type"),
+            "word_start": chunk.get("word_start", -1),
+            "word_end": chunk.get("word_end", -1),
+            "arabic_chars": len(chunk.get("arabic_text") or ""),
+            "translation_count": len(translations),
+        })
+        for lang, text in sorted(translations.items()):
+            translation_rows.append({"verse_id": verse_id, "chunk_index": index, "field": "chunk",
+                                     "lang": lang, "chars": len(text or "")})
+    for lang, entry in sorted((result.get("translations") or {}).items()):
+        if isinstance(entry, dict) and entry.get("summary"):
+            translation_rows.append({"verse_id": verse_id, "chunk_index": -1, "field": "summary",
+                                     "lang": lang, "chars": len(entry["summary"])})
+
+    return {"verses": [verse], "narrators": narrator_rows,
+            "chunks": chunk_rows, "translations": translation_rows}
+
+
+def _flatten_task(task: Tuple[str, Optional[str], Optional[str]]) -> Dict[str, List[dict]]:
+    verse_id, response_path, stats_path = task
+    return flatten_verse(verse_id, _load(response_path), _load(stats_path))
+
+
+def _scan(directory: str, suffix: str) -> Dict[str, str]:
+    """{verse_id: path} for the ``{verse_id}{suffix}`` files in ``directory``."""
+    found = {}
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith(suffix) and not entry.name.startswith("_") and entry.is_file():
+                    found[entry.name[:-len(suffix)]] = entry.path
+    except FileNotFoundError:
+        pass
+    return found
+
+
+def iter_tasks(responses_dir: str, stats_dir: str) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    responses = _scan(responses_dir, ".json")
+    stats = _scan(stats_dir, ".stats.json")
+    return [(verse_id, responses.get(verse_id), stats.get(verse_id))
+            for verse_id in sorted(set(responses) | set(stats))]
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+def write_npy(path: str, values: array.array, descr: str) -> None:
+    """Write a 1-D array in NumPy's ``.npy`` v1.0 format."""
+    header = "{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }" % (descr, len(values))
+    # magic + version + uint16 length + header, padded to a multiple of 64
+    pad = 64 - (len(_NPY_MAGIC) + 2 + len(header) + 1) % 64
+    header = header + " " * (pad % 64) + "\n"
+    if sys.byteorder == "big" and values.itemsize > 1:
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    with open(path, "wb") as f:
+        f.write(_NPY_MAGIC)
+        f.write(struct.pack("<H", len(header)))
+        f.write(header.encode("latin1"))
+        values.tofile(f)
+
+
+def read_npy(path: str, typecode: str) -> array.array:
+    """Read a ``.npy`` file written by :func:`write_npy` without numpy."""
+    with open(path, "rb") as f:
+        if f.read(len(_NPY_MAGIC)) != _NPY_MAGIC:
+            raise ValueError(f"Not a v1.0 .npy file: {path}")
+        (header_len,) = struct.unpack("<H", f.read(2))
+        header = ast.literal_eval(f.read(header_len).decode("latin1"))
+        values = array.array(typecode)
+        values.frombytes(f.read())
+    if len(values) != header["shape"][0]:
+        raise ValueError(f"Truncated column file: {path}")
+    if sys.byteorder == "big" and values.itemsize > 1:
+        values.byteswap()
+    return values
+
+
+def _write_npy_table(output_dir: str, table: TableBuilder) -> None:
+    table_dir = os.path.join(output_dir, table.name)
+    os.makedirs(table_dir, exist_ok=True)
+    for col, kind in table.schema:
+        write_npy(os.path.join(table_dir, f"{col}.npy"), table.columns[col], _NPY_TYPES[kind][1])
+
+
+def _write_parquet_table(output_dir: str, table: TableBuilder, dictionary) -> None:
+    types = {"i4": pyarrow.int32(), "i8": pyarrow.int64(), "f8": pyarrow.float64(), "bool": pyarrow.bool_()}
+    arrays = {}
+    for col, kind in table.schema:
+        values = table.columns[col]
+        if kind == "str":
+            arrays[col] = pyarrow.DictionaryArray.from_arrays(pyarrow.array(values, pyarrow.int32()), dictionary)
+        elif kind == "bool":
+            arrays[col] = pyarrow.array([bool(v) for v in values], types[kind])
+        else:
+            arrays[col] = pyarrow.array(values, types[kind])
+    pyarrow.parquet.write_table(pyarrow.table(arrays), os.path.join(output_dir, f"{table.name}.parquet"))
+
+
+def export_analytics(
+    responses_dir: str,
+    output_dir: Optional[str] = None,
+    stats_dir: Optional[str] = None,
+    fmt: str = "auto",
+    workers: int = 1,
+) -> dict:
+    """Flatten every response and stats file into columnar tables.
+
+    ``stats_dir`` and ``output_dir`` default to ``stats/`` and
+    ``analytics/`` next to ``responses_dir``. Returns the manifest.
+    """
+    content_dir = os.path.dirname(os.path.normpath(responses_dir))
+    stats_dir = stats_dir or os.path.join(content_dir, "stats")
+    output_dir = output_dir or os.path.join(content_dir, "analytics")
+    if fmt == "auto":
+        fmt = "parquet" if pyarrow is not None else "npy"
+    if fmt == "parquet" and pyarrow is None:
+        raise RuntimeError("--format parquet needs the pyarrow package")
+
+    start = time.perf_counter()
+    tasks = iter_tasks(responses_dir, stats_dir)
+    strings = StringTable()
+    tables = {name: TableBuilder(name, strings) for name in TABLES}
+
+    if workers > 1 and len(tasks) > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(min(workers, len(tasks)))
+        flattened = pool.imap(_flatten_task, tasks, chunksize=64)
+    else:
+        pool = None
+        flattened = map(_flatten_task, tasks)
+    try:
+        for rows in flattened:
+            for name, table_rows in rows.items():
+                for row in table_rows:
+                    tables[name].append(row)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    os.makedirs(output_dir, exist_ok=True)
+    if fmt == "parquet":
+        dictionary = pyarrow.array(strings.strings, pyarrow.string())
+        for table in tables.values():
+            _write_parquet_table(output_dir, table, dictionary)
+    else:
+        for table in tables.values():
+            _write_npy_table(output_dir, table)
+        with open(os.path.join(output_dir, STRINGS_FILENAME), "w", encoding="utf-8") as f:
+            json.dump(strings.strings, f, ensure_ascii=False)
+
+    manifest = {
+        "version": EXPORT_VERSION,
+        "format": fmt,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "responses_dir": os.path.abspath(responses_dir),
+        "stats_dir": os.path.abspath(stats_dir),
+        "strings": len(strings.strings),
+        "elapsed_s": round(time.perf_counter() - start, 3),
+        "tables": {
+            name: {"rows": table.rows, "columns": dict(table.schema)}
+            for name, table in tables.items()
+        },
+    }
+    with open(os.path.join(output_dir, MANIFEST_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    logger.info("Exported %d verses to %s (%s) in %.1fs", tables["verses"].rows, output_dir, fmt,
+                manifest["elapsed_s"])
+    return manifest
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+def load_manifest(export_dir: str) -> dict:
+    with open(os.path.join(export_dir, MANIFEST_FILENAME), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_table(export_dir: str, name: str, columns: Optional[Sequence[str]] = None) -> Dict[str, object]:
+    """Load ``columns`` (default: all) of one exported table.
+
+    With numpy installed every column is a numpy array (strings as an
+    object array), ready for vectorized filtering; otherwise numeric
+    columns are ``array.array`` and string columns lists of ``str``.
+    """
+    manifest = load_manifest(export_dir)
+    schema = manifest["tables"][name]["columns"]
+    columns = list(columns or schema)
+
+    if manifest["format"] == "parquet":
+        table = pyarrow.parquet.read_table(os.path.join(export_dir, f"{name}.parquet"), columns=columns)
+        if numpy is None:
+            return table.to_pydict()
+        return {col: table.column(col).to_numpy() for col in columns}
+
+    strings = None
+    loaded = {}
+    for col in columns:
+        path = os.path.join(export_dir, name, f"{col}.npy")
+        kind = schema[col]
+        values = numpy.load(path) if numpy is not None else read_npy(path, _NPY_TYPES[kind][0])
+        if kind == "str":
+            if strings is None:
+                with open(os.path.join(export_dir, STRINGS_FILENAME), "r", encoding="utf-8") as f:
+                    strings = json.load(f)
+                if numpy is not None:
+                    strings = numpy.array(strings, dtype=object)
+            values = strings[values] if numpy is not None else [strings[code] for code in values]
+        elif kind == "bool" and numpy is None:
+            values = [bool(v) for v in values]
+        loaded[col] = values
+    return loaded
+
+
+def iter_rows(export_dir: str, name: str, columns: Optional[Sequence[str]] = None) -> Iterator[dict]:
+    """Rows of an exported table as dicts (for small ad-hoc scans)."""
+    loaded = load_table(export_dir, name, columns)
+    cols = list(loaded)
+    for values in zip(*(loaded[col] for col in cols)):
+        yield dict(zip(cols, values))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export AI responses and stats as columnar tables")
+    parser.add_argument("--responses-dir", default=None, help="Override responses directory")
+    parser.add_argument("--stats-dir", default=None, help="Default: stats/ next to responses/")
+    parser.add_argument("--output", default=None, help="Default: analytics/ next to responses/")
+    parser.add_argument("--format", choices=FORMATS, default="auto",
+                        help="parquet needs pyarrow; auto picks parquet when installed, else npy")
+    parser.add_argument("--workers", type=int, default=1, help="Processes parsing the JSON files")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    manifest = export_analytics(args.responses_dir or AI_RESPONSES_DIR, args.output,
+                                args.stats_dir, args.format, args.workers)
+    for name, table in manifest["tables"].items():
+        print(f"  {name}: {table['rows']:,} rows")
+
+
+if __name__ == "__main__":
+    main()
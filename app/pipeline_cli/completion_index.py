@@ -0,0 +1,189 @@
+"""Directory-snapshot completion index for the AI pipeline.
+
+Queue building used to call ``os.path.exists`` on responses/ and
+quarantine/ once per verse path, which on network-mounted source data means
+100k+ stat calls. ``CompletionIndex`` instead takes one ``os.scandir`` of
+responses/, quarantine/ and stats/ and answers membership queries from
+in-memory sets.
+
+The snapshot can optionally be persisted to ``completion_index.json`` next to
+responses/. A persisted snapshot is reused only while the mtimes of the three
+directories are unchanged (three stat calls), otherwise it is rebuilt. The
+mtimes saved are the ones read just before the directories were scanned, so
+a file added or removed after the scan (by a concurrent run, a batch
+download or by hand) always makes the snapshot stale; ``mark_*`` updates
+never refresh them.
+
+Usage:
+    index = CompletionIndex.load_or_scan(responses_dir)
+    if not index.is_complete(verse_id): ...
+    index.mark_complete(verse_id)
+"""
+
+import json
+import logging
+import os
+from collections import Counter
+from typing import Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "completion_index.json"
+INDEX_VERSION = 1
+
+
+def _scan_ids(directory: str, suffix: str) -> Set[str]:
+    """Return the verse ids of all ``{id}{suffix}`` files in a directory."""
+    ids: Set[str] = set()
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                name = entry.name
+                if name.endswith(suffix) and entry.is_file():
+                    ids.add(name[:-len(suffix)])
+    except FileNotFoundError:
+        pass
+    return ids
+
+
+def _dir_mtime(directory: str) -> Optional[float]:
+    try:
+        return os.stat(directory).st_mtime
+    except OSError:
+        return None
+
+
+class CompletionIndex:
+    """In-memory view of which verses are complete, quarantined or have stats."""
+
+    def __init__(
+        self,
+        responses_dir: str,
+        complete: Optional[Iterable[str]] = None,
+        quarantined: Optional[Iterable[str]] = None,
+        with_stats: Optional[Iterable[str]] = None,
+    ):
+        self.responses_dir = responses_dir
+        content_dir = os.path.dirname(responses_dir)
+        self.quarantine_dir = os.path.join(content_dir, "quarantine")
+        self.stats_dir = os.path.join(content_dir, "stats")
+        self.complete: Set[str] = set(complete or ())
+        self.quarantined: Set[str] = set(quarantined or ())
+        self.with_stats: Set[str] = set(with_stats or ())
+        # Directory mtimes the sets are known to match (None: unknown)
+        self.mtimes: Optional[Dict[str, Optional[float]]] = None
+
+    # -- construction ------------------------------------------------------
+
+    @classmethod
+    def scan(cls, responses_dir: str) -> "CompletionIndex":
+        """Build the index from one scandir of each pipeline directory."""
+        index = cls(responses_dir)
+        index.mtimes = index._mtimes()  # before scanning: later changes invalidate
+        index.complete = _scan_ids(responses_dir, ".json")
+        index.quarantined = _scan_ids(index.quarantine_dir, ".json")
+        index.with_stats = _scan_ids(index.stats_dir, ".stats.json")
+        logger.info(
+            "Completion index: %d complete, %d quarantined, %d with stats",
+            len(index.complete), len(index.quarantined), len(index.with_stats),
+        )
+        return index
+
+    @classmethod
+    def load_or_scan(cls, responses_dir: str, persist: bool = False) -> "CompletionIndex":
+        """Reuse a persisted snapshot if the directories are unchanged, else scan.
+
+        With ``persist=True`` a freshly scanned index is written back so the
+        next invocation can skip the scan.
+        """
+        index = cls.load(responses_dir)
+        if index is not None:
+            return index
+        index = cls.scan(responses_dir)
+        if persist:
+            index.save()
+        return index
+
+    @classmethod
+    def load(cls, responses_dir: str) -> Optional["CompletionIndex"]:
+        """Load a persisted snapshot; None if missing, stale or unreadable."""
+        path = cls.index_path(responses_dir)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return None
+        if data.get("version") != INDEX_VERSION:
+            return None
+        index = cls(
+            responses_dir,
+            complete=data.get("complete", []),
+            quarantined=data.get("quarantined", []),
+            with_stats=data.get("with_stats", []),
+        )
+        if data.get("mtimes") != index._mtimes():
+            logger.info("Completion index stale, rescanning: %s", path)
+            return None
+        index.mtimes = data["mtimes"]
+        return index
+
+    @staticmethod
+    def index_path(responses_dir: str) -> str:
+        return os.path.join(os.path.dirname(responses_dir), INDEX_FILENAME)
+
+    def save(self) -> str:
+        """Persist the snapshot alongside responses/.
+
+        It is stored with the mtimes of its scan, so it only stays valid
+        while nothing has changed since; to persist the state after writing
+        responses, save a fresh :meth:`scan`.
+        """
+        path = os.path.abspath(self.index_path(self.responses_dir))
+        data = {
+            "version": INDEX_VERSION,
+            "mtimes": self.mtimes,
+            "complete": sorted(self.complete),
+            "quarantined": sorted(self.quarantined),
+            "with_stats": sorted(self.with_stats),
+        }
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        logger.info("WROTE %s", path)
+        return path
+
+    def _mtimes(self) -> Dict[str, Optional[float]]:
+        return {
+            "responses": _dir_mtime(self.responses_dir),
+            "quarantine": _dir_mtime(self.quarantine_dir),
+            "stats": _dir_mtime(self.stats_dir),
+        }
+
+    # -- queries -----------------------------------------------------------
+
+    def is_complete(self, verse_id: str) -> bool:
+        return verse_id in self.complete
+
+    def is_quarantined(self, verse_id: str) -> bool:
+        return verse_id in self.quarantined
+
+    def has_stats(self, verse_id: str) -> bool:
+        return verse_id in self.with_stats
+
+    def counts_by_book(self) -> Dict[str, int]:
+        """Completed response count per book slug."""
+        return dict(Counter(vid.split("_")[0] for vid in self.complete))
+
+    # -- updates (keep the snapshot current during a run) ------------------
+
+    def mark_complete(self, verse_id: str) -> None:
+        self.complete.add(verse_id)
+
+    def mark_quarantined(self, verse_id: str) -> None:
+        self.quarantined.add(verse_id)
+
+    def mark_stats(self, verse_id: str) -> None:
+        self.with_stats.add(verse_id)
@@ -17,8 +17,12 @@ import json
 import logging
 import os
 import time
+from datetime import datetime
 from typing import Optional
 
+from app.config import DEFAULT_RAW_ARCHIVE_BACKEND
+from app.pipeline_cli.raw_archive import get_archive, has_archive, raw_filename
+
 logger = logging.getLogger(__name__)
 
 # Batch API pricing is 50% of standard
@@ -163,6 +167,10 @@ def get_model_provenance(model: str) -> Optional[dict]:
     return dict(entry) if entry else None
 
 
+def _raw_archive_backend() -> str:
+    return os.environ.get("RAW_ARCHIVE_BACKEND", DEFAULT_RAW_ARCHIVE_BACKEND)
+
+
 def archive_raw_response(
     raw_archive_dir: Optional[str],
     verse_id: Optional[str],
@@ -172,19 +180,27 @@ def archive_raw_response(
     """Persist a raw API response to disk so it can be salvaged offline.
 
     Used on parse failure paths to preserve the (paid-for) LLM output that
-    would otherwise be lost when the parser raises. Silently no-ops if either
+    would otherwise be lost when the parser raises, and by the pipelines to
+    keep every raw response for audit. Silently no-ops if either
     `raw_archive_dir` or `verse_id` is None — call sites can pass through
     optional config without conditional wrapping.
 
-    Filename: {raw_archive_dir}/{verse_id}.{suffix}.raw.txt
+    Filename: {raw_archive_dir}/{verse_id}.{suffix}.raw.txt ({verse_id}.raw.txt
+    for an empty suffix), or with RAW_ARCHIVE_BACKEND=segments the next
+    attempt in the directory's segment archive (see raw_archive.py).
     """
     if not raw_archive_dir or not verse_id:
         return
     if not raw_text:
         return
     try:
+        if _raw_archive_backend() == "segments":
+            entry = get_archive(raw_archive_dir).put(verse_id, suffix, raw_text)
+            logger.info("Archived raw response: %s %s attempt %d (%s)",
+                        verse_id, suffix, entry["attempt"], entry["segment"])
+            return
         os.makedirs(raw_archive_dir, exist_ok=True)
-        path = os.path.join(raw_archive_dir, f"{verse_id}.{suffix}.raw.txt")
+        path = os.path.join(raw_archive_dir, raw_filename(verse_id, suffix))
         with open(path, "w", encoding="utf-8") as f:
             f.write(raw_text)
         logger.info("Archived raw response: %s", path)
@@ -195,6 +211,30 @@ def archive_raw_response(
                        verse_id, suffix, e)
 
 
+def read_raw_response(raw_archive_dir: str, verse_id: str, suffix: str = "") -> Optional[str]:
+    """Latest archived raw response for (verse_id, suffix), from either layout.
+
+    A directory can hold both: files written before RAW_ARCHIVE_BACKEND was
+    switched to segments (or after it was switched back), and segment
+    entries. The per-file response is returned when its mtime is not older
+    than the latest segment entry's ``archived_at``; otherwise the entry.
+    """
+    path = os.path.join(raw_archive_dir, raw_filename(verse_id, suffix))
+    entry = None
+    if has_archive(raw_archive_dir):
+        archive = get_archive(raw_archive_dir)
+        attempts = archive.attempts(verse_id, suffix)
+        entry = attempts[-1] if attempts else None
+    if os.path.exists(path) and (
+            entry is None
+            or os.path.getmtime(path) >= datetime.fromisoformat(entry["archived_at"]).timestamp()):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    if entry is not None:
+        return archive.read_entry(entry)
+    return None
+
+
 def compute_cost(
     model: str,
     input_tokens: int,
@@ -237,7 +277,11 @@ def compute_cost(
 
 
 def _get_client(base_url: Optional[str] = None, timeout: float = 600.0):
-    """Lazy-import and create OpenAI client.
+    """Lazy-import OpenAI and return the shared client for this endpoint.
+
+    Clients and their connection pools are kept per (base_url, timeout) for
+    the whole process by ``openai_clients``, so the calls of every phase
+    reuse warm keep-alive connections.
 
     Args:
         base_url: Custom base URL (for vLLM-compatible endpoints e.g. Spark).
@@ -245,22 +289,18 @@ def _get_client(base_url: Optional[str] = None, timeout: float = 600.0):
         timeout: Per-request timeout in seconds.
     """
     try:
-        from openai import AsyncOpenAI
+        import openai  # noqa: F401
     except ImportError:
         raise ImportError(
             "openai package not installed. Install with: pip install openai\n"
             "Or add to pyproject.toml [project.optional-dependencies] openai group."
         )
+    from app.pipeline_cli.openai_clients import get_client
 
     if base_url:
         # Custom endpoint (Spark vLLM). API key is unused but the SDK still
         # requires a non-empty value.
-        return AsyncOpenAI(
-            api_key=os.environ.get("OPENAI_API_KEY", "not-needed"),
-            base_url=base_url,
-            max_retries=3,
-            timeout=timeout,
-        )
+        return get_client(os.environ.get("OPENAI_API_KEY", "not-needed"), base_url=base_url, timeout=timeout)
 
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
@@ -269,16 +309,12 @@ def _get_client(base_url: Optional[str] = None, timeout: float = 600.0):
             "Get your API key from https://platform.openai.com/api-keys"
         )
 
-    return AsyncOpenAI(
-        api_key=api_key,
-        max_retries=3,
-        # 10-min per-request timeout. Was 3600s but that meant a dead TCP
-        # connection (e.g. machine slept then woke) sat for an hour before
-        # the SDK gave up — losing 1-3 hours per stuck call across retries.
-        # 600s still leaves ample headroom for legitimate long-reasoning
-        # calls (typical Phase 1 finishes 10-30s, worst-case under 5 min).
-        timeout=timeout,
-    )
+    # 10-min per-request timeout. Was 3600s but that meant a dead TCP
+    # connection (e.g. machine slept then woke) sat for an hour before
+    # the SDK gave up — losing 1-3 hours per stuck call across retries.
+    # 600s still leaves ample headroom for legitimate long-reasoning
+    # calls (typical Phase 1 finishes 10-30s, worst-case under 5 min).
+    return get_client(api_key, timeout=timeout)
 
 
 async def call_openai(
@@ -16,7 +16,7 @@ Usage:
     python -m app.pipeline_cli.pipeline batch status
 
     # Phase 3: Download results, postprocess, identify fixes
-    python -m app.pipeline_cli.pipeline batch download
+    python -m app.pipeline_cli.pipeline batch download  # --postprocess-workers N to parallelize
 
     # Phase 4: Submit fix batch (auto-detected from download results)
     python -m app.pipeline_cli.pipeline batch submit-fixes
@@ -30,9 +30,13 @@ import logging
 import os
 import sys
 import time
+from dataclasses import asdict
 from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.pipeline_cli.openai_backend import archive_raw_response, read_raw_response
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +46,16 @@ BATCH_DISCOUNT = 0.5
 # Default state directory — alongside responses
 DEFAULT_BATCH_DIR = "batches"
 
+# Output files are streamed to disk in chunks of this size
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Postprocess progress is checkpointed after this many output lines
+CURSOR_SAVE_EVERY = 100
+
+# Output lines handed to the worker pool at a time (per worker), so a large
+# output file is never read into memory as a whole
+POSTPROCESS_WINDOW_PER_WORKER = 32
+
 
 def _get_sync_client():
     """Get synchronous OpenAI client. API key from environment only."""
@@ -126,12 +140,11 @@ def batch_submit(
     attempt_quarantined: bool = False,
 ) -> None:
     """Prepare all verses, write JSONL, upload to OpenAI, create batch."""
+    from app.pipeline_cli.completion_index import CompletionIndex
     from app.pipeline_cli.verse_processor import (
-        is_complete,
         prepare_verse,
         verse_path_to_id,
     )
-    from app.pipeline_cli.pipeline import is_quarantined
 
     batch_dir = _get_batch_dir(responses_dir)
 
@@ -147,13 +160,14 @@ def batch_submit(
         )
         return
 
-    # Filter verse paths
+    # Filter verse paths (one directory scan instead of a stat per verse)
+    index = CompletionIndex.scan(responses_dir)
     queue = []
     for vp in verse_paths:
         vid = vp.replace("/books/", "").replace(":", "_")
-        if is_complete(vid, responses_dir):
+        if index.is_complete(vid):
             continue
-        if not attempt_quarantined and is_quarantined(vid, responses_dir):
+        if not attempt_quarantined and index.is_quarantined(vid):
             continue
         queue.append(vp)
 
@@ -171,6 +185,7 @@ def batch_submit(
     os.makedirs(tmp_dir, exist_ok=True)
 
     jsonl_lines = []
+    plan_lines = []  # postprocess plans, reused by batch download
     verse_mapping = {}  # custom_id -> verse_path
     skipped = 0
 
@@ -189,6 +204,7 @@ def batch_submit(
 
         custom_id = f"gen-{vid}"
         verse_mapping[custom_id] = vp
+        plan_lines.append(json.dumps(_plan_record(custom_id, plan), ensure_ascii=False))
 
         # Reasoning models (gpt-5, o3, o4) use different API parameters
         is_reasoning = model.startswith(("gpt-5", "o3", "o4"))
@@ -234,6 +250,10 @@ def batch_submit(
         f.write("\n".join(jsonl_lines) + "\n")
     jsonl_size_mb = os.path.getsize(jsonl_path) / (1024 * 1024)
     print(f"Wrote {jsonl_path} ({jsonl_size_mb:.1f} MB, {len(jsonl_lines)} requests)", flush=True)
+    plans_path = os.path.abspath(_get_plans_path(batch_dir, "generation"))
+    with open(plans_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(plan_lines) + "\n")
+    logger.info("WROTE %s", plans_path)
 
     # Upload to OpenAI
     print("Uploading to OpenAI...", flush=True)
@@ -266,6 +286,7 @@ def batch_submit(
         "request_count": len(jsonl_lines),
         "verse_mapping": verse_mapping,
         "jsonl_path": jsonl_path,
+        "plans_path": plans_path,
     }
     state_path = _save_state(batch_dir, state, "generation")
 
@@ -365,18 +386,293 @@ def batch_status(responses_dir: str, phase: Optional[str] = None) -> None:
 # Download generation results
 # ---------------------------------------------------------------------------
 
-def batch_download(responses_dir: str) -> None:
-    """Download generation batch results, postprocess, identify fixes needed."""
+def _get_plans_path(batch_dir: str, phase: str = "generation") -> str:
+    """Path of the postprocess plans written at submit time."""
+    return os.path.join(batch_dir, f"batch_{phase}_plans.jsonl")
+
+
+def _get_cursor_path(batch_dir: str, phase: str = "generation") -> str:
+    """Path of the resumable postprocess cursor for a phase."""
+    return os.path.join(batch_dir, f"batch_{phase}_postprocess.json")
+
+
+def _plan_record(custom_id: str, plan) -> dict:
+    """What postprocessing needs from a VersePlan, as a JSON-able record.
+
+    The prompts are left out: they are already in the batch input JSONL and
+    postprocessing only reviews against the extracted request.
+    """
+    return {
+        "custom_id": custom_id,
+        "verse_path": plan.verse_path,
+        "verse_id": plan.verse_id,
+        "mode": plan.mode,
+        "word_count": plan.word_count,
+        "request": asdict(plan.request),
+    }
+
+
+def _plan_from_record(record: dict, work_dir: str, model: str):
+    """Rebuild a VersePlan from a record written by ``_plan_record``."""
+    from app.ai_pipeline import PipelineRequest
+    from app.pipeline_cli.verse_processor import VersePlan
+
+    return VersePlan(
+        verse_path=record["verse_path"],
+        verse_id=record["verse_id"],
+        mode=record["mode"],
+        request=PipelineRequest(**record["request"]),
+        system_prompt="",
+        user_message="",
+        work_dir=work_dir,
+        word_count=record.get("word_count", 0),
+        backend="openai",
+        model=model,
+    )
+
+
+def _load_plans(path: Optional[str]) -> Dict[str, dict]:
+    """Plans saved at submit time, by custom_id ({} for older batches)."""
+    plans = {}
+    if not path or not os.path.exists(path):
+        return plans
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                plans[record["custom_id"]] = record
+    return plans
+
+
+def _stream_file_to_disk(client, file_id: str, path: str) -> int:
+    """Download an OpenAI file to ``path`` in chunks. Returns bytes written.
+
+    Written to ``{path}.part`` first so an interrupted download never leaves
+    a truncated file that looks complete.
+    """
+    part_path = path + ".part"
+    size = 0
+    with client.files.with_streaming_response.content(file_id) as response:
+        with open(part_path, "wb") as f:
+            for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                size += len(chunk)
+    os.replace(part_path, path)
+    logger.info("WROTE %s", path)
+    return size
+
+
+def _iter_jsonl_lines(path: str, start: int = 0) -> Iterator[Tuple[int, str]]:
+    """``(line_number, line)`` for the non-blank lines of ``path`` from ``start``."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            if line_no >= start and line.strip():
+                yield line_no, line
+
+
+def _new_cursor(output_file_id: str) -> dict:
+    return {
+        "output_file_id": output_file_id,
+        "next_line": 0,
+        "results": 0,
+        "passed": 0,
+        "needs_fix": 0,
+        "errors": 0,
+        "total_cost": 0.0,
+        "total_input_tokens": 0,
+        "total_output_tokens": 0,
+        "fix_candidates": {},
+    }
+
+
+def _load_cursor(batch_dir: str, output_file_id: str, phase: str = "generation") -> dict:
+    """Saved postprocess progress for ``output_file_id``, or a fresh cursor."""
+    path = _get_cursor_path(batch_dir, phase)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            cursor = json.load(f)
+        if cursor.get("output_file_id") == output_file_id:
+            return cursor
+    return _new_cursor(output_file_id)
+
+
+def _save_cursor(batch_dir: str, cursor: dict, phase: str = "generation") -> None:
+    path = _get_cursor_path(batch_dir, phase)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cursor, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+# Per-process postprocess context, set by _init_postprocess_worker
+_postprocess_ctx: dict = {}
+
+
+def _init_postprocess_worker(settings: dict) -> None:
+    """Load the dictionaries once per worker process."""
+    from app.pipeline_cli.verse_processor import load_narrator_templates, load_word_dictionary
+
+    _postprocess_ctx.clear()
+    _postprocess_ctx.update(settings)
+    _postprocess_ctx["word_dict"] = load_word_dictionary()
+    _postprocess_ctx["narrator_tmpl"] = load_narrator_templates()
+
+
+def _postprocess_output_line(task: Tuple[int, str, Optional[dict], Optional[str]]) -> dict:
+    """Postprocess one batch output line; returns its outcome for the cursor."""
     from app.pipeline_cli.openai_backend import compute_cost, BATCH_DISCOUNT
-    from app.pipeline_cli.verse_processor import (
-        VersePlan,
-        postprocess_verse,
-        prepare_verse,
-        verse_path_to_id,
-        load_word_dictionary as load_word_dict_vp,
-        load_narrator_templates as load_narrator_tmpl_vp,
+    from app.pipeline_cli.verse_processor import postprocess_verse, prepare_verse, verse_path_to_id
+
+    line_no, line, record, verse_path = task
+    ctx = _postprocess_ctx
+    res = json.loads(line)
+    custom_id = res.get("custom_id", "")
+    outcome = {"line": line_no, "custom_id": custom_id, "status": "error",
+               "cost": 0.0, "input_tokens": 0, "output_tokens": 0}
+    if record is not None:
+        verse_path = record["verse_path"]
+    if not verse_path:
+        logger.warning("Unknown custom_id in output: %s", custom_id)
+        return outcome
+
+    verse_id = verse_path_to_id(verse_path)
+    response = res.get("response", {})
+    status_code = response.get("status_code", 0)
+    body = response.get("body", {})
+
+    if status_code != 200:
+        logger.warning("API error for %s: status=%d, body=%s",
+                       verse_id, status_code, str(body)[:200])
+        return outcome
+
+    # Extract usage for cost tracking
+    usage = body.get("usage", {})
+    outcome["input_tokens"] = usage.get("prompt_tokens", 0)
+    outcome["output_tokens"] = usage.get("completion_tokens", 0)
+    outcome["cost"] = compute_cost(ctx["model"], outcome["input_tokens"],
+                                   outcome["output_tokens"]) * BATCH_DISCOUNT
+
+    # Extract response text
+    choices = body.get("choices", [])
+    if not choices:
+        logger.warning("No choices for %s", verse_id)
+        return outcome
+    raw_response = choices[0].get("message", {}).get("content", "")
+
+    work_dir = os.path.join(ctx["batch_dir"], "tmp_process", verse_id)
+    os.makedirs(work_dir, exist_ok=True)
+    if record is not None:
+        plan = _plan_from_record(record, work_dir, ctx["model"])
+    else:
+        # Batch submitted before plans were saved: prepare again
+        plan = prepare_verse(verse_path, work_dir, data_dir=ctx["data_dir"], use_v3=ctx["use_v3"])
+        if plan is None:
+            logger.warning("Cannot prepare verse for postprocessing: %s", verse_path)
+            return outcome
+        plan.backend = "openai"
+        plan.model = ctx["model"]
+
+    # Save raw response for archive
+    raw_archive_dir = os.path.join(os.path.dirname(ctx["responses_dir"]), "raw_responses")
+    archive_raw_response(raw_archive_dir, verse_id, "", raw_response)
+
+    result = postprocess_verse(
+        plan=plan,
+        raw_response=raw_response,
+        word_dict_data=ctx["word_dict"],
+        narrator_templates=ctx["narrator_tmpl"],
+        responses_dir=ctx["responses_dir"],
     )
 
+    outcome["status"] = result.status if result.status in ("pass", "needs_fix") else "error"
+    if result.status == "needs_fix":
+        outcome["fix"] = {
+            "verse_path": verse_path,
+            "warnings": [
+                {"field": w.field, "category": w.category,
+                 "severity": w.severity, "message": w.message}
+                for w in result.warnings if w.severity in ("high", "medium")
+            ],
+        }
+
+    import shutil
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return outcome
+
+
+def _apply_outcome(cursor: dict, outcome: dict) -> None:
+    """Fold one line's outcome into the cursor totals."""
+    cursor["next_line"] = outcome["line"] + 1
+    cursor["results"] += 1
+    cursor["total_cost"] += outcome["cost"]
+    cursor["total_input_tokens"] += outcome["input_tokens"]
+    cursor["total_output_tokens"] += outcome["output_tokens"]
+    if outcome["status"] == "pass":
+        cursor["passed"] += 1
+    elif outcome["status"] == "needs_fix":
+        cursor["needs_fix"] += 1
+        cursor["fix_candidates"][outcome["custom_id"]] = outcome["fix"]
+    else:
+        cursor["errors"] += 1
+
+
+def _postprocess_output(output_path: str, cursor: dict, plans: Dict[str, dict],
+                        verse_mapping: Dict[str, str], settings: dict,
+                        batch_dir: str, workers: int = 1) -> None:
+    """Stream the output JSONL through postprocessing, advancing ``cursor``.
+
+    Lines before ``cursor["next_line"]`` were handled by an earlier run and
+    are skipped. With ``workers`` > 1 lines are postprocessed in a process
+    pool, a bounded window at a time and in file order, so the cursor always
+    marks a prefix of the file. The cursor is checkpointed every
+    ``CURSOR_SAVE_EVERY`` lines; postprocessing a line again after a crash
+    just rewrites the same files.
+    """
+    def tasks():
+        for line_no, line in _iter_jsonl_lines(output_path, cursor["next_line"]):
+            custom_id = json.loads(line).get("custom_id", "")
+            yield line_no, line, plans.get(custom_id), verse_mapping.get(custom_id)
+
+    pool = None
+    if workers > 1:
+        import multiprocessing
+        pool = multiprocessing.Pool(workers, initializer=_init_postprocess_worker, initargs=(settings,))
+        window_size = workers * POSTPROCESS_WINDOW_PER_WORKER
+    else:
+        _init_postprocess_worker(settings)
+        window_size = CURSOR_SAVE_EVERY
+
+    since_save = 0
+    try:
+        pending = tasks()
+        while True:
+            window = list(islice(pending, window_size))
+            if not window:
+                break
+            outcomes = (pool.imap(_postprocess_output_line, window)
+                        if pool is not None else map(_postprocess_output_line, window))
+            for outcome in outcomes:
+                _apply_outcome(cursor, outcome)
+                since_save += 1
+                if since_save >= CURSOR_SAVE_EVERY:
+                    _save_cursor(batch_dir, cursor)
+                    since_save = 0
+                    print(f"  Processed {cursor['results']} results...", flush=True)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        _save_cursor(batch_dir, cursor)
+
+
+def batch_download(responses_dir: str, workers: int = 1) -> None:
+    """Download generation batch results, postprocess, identify fixes needed.
+
+    The output file is streamed to disk and postprocessed line by line
+    (across ``workers`` processes) using the plans saved at submit time.
+    Progress is kept in a cursor file, so running ``batch download`` again
+    after an interruption resumes where it stopped instead of restarting.
+    """
     batch_dir = _get_batch_dir(responses_dir)
     state = _load_state(batch_dir, "generation")
     if not state:
@@ -408,135 +704,53 @@ def batch_download(responses_dir: str) -> None:
         print("ERROR: Batch completed but no output file available.", flush=True)
         return
 
-    print(f"Downloading results from {output_file_id}...", flush=True)
-    output_content = client.files.content(output_file_id).content
     output_path = os.path.abspath(os.path.join(batch_dir, "batch_generation_output.jsonl"))
-    with open(output_path, "wb") as f:
-        f.write(output_content)
-    print(f"Wrote {output_path} ({len(output_content) / 1024:.0f} KB)", flush=True)
+    if state.get("output_downloaded") == output_file_id and os.path.exists(output_path):
+        print(f"Using downloaded {output_path}", flush=True)
+    else:
+        print(f"Downloading results from {output_file_id}...", flush=True)
+        size = _stream_file_to_disk(client, output_file_id, output_path)
+        print(f"Wrote {output_path} ({size / 1024:.0f} KB)", flush=True)
+        state["output_downloaded"] = output_file_id
+        _save_state(batch_dir, state, "generation")
 
     # Download error file if present
     error_file_id = batch.error_file_id
     errors_data = []
     if error_file_id:
-        error_content = client.files.content(error_file_id).content
         error_path = os.path.abspath(os.path.join(batch_dir, "batch_generation_errors.jsonl"))
-        with open(error_path, "wb") as f:
-            f.write(error_content)
-        for line in error_content.decode("utf-8", errors="replace").strip().split("\n"):
-            if line.strip():
-                errors_data.append(json.loads(line))
+        if not os.path.exists(error_path) or state.get("errors_downloaded") != error_file_id:
+            _stream_file_to_disk(client, error_file_id, error_path)
+            state["errors_downloaded"] = error_file_id
+        errors_data = [json.loads(line) for _, line in _iter_jsonl_lines(error_path)]
         print(f"Wrote {error_path} ({len(errors_data)} errors)", flush=True)
 
-    # Parse output
-    results = []
-    with open(output_path, "r", encoding="utf-8") as f:
-        for line in f:
-            if line.strip():
-                results.append(json.loads(line))
-
-    print(f"Processing {len(results)} results...", flush=True)
-
-    # Load verse mapping and dictionaries
-    verse_mapping = state.get("verse_mapping", {})
-    word_dict = load_word_dict_vp()
-    narrator_tmpl = load_narrator_tmpl_vp()
-
-    # Process each result
-    model = state.get("model", "gpt-4.1-mini")
-    data_dir = state.get("data_dir", "../ThaqalaynData/")
-    use_v3 = state.get("use_v3", False)
-    total_cost = 0.0
-    total_input_tokens = 0
-    total_output_tokens = 0
-    passed = 0
-    needs_fix = 0
-    processing_errors = 0
-    fix_candidates = {}  # custom_id -> {verse_path, warnings}
-
-    for res in results:
-        custom_id = res.get("custom_id", "")
-        verse_path = verse_mapping.get(custom_id)
-        if not verse_path:
-            logger.warning("Unknown custom_id in output: %s", custom_id)
-            processing_errors += 1
-            continue
-
-        verse_id = verse_path_to_id(verse_path)
-        response = res.get("response", {})
-        status_code = response.get("status_code", 0)
-        body = response.get("body", {})
-
-        if status_code != 200:
-            logger.warning("API error for %s: status=%d, body=%s",
-                           verse_id, status_code, str(body)[:200])
-            processing_errors += 1
-            continue
-
-        # Extract usage for cost tracking
-        usage = body.get("usage", {})
-        input_tokens = usage.get("prompt_tokens", 0)
-        output_tokens = usage.get("completion_tokens", 0)
-        cost = compute_cost(model, input_tokens, output_tokens) * BATCH_DISCOUNT
-        total_cost += cost
-        total_input_tokens += input_tokens
-        total_output_tokens += output_tokens
-
-        # Extract response text
-        choices = body.get("choices", [])
-        if not choices:
-            logger.warning("No choices for %s", verse_id)
-            processing_errors += 1
-            continue
-        raw_response = choices[0].get("message", {}).get("content", "")
-
-        # Prepare a minimal VersePlan for postprocessing
-        work_dir = os.path.join(batch_dir, "tmp_process", verse_id)
-        os.makedirs(work_dir, exist_ok=True)
-        plan = prepare_verse(verse_path, work_dir, data_dir=data_dir, use_v3=use_v3)
-        if plan is None:
-            logger.warning("Cannot prepare verse for postprocessing: %s", verse_path)
-            processing_errors += 1
-            continue
-
-        # Tag plan with backend info
-        plan.backend = "openai"
-        plan.model = model
-
-        # Save raw response for archive
-        raw_archive_dir = os.path.join(os.path.dirname(responses_dir), "raw_responses")
-        os.makedirs(raw_archive_dir, exist_ok=True)
-        raw_path = os.path.abspath(os.path.join(raw_archive_dir, f"{verse_id}.raw.txt"))
-        with open(raw_path, "w", encoding="utf-8") as f:
-            f.write(raw_response)
-
-        # Postprocess
-        result = postprocess_verse(
-            plan=plan,
-            raw_response=raw_response,
-            word_dict_data=word_dict,
-            narrator_templates=narrator_tmpl,
-            responses_dir=responses_dir,
-        )
-
-        if result.status == "pass":
-            passed += 1
-        elif result.status == "needs_fix":
-            needs_fix += 1
-            fix_candidates[custom_id] = {
-                "verse_path": verse_path,
-                "warnings": [
-                    {"field": w.field, "category": w.category,
-                     "severity": w.severity, "message": w.message}
-                    for w in result.warnings if w.severity in ("high", "medium")
-                ],
-            }
-        else:
-            processing_errors += 1
-
-        # Clean up work dir
-        import shutil
-        shutil.rmtree(work_dir, ignore_errors=True)
+    cursor = _load_cursor(batch_dir, output_file_id)
+    if cursor["next_line"]:
+        print(f"Resuming postprocess at line {cursor['next_line']} "
+              f"({cursor['results']} results already processed)", flush=True)
+
+    plans = _load_plans(state.get("plans_path"))
+    if not plans:
+        print("No saved plans for this batch; preparing each verse again.", flush=True)
+    settings = {
+        "model": state.get("model", "gpt-4.1-mini"),
+        "data_dir": state.get("data_dir", "../ThaqalaynData/"),
+        "use_v3": state.get("use_v3", False),
+        "responses_dir": responses_dir,
+        "batch_dir": batch_dir,
+    }
+    print(f"Processing results ({workers} worker{'s' if workers != 1 else ''})...", flush=True)
+    _postprocess_output(output_path, cursor, plans, state.get("verse_mapping", {}),
+                        settings, batch_dir, workers=workers)
+
+    passed = cursor["passed"]
+    needs_fix = cursor["needs_fix"]
+    processing_errors = cursor["errors"]
+    total_cost = cursor["total_cost"]
+    total_input_tokens = cursor["total_input_tokens"]
+    total_output_tokens = cursor["total_output_tokens"]
+    fix_candidates = cursor["fix_candidates"]
 
     # Handle API-level errors
     for err in errors_data:
@@ -556,7 +770,7 @@ def batch_download(responses_dir: str) -> None:
     state["output_file_id"] = output_file_id
     state["download_stats"] = {
         "downloaded_at": datetime.now(timezone.utc).isoformat(),
-        "total_results": len(results),
+        "total_results": cursor["results"],
         "passed": passed,
         "needs_fix": needs_fix,
         "errors": processing_errors,
@@ -568,11 +782,12 @@ def batch_download(responses_dir: str) -> None:
         state["fix_candidates"] = fix_candidates
     _save_state(batch_dir, state, "generation")
     _archive_state(batch_dir, state, "generation")
+    os.remove(_get_cursor_path(batch_dir))
 
     # Summary
     print(f"\n{'=' * 60}", flush=True)
     print(f"Batch Download Complete", flush=True)
-    print(f"  Results:  {len(results)} downloaded", flush=True)
+    print(f"  Results:  {cursor['results']} downloaded", flush=True)
     print(f"  Passed:   {passed}", flush=True)
     print(f"  Needs fix: {needs_fix}", flush=True)
     print(f"  Errors:   {processing_errors}", flush=True)
@@ -654,15 +869,12 @@ def batch_submit_fixes(responses_dir: str) -> None:
 
         # Load the raw response to re-postprocess and get the result for fix prompt
         raw_archive_dir = os.path.join(os.path.dirname(responses_dir), "raw_responses")
-        raw_path = os.path.join(raw_archive_dir, f"{verse_id}.raw.txt")
-        if not os.path.exists(raw_path):
+        raw_response = read_raw_response(raw_archive_dir, verse_id)
+        if raw_response is None:
             logger.warning("Raw response not found for %s, skipping fix", verse_id)
             skipped += 1
             continue
 
-        with open(raw_path, "r", encoding="utf-8") as f:
-            raw_response = f.read()
-
         # Re-postprocess to get the VerseResult with warnings
         result = postprocess_verse(
             plan=plan,
@@ -891,14 +1103,11 @@ def batch_download_fixes(responses_dir: str) -> None:
 
         # Load original raw response for context
         raw_archive_dir = os.path.join(os.path.dirname(responses_dir), "raw_responses")
-        raw_path = os.path.join(raw_archive_dir, f"{verse_id}.raw.txt")
-        if not os.path.exists(raw_path):
+        raw_response = read_raw_response(raw_archive_dir, verse_id)
+        if raw_response is None:
             fix_errors += 1
             continue
 
-        with open(raw_path, "r", encoding="utf-8") as f:
-            raw_response = f.read()
-
         # Postprocess original to get the result dict for merging
         orig_result = postprocess_verse(
             plan=plan,
@@ -924,9 +1133,7 @@ def batch_download_fixes(responses_dir: str) -> None:
         )
 
         # Archive fix raw response
-        fix_raw_path = os.path.join(raw_archive_dir, f"{verse_id}.fix.raw.txt")
-        with open(fix_raw_path, "w", encoding="utf-8") as f:
-            f.write(fix_response)
+        archive_raw_response(raw_archive_dir, verse_id, "fix", fix_response)
 
         if fix_result.status == "pass":
             fixed += 1
@@ -1027,7 +1234,7 @@ def handle_batch_command(args) -> None:
         batch_status(responses_dir)
 
     elif subcmd == "download":
-        batch_download(responses_dir)
+        batch_download(responses_dir, workers=args.postprocess_workers)
 
     elif subcmd == "submit-fixes":
         batch_submit_fixes(responses_dir)
@@ -0,0 +1,205 @@
+"""Process-wide AsyncOpenAI clients over shared, instrumented connection pools.
+
+``call_openai`` used to build a fresh ``AsyncOpenAI`` (and with it a fresh
+httpx pool) on every call, so each Phase 1, Phase 3, Phase 4 and Spark
+narrator-filler request opened a new TCP connection. The churn is costly
+at hundreds of concurrent calls to one local vLLM endpoint. This module
+keeps:
+
+- one httpx ``AsyncClient`` per endpoint (``base_url``; ``None`` is
+  api.openai.com) and event loop, with keep-alive limits sized for that
+  concurrency (``DEFAULT_OPENAI_MAX_CONNECTIONS`` /
+  ``DEFAULT_OPENAI_MAX_KEEPALIVE``) and HTTP/2 when the ``h2`` package is
+  installed (``OPENAI_HTTP2=0`` turns it off; plain ``http://`` endpoints
+  such as Spark always speak HTTP/1.1);
+- one ``AsyncOpenAI`` per ``(base_url, timeout, api key)`` on top of it,
+  from :func:`get_client`.
+
+A pool is bound to the event loop that created it. A later
+``asyncio.run`` gets a new pool and keeps the endpoint's metrics.
+
+Every request through a pool is timed by httpx event hooks and an httpcore
+trace: :class:`ConnectionMetrics` counts requests that opened a new
+connection versus reused a pooled one, and time to first byte (request
+sent to response headers received). ``run_pipeline`` prints
+:func:`client_metrics` with its progress and stores it in the session
+record.
+
+Without httpx (it ships with openai) each client keeps the SDK's own pool
+and no metrics are collected.
+"""
+
+import asyncio
+import importlib.util
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app.config import (
+    DEFAULT_OPENAI_KEEPALIVE_EXPIRY,
+    DEFAULT_OPENAI_MAX_CONNECTIONS,
+    DEFAULT_OPENAI_MAX_KEEPALIVE,
+)
+
+try:
+    import httpx
+except ImportError:  # openai not installed
+    httpx = None
+
+_STATE_KEY = "pipeline_timing"
+
+
+class ConnectionMetrics:
+    """Connection reuse and time-to-first-byte counters for one endpoint."""
+
+    TTFB_SAMPLES = 4096  # recent requests kept for percentiles
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.connect_s = 0.0
+        self.ttfb_total_s = 0.0
+        self.ttfb_max_s = 0.0
+        self._ttfb: Deque[float] = deque(maxlen=self.TTFB_SAMPLES)
+
+    def record(self, ttfb_s: float, new_connection: bool, connect_s: float = 0.0) -> None:
+        self.requests += 1
+        if new_connection:
+            self.new_connections += 1
+            self.connect_s += connect_s
+        self.ttfb_total_s += ttfb_s
+        self.ttfb_max_s = max(self.ttfb_max_s, ttfb_s)
+        self._ttfb.append(ttfb_s)
+
+    def snapshot(self) -> dict:
+        samples = sorted(self._ttfb)
+        reused = self.requests - self.new_connections
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": reused,
+            "reuse_rate": round(reused / self.requests, 4) if self.requests else None,
+            "connect_avg_s": round(self.connect_s / self.new_connections, 4) if self.new_connections else None,
+            "ttfb_avg_s": round(self.ttfb_total_s / self.requests, 4) if self.requests else None,
+            "ttfb_p50_s": _percentile(samples, 0.50),
+            "ttfb_p95_s": _percentile(samples, 0.95),
+            "ttfb_max_s": round(self.ttfb_max_s, 4) if self.requests else None,
+        }
+
+
+def _percentile(samples: List[float], q: float) -> Optional[float]:
+    if not samples:
+        return None
+    return round(samples[min(len(samples) - 1, int(q * len(samples)))], 4)
+
+
+def http2_enabled() -> bool:
+    if os.environ.get("OPENAI_HTTP2", "1") == "0":
+        return False
+    return importlib.util.find_spec("h2") is not None
+
+
+def _trace(state: dict):
+    """httpcore trace callback noting whether (and how long) a new connection was opened."""
+    async def trace(event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.started":
+            state["connect_start"] = time.perf_counter()
+        elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            state["connect_s"] = time.perf_counter() - state["connect_start"]
+    return trace
+
+
+def _make_http_client(metrics: ConnectionMetrics):
+    async def on_request(request):
+        state = {"start": time.perf_counter()}
+        request.extensions[_STATE_KEY] = state
+        request.extensions["trace"] = _trace(state)
+
+    async def on_response(response):
+        state = response.request.extensions.get(_STATE_KEY)
+        if state is not None:
+            metrics.record(time.perf_counter() - state["start"], "connect_start" in state,
+                           state.get("connect_s", 0.0))
+
+    limits = httpx.Limits(
+        max_connections=int(os.environ.get("OPENAI_MAX_CONNECTIONS", DEFAULT_OPENAI_MAX_CONNECTIONS)),
+        max_keepalive_connections=int(os.environ.get("OPENAI_MAX_KEEPALIVE", DEFAULT_OPENAI_MAX_KEEPALIVE)),
+        keepalive_expiry=DEFAULT_OPENAI_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        limits=limits,
+        http2=http2_enabled(),
+        follow_redirects=True,
+        event_hooks={"request": [on_request], "response": [on_response]},
+    )
+
+
+class _Pool:
+    """The shared http client of one endpoint on one event loop, and the clients using it."""
+
+    def __init__(self, loop, metrics: ConnectionMetrics):
+        self.loop = loop
+        self.http_client = _make_http_client(metrics) if httpx is not None else None
+        self.clients: Dict[Tuple[float, str], object] = {}
+
+
+_pools: Dict[Optional[str], _Pool] = {}
+_metrics: Dict[Optional[str], ConnectionMetrics] = {}
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_client(api_key: str, base_url: Optional[str] = None, timeout: float = 600.0):
+    """The shared ``AsyncOpenAI`` for ``(base_url, timeout, api_key)`` on the running loop."""
+    from openai import AsyncOpenAI
+
+    loop = _running_loop()
+    pool = _pools.get(base_url)
+    if pool is None or pool.loop is not loop:
+        metrics = _metrics.setdefault(base_url, ConnectionMetrics())
+        pool = _pools[base_url] = _Pool(loop, metrics)
+    client = pool.clients.get((timeout, api_key))
+    if client is None:
+        kwargs = {"http_client": pool.http_client} if pool.http_client is not None else {}
+        client = pool.clients[(timeout, api_key)] = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=3,
+            timeout=timeout,
+            **kwargs,
+        )
+    return client
+
+
+async def close_clients() -> None:
+    """Close the pools created on the running loop (metrics are kept)."""
+    loop = _running_loop()
+    for base_url, pool in list(_pools.items()):
+        if pool.loop is not loop:
+            continue
+        del _pools[base_url]
+        if pool.http_client is not None:
+            await pool.http_client.aclose()
+        else:
+            for client in pool.clients.values():
+                await client.close()
+
+
+def client_metrics() -> Dict[str, dict]:
+    """Per-endpoint :meth:`ConnectionMetrics.snapshot`, for endpoints that served a request."""
+    return {base_url or "openai": m.snapshot() for base_url, m in _metrics.items() if m.requests}
+
+
+def format_metrics(metrics: Dict[str, dict]) -> List[str]:
+    """One ``endpoint: requests, reuse, TTFB`` string per endpoint."""
+    lines = []
+    for endpoint, m in metrics.items():
+        lines.append(f"{endpoint}: {m['requests']} req, {m['reuse_rate']:.0%} reused conns, "
+                     f"TTFB p50 {m['ttfb_p50_s']:.2f}s p95 {m['ttfb_p95_s']:.2f}s")
+    return lines
@@ -31,8 +31,13 @@ from typing import Dict, List, Optional
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from app.config import AI_PIPELINE_DATA_DIR, AI_RESPONSES_DIR
+from app.config import AI_PIPELINE_DATA_DIR, AI_RESPONSES_DIR, BATCH_POSTPROCESS_WORKERS, DEFAULT_PROMPT_CACHE_MAX_RUN
 from app.narrator_registry import NarratorRegistry
+from app.phrase_matcher import PhraseMatcher
+from app.pipeline_cli.completion_index import CompletionIndex
+from app.pipeline_cli.openai_clients import client_metrics, close_clients, format_metrics
+from app.pipeline_cli.prompt_cache import PrefixCacheStats, PrefixScheduler, prefix_key, prompt_tokens
+from app.pipeline_cli.stats_ledger import StatsLedger
 from app.pipeline_cli.verse_processor import (
     VersePlan,
     VerseResult,
@@ -156,6 +161,7 @@ def save_verse_stats(
 
     # Read previous failure count for cumulative tracking
     prev_failure_count = 0
+    prev_data = None
     if os.path.exists(stats_path):
         try:
             with open(stats_path, "r", encoding="utf-8") as f:
@@ -208,6 +214,8 @@ def save_verse_stats(
     with open(stats_path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
     logger.info("WROTE %s", stats_path)
+    # Keep pipeline_status aggregates incremental (replaces prev_data's contribution)
+    StatsLedger(stats_dir).append(verse_id, data, prev_data)
 
 
 @dataclass
@@ -235,6 +243,9 @@ class PipelineConfig:
     phase1_model: str = "gpt-5.4"
     phase4_model: str = "gpt-4.1-mini"
     phase3_model: str = "sonnet"  # Claude by default — Phase 3 is scholarly
+    # Dispatch requests grouped by prompt prefix with per-prefix cache
+    # warm-up (see prompt_cache.py); False = plain FIFO semaphore order
+    prefix_scheduling: bool = True
     # Derived paths (set by run_pipeline)
     stats_dir: str = ""
     logs_dir: str = ""
@@ -266,6 +277,8 @@ class SessionStats:
     phase1_cost: float = 0.0
     phase3_cost: float = 0.0
     phase4_cost: float = 0.0
+    # Input / cache-read tokens per prompt prefix (live cache hit rates)
+    prefix_cache: PrefixCacheStats = field(default_factory=PrefixCacheStats)
 
 
 # Global shutdown event for graceful Ctrl+C handling
@@ -360,8 +373,15 @@ def build_queue(
     book: Optional[str] = None,
     volume: Optional[int] = None,
     attempt_quarantined: bool = False,
+    index: Optional[CompletionIndex] = None,
 ) -> List[str]:
-    """Filter verse paths to those not yet completed or quarantined."""
+    """Filter verse paths to those not yet completed or quarantined.
+
+    Membership is answered from a CompletionIndex (one directory scan)
+    rather than a stat per verse; pass ``index`` to reuse an existing one.
+    """
+    if index is None:
+        index = CompletionIndex.scan(responses_dir)
     books = [b.strip() for b in book.split(",")] if book else []
     queue = []
     skipped_quarantine = 0
@@ -376,10 +396,10 @@ def build_queue(
                 continue
         # Skip completed
         vid = verse_path_to_id(vp)
-        if is_complete(vid, responses_dir):
+        if index.is_complete(vid):
             continue
         # Skip quarantined (unless --attempt-quarantined)
-        if not attempt_quarantined and is_quarantined(vid, responses_dir):
+        if not attempt_quarantined and index.is_quarantined(vid):
             skipped_quarantine += 1
             continue
         queue.append(vp)
@@ -598,7 +618,7 @@ def recover_stale_work_dirs(tmp_dir: str, responses_dir: str) -> List[str]:
 async def process_verse(
     verse_path: str,
     config: PipelineConfig,
-    semaphore: asyncio.Semaphore,
+    scheduler: PrefixScheduler,
     stats: SessionStats,
     word_dict: Optional[dict],
     narrator_tmpl: Optional[dict],
@@ -648,10 +668,11 @@ async def process_verse(
         config.event_log.log("VERSE_START", verse_id=verse_id,
                              words=plan.word_count, mode=plan.mode)
 
-        # Step 2: Generate (acquire semaphore for Claude call, retry on malformed)
+        # Step 2: Generate (acquire a worker slot for the LLM call, retry on malformed)
         cr = None
+        gen_key = prefix_key("gen", plan.system_prompt)
         for gen_attempt in range(2):  # 1 retry on malformed response
-            async with semaphore:
+            async with scheduler.slot(gen_key):
                 if shutdown_event.is_set():
                     return VerseResult(verse_id=verse_id, status="skipped")
 
@@ -754,17 +775,22 @@ async def process_verse(
             f.write(raw_response_str)
         logger.info("WROTE %s", raw_path)
         # Archive to permanent dir
+        from app.pipeline_cli.openai_backend import archive_raw_response
         raw_archive_dir = os.path.join(os.path.dirname(responses_dir), "raw_responses")
-        os.makedirs(raw_archive_dir, exist_ok=True)
-        raw_archive_path = os.path.abspath(os.path.join(raw_archive_dir, f"{verse_id}.raw.txt"))
-        with open(raw_archive_path, "w", encoding="utf-8") as f:
-            f.write(raw_response_str)
-        logger.info("WROTE %s", raw_archive_path)
+        archive_raw_response(raw_archive_dir, verse_id, "", raw_response_str)
 
         # Track costs
         stats.total_cost += cr.get("cost", 0)
         stats.total_output_tokens += cr.get("output_tokens", 0)
         stats.total_input_tokens += cr.get("input_tokens", 0)
+        stats.total_cache_creation_tokens += cr.get("cache_creation_tokens", 0)
+        stats.total_cache_read_tokens += cr.get("cache_read_tokens", 0)
+        stats.prefix_cache.record(
+            gen_key,
+            prompt_tokens(config.backend, cr.get("input_tokens", 0), cr.get("cache_read_tokens", 0),
+                          cr.get("cache_creation_tokens", 0)),
+            cr.get("cache_read_tokens", 0),
+        )
         stats.total_elapsed += cr.get("elapsed", 0)
 
         # Step 3: Postprocess (0 tokens)
@@ -794,7 +820,8 @@ async def process_verse(
                                  warnings=len([w for w in result.warnings
                                                if w.severity in ("high", "medium")]))
 
-            async with semaphore:
+            fix_key = prefix_key("fix", fix_system)
+            async with scheduler.slot(fix_key):
                 if shutdown_event.is_set():
                     return result
 
@@ -808,11 +835,9 @@ async def process_verse(
 
             if "error" not in fix_cr:
                 # Archive fix raw response for debugging
+                from app.pipeline_cli.openai_backend import archive_raw_response
                 fix_raw_dir = os.path.join(os.path.dirname(responses_dir), "raw_responses")
-                os.makedirs(fix_raw_dir, exist_ok=True)
-                fix_raw_path = os.path.join(fix_raw_dir, f"{verse_id}.fix.raw.txt")
-                with open(fix_raw_path, "w", encoding="utf-8") as f:
-                    f.write(fix_cr.get("result", ""))
+                archive_raw_response(fix_raw_dir, verse_id, "fix", fix_cr.get("result", ""))
 
                 # Pass original result for merge if fix returns partial corrections
                 orig_result = result.result_dict
@@ -830,6 +855,12 @@ async def process_verse(
                 )
                 stats.total_cost += fix_cr.get("cost", 0)
                 stats.total_output_tokens += fix_cr.get("output_tokens", 0)
+                stats.prefix_cache.record(
+                    fix_key,
+                    prompt_tokens(config.backend, fix_cr.get("input_tokens", 0),
+                                  fix_cr.get("cache_read_tokens", 0), fix_cr.get("cache_creation_tokens", 0)),
+                    fix_cr.get("cache_read_tokens", 0),
+                )
 
                 if fix_result.status == "pass":
                     stats.fixed += 1
@@ -937,13 +968,14 @@ async def process_verse(
 async def process_verse_phased(
     verse_path: str,
     config: PipelineConfig,
-    semaphore: asyncio.Semaphore,
+    scheduler: PrefixScheduler,
     stats: SessionStats,
     word_dict: Optional[dict],
     narrator_tmpl: Optional[dict],
     narrator_registry: Optional[NarratorRegistry] = None,
     phrases_dict: Optional[dict] = None,
     taxonomy: Optional[dict] = None,
+    phrase_matcher: Optional[PhraseMatcher] = None,
 ) -> VerseResult:
     """Process a single verse through the multi-phase pipeline.
 
@@ -958,7 +990,7 @@ async def process_verse_phased(
         parse_phase1_response,
     )
     from app.pipeline_cli.programmatic_enrichment import programmatic_enrich
-    from app.pipeline_cli.translation_phase import translate_chunks
+    from app.pipeline_cli.translation_phase import translate_chunks, translation_system_prompt
     from app.ai_pipeline import (
         extract_pipeline_request,
         validate_result,
@@ -1023,7 +1055,8 @@ async def process_verse_phased(
                 }
                 p1_kwargs["max_output_tokens"] = 12000
 
-        async with semaphore:
+        p1_key = prefix_key("p1", system_prompt)
+        async with scheduler.slot(p1_key):
             if shutdown_event.is_set():
                 return VerseResult(verse_id=verse_id, status="skipped")
 
@@ -1055,6 +1088,12 @@ async def process_verse_phased(
         stats.total_input_tokens += cr.get("input_tokens", 0)
         stats.total_cache_creation_tokens += cr.get("cache_creation_tokens", 0)
         stats.total_cache_read_tokens += cr.get("cache_read_tokens", 0)
+        stats.prefix_cache.record(
+            p1_key,
+            prompt_tokens(config.backend, cr.get("input_tokens", 0), cr.get("cache_read_tokens", 0),
+                          cr.get("cache_creation_tokens", 0)),
+            cr.get("cache_read_tokens", 0),
+        )
 
         # Parse Phase 1 response
         from app.pipeline_cli.verse_processor import strip_code_fences, repair_json_quotes
@@ -1096,6 +1135,7 @@ async def process_verse_phased(
             word_dict=word_dict,
             phrases_dict=phrases_dict,
             taxonomy=taxonomy,
+            phrase_matcher=phrase_matcher,
         )
 
         # ── Phase 2 (Spark only): fill name_en for unresolved narrators
@@ -1109,7 +1149,7 @@ async def process_verse_phased(
                 from app.pipeline_cli.spark_narrator_filler import (
                     fill_unresolved_narrators,
                 )
-                async with semaphore:
+                async with scheduler:
                     if not shutdown_event.is_set():
                         full_result = await fill_unresolved_narrators(
                             full_result, model=config.phase1_model,
@@ -1122,10 +1162,11 @@ async def process_verse_phased(
 
         # ── Phase 3: Scholarly enrichment (optional) ──────────────────
         if not config.skip_scholarly:
-            from app.pipeline_cli.scholarly_phase import enrich_scholarly
+            from app.pipeline_cli.scholarly_phase import build_scholarly_prompt, enrich_scholarly
             logger.info("P3-SCHOLARLY %s (%s/%s)...",
                         verse_id, config.backend, config.phase3_model)
-            async with semaphore:
+            p3_key = prefix_key("p3", build_scholarly_prompt("", "", [])[0])
+            async with scheduler.slot(p3_key):
                 if shutdown_event.is_set():
                     return VerseResult(verse_id=verse_id, status="skipped")
                 full_result = await enrich_scholarly(
@@ -1142,14 +1183,19 @@ async def process_verse_phased(
                 )
             p3_cost = full_result.pop("_phase3_cost", 0)
             stats.total_output_tokens += full_result.pop("_phase3_tokens", 0)
-            stats.total_input_tokens += full_result.pop("_phase3_input_tokens", 0)
-            stats.total_cache_read_tokens += full_result.pop("_phase3_cache_read_tokens", 0)
+            p3_input = full_result.pop("_phase3_input_tokens", 0)
+            p3_cache_read = full_result.pop("_phase3_cache_read_tokens", 0)
+            stats.total_input_tokens += p3_input
+            stats.total_cache_read_tokens += p3_cache_read
+            stats.prefix_cache.record(p3_key, prompt_tokens(config.backend, p3_input, p3_cache_read),
+                                      p3_cache_read)
             stats.total_cost += p3_cost
             stats.phase3_cost += p3_cost
 
         # ── Phase 4: Multi-language translation ───────────────────────
         logger.info("P4-TRANSLATE %s...", verse_id)
-        async with semaphore:
+        p4_key = prefix_key("p4", translation_system_prompt(config.phase4_model))
+        async with scheduler.slot(p4_key):
             if shutdown_event.is_set():
                 return VerseResult(verse_id=verse_id, status="skipped")
             full_result = await translate_chunks(
@@ -1163,8 +1209,12 @@ async def process_verse_phased(
             )
         p4_cost = full_result.pop("_phase4_cost", 0)
         stats.total_output_tokens += full_result.pop("_phase4_tokens", 0)
-        stats.total_input_tokens += full_result.pop("_phase4_input_tokens", 0)
-        stats.total_cache_read_tokens += full_result.pop("_phase4_cache_read_tokens", 0)
+        p4_input = full_result.pop("_phase4_input_tokens", 0)
+        p4_cache_read = full_result.pop("_phase4_cache_read_tokens", 0)
+        stats.total_input_tokens += p4_input
+        stats.total_cache_read_tokens += p4_cache_read
+        # translate_chunks always calls the OpenAI-compatible API
+        stats.prefix_cache.record(p4_key, p4_input, p4_cache_read)
         stats.total_cost += p4_cost
         stats.phase4_cost += p4_cost
         # Server-reported canonical model name for the attribution string
@@ -1316,6 +1366,11 @@ async def progress_reporter(stats: SessionStats, config: PipelineConfig):
                 f"  Phases: P1=${stats.phase1_cost:.2f} | P4=${stats.phase4_cost:.2f}"
             )
         progress_lines.append(f"  Out tokens: {stats.total_output_tokens:,}")
+        if stats.prefix_cache.prefixes:
+            progress_lines.append(f"  Prompt cache: {' | '.join(stats.prefix_cache.format())}")
+        http_metrics = client_metrics()
+        if http_metrics:
+            progress_lines.append(f"  HTTP: {' | '.join(format_metrics(http_metrics))}")
         progress_lines.append("---")
         print("\n".join(progress_lines), flush=True)
 
@@ -1388,8 +1443,10 @@ async def run_pipeline(config: PipelineConfig, verse_paths: List[str]):
                 verse_paths.append(vp)
 
     # Build queue (filters out already-completed verses)
+    completion_index = CompletionIndex.load_or_scan(responses_dir, persist=not config.dry_run)
     queue = build_queue(verse_paths, responses_dir,
-                        attempt_quarantined=config.attempt_quarantined)
+                        attempt_quarantined=config.attempt_quarantined,
+                        index=completion_index)
     if config.max_verses:
         queue = queue[:config.max_verses]
     if not queue:
@@ -1403,7 +1460,10 @@ async def run_pipeline(config: PipelineConfig, verse_paths: List[str]):
         return
 
     stats = SessionStats(total_queued=len(queue))
-    semaphore = asyncio.Semaphore(config.workers)
+    if config.prefix_scheduling:
+        scheduler = PrefixScheduler(config.workers, max_run=DEFAULT_PROMPT_CACHE_MAX_RUN)
+    else:
+        scheduler = PrefixScheduler(config.workers, max_run=0, warmup=False)
 
     mode_str = "phased" if config.phased else "monolithic"
     model_str = (f"p1={config.phase1_model}, p4={config.phase4_model}"
@@ -1427,10 +1487,13 @@ async def run_pipeline(config: PipelineConfig, verse_paths: List[str]):
 
     # Load phased pipeline resources if needed
     phrases_dict = None
+    phrase_matcher = None
     taxonomy = None
     if config.phased:
         from app.ai_pipeline import load_key_phrases_dictionary
         phrases_dict = load_key_phrases_dictionary()
+        # Compiled once here; Phase 2 matches every verse against it
+        phrase_matcher = PhraseMatcher.from_dictionary(phrases_dict) if phrases_dict else None
         # Load tag_topic_mapping.json for Phase 2 topic/tag heuristics
         taxonomy_path = os.path.join(AI_PIPELINE_DATA_DIR, "tag_topic_mapping.json")
         if os.path.exists(taxonomy_path):
@@ -1444,14 +1507,14 @@ async def run_pipeline(config: PipelineConfig, verse_paths: List[str]):
     if config.phased:
         tasks = [
             process_verse_phased(
-                vp, config, semaphore, stats, word_dict, narrator_tmpl,
-                narrator_registry, phrases_dict, taxonomy,
+                vp, config, scheduler, stats, word_dict, narrator_tmpl,
+                narrator_registry, phrases_dict, taxonomy, phrase_matcher,
             )
             for vp in queue
         ]
     else:
         tasks = [
-            process_verse(vp, config, semaphore, stats, word_dict, narrator_tmpl, narrator_registry)
+            process_verse(vp, config, scheduler, stats, word_dict, narrator_tmpl, narrator_registry)
             for vp in queue
         ]
     results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -1462,6 +1525,14 @@ async def run_pipeline(config: PipelineConfig, verse_paths: List[str]):
         await progress_task
     except asyncio.CancelledError:
         pass
+    await close_clients()
+    http_metrics = client_metrics()
+
+    # Persist a fresh snapshot for the next run. A rescan, not the start-of-run
+    # sets plus this run's verses: other processes may have added or removed
+    # responses meanwhile.
+    if not config.dry_run:
+        CompletionIndex.scan(responses_dir).save()
 
     # Final summary
     elapsed_min = (time.time() - stats.started_at) / 60
@@ -1504,6 +1575,12 @@ async def run_pipeline(config: PipelineConfig, verse_paths: List[str]):
             print(f"  Cache: {hit_rate:.0%} hit rate (saved ~${saved:.2f} vs full input rate)", flush=True)
         except (ImportError, KeyError, ValueError):
             print(f"  Cache: {hit_rate:.0%} hit rate", flush=True)
+    if stats.prefix_cache.prefixes:
+        print("  Cache by prompt prefix:", flush=True)
+        for line in stats.prefix_cache.format():
+            print(f"    {line}", flush=True)
+    for line in format_metrics(http_metrics):
+        print(f"  HTTP {line}", flush=True)
     # 58K projection
     if stats.completed and avg_cost > 0:
         print(f"  Projected 58K corpus: ${avg_cost * 58000:.0f}", flush=True)
@@ -1530,6 +1607,8 @@ async def run_pipeline(config: PipelineConfig, verse_paths: List[str]):
         "total_output_tokens": stats.total_output_tokens,
         "total_cache_creation_tokens": stats.total_cache_creation_tokens,
         "total_cache_read_tokens": stats.total_cache_read_tokens,
+        "prefix_cache": stats.prefix_cache.snapshot(),
+        "http": http_metrics,
         "total_elapsed_s": round(stats.total_elapsed, 1),
         "avg_cost_per_verse": round(stats.total_cost / stats.completed, 4) if stats.completed else 0,
         "avg_elapsed_per_verse": round(stats.total_elapsed / stats.completed, 1) if stats.completed else 0,
@@ -1543,6 +1622,7 @@ async def run_pipeline(config: PipelineConfig, verse_paths: List[str]):
             "max_verses": config.max_verses,
             "dry_run": config.dry_run,
             "system_prompt_hash": config.system_prompt_hash,
+            "prefix_scheduling": config.prefix_scheduling,
         },
     }
 
@@ -1733,7 +1813,11 @@ def main():
                         help="Command: run (default), retranslate, word-dict, batch")
     parser.add_argument("subcommand", nargs="?", default=None,
                         help="Subcommand for word-dict (extract, missing, stats) or batch (submit, status, download, submit-fixes, download-fixes)")
-    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent Claude calls")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Concurrent LLM calls for run and retranslate")
+    parser.add_argument("--postprocess-workers", type=int, default=BATCH_POSTPROCESS_WORKERS,
+                        help="batch download: processes postprocessing results "
+                             "(default: BATCH_POSTPROCESS_WORKERS env, 1 = serial)")
     parser.add_argument("--model", default="sonnet", help="Model for generation (default: sonnet)")
     parser.add_argument("--fix-model", default="sonnet", help="Model for fix pass (default: sonnet)")
     parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="ThaqalaynData directory")
@@ -1771,6 +1855,8 @@ def main():
                              "When --backend spark, defaults to qwen36-fast.")
     parser.add_argument("--skip-merge", action="store_true",
                         help="Skip merging AI content into ThaqalaynData after run")
+    parser.add_argument("--no-prefix-scheduling", action="store_true",
+                        help="Dispatch LLM calls in queue order instead of grouped by prompt prefix")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose logging")
     args = parser.parse_args()
 
@@ -1862,6 +1948,7 @@ def main():
         phase1_model=args.phase1_model,
         phase4_model=args.phase4_model,
         phase3_model=args.phase3_model,
+        prefix_scheduling=not args.no_prefix_scheduling,
     )
 
     # Load verse paths
@@ -3,6 +3,7 @@
 Usage:
     python -m app.pipeline_cli.pipeline_status
     python -m app.pipeline_cli.pipeline_status --audit
+    python -m app.pipeline_cli.pipeline_status --rebuild-stats
     python -m app.pipeline_cli.pipeline_status --responses-dir path/to/responses
 """
 
@@ -12,11 +13,14 @@ import os
 import sys
 from collections import Counter, defaultdict
 from pathlib import Path
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from app.config import AI_PIPELINE_DATA_DIR, AI_RESPONSES_DIR
+from app.pipeline_cli.completion_index import CompletionIndex
+from app.pipeline_cli.stats_ledger import StatsLedger
 from app.pipeline_cli.verse_processor import verse_path_to_id
 
 
@@ -36,19 +40,11 @@ def _load_corpus_manifest() -> dict:
     return dict(by_book)
 
 
-def _count_responses(responses_dir: str) -> dict:
+def _count_responses(responses_dir: str, index: Optional[CompletionIndex] = None) -> dict:
     """Count response files per book."""
-    by_book = Counter()
-    total = 0
-    if not os.path.exists(responses_dir):
-        return {"total": 0, "by_book": dict(by_book)}
-    for fname in os.listdir(responses_dir):
-        if not fname.endswith(".json"):
-            continue
-        book = fname.split("_")[0]
-        by_book[book] += 1
-        total += 1
-    return {"total": total, "by_book": dict(by_book)}
+    if index is None:
+        index = CompletionIndex.load_or_scan(responses_dir)
+    return {"total": len(index.complete), "by_book": index.counts_by_book()}
 
 
 def _load_quarantine(responses_dir: str) -> list:
@@ -86,17 +82,18 @@ def _load_session_logs(tmp_dir: str) -> list:
     return logs
 
 
-def _count_stale_work_dirs(tmp_dir: str, responses_dir: str) -> int:
+def _count_stale_work_dirs(tmp_dir: str, responses_dir: str, index: Optional[CompletionIndex] = None) -> int:
     """Count orphaned work directories."""
     if not os.path.exists(tmp_dir):
         return 0
+    if index is None:
+        index = CompletionIndex.load_or_scan(responses_dir)
     count = 0
     for entry in os.listdir(tmp_dir):
         work_dir = os.path.join(tmp_dir, entry)
         if not os.path.isdir(work_dir) or entry == "pipeline_session.json":
             continue
-        resp_path = os.path.join(responses_dir, f"{entry}.json")
-        if not os.path.exists(resp_path):
+        if not index.is_complete(entry):
             count += 1
     return count
 
@@ -118,64 +115,23 @@ def _load_session_history(sessions_dir: str) -> list:
     return sessions
 
 
-def _aggregate_verse_stats(stats_dir: str) -> dict:
-    """Aggregate per-verse stats files for summary metrics."""
+def _aggregate_verse_stats(stats_dir: str, rebuild: bool = False) -> dict:
+    """Aggregate per-verse stats for summary metrics.
+
+    Served from the incremental stats ledger; only ledger lines appended since
+    the last query are read. ``rebuild=True`` forces a full rescan of the
+    ``*.stats.json`` files.
+    """
     if not os.path.exists(stats_dir):
         return {}
-    total_cost = 0.0
-    total_fix_cost = 0.0
-    total_tokens = 0
-    total_gen_time = 0.0
-    total_fix_time = 0.0
-    count = 0
-    by_status = Counter()
-    by_content_type = Counter()
-    by_model = Counter()
-    warnings_total = {"high": 0, "medium": 0, "low": 0}
+    ledger = StatsLedger(stats_dir)
+    if rebuild:
+        agg, _ = ledger.rebuild()
+        return agg.to_dict()
+    return ledger.aggregate()
 
-    for fname in os.listdir(stats_dir):
-        if not fname.endswith(".stats.json"):
-            continue
-        path = os.path.join(stats_dir, fname)
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                s = json.load(f)
-        except (json.JSONDecodeError, OSError):
-            continue
-        count += 1
-        by_status[s.get("status", "unknown")] += 1
-        gen = s.get("generation", {})
-        total_cost += gen.get("cost_usd", 0)
-        total_tokens += gen.get("output_tokens", 0)
-        total_gen_time += gen.get("elapsed_s", 0)
-        by_model[s.get("model", "unknown")] += 1
-        fix = s.get("fix", {})
-        if fix.get("needed"):
-            total_fix_cost += fix.get("cost_usd", 0)
-            total_fix_time += fix.get("elapsed_s", 0)
-        ct = s.get("content", {}).get("content_type", "")
-        if ct:
-            by_content_type[ct] += 1
-        q = s.get("quality", {})
-        warnings_total["high"] += q.get("warnings_high", 0)
-        warnings_total["medium"] += q.get("warnings_medium", 0)
-        warnings_total["low"] += q.get("warnings_low", 0)
-
-    return {
-        "count": count,
-        "total_cost": total_cost,
-        "total_fix_cost": total_fix_cost,
-        "total_tokens": total_tokens,
-        "total_gen_time": total_gen_time,
-        "total_fix_time": total_fix_time,
-        "by_status": dict(by_status),
-        "by_content_type": dict(by_content_type.most_common(10)),
-        "by_model": dict(by_model),
-        "warnings": warnings_total,
-    }
-
-
-def print_status(responses_dir: str, tmp_dir: str):
+
+def print_status(responses_dir: str, tmp_dir: str, rebuild_stats: bool = False):
     """Print the pipeline status summary."""
     content_dir = os.path.dirname(responses_dir)
 
@@ -183,8 +139,9 @@ def print_status(responses_dir: str, tmp_dir: str):
     manifest = _load_corpus_manifest()
     total_corpus = sum(len(v) for v in manifest.values())
 
-    # Response counts
-    resp = _count_responses(responses_dir)
+    # Response counts (one directory snapshot shared by all checks below)
+    index = CompletionIndex.load_or_scan(responses_dir)
+    resp = _count_responses(responses_dir, index)
     complete = resp["total"]
     remaining = total_corpus - complete
 
@@ -198,10 +155,10 @@ def print_status(responses_dir: str, tmp_dir: str):
 
     # Per-verse stats
     stats_dir = os.path.join(content_dir, "stats")
-    verse_agg = _aggregate_verse_stats(stats_dir)
+    verse_agg = _aggregate_verse_stats(stats_dir, rebuild=rebuild_stats)
 
     # Stale work dirs
-    stale = _count_stale_work_dirs(tmp_dir, responses_dir)
+    stale = _count_stale_work_dirs(tmp_dir, responses_dir, index)
 
     # Print
     pct = (complete / total_corpus * 100) if total_corpus > 0 else 0
@@ -361,12 +318,14 @@ def main():
     parser.add_argument("--responses-dir", default=None, help="Override responses directory")
     parser.add_argument("--tmp-dir", default="tmp/pipeline", help="Pipeline temp directory")
     parser.add_argument("--audit", action="store_true", help="Re-validate all responses (slow)")
+    parser.add_argument("--rebuild-stats", action="store_true",
+                        help="Recompute stats aggregates from every *.stats.json file")
     args = parser.parse_args()
 
     responses_dir = args.responses_dir or AI_RESPONSES_DIR
     os.environ.setdefault("SOURCE_DATA_DIR", "../ThaqalaynDataSources/")
 
-    print_status(responses_dir, args.tmp_dir)
+    print_status(responses_dir, args.tmp_dir, rebuild_stats=args.rebuild_stats)
 
     if args.audit:
         run_audit(responses_dir)
@@ -10,6 +10,7 @@ from collections import Counter
 from typing import Any, Dict, List, Optional, Tuple
 
 from app.arabic_normalization import strip_tashkeel
+from app.phrase_matcher import PhraseMatcher
 from app.ai_pipeline import (
     VALID_TAGS,
     VALID_CONTENT_TYPES,
@@ -233,49 +234,44 @@ def enrich_explicit_quran_refs(
 def enrich_key_phrases(
     arabic_text: Optional[str],
     phrases_dict: Optional[dict],
+    matcher: Optional[PhraseMatcher] = None,
 ) -> List[dict]:
     """Match known key phrases against the Arabic text of a verse.
 
-    Uses diacritics-insensitive comparison via :func:`strip_tashkeel`.
+    Uses diacritics-insensitive comparison via :func:`strip_tashkeel`. All
+    phrases are found in one pass with a compiled :class:`PhraseMatcher`;
+    callers matching many verses should build it once and pass ``matcher``.
 
     Args:
         arabic_text: The Arabic text to search within.
         phrases_dict: Dictionary with a ``"phrases"`` key containing a list of
             phrase objects, each having ``phrase_ar``, ``phrase_en``, and
             ``category``.
+        matcher: Pre-built matcher for ``phrases_dict``; compiled for this
+            call when omitted.
 
     Returns:
         List of matching phrase dicts (``phrase_ar``, ``phrase_en``,
         ``category``).
     """
-    if not arabic_text or not phrases_dict:
+    if not arabic_text:
         return []
+    if matcher is None:
+        if not phrases_dict:
+            return []
+        matcher = PhraseMatcher.from_dictionary(phrases_dict)
 
-    phrases = phrases_dict.get("phrases")
-    if not phrases or not isinstance(phrases, list):
-        return []
-
-    stripped_text = strip_tashkeel(arabic_text)
     results: List[dict] = []
-
-    for phrase in phrases:
-        if not isinstance(phrase, dict):
-            continue
-        phrase_ar = phrase.get("phrase_ar", "")
-        if not phrase_ar:
-            continue
-
-        # Check both diacritized and stripped versions.
-        if phrase_ar in arabic_text or strip_tashkeel(phrase_ar) in stripped_text:
-            category = phrase.get("category", "")
-            if category and category in VALID_PHRASE_CATEGORIES:
-                results.append(
-                    {
-                        "phrase_ar": phrase_ar,
-                        "phrase_en": phrase.get("phrase_en", ""),
-                        "category": category,
-                    }
-                )
+    for phrase in matcher.find(arabic_text):
+        category = phrase.get("category", "")
+        if category and category in VALID_PHRASE_CATEGORIES:
+            results.append(
+                {
+                    "phrase_ar": phrase["phrase_ar"],
+                    "phrase_en": phrase.get("phrase_en", ""),
+                    "category": category,
+                }
+            )
 
     return results
 
@@ -608,6 +604,7 @@ def programmatic_enrich(
     word_dict: Optional[dict] = None,
     phrases_dict: Optional[dict] = None,
     taxonomy: Optional[dict] = None,
+    phrase_matcher: Optional[PhraseMatcher] = None,
 ) -> dict:
     """Orchestrate all Phase 2 programmatic enrichments.
 
@@ -643,6 +640,8 @@ def programmatic_enrich(
         phrases_dict: Key phrases dictionary (``{"phrases": [...]}``) for
             phrase matching.
         taxonomy: Tag/topic mapping from ``tag_topic_mapping.json``.
+        phrase_matcher: :class:`PhraseMatcher` prebuilt from
+            ``phrases_dict`` (see :func:`enrich_key_phrases`).
 
     Returns:
         A complete result dict with all 12 pipeline fields, ready for
@@ -730,7 +729,7 @@ def programmatic_enrich(
         result["content_type"] = content_type
 
     # --- Key phrases ---
-    matched_phrases = enrich_key_phrases(arabic_text, phrases_dict)
+    matched_phrases = enrich_key_phrases(arabic_text, phrases_dict, matcher=phrase_matcher)
     if "key_phrases" not in result or not result["key_phrases"]:
         result["key_phrases"] = matched_phrases
 
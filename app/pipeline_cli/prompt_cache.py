@@ -0,0 +1,186 @@
+"""Prompt-prefix aware request dispatch and per-prefix cache telemetry.
+
+OpenAI (automatic prompt caching), Anthropic and vLLM on Spark (automatic
+prefix caching) only bill or prefill the leading tokens of a request once
+when a recent request started with the same tokens. Every pipeline request
+starts with a system prompt that is identical for all verses of one phase
+(the few-shot block, when used, is part of it) followed by the
+verse-specific user message, so the cacheable prefix of a request is
+identified by its phase and system prompt: :func:`prefix_key`.
+
+``run_pipeline`` used to dispatch requests through a plain semaphore in
+manifest order, so on phased runs P1, P3 and P4 requests interleaved and
+every prefix's first requests went out in parallel before any of them had
+populated the cache. :class:`PrefixScheduler` replaces that semaphore:
+
+- Warm-up: the first request of a prefix runs alone; the other requests
+  with that prefix wait until it has finished, so they all read its cached
+  prefix instead of each prefilling it.
+- Grouping: a worker slot that frees up goes to the oldest request with the
+  prefix that was dispatched last, keeping one prefix hot at a time.
+  After ``max_run`` such grants in a row (``DEFAULT_PROMPT_CACHE_MAX_RUN``)
+  the oldest request of another prefix goes first, so no phase starves.
+
+:class:`PrefixCacheStats` counts input and cache-read tokens per prefix for
+the live hit rates printed by ``progress_reporter`` and the session record.
+"""
+
+import asyncio
+import hashlib
+import itertools
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+from app.config import DEFAULT_PROMPT_CACHE_MAX_RUN
+
+_NO_WAITER = object()
+
+
+def prefix_key(phase: str, *prompt_parts: str) -> str:
+    """``{phase}:{hash}`` identifying requests that share a cacheable prompt prefix."""
+    digest = hashlib.sha256("\0".join(prompt_parts).encode("utf-8")).hexdigest()
+    return f"{phase}:{digest[:8]}"
+
+
+def prompt_tokens(backend: str, input_tokens: int, cache_read_tokens: int = 0,
+                  cache_creation_tokens: int = 0) -> int:
+    """All prompt tokens of a call, cached or not.
+
+    OpenAI-compatible usage counts cached tokens inside ``input_tokens``;
+    the Claude CLI reports cache reads and writes next to it.
+    """
+    if backend == "claude":
+        return (input_tokens or 0) + (cache_read_tokens or 0) + (cache_creation_tokens or 0)
+    return input_tokens or 0
+
+
+class PrefixScheduler:
+    """Concurrency limiter that orders waiting requests by prompt prefix.
+
+    ``async with scheduler.slot(key):`` holds one of ``workers`` slots for a
+    request with prefix ``key``; ``async with scheduler:`` holds one for a
+    request without a tracked prefix, which is never warmed up or kept hot.
+    ``max_run=0`` turns grouping off (oldest request first); with
+    ``warmup=False`` as well this is a FIFO semaphore.
+    """
+
+    def __init__(self, workers: int, max_run: int = DEFAULT_PROMPT_CACHE_MAX_RUN,
+                 warmup: bool = True):
+        self.workers = workers
+        self.max_run = max_run
+        self.warmup = warmup
+        self._free = workers
+        self._seq = itertools.count()
+        self._waiters: Dict[Optional[str], Deque[Tuple[int, asyncio.Future]]] = {}
+        self._warming: Set[str] = set()
+        self._seen: Set[str] = set()
+        self._hot: Optional[str] = None
+        self._run = 0
+
+    @asynccontextmanager
+    async def slot(self, key: Optional[str] = None) -> AsyncIterator[None]:
+        await self._acquire(key)
+        try:
+            yield
+        finally:
+            self._release(key)
+
+    async def __aenter__(self):
+        await self._acquire(None)
+
+    async def __aexit__(self, *exc):
+        self._release(None)
+
+    def _eligible(self, key: Optional[str]) -> bool:
+        return key is None or key not in self._warming
+
+    async def _acquire(self, key: Optional[str]) -> None:
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, deque()).append((next(self._seq), fut))
+        self._wake()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # A cancelled waiter is dropped by _pick; one that was already
+            # granted a slot must hand it back.
+            if not fut.cancelled():
+                self._release(key)
+            raise
+
+    def _grant(self, key: Optional[str]) -> None:
+        self._free -= 1
+        if key is None:
+            return
+        if self.warmup and key not in self._seen:
+            self._warming.add(key)
+        self._seen.add(key)
+        if key == self._hot:
+            self._run += 1
+        else:
+            self._hot, self._run = key, 1
+
+    def _release(self, key: Optional[str]) -> None:
+        self._free += 1
+        self._warming.discard(key)
+        self._wake()
+
+    def _pick(self) -> object:
+        """Key of the waiter to serve next, or ``_NO_WAITER`` when none is eligible."""
+        heads = {}
+        for key, queue in self._waiters.items():
+            while queue and queue[0][1].done():  # cancelled waiters
+                queue.popleft()
+            if queue and self._eligible(key):
+                heads[key] = queue[0][0]
+        if not heads:
+            return _NO_WAITER
+        if self.max_run and self._hot in heads:
+            if self._run < self.max_run:
+                return self._hot
+            heads = {k: seq for k, seq in heads.items() if k != self._hot} or heads
+        return min(heads, key=heads.get)
+
+    def _wake(self) -> None:
+        while self._free:
+            key = self._pick()
+            if key is _NO_WAITER:
+                return
+            _, fut = self._waiters[key].popleft()
+            self._grant(key)
+            fut.set_result(None)
+
+
+class PrefixCacheStats:
+    """Prompt and cache-read token totals per prompt prefix."""
+
+    def __init__(self):
+        self.prefixes: Dict[str, Dict[str, int]] = {}
+
+    def record(self, key: str, prompt_tokens: int, cache_read_tokens: int, calls: int = 1) -> None:
+        entry = self.prefixes.setdefault(key, {"calls": 0, "prompt_tokens": 0, "cache_read_tokens": 0})
+        entry["calls"] += calls
+        entry["prompt_tokens"] += prompt_tokens or 0
+        entry["cache_read_tokens"] += cache_read_tokens or 0
+
+    def hit_rate(self, key: str) -> Optional[float]:
+        entry = self.prefixes.get(key)
+        if not entry or not entry["prompt_tokens"]:
+            return None
+        return entry["cache_read_tokens"] / entry["prompt_tokens"]
+
+    def snapshot(self) -> Dict[str, dict]:
+        out = {}
+        for key, entry in self.prefixes.items():
+            rate = self.hit_rate(key)
+            out[key] = {**entry, "hit_rate": None if rate is None else round(rate, 4)}
+        return out
+
+    def format(self) -> List[str]:
+        """One ``key rate (calls, cached/prompt tokens)`` string per prefix, in first-seen order."""
+        parts = []
+        for key, entry in self.prefixes.items():
+            rate = self.hit_rate(key)
+            parts.append(f"{key} {'-' if rate is None else f'{rate:.0%}'} "
+                         f"({entry['calls']} calls, {entry['cache_read_tokens']:,}/{entry['prompt_tokens']:,} tok)")
+        return parts
@@ -0,0 +1,279 @@
+"""Segmented, compressed, deduplicated archive of raw LLM responses.
+
+``raw_responses/`` used to get one ``{verse_id}[.{suffix}].raw.txt`` per
+verse per attempt, hundreds of thousands of files that slow every scan and
+backup of the content directory. A :class:`RawArchive` instead appends each
+response to a rotating segment file in the same directory:
+
+- ``raw-{started}-{pid}-{n}.gz``: each record is one gzip member, so a
+  record is read back by seeking to its offset, and the whole segment is
+  still a valid multi-member ``.gz`` (``zcat`` prints every record).
+  Every writer process owns its own segments, so concurrent pipeline
+  workers never interleave bytes; a segment is closed once it passes
+  ``RAW_ARCHIVE_SEGMENT_BYTES``.
+- ``index.jsonl``: one line per ``put`` — verse id, suffix, SHA-256 of the
+  text and the segment/offset/length holding it. Lines are appended with a
+  single ``O_APPEND`` write. Attempts are numbered by index order.
+
+Content is deduplicated by hash: re-archiving an identical response (a
+retry that returned the same text, the same prompt sent twice) adds an
+index line pointing at the stored copy.
+
+``openai_backend.archive_raw_response`` writes here when
+``RAW_ARCHIVE_BACKEND=segments``; ``read_raw_response`` finds a response in
+either layout, taking whichever of the file and the latest entry is newer.
+
+The content directory's ``prompts/`` and ``logs/`` stay as they are: they
+do not grow per verse. ``prompts/`` holds one ``system_prompt_{hash}.txt``
+per distinct system prompt (already content-addressed), and ``logs/`` one
+``{session}.log`` per run plus the append-only ``pipeline.jsonl``.
+
+Usage:
+    python -m app.pipeline_cli.raw_archive pack DIR [--delete]   # fold *.raw.txt into segments
+    python -m app.pipeline_cli.raw_archive show DIR VERSE_ID [--suffix S] [--attempt N]
+    python -m app.pipeline_cli.raw_archive stats DIR
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from app.config import DEFAULT_RAW_ARCHIVE_SEGMENT_BYTES
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.jsonl"
+RAW_SUFFIX = ".raw.txt"
+SEGMENT_PREFIX = "raw-"
+SEGMENT_SUFFIX = ".gz"
+
+
+def segment_bytes() -> int:
+    return int(os.environ.get("RAW_ARCHIVE_SEGMENT_BYTES", DEFAULT_RAW_ARCHIVE_SEGMENT_BYTES))
+
+
+def raw_filename(verse_id: str, suffix: str = "") -> str:
+    """Per-file layout name: ``{verse_id}.{suffix}.raw.txt`` (no suffix: ``{verse_id}.raw.txt``)."""
+    return f"{verse_id}.{suffix}{RAW_SUFFIX}" if suffix else f"{verse_id}{RAW_SUFFIX}"
+
+
+def parse_raw_filename(name: str) -> Optional[Tuple[str, str]]:
+    """``al-kafi_1_1_1_1.phase4.batch0.raw.txt`` → ``("al-kafi_1_1_1_1", "phase4.batch0")``."""
+    if not name.endswith(RAW_SUFFIX):
+        return None
+    verse_id, _, suffix = name[:-len(RAW_SUFFIX)].partition(".")
+    return verse_id, suffix
+
+
+class RawArchive:
+    """Append/read access to one archive directory for this process."""
+
+    def __init__(self, directory: str, max_segment_bytes: Optional[int] = None):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes or segment_bytes()
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, INDEX_FILENAME)
+        self._lock = threading.Lock()
+        self._entries: List[dict] = []
+        self._by_key: Dict[Tuple[str, str], List[dict]] = {}
+        self._by_hash: Dict[str, dict] = {}
+        self._index_pos = 0
+        self._segment: Optional[str] = None
+        self._segment_size = 0
+        self._segment_count = 0
+        self._started = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        self._refresh()
+
+    # -- index ---------------------------------------------------------------
+
+    def _refresh(self) -> None:
+        """Fold index lines appended (by any process) since the last read."""
+        try:
+            with open(self.index_path, "rb") as f:
+                f.seek(self._index_pos)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1  # ignore a line still being written
+        for line in data[:end].splitlines():
+            if line.strip():
+                self._add_entry(json.loads(line))
+        self._index_pos += end
+
+    def _add_entry(self, entry: dict) -> None:
+        attempts = self._by_key.setdefault((entry["verse_id"], entry["suffix"]), [])
+        entry["attempt"] = len(attempts) + 1
+        attempts.append(entry)
+        self._entries.append(entry)
+        self._by_hash.setdefault(entry["sha256"], entry)
+
+    def _append_index(self, entry: dict) -> None:
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        fd = os.open(self.index_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    # -- segments ------------------------------------------------------------
+
+    def _segment_for(self, nbytes: int) -> str:
+        if self._segment is None or (self._segment_size and self._segment_size + nbytes > self.max_segment_bytes):
+            self._segment_count += 1
+            self._segment = f"{SEGMENT_PREFIX}{self._started}-{os.getpid()}-{self._segment_count:04d}{SEGMENT_SUFFIX}"
+            self._segment_size = 0
+        return self._segment
+
+    def put(self, verse_id: str, suffix: str, text: str) -> dict:
+        """Archive ``text`` as the next attempt of ``(verse_id, suffix)``; returns its index entry."""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self._refresh()
+            stored = self._by_hash.get(digest)
+            if stored is not None:
+                location = {k: stored[k] for k in ("segment", "offset", "length")}
+            else:
+                member = gzip.compress(data, compresslevel=6, mtime=0)
+                segment = self._segment_for(len(member))
+                with open(os.path.join(self.directory, segment), "ab") as f:
+                    offset = f.tell()
+                    f.write(member)
+                self._segment_size = offset + len(member)
+                location = {"segment": segment, "offset": offset, "length": len(member)}
+            entry = {
+                "verse_id": verse_id,
+                "suffix": suffix,
+                "sha256": digest,
+                "size": len(data),
+                **location,
+                "archived_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self._append_index(entry)
+            self._refresh()
+        return self._by_key[(verse_id, suffix)][-1]
+
+    # -- reading -------------------------------------------------------------
+
+    def read_entry(self, entry: dict) -> str:
+        with open(os.path.join(self.directory, entry["segment"]), "rb") as f:
+            f.seek(entry["offset"])
+            member = f.read(entry["length"])
+        return gzip.decompress(member).decode("utf-8")
+
+    def get(self, verse_id: str, suffix: str = "", attempt: Optional[int] = None) -> Optional[str]:
+        """Text of ``attempt`` (1-based; default: the latest) of ``(verse_id, suffix)``."""
+        with self._lock:
+            self._refresh()
+            attempts = self._by_key.get((verse_id, suffix), [])
+        if not attempts:
+            return None
+        if attempt is None:
+            return self.read_entry(attempts[-1])
+        if not 1 <= attempt <= len(attempts):
+            return None
+        return self.read_entry(attempts[attempt - 1])
+
+    def attempts(self, verse_id: str, suffix: str = "") -> List[dict]:
+        with self._lock:
+            self._refresh()
+            return list(self._by_key.get((verse_id, suffix), []))
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._refresh()
+            entries = list(self._entries)
+            blobs = list(self._by_hash.values())
+        segments = {e["segment"] for e in blobs}
+        return {
+            "entries": len(entries),
+            "verses": len({e["verse_id"] for e in entries}),
+            "unique_blobs": len(blobs),
+            "segments": len(segments),
+            "raw_bytes": sum(e["size"] for e in entries),
+            "stored_bytes": sum(e["length"] for e in blobs),
+        }
+
+
+_archives: Dict[Tuple[str, int], RawArchive] = {}
+_archives_lock = threading.Lock()
+
+
+def get_archive(directory: str) -> RawArchive:
+    """The process-wide :class:`RawArchive` for ``directory`` (one per pid, so forked workers get their own segments)."""
+    key = (os.path.abspath(directory), os.getpid())
+    with _archives_lock:
+        archive = _archives.get(key)
+        if archive is None:
+            archive = _archives[key] = RawArchive(directory)
+        return archive
+
+
+def has_archive(directory: str) -> bool:
+    return os.path.exists(os.path.join(directory, INDEX_FILENAME))
+
+
+def pack_directory(directory: str, delete: bool = False) -> dict:
+    """Fold the per-file ``*.raw.txt`` responses in ``directory`` into its segments.
+
+    Files are archived oldest first, so attempt order follows write order.
+    With ``delete`` each file is removed once archived.
+    """
+    archive = get_archive(directory)
+    names = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_file() and parse_raw_filename(entry.name):
+                names.append((entry.stat().st_mtime, entry.name))
+    packed = 0
+    for _, name in sorted(names):
+        verse_id, suffix = parse_raw_filename(name)
+        path = os.path.join(directory, name)
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        if text:
+            archive.put(verse_id, suffix, text)
+        if delete:
+            os.remove(path)
+        packed += 1
+    logger.info("Packed %d raw response files into %s", packed, directory)
+    return {"packed": packed, **archive.stats()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Segmented raw LLM response archive")
+    sub = parser.add_subparsers(dest="command", required=True)
+    pack = sub.add_parser("pack", help="Archive the *.raw.txt files of a directory into segments")
+    pack.add_argument("directory")
+    pack.add_argument("--delete", action="store_true", help="Remove each file once archived")
+    show = sub.add_parser("show", help="Print an archived response")
+    show.add_argument("directory")
+    show.add_argument("verse_id")
+    show.add_argument("--suffix", default="")
+    show.add_argument("--attempt", type=int, default=None, help="1-based; default: latest")
+    stats = sub.add_parser("stats", help="Entry, dedup and compression counts")
+    stats.add_argument("directory")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "pack":
+        print(json.dumps(pack_directory(args.directory, delete=args.delete), indent=2))
+    elif args.command == "show":
+        text = get_archive(args.directory).get(args.verse_id, args.suffix, args.attempt)
+        if text is None:
+            print(f"Not archived: {args.verse_id} {args.suffix}".rstrip(), file=sys.stderr)
+            sys.exit(1)
+        sys.stdout.write(text)
+    else:
+        print(json.dumps(get_archive(args.directory).stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
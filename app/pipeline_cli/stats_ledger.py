@@ -0,0 +1,219 @@
+"""Append-only stats ledger with pre-aggregated counters.
+
+``save_verse_stats`` appends one compact line per verse completion to
+``stats_ledger.jsonl`` next to ``stats/``. Each line carries the verse's new summary and the
+summary it replaces (from the previous ``.stats.json``), so aggregates can be
+maintained as running deltas instead of re-parsing every stats file.
+
+``stats_aggregate.json`` (also next to ``stats/``) caches the folded counters
+together with the ledger byte offset they cover. A status query loads the
+snapshot and folds only the ledger lines appended since, which keeps
+``pipeline_status`` cheap enough to poll during a run.
+
+Neither file lives inside ``stats/``: the completion index keys its
+freshness on that directory's mtime, which creating the ledger or replacing
+the aggregate on every status poll would otherwise bump.
+
+If the snapshot is missing (first use, or stats written by older code) the
+aggregate is rebuilt once from the ``*.stats.json`` files.
+"""
+
+import json
+import logging
+import os
+from collections import Counter
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+LEDGER_FILENAME = "stats_ledger.jsonl"
+AGGREGATE_FILENAME = "stats_aggregate.json"
+AGGREGATE_VERSION = 1
+
+
+def summarize_stats(data: dict) -> dict:
+    """Reduce a full ``.stats.json`` payload to the fields that are aggregated."""
+    gen = data.get("generation", {})
+    fix = data.get("fix", {})
+    q = data.get("quality", {})
+    fix_needed = bool(fix.get("needed"))
+    return {
+        "status": data.get("status", "unknown"),
+        "model": data.get("model", "unknown"),
+        "content_type": data.get("content", {}).get("content_type", ""),
+        "cost": gen.get("cost_usd", 0),
+        "tokens": gen.get("output_tokens", 0),
+        "gen_time": gen.get("elapsed_s", 0),
+        "fix_cost": fix.get("cost_usd", 0) if fix_needed else 0,
+        "fix_time": fix.get("elapsed_s", 0) if fix_needed else 0,
+        "warnings_high": q.get("warnings_high", 0),
+        "warnings_medium": q.get("warnings_medium", 0),
+        "warnings_low": q.get("warnings_low", 0),
+    }
+
+
+class StatsAggregate:
+    """Running totals over per-verse stats summaries."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_cost = 0.0
+        self.total_fix_cost = 0.0
+        self.total_tokens = 0
+        self.total_gen_time = 0.0
+        self.total_fix_time = 0.0
+        self.by_status: Counter = Counter()
+        self.by_content_type: Counter = Counter()
+        self.by_model: Counter = Counter()
+        self.warnings = {"high": 0, "medium": 0, "low": 0}
+
+    def apply(self, summary: dict, sign: int = 1) -> None:
+        """Add (sign=1) or remove (sign=-1) one verse's contribution."""
+        self.count += sign
+        self.total_cost += sign * summary.get("cost", 0)
+        self.total_fix_cost += sign * summary.get("fix_cost", 0)
+        self.total_tokens += sign * summary.get("tokens", 0)
+        self.total_gen_time += sign * summary.get("gen_time", 0)
+        self.total_fix_time += sign * summary.get("fix_time", 0)
+        self.by_status[summary.get("status", "unknown")] += sign
+        self.by_model[summary.get("model", "unknown")] += sign
+        if summary.get("content_type"):
+            self.by_content_type[summary["content_type"]] += sign
+        for level in ("high", "medium", "low"):
+            self.warnings[level] += sign * summary.get(f"warnings_{level}", 0)
+
+    def apply_record(self, record: dict) -> None:
+        """Fold one ledger line: retract the replaced summary, add the new one."""
+        if record.get("prev"):
+            self.apply(record["prev"], -1)
+        self.apply(record["new"], 1)
+
+    def to_dict(self) -> dict:
+        """Same shape ``pipeline_status`` has always printed from."""
+        if not self.count:
+            return {}
+        return {
+            "count": self.count,
+            "total_cost": self.total_cost,
+            "total_fix_cost": self.total_fix_cost,
+            "total_tokens": self.total_tokens,
+            "total_gen_time": self.total_gen_time,
+            "total_fix_time": self.total_fix_time,
+            "by_status": {k: v for k, v in self.by_status.items() if v},
+            "by_content_type": dict((+self.by_content_type).most_common(10)),
+            "by_model": {k: v for k, v in self.by_model.items() if v},
+            "warnings": dict(self.warnings),
+        }
+
+    def to_state(self) -> dict:
+        state = self.to_dict() or {"count": 0}
+        state["by_content_type"] = dict(+self.by_content_type)
+        return state
+
+    @classmethod
+    def from_state(cls, state: dict) -> "StatsAggregate":
+        agg = cls()
+        agg.count = state.get("count", 0)
+        agg.total_cost = state.get("total_cost", 0.0)
+        agg.total_fix_cost = state.get("total_fix_cost", 0.0)
+        agg.total_tokens = state.get("total_tokens", 0)
+        agg.total_gen_time = state.get("total_gen_time", 0.0)
+        agg.total_fix_time = state.get("total_fix_time", 0.0)
+        agg.by_status = Counter(state.get("by_status", {}))
+        agg.by_content_type = Counter(state.get("by_content_type", {}))
+        agg.by_model = Counter(state.get("by_model", {}))
+        agg.warnings.update(state.get("warnings", {}))
+        return agg
+
+
+class StatsLedger:
+    """Ledger + aggregate snapshot kept next to a pipeline stats/ directory."""
+
+    def __init__(self, stats_dir: str):
+        self.stats_dir = stats_dir
+        content_dir = os.path.dirname(os.path.normpath(stats_dir))
+        self.ledger_path = os.path.join(content_dir, LEDGER_FILENAME)
+        self.aggregate_path = os.path.join(content_dir, AGGREGATE_FILENAME)
+
+    def append(self, verse_id: str, new_data: dict, prev_data: Optional[dict] = None) -> None:
+        """Record one verse's stats update (called from ``save_verse_stats``)."""
+        record = {
+            "verse_id": verse_id,
+            "new": summarize_stats(new_data),
+            "prev": summarize_stats(prev_data) if prev_data else None,
+        }
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with open(self.ledger_path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def aggregate(self, save: bool = True) -> dict:
+        """Return aggregated verse stats, folding only unseen ledger lines."""
+        agg, offset = self._load_snapshot()
+        if agg is None:
+            agg, offset = self.rebuild()
+        else:
+            offset = self._fold_ledger(agg, offset)
+            if save:
+                self._save_snapshot(agg, offset)
+        return agg.to_dict()
+
+    def rebuild(self) -> tuple:
+        """Recompute the aggregate from every ``*.stats.json`` (one full scan)."""
+        agg = StatsAggregate()
+        if os.path.isdir(self.stats_dir):
+            for fname in os.listdir(self.stats_dir):
+                if not fname.endswith(".stats.json"):
+                    continue
+                try:
+                    with open(os.path.join(self.stats_dir, fname), "r", encoding="utf-8") as f:
+                        agg.apply(summarize_stats(json.load(f)))
+                except (json.JSONDecodeError, OSError):
+                    continue
+        offset = self._ledger_size()
+        if agg.count or offset:
+            self._save_snapshot(agg, offset)
+        return agg, offset
+
+    def _ledger_size(self) -> int:
+        try:
+            return os.path.getsize(self.ledger_path)
+        except OSError:
+            return 0
+
+    def _fold_ledger(self, agg: StatsAggregate, offset: int) -> int:
+        size = self._ledger_size()
+        if size <= offset:
+            return offset
+        with open(self.ledger_path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # partially written line; pick it up next time
+                offset += len(raw)
+                try:
+                    agg.apply_record(json.loads(raw))
+                except (json.JSONDecodeError, KeyError):
+                    logger.warning("Skipping malformed ledger line at %d", offset)
+        return offset
+
+    def _load_snapshot(self):
+        if not os.path.exists(self.aggregate_path):
+            return None, 0
+        try:
+            with open(self.aggregate_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return None, 0
+        if data.get("version") != AGGREGATE_VERSION or data.get("ledger_offset", 0) > self._ledger_size():
+            return None, 0
+        return StatsAggregate.from_state(data.get("aggregate", {})), data.get("ledger_offset", 0)
+
+    def _save_snapshot(self, agg: StatsAggregate, offset: int) -> None:
+        tmp_path = self.aggregate_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": AGGREGATE_VERSION,
+                "ledger_offset": offset,
+                "aggregate": agg.to_state(),
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.aggregate_path)
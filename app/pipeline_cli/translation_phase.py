@@ -502,6 +502,15 @@ async def _translate_chunks_per_language(
     return result
 
 
+def translation_system_prompt(model: str) -> str:
+    """System prompt shared by every call ``translate_chunks`` makes for ``model``."""
+    from app.pipeline_cli.openai_backend import is_spark_model
+
+    if is_spark_model(model):
+        return PER_LANG_SYSTEM_PROMPT
+    return _build_batch_prompt([], "", "", "", False, 0)[0]
+
+
 async def translate_chunks(
     result: dict,
     model: str = "gpt-5-mini",
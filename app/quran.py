@@ -4,8 +4,6 @@ import os
 import xml.etree.ElementTree
 from typing import Dict, List
 
-import fastapi
-
 # make sure all SQL Alchemy models are imported before initializing DB
 # otherwise, SQL Alchemy might fail to initialize relationships properly
 # for more details: https://github.com/tiangolo/full-stack-fastapi-postgresql/issues/28
@@ -210,7 +208,7 @@ def build_quran() -> Chapter:
 def init_quran():
 	quran = build_quran()
 	insert_chapter(quran) 
-	write_file("/books/complete/quran", fastapi.encoders.jsonable_encoder(quran))
+	write_file("/books/complete/quran", quran)
 	from app.lib_index import collect_indexes, update_index_files
 	index_maps = collect_indexes(quran)
 	update_index_files(index_maps)
@@ -0,0 +1,208 @@
+"""Stage timing, memory and I/O instrumentation for a data generation run.
+
+``main_add.init`` runs each pipeline stage inside :meth:`RunProfiler.stage`,
+which records per stage:
+
+- wall time and CPU time (this process plus any pool workers it waited on),
+- growth of the process's peak RSS (``ru_maxrss``; ``None`` where the
+  ``resource`` module is unavailable, i.e. Windows),
+- files read/written and bytes read/written, counted by the
+  :func:`record_read` / :func:`record_write` hooks in ``lib_db.load_chapter``,
+  ``lib_db.load_json`` and ``lib_db.write_file``.
+
+Stages may nest; a stage's counters include its children's. I/O done in
+pool worker processes is not counted (their CPU time is).
+
+At the end of the run :meth:`RunProfiler.finish` logs a table and, when set
+in the environment, writes:
+
+- ``RUN_REPORT``: a JSON report (stages, totals and the per-kind output
+  sizes from ``json_output.output_stats``) for tracking regen performance
+  across releases;
+- ``RUN_TRACE``: a Chrome trace (open in ``chrome://tracing`` or Perfetto)
+  with one slice per stage.
+"""
+
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """High-water mark of this process's resident set size."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def cpu_seconds() -> float:
+    """CPU time of this process and of the child processes it has waited for."""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+class IOCounters:
+    """Running totals of files and bytes read and written."""
+
+    FIELDS = ("files_read", "bytes_read", "files_written", "bytes_written")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        for name in self.FIELDS:
+            setattr(self, name, 0)
+
+    def snapshot(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class RunProfiler:
+    """Collects one record per stage of a run."""
+
+    def __init__(self):
+        self.io = IOCounters()
+        self.reset()
+
+    def reset(self) -> None:
+        self.io.reset()
+        self.stages: List[dict] = []
+        self._depth = 0
+        self._started_at = datetime.now(timezone.utc)
+        self._t0 = time.perf_counter()
+        self._cpu0 = cpu_seconds()
+        self._rss0 = peak_rss_bytes()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[dict]:
+        """Time the enclosed block as stage ``name``; yields its record."""
+        record = {"name": name, "depth": self._depth}
+        self.stages.append(record)
+        io_start = self.io.snapshot()
+        rss_start = peak_rss_bytes()
+        cpu_start = cpu_seconds()
+        start = time.perf_counter()
+        self._depth += 1
+        try:
+            yield record
+        finally:
+            self._depth -= 1
+            record["start_s"] = round(start - self._t0, 6)
+            record["wall_s"] = round(time.perf_counter() - start, 6)
+            record["cpu_s"] = round(cpu_seconds() - cpu_start, 6)
+            rss_end = peak_rss_bytes()
+            record["peak_rss_bytes"] = rss_end
+            record["peak_rss_delta_bytes"] = None if rss_start is None else rss_end - rss_start
+            io_end = self.io.snapshot()
+            for field in IOCounters.FIELDS:
+                record[field] = io_end[field] - io_start[field]
+
+    def report(self, extra: Optional[dict] = None) -> dict:
+        """The run report: totals, stage records and any ``extra`` sections."""
+        rss = peak_rss_bytes()
+        report = {
+            "started_at": self._started_at.isoformat(),
+            "python": platform.python_version(),
+            "platform": sys.platform,
+            "wall_s": round(time.perf_counter() - self._t0, 6),
+            "cpu_s": round(cpu_seconds() - self._cpu0, 6),
+            "peak_rss_bytes": rss,
+            "peak_rss_delta_bytes": None if self._rss0 is None else rss - self._rss0,
+            **self.io.snapshot(),
+            "stages": [dict(s) for s in self.stages],
+        }
+        if extra:
+            report.update(extra)
+        return report
+
+    def chrome_trace(self) -> dict:
+        """Stages as Chrome trace-event "complete" slices (microseconds)."""
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                   "args": {"name": "main_add"}}]
+        for s in self.stages:
+            if "wall_s" not in s:
+                continue
+            events.append({
+                "name": s["name"],
+                "cat": "stage",
+                "ph": "X",
+                "pid": pid,
+                "tid": 0,
+                "ts": round(s["start_s"] * 1e6),
+                "dur": round(s["wall_s"] * 1e6),
+                "args": {k: v for k, v in s.items() if k not in ("name", "depth", "start_s", "wall_s")},
+            })
+            if s["peak_rss_bytes"] is not None:
+                events.append({
+                    "name": "peak RSS (MB)", "ph": "C", "pid": pid, "tid": 0,
+                    "ts": round((s["start_s"] + s["wall_s"]) * 1e6),
+                    "args": {"peak_rss": round(s["peak_rss_bytes"] / 1e6, 1)},
+                })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def log_summary(self) -> None:
+        if not self.stages:
+            return
+        logger.info("Run profile:")
+        logger.info("  %-28s %9s %9s %9s %8s %8s %10s", "stage", "wall s", "cpu s",
+                    "+rss MB", "read", "written", "out MB")
+        for s in self.stages:
+            if "wall_s" not in s:
+                continue
+            rss = s["peak_rss_delta_bytes"]
+            logger.info("  %-28s %9.2f %9.2f %9s %8d %8d %10.1f",
+                        "  " * s["depth"] + s["name"], s["wall_s"], s["cpu_s"],
+                        "-" if rss is None else f"{rss / 1e6:.1f}",
+                        s["files_read"], s["files_written"], s["bytes_written"] / 1e6)
+
+    def finish(self, extra: Optional[dict] = None) -> dict:
+        """Log the summary and write ``RUN_REPORT`` / ``RUN_TRACE`` if set."""
+        self.log_summary()
+        report = self.report(extra)
+        report_path = os.environ.get("RUN_REPORT")
+        if report_path:
+            _write(report_path, report)
+            logger.info("Wrote run report %s", report_path)
+        trace_path = os.environ.get("RUN_TRACE")
+        if trace_path:
+            _write(trace_path, self.chrome_trace())
+            logger.info("Wrote run trace %s", trace_path)
+        return report
+
+
+def _write(path: str, obj: dict) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2)
+
+
+profiler = RunProfiler()
+stage = profiler.stage
+
+
+def record_read(nbytes: int) -> None:
+    profiler.io.files_read += 1
+    profiler.io.bytes_read += nbytes
+
+
+def record_write(nbytes: int) -> None:
+    profiler.io.files_written += 1
+    profiler.io.bytes_written += nbytes
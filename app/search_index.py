@@ -3,6 +3,7 @@
 Reads ThaqalaynData JSON files and produces:
 1. titles.json - lightweight index of all book/chapter/surah titles for instant search
 2. {book-slug}-docs.json - full-text search documents per book (Arabic + English translations)
+3. shards/{book-slug}/ - sharded inverted index over those docs (see app.search_shards)
 
 All book directories under books/ are automatically discovered and indexed.
 
@@ -13,14 +14,17 @@ normalized version is stored in a separate field for search matching.
 Output is written to ThaqalaynData/index/search/.
 """
 
+import argparse
 import json
 import logging
 import os
 import re
 import sys
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from app.arabic_normalization import normalize_arabic
+from app.search_shards import MANIFEST_FILENAME, SHARDS_DIRNAME, book_shard_dir, build_book_shards
+from app.verse_pack import key_relpath, open_pack, pack_path
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -30,6 +34,10 @@ HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
 # Footnote reference pattern like [1], [2] etc.
 FOOTNOTE_PATTERN = re.compile(r"\[\d+\]")
 
+# Per-book fingerprints of the last run, for skipping unchanged books.
+SEARCH_STATE_FILE = "search-state.json"
+SEARCH_STATE_VERSION = 2
+
 
 def strip_html(text: str) -> str:
     """Remove HTML tags and footnote references from text."""
@@ -134,7 +142,39 @@ def build_titles_index(data_dir: str) -> List[dict]:
     return docs
 
 
-def extract_verse_docs(chapter_json: dict, book_slug: str) -> List[dict]:
+def _english_text(translations: dict, default_en_trans: str) -> str:
+    """Default English translation, falling back to the first ``en.*`` one."""
+    if default_en_trans and default_en_trans in translations:
+        return " ".join(translations[default_en_trans])
+    for tid, ttext in translations.items():
+        if tid.startswith("en.") and tid != "en.transliteration":
+            return " ".join(ttext)
+    return ""
+
+
+def _verse_doc(verse: dict, chapter_title_en: str, default_en_trans: str) -> dict:
+    """Build one compact search document from a verse dict."""
+    # Arabic text (normalized for search)
+    text_parts = verse.get("text", [])
+    text_ar = " ".join(text_parts) if text_parts else ""
+
+    # English translation - use default, fallback to first en.* translation
+    text_en = strip_html(_english_text(verse.get("translations", {}), default_en_trans))
+
+    return {
+        "p": verse["path"],
+        "t": chapter_title_en,
+        "ar": normalize_arabic(text_ar) if text_ar.strip() else "",
+        "en": text_en.strip(),
+        "i": verse.get("local_index", 0),
+    }
+
+
+def extract_verse_docs(
+    chapter_json: dict,
+    book_slug: str,
+    verse_details: Optional[Dict[str, dict]] = None,
+) -> List[dict]:
     """Extract search documents from a verse_list chapter JSON.
 
     Each verse becomes a search document with:
@@ -144,12 +184,25 @@ def extract_verse_docs(chapter_json: dict, book_slug: str) -> List[dict]:
     - en: primary English translation for English search (HTML stripped)
     - i: local_index (verse/hadith number within chapter)
 
+    Legacy chapters carry their verses inline in ``data.verses``. Shell
+    chapters (see ``lib_db.insert_chapter_content``) only carry
+    ``data.verse_refs``; each ref is joined to its verse via
+    ``verse_details`` (verse path → verse dict from its verse_detail file),
+    and headings kept ``inline`` in the ref are used as-is.
+
     The original (diacritized) Arabic text is NOT stored here -- it's
     available from the verse data files and would double the index size.
     The chapter path and book slug are derivable from the verse path.
     """
     data = chapter_json.get("data", {})
-    verses = data.get("verses", [])
+    verses = data.get("verses")
+    if not verses:
+        verses = []
+        for ref in data.get("verse_refs") or []:
+            if "inline" in ref:
+                verses.append(ref["inline"])
+            elif verse_details and ref.get("path") in verse_details:
+                verses.append(verse_details[ref["path"]])
     if not verses:
         return []
 
@@ -162,74 +215,126 @@ def extract_verse_docs(chapter_json: dict, book_slug: str) -> List[dict]:
 
     docs = []
     for verse in verses:
-        verse_path = verse.get("path", "")
-        if not verse_path:
+        if not verse.get("path"):
             continue
+        docs.append(_verse_doc(verse, chapter_title_en, default_en_trans))
 
-        # Arabic text (normalized for search)
-        text_parts = verse.get("text", [])
-        text_ar = " ".join(text_parts) if text_parts else ""
-
-        # English translation - use default, fallback to first en.* translation
-        translations = verse.get("translations", {})
-        text_en = ""
-        if default_en_trans and default_en_trans in translations:
-            text_en = " ".join(translations[default_en_trans])
-        else:
-            for tid, ttext in translations.items():
-                if tid.startswith("en.") and tid != "en.transliteration":
-                    text_en = " ".join(ttext)
-                    break
-
-        text_en = strip_html(text_en)
+    return docs
 
-        doc = {
-            "p": verse_path,
-            "t": chapter_title_en,
-            "ar": normalize_arabic(text_ar) if text_ar.strip() else "",
-            "en": text_en.strip(),
-            "i": verse.get("local_index", 0),
-        }
-        docs.append(doc)
 
-    return docs
+def _walk_book_files(book_dir: str) -> Iterator[str]:
+    """Yield a book's JSON files in a stable (sorted) order."""
+    for root, dirs, files in os.walk(book_dir):
+        dirs.sort()
+        for filename in sorted(files):
+            if filename.endswith(".json"):
+                yield os.path.join(root, filename)
 
 
 def build_book_docs(data_dir: str, book_slug: str) -> List[dict]:
     """Build full-text search documents for a book by walking its JSON files.
 
-    Finds all verse_list JSON files for the given book and extracts
-    search documents from each.
+    Every file is read once: verse_list chapters (shell or inline) are kept
+    and verse_detail files are reduced to the fields a search document
+    needs, then the shells are joined to their verse details.
     """
     book_dir = os.path.join(data_dir, "books", book_slug)
     if not os.path.isdir(book_dir):
         logger.warning("Book directory not found: %s", book_dir)
         return []
 
-    docs = []
-    file_count = 0
+    chapters: List[dict] = []
+    verse_details: Dict[str, dict] = {}
+
+    def add_detail(doc: dict) -> None:
+        verse = doc.get("data", {}).get("verse") or {}
+        if verse.get("path"):
+            verse_details[verse["path"]] = {
+                key: verse[key]
+                for key in ("path", "text", "translations", "local_index")
+                if key in verse
+            }
+
+    # Verse details from the book's pack (app.verse_pack), if it has one.
+    # A detail file on disk is newer than its pack record and replaces it,
+    # so only records without a file are read from the pack.
+    filepaths = list(_walk_book_files(book_dir))
+    pack = open_pack(data_dir, book_slug)
+    if pack is not None:
+        on_disk = set(filepaths)
+        with pack:
+            for key, data in pack.items(base_only=True):
+                if os.path.join(data_dir, "books", key_relpath(key)) not in on_disk:
+                    add_detail(json.loads(data))
+
+    for filepath in filepaths:
+        if os.path.basename(filepath).count(".") > 1:
+            continue
+        doc = load_json_file(filepath)
+        if not doc:
+            continue
+        kind = doc.get("kind")
+        if kind == "verse_list":
+            chapters.append(doc)
+        elif kind == "verse_detail":
+            add_detail(doc)
 
-    for root, _dirs, files in os.walk(book_dir):
-        for filename in files:
-            if not filename.endswith(".json"):
-                continue
-            filepath = os.path.join(root, filename)
-            chapter_json = load_json_file(filepath)
-            if not chapter_json:
-                continue
-            if chapter_json.get("kind") != "verse_list":
-                continue
-            file_count += 1
-            verse_docs = extract_verse_docs(chapter_json, book_slug)
-            docs.extend(verse_docs)
+    docs = []
+    for chapter_json in chapters:
+        docs.extend(extract_verse_docs(chapter_json, book_slug, verse_details))
 
     logger.info(
-        "Built %d search docs from %d verse_list files for %s",
-        len(docs), file_count, book_slug,
+        "Built %d search docs from %d verse_list files (%d verse details) for %s",
+        len(docs), len(chapters), len(verse_details), book_slug,
     )
     return docs
 
 
+def book_fingerprint(data_dir: str, book_slug: str) -> List[int]:
+    """Return ``[file_count, total_size, max_mtime_ns]`` for a book's JSON files
+    (and its verse pack, if any).
+
+    Computed from ``stat`` only, so unchanged books can be skipped without
+    parsing any of their files.
+    """
+    count = total = latest = 0
+    paths = list(_walk_book_files(os.path.join(data_dir, "books", book_slug)))
+    if os.path.exists(pack_path(data_dir, book_slug)):
+        paths.append(pack_path(data_dir, book_slug))
+    for filepath in paths:
+        st = os.stat(filepath)
+        count += 1
+        total += st.st_size
+        latest = max(latest, st.st_mtime_ns)
+    return [count, total, latest]
+
+
+def _build_book_task(args) -> Tuple[str, int, List[int]]:
+    """Build and write one book's docs and shards; return ``(slug, doc_count, fingerprint)``."""
+    data_dir, book_slug, fingerprint = args
+    docs = build_book_docs(data_dir, book_slug)
+    write_search_json(data_dir, f"{book_slug}-docs.json", docs)
+    build_book_shards(data_dir, book_slug, docs)
+    return book_slug, len(docs), fingerprint
+
+
+def _load_search_state(data_dir: str) -> dict:
+    state_path = os.path.join(data_dir, "index", "search", SEARCH_STATE_FILE)
+    state = load_json_file(state_path) if os.path.exists(state_path) else None
+    if not state or state.get("version") != SEARCH_STATE_VERSION:
+        return {"version": SEARCH_STATE_VERSION, "books": {}}
+    return state
+
+
+def _save_search_state(data_dir: str, state: dict) -> None:
+    search_dir = os.path.join(data_dir, "index", "search")
+    os.makedirs(search_dir, exist_ok=True)
+    tmp_path = os.path.join(search_dir, SEARCH_STATE_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, os.path.join(search_dir, SEARCH_STATE_FILE))
+
+
 def discover_book_slugs(data_dir: str) -> List[str]:
     """Discover all book slugs by listing directories under books/.
 
@@ -264,9 +369,19 @@ def write_search_json(data_dir: str, filename: str, docs: list) -> str:
     return filepath
 
 
-def generate_search_indexes(data_dir: Optional[str] = None) -> dict:
+def generate_search_indexes(
+    data_dir: Optional[str] = None,
+    workers: int = 1,
+    force: bool = False,
+) -> dict:
     """Generate all search index document files.
 
+    Per-book doc files are only rebuilt when the book's files changed since
+    the last run (see :func:`book_fingerprint`; state is kept in
+    ``index/search/search-state.json``) unless ``force`` is set. With
+    ``workers`` > 1 books are built in parallel processes, each writing its
+    doc file as soon as it is done.
+
     Returns a dict mapping filename to document count.
     """
     if data_dir is None:
@@ -281,13 +396,39 @@ def generate_search_indexes(data_dir: Optional[str] = None) -> dict:
 
     # 2. Per-book full-text indexes (lazy-loaded on demand)
     book_slugs = discover_book_slugs(data_dir)
-    book_files: Dict[str, str] = {}
+    book_files: Dict[str, str] = {slug: f"{slug}-docs.json" for slug in book_slugs}
+    search_dir = os.path.join(data_dir, "index", "search")
+    state = _load_search_state(data_dir)
+    previous = state["books"]
+    state["books"] = {}
+
+    tasks = []
     for book_slug in book_slugs:
-        filename = f"{book_slug}-docs.json"
-        docs = build_book_docs(data_dir, book_slug)
-        write_search_json(data_dir, filename, docs)
-        results[filename] = len(docs)
-        book_files[book_slug] = filename
+        fingerprint = book_fingerprint(data_dir, book_slug)
+        entry = previous.get(book_slug)
+        if (not force and entry and entry.get("fingerprint") == fingerprint
+                and os.path.exists(os.path.join(search_dir, book_files[book_slug]))
+                and os.path.exists(os.path.join(book_shard_dir(data_dir, book_slug), MANIFEST_FILENAME))):
+            state["books"][book_slug] = entry
+            logger.info("Search docs for %s unchanged, skipping", book_slug)
+            continue
+        tasks.append((data_dir, book_slug, fingerprint))
+
+    if workers > 1 and len(tasks) > 1:
+        import multiprocessing
+        with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+            for book_slug, count, fingerprint in pool.imap_unordered(_build_book_task, tasks):
+                state["books"][book_slug] = {"fingerprint": fingerprint, "docs": count}
+                _save_search_state(data_dir, state)
+    else:
+        for task in tasks:
+            book_slug, count, fingerprint = _build_book_task(task)
+            state["books"][book_slug] = {"fingerprint": fingerprint, "docs": count}
+            _save_search_state(data_dir, state)
+    _save_search_state(data_dir, state)
+
+    for book_slug in book_slugs:
+        results[book_files[book_slug]] = state["books"][book_slug]["docs"]
 
     # 3. Write metadata file documenting the schema for the frontend
     metadata = {
@@ -318,6 +459,19 @@ def generate_search_indexes(data_dir: Optional[str] = None) -> dict:
                 },
                 "orama_schema": {"p": "string", "t": "string", "ar": "string", "en": "string", "i": "number"},
             },
+            "shards": {
+                "dir": SHARDS_DIRNAME,
+                "description": "Per-book inverted index over the book docs, fetched per query term",
+                "layout": "shards/{book}/manifest.json; shards/{book}/{field}/{shard:03d}.json",
+                "shard": "crc32(utf-8 term) % manifest.fields[field].shards",
+                "entry": "t[term] = [doc_id_deltas, term_freqs]; doc ids index into {book}-docs.json",
+                "tokenizer": "ar: normalize_arabic then /[\\p{L}\\p{N}_]+/u runs; en: lowercase then /[\\p{L}\\p{N}_]+/u runs",
+            },
+            "roots": {
+                "file_pattern": "{book}-roots.json",
+                "description": "Lemma and root postings from AI word analyses (built with --roots)",
+                "entry": "lemma[normalized lex] / root[dotted root] = doc_id_deltas into {book}-docs.json",
+            },
         },
         "notes": {
             "arabic_search": "Use 'arn' field for titles and 'ar' field for verses. Text is normalized: diacritics stripped, letter forms unified (hamza->alef, teh marbuta->heh, alef maksura->yeh), tatweel removed.",
@@ -335,9 +489,25 @@ def main():
     if sys.platform == "win32":
         sys.stdout.reconfigure(encoding="utf-8")
 
+    parser = argparse.ArgumentParser(description="Generate Orama search index documents")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Build books in N parallel processes (default: 1)")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild every book, even if its files are unchanged")
+    parser.add_argument("--roots", action="store_true",
+                        help="Also build root/lemma postings from AI word analyses (needs CAMeL Tools)")
+    parser.add_argument("--morph-cache", default=os.path.join("tmp", "morphology_cache.sqlite"),
+                        help="Persistent morphology cache for --roots")
+    args = parser.parse_args()
+
     data_dir = get_data_dir()
     logger.info("Generating search indexes from %s", data_dir)
-    results = generate_search_indexes(data_dir)
+    results = generate_search_indexes(data_dir, workers=args.workers, force=args.force)
+    if args.roots:
+        from app.search_roots import build_root_indexes
+        results.update(build_root_indexes(
+            data_dir, discover_book_slugs(data_dir), morph_cache=args.morph_cache,
+        ))
 
     print("\nSearch index generation complete:")
     for filename, count in results.items():
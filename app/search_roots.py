@@ -0,0 +1,226 @@
+"""Root- and lemma-level search postings built from the AI word analyses.
+
+Search docs carry only ``normalize_arabic`` surface text, so a query for a
+lemma or root misses its inflected and cliticized forms. This stage reads
+each verse's words from its AI response (``word_analysis`` for v3,
+``word_tags`` or ``chunks[].arabic_text`` for v4), analyzes each distinct
+surface once with :mod:`app.words.morphology` (memoized, and persisted when
+a morphology cache path is given), and writes per book:
+
+    index/search/{book}-roots.json
+    {"version": 1, "docs_file": "{book}-docs.json", "doc_count": N, "verses": M,
+     "lemma": {lemma: doc_id_deltas}, "root": {root: doc_id_deltas}}
+
+Doc ids are positions in ``{book}-docs.json`` (as in the search shards).
+Lemma keys are ``normalize_arabic``-ed CAMeL ``lex`` values; root keys keep
+CAMeL's dotted form (``ق.و.ل``), as on the word pages. Clients look keys
+up directly — no morphology runs at query time.
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.arabic_normalization import normalize_arabic, strip_tashkeel
+from app.search_shards import delta_decode, delta_encode
+
+logger = logging.getLogger(__name__)
+
+ROOTS_VERSION = 1
+
+# Function-word POS tags (Phase 1 tag set) that are never indexed.
+_FUNCTION_POS = frozenset({
+    "PREP", "CONJ", "PRON", "DET", "PART", "INTJ", "REL", "DEM", "NEG", "COND", "INTERR",
+})
+
+_NON_LETTERS = re.compile(r"[^\u0621-\u064A\u064B-\u0670\u0671-\u06D3]+")
+_ARABIC_LETTER = re.compile(r"[\u0621-\u064A]")
+
+
+def verse_words(result: dict) -> List[Tuple[str, Optional[str]]]:
+    """Return ``(word, pos)`` pairs for one AI result (v3 or v4)."""
+    words = result.get("word_analysis")
+    if isinstance(words, list) and words:
+        return [(w.get("word", ""), w.get("pos")) for w in words if isinstance(w, dict)]
+    tags = result.get("word_tags")
+    if isinstance(tags, list) and tags:
+        return [(t[0], t[1] if len(t) > 1 else None)
+                for t in tags if isinstance(t, list) and t]
+    out: List[Tuple[str, Optional[str]]] = []
+    for chunk in result.get("chunks") or []:
+        text = chunk.get("arabic_text") if isinstance(chunk, dict) else None
+        if text:
+            out.extend((word, None) for word in text.split())
+    return out
+
+
+def _clean_surface(word: str) -> str:
+    """Drop punctuation/digits around a word, keeping letters and tashkeel."""
+    return _NON_LETTERS.sub("", word or "")
+
+
+class RootKeyer:
+    """Map surface forms to ``(lemma_key, root)``, analyzing each once."""
+
+    def __init__(self, analyze=None):
+        if analyze is None:
+            from app.words.morphology import get_best_analysis
+            analyze = get_best_analysis
+        self._analyze = analyze
+        self._keys: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def keys(self, surface: str) -> Tuple[Optional[str], Optional[str]]:
+        if surface not in self._keys:
+            analysis = self._analyze(surface) or {}
+            lex = analysis.get("lex")
+            lemma = normalize_arabic(strip_tashkeel(lex)) if lex else None
+            root = analysis.get("root")
+            if root and ("#" in root or not _ARABIC_LETTER.search(root)):
+                root = None
+            self._keys[surface] = (lemma or None, root or None)
+        return self._keys[surface]
+
+    def verse_keys(self, result: dict) -> Tuple[Set[str], Set[str]]:
+        """Lemma and root keys for every content word of one AI result."""
+        lemmas: Set[str] = set()
+        roots: Set[str] = set()
+        for word, pos in verse_words(result):
+            if pos in _FUNCTION_POS:
+                continue
+            surface = _clean_surface(word)
+            if not surface:
+                continue
+            lemma, root = self.keys(surface)
+            if lemma:
+                lemmas.add(lemma)
+            if root:
+                roots.add(root)
+        return lemmas, roots
+
+
+def _postings(index: Dict[str, List[int]]) -> Dict[str, List[int]]:
+    return {key: delta_encode(sorted(doc_ids)) for key, doc_ids in sorted(index.items())}
+
+
+def build_book_roots(
+    data_dir: str,
+    book_slug: str,
+    ai_results: Dict[str, dict],
+    keyer: RootKeyer,
+) -> Optional[dict]:
+    """Write ``{book}-roots.json`` for one book; return the index (None if no docs)."""
+    search_dir = os.path.join(data_dir, "index", "search")
+    docs_path = os.path.join(search_dir, f"{book_slug}-docs.json")
+    if not os.path.exists(docs_path):
+        logger.warning("No search docs for %s — run search_index first", book_slug)
+        return None
+    with open(docs_path, "r", encoding="utf-8") as f:
+        docs = json.load(f)
+
+    lemma_index: Dict[str, List[int]] = {}
+    root_index: Dict[str, List[int]] = {}
+    analyzed = 0
+    for doc_id, doc in enumerate(docs):
+        result = ai_results.get(doc.get("p"))
+        if not result:
+            continue
+        analyzed += 1
+        lemmas, roots = keyer.verse_keys(result)
+        for lemma in lemmas:
+            lemma_index.setdefault(lemma, []).append(doc_id)
+        for root in roots:
+            root_index.setdefault(root, []).append(doc_id)
+
+    index = {
+        "version": ROOTS_VERSION,
+        "docs_file": f"{book_slug}-docs.json",
+        "doc_count": len(docs),
+        "verses": analyzed,
+        "lemma": _postings(lemma_index),
+        "root": _postings(root_index),
+    }
+    out_path = os.path.join(search_dir, f"{book_slug}-roots.json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    logger.info("Wrote %s (%d analyzed verses, %d lemmas, %d roots, %.1f KB)",
+                out_path, analyzed, len(lemma_index), len(root_index),
+                os.path.getsize(out_path) / 1024)
+    return index
+
+
+def build_root_indexes(
+    data_dir: str,
+    book_slugs: Iterable[str],
+    responses_dir: Optional[str] = None,
+    morph_cache: Optional[str] = None,
+    keyer: Optional[RootKeyer] = None,
+) -> Dict[str, int]:
+    """Build root/lemma postings for each book; return ``{filename: verse count}``.
+
+    ``morph_cache`` enables the persistent morphology memo
+    (:func:`app.words.morphology.configure_cache`).
+    """
+    from app.ai_content_merger import load_ai_responses
+
+    if keyer is None:
+        if morph_cache:
+            from app.words.morphology import configure_cache
+            configure_cache(morph_cache)
+        keyer = RootKeyer()
+
+    ai_results = {path: entry["result"] for path, entry in load_ai_responses(responses_dir).items()}
+    results = {}
+    for book_slug in book_slugs:
+        index = build_book_roots(data_dir, book_slug, ai_results, keyer)
+        if index is not None:
+            results[f"{book_slug}-roots.json"] = index["verses"]
+    logger.info("Analyzed %d distinct surface forms", len(keyer))
+    return results
+
+
+def lookup(index: dict, lemma: Optional[str] = None, root: Optional[str] = None) -> List[int]:
+    """Doc ids in a loaded ``{book}-roots.json`` for a lemma and/or root (intersection)."""
+    selected: Optional[Set[int]] = None
+    if lemma:
+        selected = set(delta_decode(index["lemma"].get(normalize_arabic(strip_tashkeel(lemma)), [])))
+    if root:
+        ids = set(delta_decode(index["root"].get(root, [])))
+        selected = ids if selected is None else selected & ids
+    return sorted(selected or [])
+
+
+def main():
+    """CLI: ``python -m app.search_roots [BOOK...] [--morph-cache PATH]``."""
+    import argparse
+
+    from app.search_index import discover_book_slugs, get_data_dir
+
+    if sys.platform == "win32":
+        sys.stdout.reconfigure(encoding="utf-8")
+
+    parser = argparse.ArgumentParser(description="Build root/lemma search postings")
+    parser.add_argument("books", nargs="*", help="Book slugs (default: all)")
+    parser.add_argument("--responses-dir", default=None)
+    parser.add_argument("--morph-cache", default=os.path.join("tmp", "morphology_cache.sqlite"),
+                        help="Persistent morphology cache (default: tmp/morphology_cache.sqlite)")
+    parser.add_argument("--no-morph-cache", action="store_true")
+    args = parser.parse_args()
+
+    data_dir = get_data_dir()
+    results = build_root_indexes(
+        data_dir, args.books or discover_book_slugs(data_dir),
+        responses_dir=args.responses_dir,
+        morph_cache=None if args.no_morph_cache else args.morph_cache,
+    )
+    for filename, count in results.items():
+        print(f"  {filename}: {count} verses")
+
+
+if __name__ == "__main__":
+    main()
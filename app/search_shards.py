@@ -0,0 +1,276 @@
+"""Sharded inverted-index files for per-term client search.
+
+``search_index.py`` writes one ``{book}-docs.json`` per book; the Orama step
+(``search/buildOramaIndexes.mjs``) then serializes a whole database per
+book that the client must download before it can answer any query. This
+module builds a compact inverted index from the same docs instead, split
+into small shards the client fetches per query term:
+
+    index/search/shards/{book}/manifest.json
+    index/search/shards/{book}/{field}/{shard:03d}.json
+
+- Documents are referenced by their position in ``{book}-docs.json``.
+- Fields are ``ar`` (already ``normalize_arabic``-ed by the doc builder)
+  and ``en`` (lowercased). :func:`tokenize` is the single tokenizer for
+  both indexing and queries.
+- A term lives in shard ``crc32(term.encode("utf-8")) % shards[field]``;
+  each shard file is the term dictionary for its terms:
+  ``{"t": {term: [doc_id_deltas, term_freqs]}}``, doc ids sorted and
+  delta-encoded.
+
+:class:`ShardIndex` is a local query engine over these files (the same
+lookup the client performs), used for tests and benchmarking.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import sys
+import time
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from app.arabic_normalization import normalize_arabic
+
+logger = logging.getLogger(__name__)
+
+SHARDS_VERSION = 1
+SHARDS_DIRNAME = "shards"
+MANIFEST_FILENAME = "manifest.json"
+FIELDS = ("ar", "en")
+
+# Target terms per shard: keeps a shard to a few KB for typical books.
+TERMS_PER_SHARD = 256
+
+TOKEN_PATTERN = re.compile(r"\w+")
+ARABIC_CHAR_PATTERN = re.compile(r"[؀-ۿ]")
+
+
+def tokenize(text: str, field: str) -> List[str]:
+    """Split a doc field (or a query) into index terms.
+
+    ``ar`` text is run through :func:`normalize_arabic` (idempotent on doc
+    text, which is stored normalized); ``en`` text is lowercased.
+    """
+    if not text:
+        return []
+    text = normalize_arabic(text) if field == "ar" else text.lower()
+    return TOKEN_PATTERN.findall(text)
+
+
+def shard_of(term: str, shard_count: int) -> int:
+    """Shard number holding ``term`` (crc32 — easy to reproduce client-side)."""
+    return zlib.crc32(term.encode("utf-8")) % shard_count
+
+
+def delta_encode(doc_ids: List[int]) -> List[int]:
+    """``[3, 7, 8]`` → ``[3, 4, 1]`` (input must be sorted)."""
+    prev = 0
+    out = []
+    for doc_id in doc_ids:
+        out.append(doc_id - prev)
+        prev = doc_id
+    return out
+
+
+def delta_decode(deltas: List[int]) -> List[int]:
+    total = 0
+    out = []
+    for delta in deltas:
+        total += delta
+        out.append(total)
+    return out
+
+
+def _dump_compact(path: str, obj) -> int:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    return os.path.getsize(path)
+
+
+def book_shard_dir(data_dir: str, book_slug: str) -> str:
+    return os.path.join(data_dir, "index", "search", SHARDS_DIRNAME, book_slug)
+
+
+def build_book_shards(
+    data_dir: str,
+    book_slug: str,
+    docs: List[dict],
+    terms_per_shard: int = TERMS_PER_SHARD,
+) -> dict:
+    """Write the sharded inverted index for one book's search docs.
+
+    Returns the manifest (also written to ``manifest.json``). Any previous
+    shards for the book are replaced.
+    """
+    postings: Dict[str, Dict[str, Dict[int, int]]] = {field: {} for field in FIELDS}
+    for doc_id, doc in enumerate(docs):
+        for field in FIELDS:
+            counts = Counter(tokenize(doc.get(field, ""), field))
+            field_postings = postings[field]
+            for term, tf in counts.items():
+                field_postings.setdefault(term, {})[doc_id] = tf
+
+    out_dir = book_shard_dir(data_dir, book_slug)
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir)
+
+    fields_meta = {}
+    for field in FIELDS:
+        terms = postings[field]
+        shard_count = max(1, math.ceil(len(terms) / terms_per_shard))
+        shards: List[Dict[str, list]] = [{} for _ in range(shard_count)]
+        for term, doc_tfs in terms.items():
+            doc_ids = sorted(doc_tfs)
+            shards[shard_of(term, shard_count)][term] = [
+                delta_encode(doc_ids), [doc_tfs[d] for d in doc_ids],
+            ]
+        field_dir = os.path.join(out_dir, field)
+        os.makedirs(field_dir)
+        total_bytes = 0
+        for n, shard in enumerate(shards):
+            total_bytes += _dump_compact(os.path.join(field_dir, f"{n:03d}.json"), {"t": shard})
+        fields_meta[field] = {"shards": shard_count, "terms": len(terms), "bytes": total_bytes}
+
+    manifest = {
+        "version": SHARDS_VERSION,
+        "book": book_slug,
+        "docs_file": f"{book_slug}-docs.json",
+        "doc_count": len(docs),
+        "hash": "crc32",
+        "fields": fields_meta,
+    }
+    _dump_compact(os.path.join(out_dir, MANIFEST_FILENAME), manifest)
+    logger.info(
+        "Wrote search shards for %s: %s", book_slug,
+        ", ".join(f"{f} {m['terms']} terms/{m['shards']} shards ({m['bytes'] / 1024:.1f} KB)"
+                  for f, m in fields_meta.items()),
+    )
+    return manifest
+
+
+class ShardIndex:
+    """Query one book's sharded index the way the client does.
+
+    Shards are loaded on first use and kept; ``bytes_loaded`` records how
+    much a client would have downloaded for the queries run so far.
+    """
+
+    def __init__(self, data_dir: str, book_slug: str):
+        self.data_dir = data_dir
+        self.book_slug = book_slug
+        self.shard_dir = book_shard_dir(data_dir, book_slug)
+        with open(os.path.join(self.shard_dir, MANIFEST_FILENAME), "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self._shards: Dict[Tuple[str, int], Dict[str, list]] = {}
+        self._docs: Optional[List[dict]] = None
+        self.bytes_loaded = 0
+
+    @property
+    def doc_count(self) -> int:
+        return self.manifest["doc_count"]
+
+    def _shard(self, field: str, n: int) -> Dict[str, list]:
+        key = (field, n)
+        if key not in self._shards:
+            path = os.path.join(self.shard_dir, field, f"{n:03d}.json")
+            self.bytes_loaded += os.path.getsize(path)
+            with open(path, "r", encoding="utf-8") as f:
+                self._shards[key] = json.load(f)["t"]
+        return self._shards[key]
+
+    def postings(self, field: str, term: str) -> List[Tuple[int, int]]:
+        """``[(doc_id, term_freq), ...]`` for one (already tokenized) term."""
+        meta = self.manifest["fields"].get(field)
+        if not meta:
+            return []
+        entry = self._shard(field, shard_of(term, meta["shards"])).get(term)
+        if not entry:
+            return []
+        deltas, tfs = entry
+        return list(zip(delta_decode(deltas), tfs))
+
+    def search(
+        self,
+        query: str,
+        field: Optional[str] = None,
+        limit: int = 20,
+        match_all: bool = True,
+    ) -> List[Tuple[int, float]]:
+        """Rank docs for ``query``; return ``[(doc_id, score), ...]``.
+
+        ``field`` defaults to ``ar`` if the query contains Arabic letters,
+        else ``en``. With ``match_all`` only docs containing every query
+        term are returned. Scores are tf·idf summed over the query terms.
+        """
+        if field is None:
+            field = "ar" if ARABIC_CHAR_PATTERN.search(query) else "en"
+        terms = list(dict.fromkeys(tokenize(query, field)))
+        if not terms:
+            return []
+
+        n_docs = max(self.doc_count, 1)
+        scores: Dict[int, float] = {}
+        hits: Counter = Counter()
+        for term in terms:
+            plist = self.postings(field, term)
+            if not plist:
+                if match_all:
+                    return []
+                continue
+            idf = math.log(1 + n_docs / len(plist))
+            for doc_id, tf in plist:
+                scores[doc_id] = scores.get(doc_id, 0.0) + tf * idf
+                hits[doc_id] += 1
+
+        if match_all:
+            scores = {d: s for d, s in scores.items() if hits[d] == len(terms)}
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def docs(self) -> List[dict]:
+        """The book's search docs (``{book}-docs.json``), for mapping ids to paths."""
+        if self._docs is None:
+            path = os.path.join(self.data_dir, "index", "search", self.manifest["docs_file"])
+            with open(path, "r", encoding="utf-8") as f:
+                self._docs = json.load(f)
+        return self._docs
+
+
+def main():
+    """Query a book's shards: ``python -m app.search_shards BOOK QUERY...``."""
+    import argparse
+
+    from app.search_index import get_data_dir
+
+    if sys.platform == "win32":
+        sys.stdout.reconfigure(encoding="utf-8")
+
+    parser = argparse.ArgumentParser(description="Query prebuilt search shards")
+    parser.add_argument("book", help="Book slug (e.g. al-kafi)")
+    parser.add_argument("query", nargs="+", help="Query text")
+    parser.add_argument("--field", choices=FIELDS, default=None)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--any", action="store_true", help="Match any term instead of all")
+    args = parser.parse_args()
+
+    index = ShardIndex(get_data_dir(), args.book)
+    start = time.perf_counter()
+    results = index.search(" ".join(args.query), field=args.field,
+                           limit=args.limit, match_all=not args.any)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    docs = index.docs()
+    for doc_id, score in results:
+        doc = docs[doc_id]
+        print(f"{score:8.3f}  {doc['p']}  {doc.get('en', '')[:80]}")
+    print(f"\n{len(results)} results in {elapsed_ms:.1f} ms; "
+          f"{index.bytes_loaded / 1024:.1f} KB of shards loaded")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,8 +14,6 @@ import os
 from collections import OrderedDict
 from typing import Dict, List, Optional
 
-import fastapi
-
 from app import config
 from app.book_registry import BOOK_REGISTRY, BookConfig, get_book_config
 from app.chapter_translations import inject_translations, load_translations
@@ -314,7 +312,7 @@ def init_thaqalayn_api_book(
     insert_chapter(book)
     write_file(
         f"/books/complete/{book_config.slug}",
-        fastapi.encoders.jsonable_encoder(book),
+        book,
     )
     index_maps = collect_indexes(book)
     update_index_files(index_maps)
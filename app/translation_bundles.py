@@ -0,0 +1,83 @@
+"""Per-translation bundles for verse_detail files.
+
+The Quran carries ~28 tanzil translations on each of its 6,236 verses, and
+``lib_db.insert_verse_details`` used to write all of them into every
+verse_detail file, so a reader wanting one translation downloaded them all.
+For books listed in ``TRANSLATION_BUNDLE_BOOKS`` (comma-separated slugs,
+e.g. ``quran``) the verse_detail files instead keep only the chapter's
+``default_verse_translation_ids``; every other translation is written once
+per chapter:
+
+    {chapter_path}/translations/{translation_id}
+    → books/quran/1/translations/en.sahih.json
+    {"index": "quran:1", "kind": "verse_translations",
+     "data": {"chapter_path": "/books/quran:1", "translation_id": "en.sahih",
+              "verses": {"/books/quran:1:1": ["..."], ...}}}
+
+The verse_detail keeps the full ``verse_translations`` list and gains
+``translation_bundle`` (``"/books/quran:1/translations"``): the client
+fetches ``{translation_bundle}/{id}`` for a non-default translation.
+
+Complete book files are unchanged — they stay the pipeline's source of
+truth for the linking passes.
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.config import DEFAULT_TRANSLATION_BUNDLE_BOOKS
+
+BUNDLE_KIND = "verse_translations"
+
+
+def bundled_books() -> Set[str]:
+    raw = os.environ.get("TRANSLATION_BUNDLE_BOOKS", DEFAULT_TRANSLATION_BUNDLE_BOOKS)
+    return {slug.strip() for slug in raw.split(",") if slug.strip()}
+
+
+def book_slug(path: Optional[str]) -> str:
+    """``"/books/quran:1:2"`` → ``"quran"``."""
+    if not path or not path.startswith("/books/"):
+        return ""
+    return path[len("/books/"):].split(":", 1)[0]
+
+
+def base_translation_ids(default_ids: Optional[Dict[str, str]]) -> Set[str]:
+    """Translation ids kept inline: the chapter's per-language defaults."""
+    return set((default_ids or {}).values())
+
+
+def bundle_path(chapter_path: str) -> str:
+    return f"{chapter_path}/translations"
+
+
+def bundles_enabled(chapter_path: Optional[str], default_ids: Optional[Dict[str, str]]) -> bool:
+    """Whether a chapter's verse_detail files are written in bundled form."""
+    return bool(default_ids) and book_slug(chapter_path) in bundled_books()
+
+
+def split_translations(verse_data: dict, keep: Set[str]) -> Dict[str, List[str]]:
+    """Move non-``keep`` translations out of ``verse_data``; return them."""
+    translations = verse_data.get("translations")
+    if not translations:
+        return {}
+    moved = {tid: text for tid, text in translations.items() if tid not in keep}
+    if moved:
+        verse_data["translations"] = {tid: text for tid, text in translations.items() if tid in keep}
+    return moved
+
+
+def bundle_docs(chapter_path: str, index: str, moved: Iterable[tuple]) -> Dict[str, dict]:
+    """Group ``(verse_path, {tid: text})`` pairs into one document per translation."""
+    verses_by_tid: Dict[str, Dict[str, List[str]]] = {}
+    for verse_path, translations in moved:
+        for tid, text in translations.items():
+            verses_by_tid.setdefault(tid, {})[verse_path] = text
+    return {
+        f"{bundle_path(chapter_path)}/{tid}": {
+            "index": index,
+            "kind": BUNDLE_KIND,
+            "data": {"chapter_path": chapter_path, "translation_id": tid, "verses": verses},
+        }
+        for tid, verses in verses_by_tid.items()
+    }
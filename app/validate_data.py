@@ -113,7 +113,7 @@ def validate_json_file(filepath: Path, report: ValidationReport, verbose: bool =
 
     kind = data["kind"]
     valid_kinds = {"chapter_list", "verse_list", "verse_content", "verse_detail",
-                   "person_content", "person_list"}
+                   "verse_translations", "person_content", "person_list"}
     if kind not in valid_kinds:
         report.error(rel, f"Unknown kind: '{kind}' (expected one of {valid_kinds})")
 
@@ -308,6 +308,8 @@ def check_narrator_references(data_dir: Path, report: ValidationReport, verbose:
         except (json.JSONDecodeError, UnicodeDecodeError):
             continue
 
+        if data.get("kind") == "verse_translations":  # verse path -> text, no chains
+            continue
         inner = data.get("data", {})
         verses = inner.get("verses", [])
         for verse in verses:
@@ -329,12 +331,71 @@ def check_narrator_references(data_dir: Path, report: ValidationReport, verbose:
         print(f"  Narrator check: {len(referenced_ids)} IDs referenced, all exist")
 
 
+def _import_verse_pack():
+    try:
+        from app import verse_pack
+    except ImportError:  # run as a script: python app/validate_data.py
+        sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+        from app import verse_pack
+    return verse_pack
+
+
+def _pack_files(data_dir: Path) -> list[Path]:
+    packs_dir = data_dir / _import_verse_pack().PACKS_DIRNAME
+    if not packs_dir.is_dir():
+        return []
+    return sorted(packs_dir.glob("*" + _import_verse_pack().PACK_SUFFIX))
+
+
+def validate_packs(data_dir: Path, report: ValidationReport, verbose: bool = False):
+    """Validate every record of every verse pack (packs/{book}.vpack).
+
+    Base records must be verse_detail documents; sister records must carry
+    ``ai``/``lang``/``path``.
+    """
+    verse_pack = _import_verse_pack()
+    for pack_file in _pack_files(data_dir):
+        rel = str(pack_file)
+        try:
+            pack = verse_pack.VersePack(str(pack_file))
+        except (ValueError, OSError) as e:
+            report.error(rel, f"Unreadable verse pack: {e}")
+            continue
+        with pack:
+            for key, data in pack.items():
+                report.files_checked += 1
+                try:
+                    doc = json.loads(data)
+                except (ValueError, UnicodeDecodeError) as e:
+                    report.error(f"{rel}:{key}", f"Invalid JSON: {e}")
+                    continue
+                if "#" in key:
+                    if not all(k in doc for k in ("ai", "lang", "path")):
+                        report.error(f"{rel}:{key}", "Sister record missing ai/lang/path")
+                        continue
+                elif doc.get("kind") != "verse_detail":
+                    report.error(f"{rel}:{key}", f"Expected verse_detail, got {doc.get('kind')!r}")
+                    continue
+                report.files_valid += 1
+        if verbose:
+            print(f"  Pack {pack_file.name}: {len(pack)} records")
+
+
 def check_navigation_targets(data_dir: Path, report: ValidationReport, verbose: bool):
-    """Spot-check that navigation targets point to existing files."""
+    """Spot-check that navigation targets point to existing files (or pack records)."""
     books_dir = data_dir / "books"
     if not books_dir.exists():
         return
 
+    verse_pack = _import_verse_pack()
+    packed = set()
+    for pack_file in _pack_files(data_dir):
+        try:
+            with verse_pack.VersePack(str(pack_file)) as pack:
+                packed.update(pack.keys())
+        except (ValueError, OSError):
+            continue
+
     book_files = list(books_dir.rglob("*.json"))
     book_files = [f for f in book_files if "complete" not in str(f)]
     sample = book_files[:100] if len(book_files) > 100 else book_files
@@ -358,7 +419,7 @@ def check_navigation_targets(data_dir: Path, report: ValidationReport, verbose:
             # Convert path to filesystem: /books/al-kafi:1:2 -> books/al-kafi/1/2.json
             fs_path = target.replace("/books/", "books/").replace(":", "/") + ".json"
             full_path = data_dir / fs_path
-            if not full_path.exists():
+            if not full_path.exists() and target not in packed:
                 broken_nav += 1
                 if broken_nav <= 5:
                     report.warn(str(filepath), f"nav.{direction} target not found: {target}")
@@ -400,6 +461,10 @@ def main():
         print(f"Checking {len(book_files)} book files...")
         for filepath in book_files:
             validate_json_file(filepath, report, args.verbose)
+        packs = _pack_files(data_dir)
+        if packs:
+            print(f"Checking {len(packs)} verse packs...")
+            validate_packs(data_dir, report, args.verbose)
 
     # Validate narrator files
     if not args.books_only:
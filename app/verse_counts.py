@@ -25,6 +25,8 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+from app.verse_pack import packed_relpaths
+
 
 COUNTED_PART_TYPES = {"Hadith", "Verse"}
 SKIP_DIRS = {"complete"}  # books/complete/ holds aggregated full-text dumps
@@ -54,7 +56,14 @@ def build(data_root: Path) -> dict:
         by_chapter: dict[str, int] = {}
         total = 0
 
+        # Files covered by the book's verse pack are verse_details, never
+        # shells — skip parsing them (see app.verse_pack).
+        packed = packed_relpaths(str(data_root), slug)
         for json_path in book_dir.rglob("*.json"):
+            if json_path.name.count(".") > 1:  # lang sisters / sidecars
+                continue
+            if packed and json_path.relative_to(books_dir).as_posix() in packed:
+                continue
             try:
                 with open(json_path, encoding="utf-8") as f:
                     data = json.load(f)
@@ -0,0 +1,414 @@
+"""Packed per-book containers for verse_detail files.
+
+ThaqalaynData keeps one pretty-printed ``verse_detail`` JSON per verse plus
+up to 11 per-language sister files (``{n}.{lang}.json``, see
+``ai_content_merger._write_verse_detail_split``) — hundreds of thousands of
+tiny files that make generation, git, rsync and CDN uploads pay per-file
+overhead. A pack holds all of a book's verse_detail files in one file:
+
+    packs/{book}.vpack
+    MAGIC | record* | index | footer
+
+- Each record is the zlib-compressed original file bytes, so unpacking
+  reproduces the per-file export byte for byte.
+- The index is zlib-compressed JSON ``{"version", "book", "keys": [[key,
+  offset, length], ...]}`` in file order. Keys are the verse path for the
+  base file and ``{verse_path}#{lang}`` for sister files.
+- The footer is ``<QQ8s``: index offset, index length, MAGIC.
+
+:class:`VersePack` is the random-access reader. :func:`iter_verse_details`
+and :class:`VerseDetailSource` are what the tools use: they read from the
+pack when a book has one and fall back to the per-file layout otherwise,
+so a book's detail files can be deleted once packed (``pack --remove``) and
+re-exported at any time (``unpack``). A detail file on disk always wins over
+the pack record with the same key: the pipeline rewrites files, never packs,
+so a file next to a pack is the newer copy until the next ``pack``.
+
+The writers that patch existing detail files (the AI merger, ``link_books``
+and translation ingest) call :func:`restore_packed_files` first, which
+writes a verse's base and sister records back to disk when they are
+missing. A removed book is therefore patched like an unpacked one, and only
+the verses a run touches come back as files; ``pack --remove`` folds them
+in again.
+
+CLI: ``python -m app.verse_pack {pack,unpack,ls} [BOOK...]``.
+"""
+
+import json
+import logging
+import os
+import struct
+import sys
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"VPACK\x00\x01\x00"
+FOOTER = struct.Struct("<QQ8s")
+PACK_VERSION = 1
+PACKS_DIRNAME = "packs"
+PACK_SUFFIX = ".vpack"
+COMPRESS_LEVEL = 6
+
+
+def pack_path(data_dir: str, book_slug: str) -> str:
+    return os.path.join(data_dir, PACKS_DIRNAME, book_slug + PACK_SUFFIX)
+
+
+def key_relpath(key: str) -> str:
+    """Pack key → file path relative to ``books/``.
+
+    ``/books/al-kafi:1:1:1:1`` → ``al-kafi/1/1/1/1.json``;
+    ``/books/al-kafi:1:1:1:1#en`` → ``al-kafi/1/1/1/1.en.json``.
+    """
+    path, _, lang = key.partition("#")
+    if path.startswith("/books/"):
+        path = path[len("/books/"):]
+    rel = path.replace(":", "/")
+    return f"{rel}.{lang}.json" if lang else f"{rel}.json"
+
+
+class VersePack:
+    """Random-access reader for one ``.vpack`` file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f = open(path, "rb")
+        if self._f.read(len(MAGIC)) != MAGIC:
+            self._f.close()
+            raise ValueError(f"Not a verse pack: {path}")
+        self._f.seek(-FOOTER.size, os.SEEK_END)
+        index_offset, index_length, magic = FOOTER.unpack(self._f.read(FOOTER.size))
+        if magic != MAGIC:
+            self._f.close()
+            raise ValueError(f"Truncated verse pack: {path}")
+        self._f.seek(index_offset)
+        index = json.loads(zlib.decompress(self._f.read(index_length)))
+        self.book = index.get("book")
+        self._keys: List[str] = [k for k, _, _ in index["keys"]]
+        self._entries: Dict[str, Tuple[int, int]] = {k: (o, n) for k, o, n in index["keys"]}
+        self._by_verse: Optional[Dict[str, List[str]]] = None
+
+    def __enter__(self) -> "VersePack":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    def verse_keys(self, verse_path: str) -> List[str]:
+        """Keys of ``verse_path``'s base record and its sister records."""
+        if self._by_verse is None:
+            self._by_verse = {}
+            for key in self._keys:
+                self._by_verse.setdefault(key.partition("#")[0], []).append(key)
+        return self._by_verse.get(verse_path, [])
+
+    def raw(self, key: str) -> bytes:
+        """The original file bytes for ``key``."""
+        offset, length = self._entries[key]
+        self._f.seek(offset)
+        return zlib.decompress(self._f.read(length))
+
+    def get(self, verse_path: str, lang: Optional[str] = None) -> Optional[dict]:
+        """Parsed base verse_detail doc (or its ``lang`` sister), None if absent."""
+        key = f"{verse_path}#{lang}" if lang else verse_path
+        if key not in self._entries:
+            return None
+        return json.loads(self.raw(key))
+
+    def items(self, base_only: bool = False) -> Iterator[Tuple[str, bytes]]:
+        """Stream ``(key, raw bytes)`` in file order (one sequential read)."""
+        for key in self._keys:
+            if base_only and "#" in key:
+                continue
+            yield key, self.raw(key)
+
+    def iter_details(self) -> Iterator[dict]:
+        """Parsed base verse_detail docs in file order."""
+        for _key, data in self.items(base_only=True):
+            yield json.loads(data)
+
+
+def open_pack(data_dir: str, book_slug: str) -> Optional[VersePack]:
+    path = pack_path(data_dir, book_slug)
+    return VersePack(path) if os.path.exists(path) else None
+
+
+def write_pack(path: str, book_slug: str, records: Iterable[Tuple[str, bytes]]) -> int:
+    """Stream ``(key, raw bytes)`` records into a pack at ``path``; return count.
+
+    Written to a temp file and renamed, so readers never see a partial pack.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    keys: List[list] = []
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        for key, data in records:
+            blob = zlib.compress(data, COMPRESS_LEVEL)
+            keys.append([key, f.tell(), len(blob)])
+            f.write(blob)
+        index_offset = f.tell()
+        index = zlib.compress(json.dumps(
+            {"version": PACK_VERSION, "book": book_slug, "keys": keys},
+            ensure_ascii=False, separators=(",", ":"),
+        ).encode("utf-8"), COMPRESS_LEVEL)
+        f.write(index)
+        f.write(FOOTER.pack(index_offset, len(index), MAGIC))
+    os.replace(tmp_path, path)
+    return len(keys)
+
+
+def _walk_book_files(book_dir: str) -> Iterator[str]:
+    for root, dirs, files in os.walk(book_dir):
+        dirs.sort()
+        for filename in sorted(files):
+            if filename.endswith(".json"):
+                yield os.path.join(root, filename)
+
+
+def _detail_key(filepath: str, data: bytes) -> Optional[str]:
+    """Pack key for a verse_detail base or sister file, else None."""
+    name = os.path.basename(filepath)
+    if name.count(".") > 2:
+        return None
+    try:
+        doc = json.loads(data)
+    except ValueError:
+        return None
+    if not isinstance(doc, dict):
+        return None
+    if name.count(".") == 1:
+        if doc.get("kind") != "verse_detail":
+            return None
+        verse = (doc.get("data") or {}).get("verse") or {}
+        path = verse.get("path") or (f"/books/{doc['index']}" if doc.get("index") else None)
+        return path
+    # Sister file: {"ai", "lang", "path"}
+    if doc.get("lang") and doc.get("path") and "ai" in doc:
+        return f"{doc['path']}#{doc['lang']}"
+    return None
+
+
+def _book_detail_files(data_dir: str, book_slug: str) -> Iterator[Tuple[str, str, bytes]]:
+    """Yield ``(key, filepath, raw bytes)`` for every verse_detail file of a book."""
+    books_dir = os.path.join(data_dir, "books")
+    for filepath in _walk_book_files(os.path.join(books_dir, book_slug)):
+        with open(filepath, "rb") as f:
+            data = f.read()
+        key = _detail_key(filepath, data)
+        # Only files at their canonical location round-trip through unpack.
+        if key and os.path.relpath(filepath, books_dir).replace(os.sep, "/") == key_relpath(key):
+            yield key, filepath, data
+
+
+def pack_book(data_dir: str, book_slug: str, remove_files: bool = False) -> dict:
+    """Pack a book's verse_detail (and sister) files; return size stats.
+
+    Records already in an existing pack are kept unless a file on disk
+    replaces them, so re-packing after a partial regeneration is safe.
+    With ``remove_files`` the packed files are deleted afterwards; writers
+    restore the ones they patch (see :func:`restore_packed_files`).
+    """
+    path = pack_path(data_dir, book_slug)
+    records: Dict[str, bytes] = {}
+    existing = open_pack(data_dir, book_slug)
+    if existing is not None:
+        with existing:
+            records.update(existing.items())
+    files: List[str] = []
+    raw_bytes = 0
+    for key, filepath, data in _book_detail_files(data_dir, book_slug):
+        records[key] = data
+        files.append(filepath)
+        raw_bytes += len(data)
+
+    ordered = sorted(records.items(), key=lambda kv: _sort_key(kv[0]))
+    count = write_pack(path, book_slug, ordered)
+    if remove_files:
+        for filepath in files:
+            os.remove(filepath)
+    stats = {"records": count, "files": len(files), "file_bytes": raw_bytes,
+             "pack_bytes": os.path.getsize(path)}
+    logger.info("Packed %s: %d records from %d files (%.1f MB -> %.1f MB)%s",
+                book_slug, count, len(files), raw_bytes / 1e6, stats["pack_bytes"] / 1e6,
+                ", files removed" if remove_files else "")
+    return stats
+
+
+def _sort_key(key: str):
+    """Natural verse order: numeric path segments, base file before sisters."""
+    path, _, lang = key.partition("#")
+    parts = path.split(":")
+    return [parts[0]] + [int(p) if p.isdigit() else p for p in parts[1:]], lang
+
+
+def unpack_book(data_dir: str, book_slug: str) -> int:
+    """Export a pack back to the per-file layout; return files written."""
+    books_dir = os.path.join(data_dir, "books")
+    written = 0
+    with VersePack(pack_path(data_dir, book_slug)) as pack:
+        for key, data in pack.items():
+            filepath = os.path.join(books_dir, key_relpath(key))
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(filepath, "wb") as f:
+                f.write(data)
+            written += 1
+    logger.info("Unpacked %d files for %s", written, book_slug)
+    return written
+
+
+# Packs opened by restore_packed_files: path -> (pid, mtime_ns, pack). The pid
+# keeps forked workers from sharing one file offset with their parent.
+_restore_packs: Dict[str, Tuple[int, int, VersePack]] = {}
+
+
+def restore_packed_files(data_dir: str, verse_path: str) -> int:
+    """Write ``verse_path``'s packed detail files back to ``books/`` where missing.
+
+    Returns the number of files written (0 when the book has no pack, the
+    verse is not in it, or its files are already on disk).
+    """
+    if not verse_path.startswith("/books/"):
+        return 0
+    path = pack_path(data_dir, verse_path[len("/books/"):].split(":", 1)[0])
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+    cached = _restore_packs.get(path)
+    if cached is None or cached[:2] != (os.getpid(), mtime_ns):
+        if cached is not None and cached[0] == os.getpid():
+            cached[2].close()
+        cached = _restore_packs[path] = (os.getpid(), mtime_ns, VersePack(path))
+    pack = cached[2]
+
+    books_dir = os.path.join(data_dir, "books")
+    written = 0
+    for key in pack.verse_keys(verse_path):
+        filepath = os.path.join(books_dir, key_relpath(key))
+        if os.path.exists(filepath):
+            continue
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, "wb") as f:
+            f.write(pack.raw(key))
+        written += 1
+    return written
+
+
+# --------------------------------------------------------------------------- #
+# Reader API for the tools (pack first, per-file layout as fallback)
+# --------------------------------------------------------------------------- #
+
+def iter_verse_details(data_dir: str, book_slug: str) -> Iterator[dict]:
+    """Yield every base verse_detail doc of a book.
+
+    From the pack if the book has one, with detail files on disk replacing
+    their pack records and files not in the pack yielded after it; else
+    from the per-file layout.
+    """
+    pack = open_pack(data_dir, book_slug)
+    if pack is None:
+        for key, _filepath, data in _book_detail_files(data_dir, book_slug):
+            if "#" not in key:
+                yield json.loads(data)
+        return
+    loose: Dict[str, bytes] = {
+        key: data for key, _filepath, data in _book_detail_files(data_dir, book_slug)
+        if "#" not in key
+    }
+    with pack:
+        for key, data in pack.items(base_only=True):
+            yield json.loads(loose.pop(key, data))
+    for data in loose.values():
+        yield json.loads(data)
+
+
+def packed_relpaths(data_dir: str, book_slug: str) -> Set[str]:
+    """``books/``-relative paths of files a book's pack already covers."""
+    pack = open_pack(data_dir, book_slug)
+    if pack is None:
+        return set()
+    with pack:
+        return {key_relpath(k) for k in pack.keys()}
+
+
+class VerseDetailSource:
+    """Load verse_detail docs by verse path for one book (file, then pack)."""
+
+    def __init__(self, data_dir: str, book_slug: str):
+        self.books_dir = os.path.join(data_dir, "books")
+        self.pack = open_pack(data_dir, book_slug)
+
+    def __enter__(self) -> "VerseDetailSource":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.pack is not None:
+            self.pack.close()
+
+    def load(self, verse_path: str, lang: Optional[str] = None) -> Optional[dict]:
+        key = f"{verse_path}#{lang}" if lang else verse_path
+        filepath = os.path.join(self.books_dir, key_relpath(key))
+        if os.path.exists(filepath):
+            try:
+                with open(filepath, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, OSError):
+                return None
+        if self.pack is not None:
+            return self.pack.get(verse_path, lang)
+        return None
+
+
+def main():
+    import argparse
+
+    from app.search_index import discover_book_slugs, get_data_dir
+
+    if sys.platform == "win32":
+        sys.stdout.reconfigure(encoding="utf-8")
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Pack/unpack per-book verse_detail containers")
+    parser.add_argument("command", choices=("pack", "unpack", "ls"))
+    parser.add_argument("books", nargs="*", help="Book slugs (default: all)")
+    parser.add_argument("--remove", action="store_true",
+                        help="pack: delete the per-file verse_detail files once packed")
+    args = parser.parse_args()
+
+    data_dir = get_data_dir()
+    books = args.books or discover_book_slugs(data_dir)
+    for book_slug in books:
+        if args.command == "pack":
+            stats = pack_book(data_dir, book_slug, remove_files=args.remove)
+            print(f"  {book_slug}: {stats['records']} records, "
+                  f"{stats['file_bytes'] / 1e6:.1f} MB -> {stats['pack_bytes'] / 1e6:.1f} MB")
+        elif not os.path.exists(pack_path(data_dir, book_slug)):
+            continue
+        elif args.command == "unpack":
+            print(f"  {book_slug}: {unpack_book(data_dir, book_slug)} files")
+        else:
+            with VersePack(pack_path(data_dir, book_slug)) as pack:
+                print(f"  {book_slug}: {len(pack)} records, "
+                      f"{os.path.getsize(pack.path) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,9 @@ Sub-modules:
   fixture locks parity with the TypeScript twin in
   `Thaqalayn/src/app/services/word-normalize.ts`.
 - `morphology` — CAMeL Tools wrapper (analyzer + generator).
+- `morph_cache` — Persistent SQLite memo for analyzer/generator output.
+- `source_snapshot` — Compiled, lazily-loaded snapshots of the builder
+  source indexes.
 - `corpus_extract` — Walks v4 chunks, NFC-normalizes, produces the
   corpus surface-form set with counts and occurrence paths.
 - `build_pages` — Page builders for surface and lemma JSONs.
@@ -28,7 +28,7 @@ from __future__ import annotations
 import functools
 import logging
 import re
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 from .morphology import (
     POS_TRANSLATION_TO_OURS,
@@ -237,6 +237,25 @@ def canonical_diacritized_lemma(lex: str, pos: str = "verb") -> str:
 # WordPageBuilder
 # ---------------------------------------------------------------------------
 
+# Attributes that fully describe a builder's loaded state: the source
+# indexes plus the normalized reverse indexes derived from them in
+# ``__init__``. Snapshots persist exactly these.
+PREBUILT_INDEX_ATTRS: Tuple[str, ...] = (
+    "corpus_surfaces",
+    "qac_lemma_index",
+    "wiktextract_summary",
+    "lanes_arabic_index",
+    "wiktextract_full",
+    "lanes_entries",
+    "hawramani_entries",
+    "_qac_normalized",
+    "_wikt_normalized",
+    "_wikt_full_normalized",
+    "_lanes_normalized",
+    "_corpus_normalized",
+)
+
+
 class WordPageBuilder:
     """Builds surface + lemma page dicts using pre-loaded source data.
 
@@ -303,6 +322,26 @@ class WordPageBuilder:
         # can write a corpus-filtered slim file post-build.
         self.wikt_matched_lemmas: Dict[str, List[Dict]] = {}
 
+    @classmethod
+    def from_prebuilt(cls, indexes: Mapping[str, Any]) -> "WordPageBuilder":
+        """Construct from already-built indexes, skipping ``__init__``'s work.
+
+        ``indexes`` maps every name in :data:`PREBUILT_INDEX_ATTRS` (source
+        indexes and their normalized variants) to a mapping; missing names
+        become empty dicts. Values are stored as-is, so lazily-loaded
+        mappings (see :mod:`.source_snapshot`) stay unloaded until a
+        lookup touches them.
+        """
+        builder = cls.__new__(cls)
+        for name in PREBUILT_INDEX_ATTRS:
+            setattr(builder, name, indexes[name] if name in indexes else {})
+        builder.wikt_matched_lemmas = {}
+        return builder
+
+    def prebuilt_indexes(self) -> Dict[str, Any]:
+        """Return every index :meth:`from_prebuilt` needs, keyed by attribute."""
+        return {name: getattr(self, name) for name in PREBUILT_INDEX_ATTRS}
+
     # ---- surface page -----------------------------------------------------
 
     def build_surface(self, surface: str) -> Dict:
@@ -0,0 +1,137 @@
+"""Persistent on-disk memo for CAMeL Tools analyses and paradigms.
+
+Every word-page build analyzes ~102K surfaces and generates paradigms for
+~13K lemmas, and almost all of that is identical to the previous build.
+:class:`MorphologyCache` stores the analyzer/generator output in a small
+SQLite file so repeat builds only pay for surfaces they haven't seen.
+
+Entries are keyed by ``(db_version, kind, key)``:
+
+- ``db_version`` — morphology DB name, installed camel-tools version and
+  the size/mtime of the installed ``morphology.db`` (camel-tools ships the
+  DB as a separately versioned data package). Upgrading either the code or
+  the data transparently starts a fresh namespace; stale rows are never
+  returned.
+- ``kind`` — ``"analyze"`` (key = surface form) or ``"paradigm"``
+  (key = ``"{pos}\\t{lemma}"``).
+
+The cache is opt-in: :func:`app.words.morphology.configure_cache` wires it
+behind the in-process LRU. SQLite in WAL mode lets parallel build workers
+share one file; they open it with ``commit_every=1`` so no worker holds the
+write lock across more than one row.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from typing import Any, Optional
+
+MORPHOLOGY_DB_NAME = "calima-msa-r13"
+
+# Rows are committed in batches; a build writes tens of thousands of them.
+# Only safe for a single writer: an open batch holds SQLite's write lock.
+_COMMIT_EVERY = 500
+
+
+def builtin_db_path(db_name: str = MORPHOLOGY_DB_NAME) -> Optional[str]:
+    """Path of the installed ``morphology.db`` of a builtin CAMeL DB, if found."""
+    try:
+        from camel_tools.data import CATALOGUE
+        db_dir = CATALOGUE.components["MorphologyDB"].datasets[db_name].path
+    except (ImportError, AttributeError, KeyError):
+        return None
+    path = os.path.join(str(db_dir), "morphology.db")
+    return path if os.path.exists(path) else None
+
+
+def morphology_db_version(db_name: str = MORPHOLOGY_DB_NAME) -> str:
+    """Return the cache namespace for the installed morphology DB."""
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+        try:
+            camel_version = version("camel-tools")
+        except PackageNotFoundError:
+            camel_version = "unknown"
+    except ImportError:  # pragma: no cover - Python < 3.8
+        camel_version = "unknown"
+    path = builtin_db_path(db_name)
+    if path is None:
+        db_stamp = "unknown"
+    else:
+        st = os.stat(path)
+        db_stamp = f"{st.st_size}-{st.st_mtime_ns}"
+    return f"{db_name}/camel-tools-{camel_version}/db-{db_stamp}"
+
+
+class MorphologyCache:
+    """SQLite-backed ``(kind, key) → JSON`` store for morphology results."""
+
+    def __init__(self, path: str, db_version: Optional[str] = None,
+                 commit_every: int = _COMMIT_EVERY):
+        self.path = path
+        self.db_version = db_version or morphology_db_version()
+        self.commit_every = max(1, commit_every)
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=60)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS morph ("
+            " db_version TEXT NOT NULL,"
+            " kind TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " PRIMARY KEY (db_version, kind, key))"
+        )
+        self._conn.commit()
+        self._pending = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss."""
+        row = self._conn.execute(
+            "SELECT value FROM morph WHERE db_version=? AND kind=? AND key=?",
+            (self.db_version, kind, key),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, kind: str, key: str, value: Any) -> None:
+        """Store a JSON-serializable value (committed every ``commit_every`` puts)."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO morph (db_version, kind, key, value) "
+            "VALUES (?, ?, ?, ?)",
+            (self.db_version, kind, key,
+             json.dumps(value, ensure_ascii=False, separators=(",", ":"))),
+        )
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending:
+            self._conn.commit()
+            self._pending = 0
+
+    def count(self, kind: Optional[str] = None) -> int:
+        if kind is None:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM morph WHERE db_version=?",
+                (self.db_version,),
+            ).fetchone()
+        else:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM morph WHERE db_version=? AND kind=?",
+                (self.db_version, kind),
+            ).fetchone()
+        return row[0]
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
@@ -12,6 +12,10 @@ provides two operations:
    declension for nouns). Used to populate the lemma page's `forms[]`
    list, including forms not present in the corpus.
 
+Results are memoized per process and, when :func:`configure_cache` is
+given a path, persisted on disk (see :mod:`.morph_cache`) so repeat
+builds only analyze surfaces they haven't seen before.
+
 Both use the CALIMA-MSA-r13 database (the MSA / classical-Arabic
 morphology DB shipped with CAMeL Tools, ~40 MB). Production code paths
 should NOT initialize the database eagerly — the loader is module-level
@@ -27,10 +31,12 @@ VALID_POS_TAGS. Translation table lives in :data:`POS_TRANSLATION_TO_OURS`.
 """
 from __future__ import annotations
 
+import atexit
 import functools
 import re
 from typing import Dict, List, Optional, Tuple
 
+from .morph_cache import MORPHOLOGY_DB_NAME, MorphologyCache
 from .normalize import normalize_for_match, slug
 
 
@@ -47,7 +53,7 @@ def _get_analyzer():
     """
     from camel_tools.morphology.database import MorphologyDB
     from camel_tools.morphology.analyzer import Analyzer
-    db = MorphologyDB.builtin_db("calima-msa-r13", flags="a")
+    db = MorphologyDB.builtin_db(MORPHOLOGY_DB_NAME, flags="a")
     return Analyzer(db)
 
 
@@ -60,10 +66,92 @@ def _get_generator():
     """
     from camel_tools.morphology.database import MorphologyDB
     from camel_tools.morphology.generator import Generator
-    db = MorphologyDB.builtin_db("calima-msa-r13", flags="g")
+    db = MorphologyDB.builtin_db(MORPHOLOGY_DB_NAME, flags="g")
     return Generator(db)
 
 
+# ---------------------------------------------------------------------------
+# Result caching — in-process LRU in front of an optional on-disk memo
+# ---------------------------------------------------------------------------
+
+_disk_cache: Optional[MorphologyCache] = None
+
+
+def configure_cache(path: Optional[str], shared: bool = False) -> Optional[MorphologyCache]:
+    """Enable (or with ``None``, disable) the persistent morphology cache.
+
+    Once enabled, :func:`analyze` and :func:`generate_paradigm` consult the
+    SQLite memo at ``path`` before running CAMeL Tools, and record every
+    new result there. The in-process LRUs are reset so results computed
+    before the switch don't mask the disk cache.
+
+    ``shared=True`` is for processes writing the same file concurrently
+    (build workers): every row is committed on its own, so no process keeps
+    the write lock between puts.
+    """
+    global _disk_cache
+    if _disk_cache is not None:
+        _disk_cache.close()
+    if not path:
+        _disk_cache = None
+    elif shared:
+        _disk_cache = MorphologyCache(path, commit_every=1)
+    else:
+        _disk_cache = MorphologyCache(path)
+    _analyze_cached.cache_clear()
+    _generate_cached.cache_clear()
+    return _disk_cache
+
+
+@atexit.register
+def _flush_disk_cache() -> None:
+    if _disk_cache is not None:
+        _disk_cache.flush()
+
+
+class _MorphologyFailed(Exception):
+    """CAMeL Tools raised on one input.
+
+    Raised out of the cached helpers instead of returning ``[]``, so
+    neither the LRU nor the disk cache records the failure; the public
+    functions turn it into an empty result.
+    """
+
+
+@functools.lru_cache(maxsize=200_000)
+def _analyze_cached(surface_form: str) -> Tuple[Dict, ...]:
+    if _disk_cache is not None:
+        cached = _disk_cache.get("analyze", surface_form)
+        if cached is not None:
+            return tuple(cached)
+    # Outside the try: a missing CAMeL install or DB must surface.
+    analyzer = _get_analyzer()
+    try:
+        result = analyzer.analyze(surface_form)
+    except Exception as exc:
+        raise _MorphologyFailed(surface_form) from exc
+    if _disk_cache is not None:
+        _disk_cache.put("analyze", surface_form, result)
+    return tuple(result)
+
+
+@functools.lru_cache(maxsize=50_000)
+def _generate_cached(lemma: str, pos: str) -> Tuple[Dict, ...]:
+    key = f"{pos}\t{lemma}"
+    if _disk_cache is not None:
+        cached = _disk_cache.get("paradigm", key)
+        if cached is not None:
+            return tuple(cached)
+    generator = _get_generator()
+    try:
+        result = generator.generate(lemma, {"pos": pos})
+    except Exception as exc:
+        raise _MorphologyFailed(key) from exc
+    if _disk_cache is not None:
+        _disk_cache.put("paradigm", key, result)
+    return tuple(result)
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -88,11 +176,12 @@ def analyze(surface_form: str) -> List[Dict]:
     """
     if not surface_form:
         return []
-    analyzer = _get_analyzer()
     try:
-        return analyzer.analyze(surface_form)
-    except Exception:
+        analyses = _analyze_cached(surface_form)
+    except _MorphologyFailed:
         return []
+    # Copies, so callers can't mutate the cached analyses.
+    return [dict(a) for a in analyses]
 
 
 def get_best_analysis(surface_form: str) -> Optional[Dict]:
@@ -198,11 +287,11 @@ def generate_paradigm(
     """
     if not lemma:
         return []
-    gen = _get_generator()
     try:
-        return gen.generate(lemma, {"pos": pos})
-    except Exception:
+        forms = _generate_cached(lemma, pos)
+    except _MorphologyFailed:
         return []
+    return [dict(a) for a in forms]
 
 
 def paradigm_by_role(lemma: str, pos: str = "verb") -> List[Dict]:
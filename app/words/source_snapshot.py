@@ -0,0 +1,206 @@
+"""Versioned binary snapshots of the WordPageBuilder source indexes.
+
+Starting a word build used to re-read every source JSON (corpus surface
+set, QAC, Wiktextract summary + the ~221 MB full slim, Lane's orth index
+and structured entries, hawramani entries), re-map every Lane's key from
+Buckwalter through CAMeL's bw2ar, and rebuild five normalized reverse
+indexes in ``WordPageBuilder.__init__`` — minutes before the first page.
+
+:func:`compile_snapshot` persists the fully-built indexes (including the
+normalized variants) as one pickle per index plus a ``manifest.json``.
+:func:`load_snapshot` returns a builder whose indexes are
+:class:`LazyIndex` mappings: each pickle is read only when a lookup first
+touches it, so e.g. a surface-only run never loads the Wiktextract slim.
+Before forking build workers, :func:`preload_indexes` loads them all in the
+parent so the workers share one copy instead of each reading the pickles.
+
+The manifest records the snapshot format version, the size + mtime of
+every source file and a :func:`builder_fingerprint` (a hash of the modules
+that build and normalize the indexes, plus the CAMeL Tools version whose
+bw2ar table maps Lane's keys). :func:`snapshot_is_fresh` rejects a snapshot
+as soon as any of them changes.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from importlib import metadata
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional
+
+from .builders import PREBUILT_INDEX_ATTRS, WordPageBuilder
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+MANIFEST_FILENAME = "manifest.json"
+
+# Modules of this package whose code shapes the snapshotted indexes
+# (index builders, normalize_for_match, Lane's and hawramani loaders).
+BUILDER_MODULES = ("builders", "normalize", "lanes", "hawramani")
+
+
+class LazyIndex(Mapping):
+    """Read-only mapping backed by a pickle file, loaded on first access.
+
+    Pickling a ``LazyIndex`` ships only the path, so spawned worker
+    processes load the data themselves rather than receiving a copy.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data: Optional[Dict[str, Any]] = None
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            with open(self.path, "rb") as f:
+                self._data = pickle.load(f)
+            logger.debug("Loaded snapshot index %s (%d keys)", self.path, len(self._data))
+        return self._data
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"path": self.path, "_data": None}
+
+
+def _source_fingerprint(source_paths: Dict[str, str]) -> Dict[str, Optional[list]]:
+    """Map each source name to ``[size, mtime_ns]`` (None if absent)."""
+    out: Dict[str, Optional[list]] = {}
+    for name, path in sorted(source_paths.items()):
+        try:
+            st = os.stat(path)
+            out[name] = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            out[name] = None
+    return out
+
+
+def builder_fingerprint() -> str:
+    """SHA-256 over the :data:`BUILDER_MODULES` sources and the camel-tools version."""
+    digest = hashlib.sha256()
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for module in BUILDER_MODULES:
+        with open(os.path.join(package_dir, f"{module}.py"), "rb") as f:
+            digest.update(module.encode("utf-8") + b"\0" + f.read() + b"\0")
+    try:
+        camel_version = metadata.version("camel-tools")
+    except metadata.PackageNotFoundError:
+        camel_version = "none"
+    digest.update(f"camel-tools={camel_version}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def compile_snapshot(
+    builder: WordPageBuilder,
+    snapshot_dir: str,
+    source_paths: Dict[str, str],
+    options: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Write every builder index to ``snapshot_dir``; return the manifest path.
+
+    Args:
+        builder: A fully-loaded builder (normalized indexes already built).
+        snapshot_dir: Output directory (created if missing).
+        source_paths: Source name → file path, fingerprinted for staleness.
+        options: Extra load options (e.g. ``load_wikt_full``) that must
+            match for the snapshot to be reused.
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    indexes: Dict[str, Dict[str, Any]] = {}
+    for name, data in builder.prebuilt_indexes().items():
+        fname = f"{name.lstrip('_')}.pickle"
+        path = os.path.join(snapshot_dir, fname)
+        with open(path, "wb") as f:
+            pickle.dump(dict(data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        indexes[name] = {"file": fname, "keys": len(data), "bytes": os.path.getsize(path)}
+    manifest = {
+        "version": SNAPSHOT_VERSION,
+        "builder": builder_fingerprint(),
+        "options": options or {},
+        "sources": _source_fingerprint(source_paths),
+        "indexes": indexes,
+    }
+    manifest_path = os.path.abspath(os.path.join(snapshot_dir, MANIFEST_FILENAME))
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    total_mb = sum(i["bytes"] for i in indexes.values()) / 1_000_000
+    logger.info("Wrote source snapshot %s (%d indexes, %.1f MB)",
+                manifest_path, len(indexes), total_mb)
+    return manifest_path
+
+
+def _load_manifest(snapshot_dir: str) -> Optional[Dict[str, Any]]:
+    path = os.path.join(snapshot_dir, MANIFEST_FILENAME)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return None
+
+
+def snapshot_is_fresh(
+    snapshot_dir: str,
+    source_paths: Dict[str, str],
+    options: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """True if a snapshot exists, matches the format/builder/options and sources."""
+    manifest = _load_manifest(snapshot_dir)
+    if manifest is None or manifest.get("version") != SNAPSHOT_VERSION:
+        return False
+    if manifest.get("builder") != builder_fingerprint():
+        return False
+    if manifest.get("options", {}) != (options or {}):
+        return False
+    if set(manifest.get("indexes", {})) != set(PREBUILT_INDEX_ATTRS):
+        return False
+    return manifest.get("sources") == _source_fingerprint(source_paths)
+
+
+def load_snapshot(snapshot_dir: str) -> WordPageBuilder:
+    """Return a builder whose indexes load lazily from ``snapshot_dir``."""
+    manifest = _load_manifest(snapshot_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"No source snapshot in {snapshot_dir}")
+    indexes = {
+        name: LazyIndex(os.path.join(snapshot_dir, info["file"]))
+        for name, info in manifest["indexes"].items()
+    }
+    return WordPageBuilder.from_prebuilt(indexes)
+
+
+def preload_indexes(builder: WordPageBuilder) -> int:
+    """Load every still-unloaded :class:`LazyIndex` of ``builder``; return how many.
+
+    A forked worker inherits the parent's loaded indexes copy-on-write, but
+    an index first touched in a worker is read (and held) once per worker.
+    """
+    loaded = 0
+    for index in builder.prebuilt_indexes().values():
+        if isinstance(index, LazyIndex) and not index.loaded:
+            _ = index.data
+            loaded += 1
+    return loaded
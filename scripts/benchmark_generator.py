@@ -0,0 +1,453 @@
+"""Benchmark the data generator's hot paths on a synthetic corpus.
+
+Builds a synthetic ThaqalaynDataSources + ThaqalaynData pair in a temp
+directory — a Quran, hadith books (books x chapters x hadith) whose Arabic
+chains name narrators from a generated canonical_narrators.json, hadiths
+quoting Quran verses, and AI response files for a share of the hadiths —
+then times, in pipeline order:
+
+    publish_book, link_fuzzy_quran, link_related_chapters,
+    process_all_narrators, merge_ai_content, narrator_analysis.build,
+    search_index.generate_search_indexes
+
+Each scale multiplies the chapter and narrator counts and runs in its own
+process (the app reads SOURCE_DATA_DIR at import and keeps index state in
+module globals). Stages are measured with app.run_profile (wall, CPU,
+peak-RSS growth, and files/bytes going through lib_db).
+
+With two or more scales every stage gets a scaling exponent (slope of
+log time over log hadith count): ~1 is linear, ~2 quadratic. Results are
+written to --output (default benchmark_results/generator_<utc>.json) and
+--compare prints per-stage ratios against an earlier result file. With
+--check the exit status is 1 when a stage regressed by more than
+--tolerance or scales worse than --max-exponent.
+
+Usage:
+    py scripts/benchmark_generator.py
+    py scripts/benchmark_generator.py --scales 1,2,4,8 --books 3 --chapters 10
+    py scripts/benchmark_generator.py --compare benchmark_results/generator_20261019T120000Z.json --check
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Allow running this script directly without PYTHONPATH set
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+STAGES = [
+    "publish_book",
+    "link_fuzzy_quran",
+    "link_related_chapters",
+    "process_all_narrators",
+    "merge_ai_content",
+    "narrator_analysis.build",
+    "generate_search_indexes",
+]
+
+# Stages faster than this at the largest scale are too noisy to judge
+MIN_JUDGED_SECONDS = 0.05
+
+ARABIC_WORDS = (
+    "الْعِلْمُ نُورٌ يَقْذِفُهُ اللَّهُ فِي قَلْبِ مَنْ يَشَاءُ الْعَقْلُ دَلِيلُ الْمُؤْمِنِ وَ الصَّبْرُ "
+    "رَأْسُ الْإِيمَانِ إِنَّ الْحَقَّ ثَقِيلٌ مَرِيءٌ وَ الْبَاطِلَ خَفِيفٌ وَبِيءٌ مَنْ عَرَفَ نَفْسَهُ فَقَدْ "
+    "عَرَفَ رَبَّهُ الصَّلَاةُ عَمُودُ الدِّينِ وَ الزَّكَاةُ تُطَهِّرُ الْأَمْوَالَ وَ الصَّوْمُ جُنَّةٌ مِنَ النَّارِ "
+    "الْجَنَّةُ تَحْتَ أَقْدَامِ الْأُمَّهَاتِ خَيْرُ النَّاسِ أَنْفَعُهُمْ لِلنَّاسِ الدُّنْيَا مَزْرَعَةُ الْآخِرَةِ"
+).split()
+
+ENGLISH_WORDS = (
+    "knowledge intellect patience faith prayer fasting charity pilgrimage truth falsehood "
+    "repentance mercy justice guardianship purity marriage trade inheritance oaths vows "
+    "hunting food drink clothing adornment manners kinship neighbours guests supplication"
+).split()
+
+FIRST_NAMES = ["مُحَمَّدُ", "أَحْمَدُ", "عَلِيُّ", "الْحَسَنُ", "الْحُسَيْنُ", "إِبْرَاهِيمُ", "يُونُسُ",
+               "هِشَامُ", "زُرَارَةُ", "جَعْفَرُ", "سَعْدُ", "حَمَّادُ", "عُثْمَانُ", "صَفْوَانُ", "أَبَانُ"]
+FATHER_NAMES = ["يَحْيَى", "عِيسَى", "خَالِدٍ", "سَالِمٍ", "مَحْبُوبٍ", "فَضَّالٍ", "سِنَانٍ", "عُمَيْرٍ",
+                "الْحَكَمِ", "أَعْيَنَ", "مُسْلِمٍ", "سَعِيدٍ"]
+GRANDFATHER_NAMES = ["", "عَمْرٍو", "مَالِكٍ", "زَيْدٍ", "بَكْرٍ", "عَامِرٍ", "هَاشِمٍ"]
+
+TRANSLATION_ID = "en.synthetic"
+QURAN_TRANSLATION_ID = "en.synthetic-quran"
+
+
+# ---------------------------------------------------------------------------
+# Synthetic corpus
+# ---------------------------------------------------------------------------
+
+def narrator_names(count: int) -> list[str]:
+    names = []
+    for grandfather in GRANDFATHER_NAMES:
+        for first in FIRST_NAMES:
+            for father in FATHER_NAMES:
+                name = f"{first} بْنُ {father}"
+                if grandfather:
+                    name += f" بْنِ {grandfather}"
+                names.append(name)
+                if len(names) == count:
+                    return names
+    raise ValueError(f"at most {len(names)} synthetic narrator names are available")
+
+
+def write_registry(path: Path, names: list[str]) -> None:
+    narrators = {
+        str(i): {
+            "canonical_name_ar": name,
+            # Chains use the genitive after عَنْ
+            "variants_ar": [name.replace(" بْنُ ", " بْنِ ")],
+            "canonical_name_en": f"Narrator {i}",
+        }
+        for i, name in enumerate(names, start=1)
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": "synthetic", "last_id": len(names), "narrators": narrators}, f, ensure_ascii=False)
+
+
+def words(rng: random.Random, low: int, high: int, pool=ARABIC_WORDS) -> str:
+    return " ".join(rng.choice(pool) for _ in range(rng.randint(low, high)))
+
+
+def build_quran(rng: random.Random, surahs: int, verses: int):
+    from app.models import Chapter, Crumb, Language, PartType, Verse
+
+    quran = Chapter(path="/books/quran", part_type=PartType.Book, index=1, verse_start_index=0,
+                    titles={Language.EN.value: "The Holy Quran", Language.AR.value: "القرآن"},
+                    verse_translations=[QURAN_TRANSLATION_ID],
+                    default_verse_translation_ids={"en": QURAN_TRANSLATION_ID}, chapters=[])
+    quran.crumbs = [Crumb(titles=quran.titles, indexed_titles=quran.titles, path=quran.path)]
+    for s in range(1, surahs + 1):
+        surah = Chapter(part_type=PartType.Chapter, verse_start_index=0,
+                        titles={Language.EN.value: f"Surah {s}", Language.AR.value: f"سورة {s}"},
+                        verse_translations=[QURAN_TRANSLATION_ID],
+                        default_verse_translation_ids={"en": QURAN_TRANSLATION_ID}, verses=[])
+        for _ in range(verses):
+            surah.verses.append(Verse(part_type=PartType.Verse, text=[words(rng, 6, 14)],
+                                      translations={QURAN_TRANSLATION_ID: [words(rng, 6, 14, ENGLISH_WORDS)]}))
+        quran.chapters.append(surah)
+    return quran
+
+
+def hadith_text(rng: random.Random, names: list[str], quran_texts: list[str]) -> str:
+    chain = [rng.randrange(len(names)) for _ in range(rng.randint(2, 5))]
+    isnad = names[chain[0]] + "".join(" عَنْ " + names[i].replace(" بْنُ ", " بْنِ ") for i in chain[1:])
+    matn = words(rng, 10, 40)
+    if rng.random() < 0.2:
+        matn += " قَالَ اللَّهُ تَعَالَى " + rng.choice(quran_texts)
+    return f"{isnad} قَالَ: {matn}"
+
+
+def build_hadith_book(rng: random.Random, config, chapters: int, hadith: int,
+                      names: list[str], quran_texts: list[str]):
+    from app.models import Chapter, Crumb, Language, PartType, Verse
+
+    volumes = 2
+    book = Chapter(path=config.path, part_type=PartType.Book, index=config.index, verse_start_index=0,
+                   titles=config.titles, verse_translations=[TRANSLATION_ID],
+                   default_verse_translation_ids={"en": TRANSLATION_ID}, chapters=[])
+    book.crumbs = [Crumb(titles=book.titles, indexed_titles=book.titles, path=book.path)]
+    for v in range(1, volumes + 1):
+        volume = Chapter(part_type=PartType.Volume, verse_start_index=0,
+                         titles={Language.EN.value: f"Volume {v}"},
+                         verse_translations=[TRANSLATION_ID], chapters=[])
+        for _ in range(max(1, chapters // volumes)):
+            title = "Chapter on " + " and ".join(rng.sample(ENGLISH_WORDS, 2))
+            leaf = Chapter(part_type=PartType.Chapter, verse_start_index=0,
+                           titles={Language.EN.value: title, Language.AR.value: "بَابُ " + words(rng, 2, 4)},
+                           verse_translations=[TRANSLATION_ID],
+                           default_verse_translation_ids={"en": TRANSLATION_ID}, verses=[])
+            for _ in range(hadith):
+                leaf.verses.append(Verse(
+                    part_type=PartType.Hadith,
+                    text=[hadith_text(rng, names, quran_texts)],
+                    translations={TRANSLATION_ID: [words(rng, 20, 60, ENGLISH_WORDS)]},
+                ))
+            volume.chapters.append(leaf)
+        book.chapters.append(volume)
+    return book
+
+
+def ai_response(verse_path: str, text: str, names: list[str], rng: random.Random) -> dict:
+    tokens = text.split()
+    chain = rng.sample(names, 2)
+    return {
+        "verse_path": verse_path,
+        "ai_attribution": {"model": "synthetic", "generated_date": "2026-01-01", "pipeline_version": "4.0.0"},
+        "result": {
+            "tags": ["theology"],
+            "content_type": "theological",
+            "topics": [rng.choice(["reasoning", "worship", "ethics", "law"])],
+            "key_phrases": [{"phrase_ar": tokens[-1], "phrase_en": "phrase", "category": "theological_concept"}],
+            "isnad_matn": {"has_chain": True, "narrators": [
+                {"name_ar": name, "name_en": "", "role": "narrator", "position": i}
+                for i, name in enumerate(chain, start=1)
+            ]},
+            "translations": {"en": {"summary": "Synthetic summary", "key_terms": {tokens[0]: "term"},
+                                    "seo_question": "What does it say?"}},
+            "chunks": [{"chunk_type": "body", "arabic_text": text, "word_start": 0,
+                        "word_end": len(tokens), "translations": {"en": "Synthetic translation"}}],
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# One scale (child process)
+# ---------------------------------------------------------------------------
+
+def run_scale(args, scale: int) -> dict:
+    """Generate the corpus for ``scale`` and time each stage in this process."""
+    from app.ai_content_merger import merge_ai_content
+    from app.base_parser import publish_book, register_translation
+    from app.book_registry import BOOK_REGISTRY
+    from app.config import AI_PIPELINE_DATA_DIR, AI_RESPONSES_DIR
+    from app.kafi_narrators import process_all_narrators
+    from app.lib_model import ProcessingReport
+    from app.link_chapters import link_related_chapters
+    from app.link_quran_fuzzy import link_fuzzy_quran
+    from app import narrator_analysis, search_index
+    from app.models import Language
+    from app.narrator_registry import REGISTRY_FILENAME
+    from app.run_profile import profiler
+
+    rng = random.Random(args.seed)
+    dest = Path(os.environ["DESTINATION_DIR"])
+    names = narrator_names(args.narrators * scale)
+    write_registry(Path(AI_PIPELINE_DATA_DIR) / REGISTRY_FILENAME, names)
+
+    register_translation(TRANSLATION_ID, Language.EN, "Synthetic")
+    register_translation(QURAN_TRANSLATION_ID, Language.EN, "Synthetic Quran")
+    quran = build_quran(rng, args.quran_surahs, args.quran_verses)
+    quran_texts = [v.text[0] for s in quran.chapters for v in s.verses]
+    # al-Kafi must be present: process_all_narrators probes it first
+    configs = [c for c in BOOK_REGISTRY if c.slug == "al-kafi"]
+    configs += [c for c in BOOK_REGISTRY if c.slug not in ("quran", "al-kafi")][:args.books - 1]
+    books = [build_hadith_book(rng, c, args.chapters * scale, args.hadith, names, quran_texts)
+             for c in configs]
+
+    profiler.reset()
+    report = ProcessingReport()
+    with profiler.stage("publish_book"):
+        for book in [quran] + books:
+            publish_book(book, report)
+
+    # AI responses reference the published verse paths
+    os.makedirs(AI_RESPONSES_DIR, exist_ok=True)
+    ai_count = 0
+    for book in books:
+        for volume in book.chapters:
+            for chapter in volume.chapters:
+                for verse in chapter.verses:
+                    if rng.random() < args.ai_fraction:
+                        response = ai_response(verse.path, verse.text[0], names, rng)
+                        file_id = verse.path.replace("/books/", "").replace(":", "_")
+                        with open(os.path.join(AI_RESPONSES_DIR, f"{file_id}.json"), "w", encoding="utf-8") as f:
+                            json.dump(response, f, ensure_ascii=False)
+                        ai_count += 1
+
+    with profiler.stage("link_fuzzy_quran"):
+        link_fuzzy_quran()
+    with profiler.stage("link_related_chapters"):
+        link_related_chapters()
+    with profiler.stage("process_all_narrators"):
+        process_all_narrators(report, workers=1)
+    with profiler.stage("merge_ai_content"):
+        merge_ai_content(report)
+    with profiler.stage("narrator_analysis.build"):
+        narrator_analysis.build(dest)
+    with profiler.stage("generate_search_indexes"):
+        search_index.generate_search_indexes(str(dest), force=True)
+
+    hadith_count = sum(len(ch.verses) for b in books for vol in b.chapters for ch in vol.chapters)
+    return {
+        "scale": scale,
+        "corpus": {
+            "books": len(books),
+            "chapters": sum(len(vol.chapters) for b in books for vol in b.chapters),
+            "hadith": hadith_count,
+            "narrators": len(names),
+            "quran_verses": len(quran_texts),
+            "ai_responses": ai_count,
+        },
+        "stages": {
+            s["name"]: {k: v for k, v in s.items() if k not in ("name", "depth", "start_s")}
+            for s in profiler.stages
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def spawn_scale(args, scale: int) -> dict:
+    """Run one scale in a fresh interpreter against its own temp corpus."""
+    with tempfile.TemporaryDirectory(prefix=f"bench_gen_{scale}_") as tmp:
+        env = dict(os.environ)
+        env["SOURCE_DATA_DIR"] = os.path.join(tmp, "sources") + os.sep
+        env["DESTINATION_DIR"] = os.path.join(tmp, "data") + os.sep
+        env["AI_CONTENT_SUBDIR"] = "corpus"
+        env.pop("RUN_REPORT", None)
+        env.pop("RUN_TRACE", None)
+        result_path = os.path.join(tmp, "result.json")
+        cmd = [sys.executable, os.path.abspath(__file__), "--child-scale", str(scale),
+               "--child-result", result_path] + child_args(args)
+        log_path = os.path.join(tmp, "run.log")
+        with open(log_path, "w", encoding="utf-8") as log:
+            proc = subprocess.run(cmd, env=env, stdout=log, stderr=subprocess.STDOUT)
+        if proc.returncode != 0:
+            with open(log_path, encoding="utf-8") as log:
+                sys.stderr.write(log.read()[-4000:])
+            raise SystemExit(f"scale {scale} failed (exit {proc.returncode})")
+        with open(result_path, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def child_args(args) -> list[str]:
+    return ["--books", str(args.books), "--chapters", str(args.chapters), "--hadith", str(args.hadith),
+            "--narrators", str(args.narrators), "--quran-surahs", str(args.quran_surahs),
+            "--quran-verses", str(args.quran_verses), "--ai-fraction", str(args.ai_fraction),
+            "--seed", str(args.seed)]
+
+
+def scaling_exponents(runs: list[dict]) -> dict:
+    """Least-squares slope of log(wall) over log(hadith count), per stage."""
+    exponents = {}
+    if len(runs) < 2:
+        return exponents
+    for stage in STAGES:
+        points = [(math.log(r["corpus"]["hadith"]), math.log(max(r["stages"][stage]["wall_s"], 1e-6)))
+                  for r in runs if stage in r["stages"]]
+        if len(points) < 2:
+            continue
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        var_x = sum((x - mean_x) ** 2 for x, _ in points)
+        if var_x:
+            exponents[stage] = round(sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x, 2)
+    return exponents
+
+
+def git_revision() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_runs(runs: list[dict], exponents: dict) -> None:
+    header = f"{'stage':<26}" + "".join(f"{'x' + str(r['scale']):>10}" for r in runs) + f"{'exp':>7}"
+    print(header)
+    print(f"{'  hadith':<26}" + "".join(f"{r['corpus']['hadith']:>10}" for r in runs))
+    for stage in STAGES:
+        cells = "".join(f"{r['stages'][stage]['wall_s']:>9.2f}s" for r in runs)
+        exp = exponents.get(stage)
+        print(f"{stage:<26}{cells}{'' if exp is None else f'{exp:>7.2f}'}")
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Print current/baseline wall-time ratios; return the regressions."""
+    regressions = []
+    base_runs = {r["scale"]: r for r in baseline["runs"]}
+    print(f"\nCompared with {baseline.get('created_at')} ({baseline.get('git_revision') or 'unknown revision'}):")
+    for run in current["runs"]:
+        base = base_runs.get(run["scale"])
+        if base is None or base["corpus"] != run["corpus"]:
+            print(f"  x{run['scale']}: no baseline run with the same corpus")
+            continue
+        for stage in STAGES:
+            new = run["stages"][stage]["wall_s"]
+            old = base["stages"].get(stage, {}).get("wall_s")
+            if not old:
+                continue
+            ratio = new / old
+            flag = ""
+            if ratio > 1 + tolerance and new >= MIN_JUDGED_SECONDS:
+                flag = "  REGRESSION"
+                regressions.append(f"{stage} x{run['scale']}: {old:.2f}s -> {new:.2f}s")
+            print(f"  x{run['scale']} {stage:<26} {old:>8.2f}s {new:>8.2f}s {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--scales", default="1,2,4", help="Comma-separated corpus multipliers (default: 1,2,4)")
+    p.add_argument("--books", type=int, default=3, help="Hadith books, al-Kafi first (default: 3)")
+    p.add_argument("--chapters", type=int, default=10, help="Chapters per book at scale 1 (default: 10)")
+    p.add_argument("--hadith", type=int, default=10, help="Hadith per chapter (default: 10)")
+    p.add_argument("--narrators", type=int, default=50, help="Narrators at scale 1 (default: 50)")
+    p.add_argument("--quran-surahs", type=int, default=20)
+    p.add_argument("--quran-verses", type=int, default=10, help="Verses per surah (default: 10)")
+    p.add_argument("--ai-fraction", type=float, default=0.25, help="Share of hadith with AI responses")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--output", help="Result file (default: benchmark_results/generator_<utc>.json)")
+    p.add_argument("--compare", help="Earlier result file to compare against")
+    p.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs --compare (default: 0.25)")
+    p.add_argument("--max-exponent", type=float, default=1.5,
+                   help="Flag stages scaling worse than n^this (default: 1.5)")
+    p.add_argument("--check", action="store_true", help="Exit 1 when a regression is flagged")
+    p.add_argument("--child-scale", type=int, help=argparse.SUPPRESS)
+    p.add_argument("--child-result", help=argparse.SUPPRESS)
+    args = p.parse_args()
+
+    if args.child_scale is not None:
+        import logging
+        logging.basicConfig(level=logging.WARNING)
+        result = run_scale(args, args.child_scale)
+        with open(args.child_result, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    scales = sorted({int(s) for s in args.scales.split(",") if s.strip()})
+    runs = []
+    for scale in scales:
+        print(f"Running scale x{scale}...", flush=True)
+        runs.append(spawn_scale(args, scale))
+    exponents = scaling_exponents(runs)
+    created = datetime.now(timezone.utc)
+    result = {
+        "created_at": created.isoformat(),
+        "git_revision": git_revision(),
+        "python": sys.version.split()[0],
+        "params": {k: v for k, v in vars(args).items()
+                   if k in ("books", "chapters", "hadith", "narrators", "quran_surahs",
+                            "quran_verses", "ai_fraction", "seed")},
+        "runs": runs,
+        "scaling": exponents,
+    }
+
+    print()
+    print_runs(runs, exponents)
+    problems = []
+    for stage, exp in exponents.items():
+        if exp > args.max_exponent and runs[-1]["stages"][stage]["wall_s"] >= MIN_JUDGED_SECONDS:
+            problems.append(f"{stage} scales as n^{exp:.2f}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            problems += compare(result, json.load(f), args.tolerance)
+
+    output = args.output or str(REPO_ROOT / "benchmark_results" / f"generator_{created:%Y%m%dT%H%M%SZ}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nWrote {output}")
+
+    for problem in problems:
+        print(f"FLAGGED: {problem}")
+    if problems and args.check:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Benchmark complete-book serialization: legacy vs app.json_output.
+
+Legacy:  json.dumps(clean_nones(jsonable_encoder(book)), indent=2, sort_keys=True)
+Current: json_output.dumpb(json_output.to_jsonable(book))
+
+Builds a synthetic al-Kafi-sized book (default 16,000 hadith in 8 volumes)
+so it runs without ThaqalaynData, checks both paths produce the same bytes,
+and prints the best of N timings for each stage. It then compares peak
+traced memory of writing the file from a full dict copy against the
+streaming writer (json_output.write_json on the model).
+
+Usage:
+    py scripts/benchmark_serialization.py
+    py scripts/benchmark_serialization.py --verses 4000 --repeat 5 --profile compact
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Allow running this script directly without PYTHONPATH set
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from app import json_output  # noqa: E402
+from app.lib_db import clean_nones  # noqa: E402
+from app.models import Chapter, PartType, Verse  # noqa: E402
+from app.models.quran import NarratorChain, SpecialText  # noqa: E402
+
+ARABIC = "عَلِيُّ بْنُ إِبْرَاهِيمَ عَنْ أَبِيهِ عَنِ ابْنِ أَبِي عُمَيْرٍ عَنْ هِشَامِ بْنِ الْحَكَمِ قَالَ"
+ENGLISH = "Ali ibn Ibrahim has narrated from his father from ibn abu Umayr from Hisham ibn al-Hakam who has said"
+
+
+def build_book(verse_count: int, volumes: int = 8, per_chapter: int = 20) -> Chapter:
+    book = Chapter(path="/books/bench", part_type=PartType.Book, titles={"en": "Bench", "ar": "بنش"}, chapters=[])
+    n = 0
+    per_volume = max(1, verse_count // volumes)
+    for v in range(1, volumes + 1):
+        volume = Chapter(path=f"/books/bench:{v}", part_type=PartType.Volume, index=v,
+                         titles={"en": f"Volume {v}", "ar": None}, chapters=[])
+        book.chapters.append(volume)
+        for c in range(1, per_volume // per_chapter + 1):
+            chapter = Chapter(path=f"/books/bench:{v}:{c}", part_type=PartType.Chapter, index=c,
+                              local_index=c, titles={"en": f"Chapter {c}", "ar": "بَابُ"},
+                              verse_translations=["en.hubeali"], verses=[])
+            volume.chapters.append(chapter)
+            for h in range(1, per_chapter + 1):
+                n += 1
+                verse = Verse(
+                    index=n, local_index=h, part_type=PartType.Hadith,
+                    path=f"/books/bench:{v}:{c}:{h}",
+                    text=[ARABIC * 3],
+                    translations={"en.hubeali": [ENGLISH * 3]},
+                    narrator_chain=NarratorChain(text=ARABIC, parts=[
+                        SpecialText(kind="narrator", text="عَلِيُّ", path=f"/people/narrators/{n % 500}"),
+                        SpecialText(kind="plain", text=" عَنْ "),
+                    ]),
+                )
+                if n % 3 == 0:
+                    verse.relations = {"Mentions": {f"/books/quran:{n % 114 + 1}:{k}" for k in range(1, 4)}}
+                chapter.verses.append(verse)
+    return book
+
+
+def legacy_encode(book):
+    return clean_nones(jsonable_encoder(book))
+
+
+def legacy_dump(data, compact: bool) -> bytes:
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8")
+
+
+def best_of(repeat: int, fn, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_memory(fn, *args) -> int:
+    tracemalloc.start()
+    try:
+        fn(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def write_materialized(path: str, book, profile: str) -> None:
+    with open(path, "wb") as f:
+        f.write(json_output.dumpb(json_output.to_jsonable(book), profile))
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--verses", type=int, default=16000)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--profile", choices=json_output.PROFILES, default=json_output.PROFILE_PRETTY)
+    args = p.parse_args()
+    compact = args.profile == json_output.PROFILE_COMPACT
+
+    book = build_book(args.verses)
+
+    t_old_enc, old_data = best_of(args.repeat, legacy_encode, book)
+    t_old_dump, old_bytes = best_of(args.repeat, legacy_dump, old_data, compact)
+    t_new_enc, new_data = best_of(args.repeat, json_output.to_jsonable, book)
+    t_new_dump, new_bytes = best_of(args.repeat, json_output.dumpb, new_data, args.profile)
+
+    print(f"Synthetic book: {args.verses} verses, {len(old_bytes) / 1e6:.1f} MB ({args.profile})")
+    print(f"orjson: {'yes' if json_output.orjson is not None else 'no (json fallback)'}")
+    print(f"{'stage':<10} {'legacy':>10} {'current':>10} {'speedup':>8}")
+    for stage, old, new in (("encode", t_old_enc, t_new_enc),
+                            ("dump", t_old_dump, t_new_dump),
+                            ("total", t_old_enc + t_old_dump, t_new_enc + t_new_dump)):
+        print(f"{stage:<10} {old * 1000:>8.0f}ms {new * 1000:>8.0f}ms {old / new:>7.1f}x")
+    print(f"identical output: {old_bytes == new_bytes}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        full_path = os.path.join(tmp, "full.json")
+        stream_path = os.path.join(tmp, "stream.json")
+        full_peak = peak_memory(write_materialized, full_path, book, args.profile)
+        stream_peak = peak_memory(json_output.write_json, stream_path, book, "complete_book", args.profile)
+        with open(full_path, "rb") as f1, open(stream_path, "rb") as f2:
+            streamed_same = f1.read() == f2.read()
+    print(f"peak memory writing the file: full dict {full_peak / 1e6:.1f} MB, "
+          f"streamed {stream_peak / 1e6:.1f} MB (identical: {streamed_same})")
+    if old_bytes != new_bytes or not streamed_same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
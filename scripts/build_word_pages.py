@@ -25,10 +25,18 @@ Usage:
 
     # Full corpus build (long-running — ~102K surfaces, ~10-30 min)
     python scripts/build_word_pages.py --full
+
+    # Same, sharded across 8 worker processes
+    python scripts/build_word_pages.py --full --workers 8
+
+    # Precompile the source-index snapshot (also done automatically
+    # whenever a source file changes)
+    python scripts/build_word_pages.py --compile-snapshot
 """
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import logging
 import sys
@@ -49,8 +57,14 @@ from app.words.builders import (  # noqa: E402  (sys.path setup must precede)
     build_lanes_arabic_index,
     canonical_diacritized_lemma,
 )
-from app.words.morphology import get_best_analysis  # noqa: E402
+from app.words.morphology import configure_cache, get_best_analysis  # noqa: E402
 from app.words.normalize import slug  # noqa: E402
+from app.words.source_snapshot import (  # noqa: E402
+    compile_snapshot,
+    load_snapshot,
+    preload_indexes,
+    snapshot_is_fresh,
+)
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger(__name__)
@@ -74,6 +88,14 @@ HAWRAMANI_ENTRIES_PATH = (
 # script reads it when present; missing → just leaves definition/etymology/
 # ipa as null, same as before this integration.
 WIKT_FULL_PATH = WIKT_CACHE / "wiktextract_arabic_lemmas.json"
+# Persistent CAMeL analysis/paradigm memo (see app.words.morph_cache).
+# Repeat builds only run the analyzer on surfaces not seen before.
+MORPH_CACHE_PATH = (PROJECT_ROOT / "tmp" / "morphology_cache.sqlite").resolve()
+# Compiled source-index snapshot (see app.words.source_snapshot). Rebuilt
+# automatically whenever any source file above changes.
+SNAPSHOT_DIR = (PROJECT_ROOT / "tmp" / "word_source_snapshot").resolve()
+# Surfaces/lemmas handed to a worker per round trip in --workers mode.
+PARALLEL_CHUNKSIZE = 256
 
 
 def load_sources(load_wikt_full: bool = True) -> WordPageBuilder:
@@ -150,6 +172,40 @@ def load_sources(load_wikt_full: bool = True) -> WordPageBuilder:
     )
 
 
+def _snapshot_source_paths() -> Dict[str, str]:
+    return {
+        "corpus": str(CORPUS_PATH),
+        "qac": str(QAC_PATH),
+        "wikt_summary": str(WIKT_PATH),
+        "wikt_full": str(WIKT_FULL_PATH),
+        "lanes_orth": str(LANES_ORTH_PATH),
+        "lanes_entries": str(LANES_ENTRIES_PATH),
+        "hawramani_entries": str(HAWRAMANI_ENTRIES_PATH),
+    }
+
+
+def load_builder(
+    snapshot_dir: Optional[Path] = SNAPSHOT_DIR,
+    rebuild: bool = False,
+) -> WordPageBuilder:
+    """Return a builder, via the compiled source snapshot when it's fresh.
+
+    A stale or missing snapshot falls back to :func:`load_sources` and is
+    recompiled for the next run. ``snapshot_dir=None`` always parses the
+    sources and writes nothing.
+    """
+    if snapshot_dir is None:
+        return load_sources()
+    paths = _snapshot_source_paths()
+    options = {"load_wikt_full": True}
+    if not rebuild and snapshot_is_fresh(str(snapshot_dir), paths, options):
+        logger.info("Using source snapshot %s", snapshot_dir)
+        return load_snapshot(str(snapshot_dir))
+    builder = load_sources()
+    compile_snapshot(builder, str(snapshot_dir), paths, options)
+    return builder
+
+
 def pick_surfaces(
     builder: WordPageBuilder,
     *,
@@ -201,6 +257,104 @@ def write_page(out_dir: Path, slug_text: str, data: Dict) -> None:
         json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
 
 
+# ---------------------------------------------------------------------------
+# Map tasks — shared by the serial and the multi-process build
+# ---------------------------------------------------------------------------
+
+# Per-process build state. In the parent (serial mode) and in forked
+# workers ``builder`` is the parent's already-loaded WordPageBuilder, shared
+# copy-on-write; spawned workers load their own copy once in _init_worker.
+_STATE: Dict = {}
+
+
+def _init_worker(
+    out_dir: Path,
+    dry_run: bool,
+    morph_cache_path: Optional[str],
+    load_in_worker: bool,
+    snapshot_dir: Optional[Path] = None,
+) -> None:
+    """Pool initializer: set up the builder + morphology cache per worker."""
+    if load_in_worker:
+        # The parent already refreshed the snapshot, so this is a lazy load.
+        _STATE["builder"] = (
+            load_snapshot(str(snapshot_dir)) if snapshot_dir else load_sources()
+        )
+    _STATE["out_dir"] = out_dir
+    _STATE["dry_run"] = dry_run
+    # Each worker opens its own SQLite connection (never share across fork),
+    # committing row by row so concurrent workers never wait on a batch.
+    configure_cache(morph_cache_path, shared=True)
+    if morph_cache_path:
+        # Pool workers leave via os._exit, which skips atexit; multiprocessing
+        # finalizers do run, so close (and flush) the cache from one.
+        from multiprocessing.util import Finalize
+        Finalize(None, configure_cache, args=(None,), exitpriority=10)
+
+
+def _surface_task(surface: str) -> Dict:
+    """Build + write one surface page; return what the reduce step needs."""
+    builder: WordPageBuilder = _STATE["builder"]
+    page = builder.build_surface(surface)
+    if not _STATE["dry_run"]:
+        write_page(_STATE["out_dir"] / "surfaces", page["slug"], page)
+    morph = page.get("morphology") or {}
+    return {
+        "has_morph": page.get("morphology") is not None,
+        "lemma_slug": morph.get("lemma_slug"),
+        "pos_camel": morph.get("pos_camel"),
+    }
+
+
+def _lemma_task(item) -> Dict:
+    """Build + write one lemma page; return its summary for root assembly."""
+    lemma_slug, pos_camel = item
+    builder: WordPageBuilder = _STATE["builder"]
+    # Pass POS hint to build_lemma so the paradigm generator gets
+    # the right base POS.
+    lemma_page = builder.build_lemma(lemma_slug, pos_hint=pos_camel or "verb")
+    if not _STATE["dry_run"]:
+        write_page(_STATE["out_dir"] / "lemmas", lemma_slug, lemma_page)
+    refs = lemma_page.get("cross_references", {})
+    return {
+        "slug": lemma_page["slug"],
+        "root": lemma_page.get("root"),
+        "pos": lemma_page.get("pos"),
+        "frequency": lemma_page.get("frequency_in_corpus", 0),
+        "qac": bool(refs.get("qac", {}).get("found")),
+        "wikt": bool(refs.get("wiktextract", {}).get("found")),
+        "lanes": bool(refs.get("lanes", {}).get("found")),
+        # build_lemma records matched Wiktextract entries on the builder;
+        # workers hand them back so the parent can write the corpus slim.
+        "wikt_entries": builder.wikt_matched_lemmas.pop(lemma_page["slug"], None),
+    }
+
+
+def _open_pool(workers: int, builder: WordPageBuilder, out_dir: Path,
+               dry_run: bool, morph_cache_path: Optional[str],
+               snapshot_dir: Optional[Path] = None):
+    """Start a worker pool, fork-sharing the loaded builder where possible."""
+    import multiprocessing
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("fork")
+        # Indexes still unloaded at fork time would be read by every worker.
+        preloaded = preload_indexes(builder)
+        if preloaded:
+            logger.info("Loaded %d snapshot indexes before forking", preloaded)
+        _STATE["builder"] = builder
+        load_in_worker = False
+    else:
+        # Windows: no fork, so every worker loads the source indexes once.
+        ctx = multiprocessing.get_context("spawn")
+        load_in_worker = True
+    return ctx.Pool(
+        workers,
+        initializer=_init_worker,
+        initargs=(out_dir, dry_run, morph_cache_path, load_in_worker, snapshot_dir),
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(description=__doc__)
     g = parser.add_mutually_exclusive_group()
@@ -214,9 +368,32 @@ def main():
                         help="Output directory (default: ../ThaqalaynWords)")
     parser.add_argument("--dry-run", action="store_true",
                         help="Don't write files, just compute + log stats")
+    parser.add_argument("--morph-cache", type=Path, default=MORPH_CACHE_PATH,
+                        help="On-disk morphology cache (default: tmp/morphology_cache.sqlite)")
+    parser.add_argument("--no-morph-cache", action="store_true",
+                        help="Run CAMeL Tools for every form without the disk cache")
+    parser.add_argument("--snapshot-dir", type=Path, default=SNAPSHOT_DIR,
+                        help="Compiled source-index snapshot (default: tmp/word_source_snapshot)")
+    parser.add_argument("--no-snapshot", action="store_true",
+                        help="Parse the source JSONs directly; don't read or write a snapshot")
+    parser.add_argument("--compile-snapshot", action="store_true",
+                        help="(Re)compile the source snapshot and exit")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for the surface/lemma map steps "
+                             "(default 1 = serial)")
     args = parser.parse_args()
 
-    builder = load_sources()
+    morph_cache = None if args.no_morph_cache else configure_cache(str(args.morph_cache))
+    if morph_cache is not None:
+        logger.info("Morphology cache: %s (%d analyses, %d paradigms)",
+                    morph_cache.path, morph_cache.count("analyze"),
+                    morph_cache.count("paradigm"))
+
+    snapshot_dir = None if args.no_snapshot else args.snapshot_dir
+    if args.compile_snapshot:
+        load_builder(args.snapshot_dir, rebuild=True)
+        return
+    builder = load_builder(snapshot_dir)
 
     surfaces = pick_surfaces(
         builder,
@@ -232,60 +409,62 @@ def main():
         (out_dir / "lemmas").mkdir(parents=True, exist_ok=True)
         (out_dir / "roots").mkdir(parents=True, exist_ok=True)
 
-    # Stats
+    workers = max(1, args.workers)
+    morph_cache_path = None if args.no_morph_cache else str(args.morph_cache)
+    pool = None
+    if workers > 1:
+        # Workers open their own cache connections; close the parent's first.
+        configure_cache(None)
+        pool = _open_pool(workers, builder, out_dir, args.dry_run,
+                          morph_cache_path, snapshot_dir)
+        logger.info("Parallel build: %d worker processes", workers)
+        run = functools.partial(pool.imap, chunksize=PARALLEL_CHUNKSIZE)
+    else:
+        _STATE.update(builder=builder, out_dir=out_dir, dry_run=args.dry_run)
+        run = map
+
+    # ----- Map: surface pages -------------------------------------------
     written_surfaces = 0
-    written_lemmas = 0
-    seen_lemmas: Set[str] = set()
-    # root → list of {slug, pos, frequency} for root-page assembly.
-    lemmas_by_root: Dict[str, List[Dict]] = {}
     no_morph = 0
+    # Reduce: dedup lemmas in surface order — the first surface that
+    # yields a lemma supplies its POS hint, same as a serial walk.
+    lemma_hints: Dict[str, Optional[str]] = {}
+    for result in run(_surface_task, surfaces):
+        written_surfaces += 1
+        if not result["has_morph"]:
+            no_morph += 1
+        lemma_slug = result["lemma_slug"]
+        if lemma_slug and lemma_slug not in lemma_hints:
+            lemma_hints[lemma_slug] = result["pos_camel"]
+    logger.info("Surface pages done: %d (unique lemmas: %d)",
+                written_surfaces, len(lemma_hints))
+
+    # ----- Map: lemma pages ---------------------------------------------
+    written_lemmas = 0
     qac_hits = 0
     wikt_hits = 0
     lanes_hits = 0
-
-    for surface in surfaces:
-        page = builder.build_surface(surface)
-        if page.get("morphology") is None:
-            no_morph += 1
-        if not args.dry_run:
-            write_page(out_dir / "surfaces", page["slug"], page)
-        written_surfaces += 1
-
-        morph = page.get("morphology")
-        if not morph:
-            continue
-        lemma_slug = morph.get("lemma_slug")
-        if not lemma_slug:
-            continue
-        if lemma_slug in seen_lemmas:
-            continue
-        seen_lemmas.add(lemma_slug)
-
-        # Pass POS hint to build_lemma so the paradigm generator gets
-        # the right base POS.
-        pos_camel = morph.get("pos_camel") or "verb"
-        lemma_page = builder.build_lemma(lemma_slug, pos_hint=pos_camel)
-
-        refs = lemma_page.get("cross_references", {})
-        if refs.get("qac", {}).get("found"):
-            qac_hits += 1
-        if refs.get("wiktextract", {}).get("found"):
-            wikt_hits += 1
-        if refs.get("lanes", {}).get("found"):
-            lanes_hits += 1
-
+    # root → list of {slug, pos, frequency} for root-page assembly.
+    lemmas_by_root: Dict[str, List[Dict]] = {}
+    for summary in run(_lemma_task, list(lemma_hints.items())):
+        written_lemmas += 1
+        qac_hits += summary["qac"]
+        wikt_hits += summary["wikt"]
+        lanes_hits += summary["lanes"]
+        if summary["wikt_entries"]:
+            builder.wikt_matched_lemmas[summary["slug"]] = summary["wikt_entries"]
         # Bucket for root assembly (skip lemmas with no/foreign root).
-        lemma_root = lemma_page.get("root")
+        lemma_root = summary["root"]
         if lemma_root and lemma_root != "FOREIGN":
             lemmas_by_root.setdefault(lemma_root, []).append({
-                "slug": lemma_page["slug"],
-                "pos": lemma_page.get("pos"),
-                "frequency": lemma_page.get("frequency_in_corpus", 0),
+                "slug": summary["slug"],
+                "pos": summary["pos"],
+                "frequency": summary["frequency"],
             })
 
-        if not args.dry_run:
-            write_page(out_dir / "lemmas", lemma_slug, lemma_page)
-        written_lemmas += 1
+    if pool is not None:
+        pool.close()
+        pool.join()
 
     # ----- Build root pages from the accumulated lemmas_by_root --------
     from app.words.builders import root_to_slug
@@ -337,6 +516,10 @@ def main():
         match_pct = 100 * len(builder.wikt_matched_lemmas) / max(written_lemmas, 1)
         logger.info("  Wikt content merged: %d lemmas (%.1f%%)",
                     len(builder.wikt_matched_lemmas), match_pct)
+    if morph_cache is not None and workers == 1:
+        morph_cache.flush()
+        logger.info("  Morphology cache: %d hits, %d misses",
+                    morph_cache.hits, morph_cache.misses)
 
 
 if __name__ == "__main__":
@@ -411,6 +411,8 @@ def cmd_apply(args: argparse.Namespace) -> None:
                     continue
                 fpath = os.path.join(root, fname)
                 data = load_json(fpath)
+                if data.get("kind") == "verse_translations":  # translation bundle
+                    continue
                 inner = data.get("data", data)
                 chapters = inner.get("chapters")
                 if not chapters or not isinstance(chapters, list):
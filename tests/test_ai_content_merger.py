@@ -768,6 +768,28 @@ class TestMergeAiIntoFileSplitVerseDetail:
         for chunk in ai["chunks"]:
             assert "translations" not in chunk
 
+    def test_sister_file_keeps_none_chunk_placeholders(self, tmp_path):
+        doc = {
+            "kind": "verse_detail",
+            "index": "al-kafi:1:1:1:1",
+            "data": {
+                "verse": {"path": "/books/al-kafi:1:1:1:1", "text": ["arabic"]},
+                "chapter_path": "/books/al-kafi:1:1:1",
+                "verse_translations": ["en.hubeali"],
+            },
+        }
+        fpath = str(tmp_path / "1.json")
+        _write_json(fpath, doc)
+
+        result = _sample_ai_result()
+        del result["chunks"][0]["translations"]["fr"]
+        lookup = {"/books/al-kafi:1:1:1:1": {"ai_attribution": _sample_attribution(), "result": result}}
+        merge_ai_into_file(fpath, lookup)
+
+        # Index-aligned: the second chunk's translation stays at index 1
+        fr_sister = _read_json(str(tmp_path / "1.fr.json"))
+        assert fr_sister["ai"]["chunks"] == [None, "Ja'far"]
+
     def test_sister_file_contents(self, tmp_path):
         doc = {
             "kind": "verse_detail",
@@ -989,6 +1011,53 @@ class TestMergeAiContentIntegration:
         assert "en.ai" in trans
         assert "en.qarai" in trans
 
+    def test_phrases_index_uses_key_phrases_dictionary(self, tmp_path):
+        resp_dir = tmp_path / "responses"
+        resp_dir.mkdir()
+        _write_json(str(resp_dir / "al-kafi_1_1_1_1.json"), _sample_wrapper())
+        dest_dir = tmp_path / "dest"
+        books_dir = dest_dir / "books" / "al-kafi" / "1" / "1"
+        books_dir.mkdir(parents=True)
+        _write_json(str(books_dir / "1.json"), {
+            "kind": "verse_list",
+            "index": "al-kafi:1:1:1",
+            "data": {"verses": [{"path": "/books/al-kafi:1:1:1:1", "index": 1, "text": ["قال الله"]}]},
+        })
+        (dest_dir / "index").mkdir()
+        _write_json(str(dest_dir / "index" / "translations.json"), {})
+        dictionary = {"phrases": [{"phrase_ar": "الله", "phrase_en": "God", "category": "theological_concept"}]}
+
+        with patch.dict(os.environ, {"DESTINATION_DIR": str(dest_dir) + "/"}):
+            with patch("app.ai_content_merger.AI_RESPONSES_DIR", str(resp_dir)), \
+                    patch("app.ai_pipeline.load_key_phrases_dictionary", return_value=dictionary):
+                merge_ai_content()
+
+        phrases = _read_json(str(dest_dir / "index" / "phrases.json"))
+        assert any(e["phrase_en"] == "God" and e["paths"] == ["/books/al-kafi:1:1:1:1"]
+                   for e in phrases.values())
+
+    def test_merges_into_detail_file_removed_into_pack(self, tmp_path):
+        from app.verse_pack import pack_book
+        resp_dir = tmp_path / "responses"
+        resp_dir.mkdir()
+        _write_json(str(resp_dir / "al-kafi_1_1_1_1.json"), _sample_wrapper())
+        dest_dir = tmp_path / "dest"
+        detail = dest_dir / "books" / "al-kafi" / "1" / "1" / "1" / "1.json"
+        _write_json(str(detail), {
+            "kind": "verse_detail",
+            "index": "al-kafi:1:1:1:1",
+            "data": {"verse": {"path": "/books/al-kafi:1:1:1:1", "index": 1, "text": ["arabic"]}},
+        })
+        _write_json(str(dest_dir / "index" / "translations.json"), {})
+        pack_book(str(dest_dir), "al-kafi", remove_files=True)
+        assert not detail.exists()
+
+        with patch.dict(os.environ, {"DESTINATION_DIR": str(dest_dir) + "/"}):
+            with patch("app.ai_content_merger.AI_RESPONSES_DIR", str(resp_dir)):
+                merge_ai_content()
+
+        assert "ai" in _read_json(str(detail))["data"]["verse"]
+
     def test_no_ai_content_dir(self, tmp_path):
         """Should handle missing AI directory gracefully."""
         dest_dir = tmp_path / "dest"
@@ -444,6 +444,104 @@ class TestIngestion:
         assert counters["ingested"] == 0
 
 
+class TestShellIngestion:
+    @pytest.fixture
+    def shell_chapter(self, tmp_path, monkeypatch):
+        """A shellified chapter with two verse_detail files."""
+        dest_dir = tmp_path / "data"
+        monkeypatch.setenv("DESTINATION_DIR", str(dest_dir) + "/")
+        chapter_dir = dest_dir / "books" / "test" / "1"
+        chapter_dir.mkdir(parents=True)
+
+        chapter = {
+            "index": "test:1",
+            "kind": "verse_list",
+            "data": {
+                "path": "/books/test:1",
+                "verse_translations": ["en.test"],
+                "default_verse_translation_ids": {"en": "en.test"},
+                "verse_refs": [{"local_index": n, "part_type": "Hadith", "path": f"/books/test:1:{n}"}
+                               for n in (1, 2)],
+            },
+        }
+        (dest_dir / "books" / "test" / "1.json").write_text(json.dumps(chapter), encoding="utf-8")
+        for n in (1, 2):
+            detail = {
+                "index": f"test:1:{n}",
+                "kind": "verse_detail",
+                "data": {
+                    "verse": {"path": f"/books/test:1:{n}", "part_type": "Hadith",
+                              "translations": {"en.test": [f"Hadith {n}"]}},
+                    "chapter_path": "/books/test:1",
+                    "verse_translations": ["en.test"],
+                },
+            }
+            (chapter_dir / f"{n}.json").write_text(json.dumps(detail), encoding="utf-8")
+        return dest_dir
+
+    @staticmethod
+    def _results(langs=("ur", "tr"), verses=(1, 2)):
+        return [
+            TranslationResult(custom_id=f"test:1:{n}__{lang}", verse_path=f"/books/test:1:{n}",
+                              target_lang=lang, translated_text=f"{lang} {n}")
+            for n in verses for lang in langs
+        ]
+
+    def test_ingest_updates_verse_details_and_shell(self, shell_chapter):
+        counters = ingest_translations(self._results())
+        assert counters["ingested"] == 4
+        assert counters["files_written"] == 3
+
+        from app.lib_db import load_json
+        detail = load_json("/books/test:1:2")["data"]
+        assert detail["verse"]["translations"]["tr.ai"] == ["tr 2"]
+        assert detail["verse"]["translations"]["en.test"] == ["Hadith 2"]
+        assert detail["verse_translations"] == ["en.test", "tr.ai", "ur.ai"]
+        assert load_json("/books/test:1")["data"]["verse_translations"] == ["en.test", "tr.ai", "ur.ai"]
+        assert {f["kind"] for f in counters["files"]} == {"verse_list", "verse_detail"}
+        assert all(f["seconds"] >= 0 for f in counters["files"])
+
+    def test_reingest_leaves_files_unchanged(self, shell_chapter):
+        ingest_translations(self._results())
+        detail_file = shell_chapter / "books" / "test" / "1" / "1.json"
+        mtime = detail_file.stat().st_mtime_ns
+
+        counters = ingest_translations(self._results())
+        assert counters["files_written"] == 0
+        assert counters["files_unchanged"] == 3
+        assert detail_file.stat().st_mtime_ns == mtime
+
+    def test_missing_verse_detail_is_skipped(self, shell_chapter):
+        counters = ingest_translations(self._results(langs=("ur",), verses=(1, 9)))
+        assert counters["ingested"] == 1
+        assert counters["skipped"] == 1
+
+    def test_bundled_book_writes_translation_bundle(self, shell_chapter, monkeypatch):
+        monkeypatch.setenv("TRANSLATION_BUNDLE_BOOKS", "test")
+        ingest_translations(self._results(langs=("ur",), verses=(1,)))
+        ingest_translations(self._results(langs=("ur",), verses=(2,)))
+
+        from app.lib_db import load_json
+        detail = load_json("/books/test:1:1")["data"]
+        assert "ur.ai" not in detail["verse"]["translations"]
+        assert "ur.ai" in detail["verse_translations"]
+        bundle = load_json("/books/test:1/translations/ur.ai")
+        assert bundle["kind"] == "verse_translations"
+        assert bundle["data"]["verses"] == {"/books/test:1:1": ["ur 1"], "/books/test:1:2": ["ur 2"]}
+
+    def test_workers_match_serial(self, shell_chapter):
+        chapter_two = shell_chapter / "books" / "test" / "2.json"
+        chapter_two.write_text(json.dumps({"index": "test:2", "kind": "verse_list",
+                                           "data": {"path": "/books/test:2", "verse_refs": []}}),
+                               encoding="utf-8")
+        results = self._results() + [TranslationResult(custom_id="test:2:1__ur", verse_path="/books/test:2:1",
+                                                       target_lang="ur", translated_text="x")]
+        counters = ingest_translations(results, workers=2)
+        assert counters["ingested"] == 4
+        assert counters["skipped"] == 1
+        assert [f["path"] for f in counters["files"]] == sorted(f["path"] for f in counters["files"])
+
+
 # ===================================================================
 # Cost estimation tests
 # ===================================================================
@@ -0,0 +1,94 @@
+"""Tests for the altafsir ayah-window chunk writer and editions.json tagging."""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), "app"))
+
+import altafsir_converter  # noqa: E402  (the script imports ``config`` as a top-level module)
+from altafsir_converter import (  # noqa: E402
+    build_ayah_index,
+    update_editions_index,
+    write_surah_chunks,
+)
+
+# Surah of 5 ayahs: block 0 covers ayahs 1-3, block 1 covers 4-5.
+BLOCKS = ["<p>first</p>", "<p>second</p>"]
+AYAHS = [{"ayah": a, "block": 0 if a <= 3 else 1} for a in (5, 1, 3, 2, 4)]
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestBuildAyahIndex:
+    def test_window_one(self):
+        index = build_ayah_index(AYAHS, len(BLOCKS), 1)
+        assert index["window"] == 1
+        assert index["ayahs"]["1"] == {"block": 0, "chunk": 1}
+        assert index["ayahs"]["5"] == {"block": 1, "chunk": 5}
+        assert index["chunks"] == {str(a): [a, a] for a in range(1, 6)}
+
+    def test_wider_window(self):
+        index = build_ayah_index(AYAHS, len(BLOCKS), 3)
+        assert [index["ayahs"][str(a)]["chunk"] for a in range(1, 6)] == [1, 1, 1, 2, 2]
+        assert index["chunks"] == {"1": [1, 3], "2": [4, 5]}
+
+    def test_block_spanning_ayahs(self):
+        index = build_ayah_index(AYAHS, len(BLOCKS), 2)
+        assert index["blocks"] == [[1, 3], [4, 5]]
+        assert index["chunks"] == {"1": [1, 2], "2": [3, 4], "3": [5, 5]}
+
+
+class TestWriteSurahChunks:
+    def test_chunks_carry_only_their_blocks(self, tmp_path):
+        assert write_surah_chunks(str(tmp_path), "ar-test", 7, BLOCKS, AYAHS, 2) == 3
+        surah_dir = tmp_path / "7"
+        assert _load(surah_dir / "index.json")["edition"] == "ar-test"
+        chunk = _load(surah_dir / "2.json")
+        assert [a["ayah"] for a in chunk["ayahs"]] == [3, 4]
+        assert chunk["blocks"] == {"0": BLOCKS[0], "1": BLOCKS[1]}
+        assert _load(surah_dir / "3.json")["blocks"] == {"1": BLOCKS[1]}
+
+    def test_removes_chunks_of_earlier_window(self, tmp_path):
+        write_surah_chunks(str(tmp_path), "ar-test", 7, BLOCKS, AYAHS, 1)
+        write_surah_chunks(str(tmp_path), "ar-test", 7, BLOCKS, AYAHS, 3)
+        assert sorted(os.listdir(tmp_path / "7")) == ["1.json", "2.json", "index.json"]
+        assert _load(tmp_path / "7" / "index.json")["window"] == 3
+
+
+class TestUpdateEditionsIndex:
+    INFO = {"edition_id": "ar-new", "name_ar": "جديد", "name_en": "New",
+            "author_ar": "مؤلف", "author_en": "Author"}
+
+    @pytest.fixture
+    def editions_file(self, tmp_path, monkeypatch):
+        path = tmp_path / "editions.json"
+        path.write_text(json.dumps([{"id": "ar-old", "name_en": "Old", "language": "ar",
+                                     "granularity": ["surah", "ayah"], "ayah_window": 1}]),
+                        encoding="utf-8")
+        monkeypatch.setattr(altafsir_converter, "EDITIONS_FILE", str(path))
+        return path
+
+    def test_tags_existing_and_new_editions(self, editions_file):
+        update_editions_index([(1, {**self.INFO, "edition_id": "ar-old"}), (2, self.INFO)], window=5)
+        by_id = {e["id"]: e for e in _load(editions_file)}
+        assert by_id["ar-old"]["name_en"] == "Old"
+        for eid in ("ar-old", "ar-new"):
+            assert by_id[eid]["granularity"] == ["surah", "window"]
+            assert by_id[eid]["ayah_window"] == 5
+        assert by_id["ar-new"]["source"] == "altafsir.com"
+
+    def test_window_one_is_ayah_granularity(self, editions_file):
+        update_editions_index([(2, self.INFO)], window=1)
+        by_id = {e["id"]: e for e in _load(editions_file)}
+        assert by_id["ar-new"]["granularity"] == ["surah", "ayah"]
+
+    def test_dry_run_leaves_file(self, editions_file):
+        before = editions_file.read_text(encoding="utf-8")
+        update_editions_index([(2, self.INFO)], dry_run=True, window=3)
+        assert editions_file.read_text(encoding="utf-8") == before
@@ -0,0 +1,136 @@
+"""Tests for the columnar analytics export of responses and stats."""
+
+import array
+import json
+
+import pytest
+
+from app.pipeline_cli import analytics_export
+from app.pipeline_cli.analytics_export import (
+    export_analytics,
+    flatten_verse,
+    iter_rows,
+    load_manifest,
+    load_table,
+    read_npy,
+    write_npy,
+)
+from app.pipeline_cli.pipeline import save_verse_stats
+
+
+def _wrapper(verse_path, narrators=2):
+    return {
+        "verse_path": verse_path,
+        "ai_attribution": {"model": "gpt-5-mini", "generated_date": "2026-03-01",
+                           "pipeline_version": "4.0.0", "generation_method": "openai_api"},
+        "result": {
+            "content_type": "legal",
+            "word_analysis": [{"word": "قال"}, {"word": "أبو"}, {"word": "جعفر"}],
+            "tags": ["prayer"],
+            "isnad_matn": {
+                "has_chain": True,
+                "narrators": [
+                    {"name_ar": f"راو {n}", "name_en": f"Narrator {n}", "role": "narrator",
+                     "position": n, "identity_confidence": "definite", "canonical_id": 10 + n,
+                     "word_ranges": [{"word_start": n, "word_end": n + 1}]}
+                    for n in range(1, narrators + 1)
+                ],
+            },
+            "chunks": [
+                {"chunk_type": "isnad", "arabic_text": "قال أبو", "word_start": 0, "word_end": 2,
+                 "translations": {"en": "Abu said", "ur": "ابو نے کہا"}},
+                {"chunk_type": "body", "arabic_text": "جعفر", "word_start": 2, "word_end": 3,
+                 "translations": {"en": "Ja'far"}},
+            ],
+            "translations": {"en": {"summary": "A summary"}, "ur": {"summary": ""}},
+        },
+    }
+
+
+@pytest.fixture
+def content_dir(tmp_path):
+    responses = tmp_path / "responses"
+    responses.mkdir()
+    for vid, narrators in (("al-kafi_1_1_1_1", 2), ("al-kafi_1_1_1_2", 0)):
+        path = "/books/al-kafi:" + ":".join(vid.split("_")[1:])
+        (responses / f"{vid}.json").write_text(json.dumps(_wrapper(path, narrators), ensure_ascii=False),
+                                               encoding="utf-8")
+    stats_dir = str(tmp_path / "stats")
+    save_verse_stats("al-kafi_1_1_1_1", "/books/al-kafi:1:1:1:1", stats_dir, status="pass",
+                     model="gpt-5-mini", gen_cost=0.5, gen_output_tokens=1200, warnings_high=1)
+    save_verse_stats("al-kafi_1_1_1_3", "/books/al-kafi:1:1:1:3", stats_dir, status="error",
+                     error="timeout")
+    return tmp_path
+
+
+class TestNpyFormat:
+    @pytest.mark.parametrize("typecode,descr", [("i", "<i4"), ("q", "<i8"), ("d", "<f8"), ("B", "|b1")])
+    def test_roundtrip(self, tmp_path, typecode, descr):
+        values = array.array(typecode, [0, 1, 1, 0, 1])
+        path = str(tmp_path / "col.npy")
+        write_npy(path, values, descr)
+        raw = (tmp_path / "col.npy").read_bytes()
+        header_len = int.from_bytes(raw[8:10], "little")
+        assert (10 + header_len) % 64 == 0
+        assert read_npy(path, typecode) == values
+
+    def test_readable_by_numpy(self, tmp_path):
+        numpy = pytest.importorskip("numpy")
+        path = str(tmp_path / "col.npy")
+        write_npy(path, array.array("d", [1.5, -2.0]), "<f8")
+        assert numpy.load(path).tolist() == [1.5, -2.0]
+
+
+class TestFlatten:
+    def test_rows_per_table(self):
+        rows = flatten_verse("v", _wrapper("/books/al-kafi:1:1:1:1"), None)
+        assert len(rows["verses"]) == 1
+        assert len(rows["narrators"]) == 2
+        assert len(rows["chunks"]) == 2
+        # three chunk translations + one non-empty summary
+        assert [(r["field"], r["lang"]) for r in rows["translations"]] == [
+            ("chunk", "en"), ("chunk", "ur"), ("chunk", "en"), ("summary", "en")]
+        verse = rows["verses"][0]
+        assert verse["book"] == "al-kafi"
+        assert verse["word_count"] == 3
+        assert verse["has_stats"] is False
+
+    def test_tolerates_malformed_narrators(self):
+        wrapper = _wrapper("/books/x:1")
+        wrapper["result"]["isnad_matn"]["narrators"] = ["bad", {"position": "first", "word_ranges": ["x"]}]
+        rows = flatten_verse("v", wrapper, None)
+        assert rows["narrators"][0]["word_start"] == -1
+
+
+class TestExport:
+    def test_export_and_load_npy(self, content_dir):
+        manifest = export_analytics(str(content_dir / "responses"), fmt="npy")
+        assert manifest["format"] == "npy"
+        assert {name: t["rows"] for name, t in manifest["tables"].items()} == {
+            "verses": 3, "narrators": 2, "chunks": 4, "translations": 8}
+        assert load_manifest(str(content_dir / "analytics"))["tables"]["verses"]["rows"] == 3
+
+        verses = {row["verse_id"]: row for row in iter_rows(str(content_dir / "analytics"), "verses")}
+        assert verses["al-kafi_1_1_1_1"]["status"] == "pass"
+        assert verses["al-kafi_1_1_1_1"]["gen_cost_usd"] == 0.5
+        assert verses["al-kafi_1_1_1_1"]["gen_output_tokens"] == 1200
+        assert verses["al-kafi_1_1_1_1"]["warnings_high"] == 1
+        assert bool(verses["al-kafi_1_1_1_2"]["has_response"]) and not verses["al-kafi_1_1_1_2"]["has_stats"]
+        assert not verses["al-kafi_1_1_1_3"]["has_response"]
+        assert verses["al-kafi_1_1_1_3"]["failure_count"] == 1
+
+        narrators = load_table(str(content_dir / "analytics"), "narrators", ["name_en", "canonical_id"])
+        assert list(narrators["name_en"]) == ["Narrator 1", "Narrator 2"]
+        assert list(narrators["canonical_id"]) == [11, 12]
+
+    def test_workers_match_serial(self, content_dir, tmp_path):
+        export_analytics(str(content_dir / "responses"), str(tmp_path / "serial"), fmt="npy")
+        export_analytics(str(content_dir / "responses"), str(tmp_path / "pooled"), fmt="npy", workers=2)
+        for table in analytics_export.TABLES:
+            assert list(iter_rows(str(tmp_path / "serial"), table)) == list(iter_rows(str(tmp_path / "pooled"), table))
+
+    def test_parquet_requires_pyarrow(self, content_dir, monkeypatch):
+        monkeypatch.setattr(analytics_export, "pyarrow", None)
+        with pytest.raises(RuntimeError, match="pyarrow"):
+            export_analytics(str(content_dir / "responses"), fmt="parquet")
+        assert export_analytics(str(content_dir / "responses"))["format"] == "npy"
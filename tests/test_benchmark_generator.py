@@ -0,0 +1,65 @@
+"""Tests for scripts/benchmark_generator.py result analysis and corpus helpers."""
+
+import importlib.util
+import random
+from pathlib import Path
+
+import pytest
+
+
+def _import_script():
+    target = Path(__file__).resolve().parents[1] / "scripts" / "benchmark_generator.py"
+    spec = importlib.util.spec_from_file_location("_benchmark_generator", str(target))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+bg = _import_script()
+
+
+def _run(scale, hadith, seconds):
+    return {"scale": scale, "corpus": {"hadith": hadith},
+            "stages": {stage: {"wall_s": seconds(hadith)} for stage in bg.STAGES}}
+
+
+class TestScaling:
+    def test_linear_and_quadratic_exponents(self):
+        runs = [_run(s, 100 * s, lambda n: n / 100) for s in (1, 2, 4)]
+        runs[1]["stages"]["link_fuzzy_quran"]["wall_s"] = 4.0
+        runs[2]["stages"]["link_fuzzy_quran"]["wall_s"] = 16.0
+        exponents = bg.scaling_exponents(runs)
+        assert exponents["publish_book"] == pytest.approx(1.0)
+        assert exponents["link_fuzzy_quran"] == pytest.approx(2.0)
+
+    def test_single_scale_has_no_exponents(self):
+        assert bg.scaling_exponents([_run(1, 100, lambda n: 1.0)]) == {}
+
+
+class TestCompare:
+    def test_flags_slowdowns_beyond_tolerance(self, capsys):
+        baseline = {"runs": [_run(1, 100, lambda n: 1.0)]}
+        current = {"runs": [_run(1, 100, lambda n: 1.1)]}
+        current["runs"][0]["stages"]["merge_ai_content"]["wall_s"] = 2.0
+        regressions = bg.compare(current, baseline, tolerance=0.25)
+        assert regressions == ["merge_ai_content x1: 1.00s -> 2.00s"]
+
+    def test_skips_runs_with_a_different_corpus(self, capsys):
+        baseline = {"runs": [_run(1, 100, lambda n: 1.0)]}
+        current = {"runs": [_run(1, 200, lambda n: 9.0)]}
+        assert bg.compare(current, baseline, tolerance=0.25) == []
+        assert "no baseline run" in capsys.readouterr().out
+
+
+class TestCorpus:
+    def test_narrator_names_are_unique(self):
+        names = bg.narrator_names(300)
+        assert len(set(names)) == 300
+        with pytest.raises(ValueError):
+            bg.narrator_names(10 ** 6)
+
+    def test_hadith_text_is_deterministic(self):
+        names = bg.narrator_names(10)
+        a = bg.hadith_text(random.Random(3), names, ["آيَةٌ"])
+        b = bg.hadith_text(random.Random(3), names, ["آيَةٌ"])
+        assert a == b and " عَنْ " in a
@@ -309,3 +309,28 @@ class TestBuildPhrasesIndex:
         result = build_phrases_index(str(tmp_dest))
         key = _normalize_arabic("بِسْمِ اللَّهِ")
         assert result[key]["phrase_ar"] == "بِسْمِ اللَّهِ"  # Original with diacritics
+
+    def test_indexes_dictionary_phrases_found_in_text(self, tmp_dest):
+        """Dictionary phrases are indexed for AI verses only, filtered like Phase 2."""
+        doc = {
+            "kind": "verse_list",
+            "data": {
+                "verses": [
+                    {"path": "/books/test:1:1", "text": ["قَالَ بِسْمِ اللَّهِ"], "ai": {"key_phrases": []}},
+                    {"path": "/books/test:1:2", "text": ["بسم الله"]},
+                    {"path": "/books/test:1:3", "text": ["لا شيء"], "ai": {"key_phrases": []}},
+                ]
+            },
+        }
+        verse_file = tmp_dest / "books" / "al-kafi" / "1.json"
+        verse_file.write_text(json.dumps(doc), encoding="utf-8")
+        phrases_dict = {"phrases": [
+            {"phrase_ar": "بسم الله", "phrase_en": "Bismillah", "category": "quranic_echo"},
+            {"phrase_ar": "قال", "phrase_en": "said", "category": "not_a_category"},
+            {"phrase_ar": "َّ", "phrase_en": "shadda", "category": "quranic_echo"},
+        ]}
+
+        assert build_phrases_index(str(tmp_dest)) == {}
+        result = build_phrases_index(str(tmp_dest), phrases_dict=phrases_dict)
+        assert list(result) == ["بسم الله"]
+        assert result["بسم الله"]["paths"] == ["/books/test:1:1"]
@@ -0,0 +1,69 @@
+"""Tests for app.chain_store: the interned chain store must reproduce the
+per-narrator subchains and shared-chain groups of the original walk."""
+
+from fastapi.encoders import jsonable_encoder
+
+from app.chain_store import ChainStore
+from app.kafi_narrators import _record_chain
+from app.link_chains import build_verse_relations, collect_shared_chains, collect_store_chains
+
+
+class _Registry:
+    def get_name_ar(self, cid):
+        return f"n{cid}"
+
+    def get_name_en(self, cid):
+        return None
+
+
+CHAINS = [
+    ("/books/al-kafi:1:1:1", [1, 2, 3]),
+    ("/books/al-kafi:1:1:2", [1, 2, 3]),
+    ("/books/al-kafi:1:1:3", [4, 2, 3, 5]),
+    ("/books/al-kafi:1:1:4", [1, 2, 1]),
+    ("/books/al-kafi:1:1:5", [6]),
+    ("/books/al-amali:1:1", [1, 2, 3]),
+    ("/books/al-amali:1:2", [4, 2, 3, 5]),
+]
+
+
+def _legacy():
+    narrators, names = {}, {}
+    for path, ids in CHAINS:
+        _record_chain(path, ids, _Registry(), narrators, names)
+    return narrators
+
+
+def _store():
+    store = ChainStore()
+    for path, ids in CHAINS:
+        store.add(path, ids)
+    return store
+
+
+class TestChainStore:
+
+    def test_interns_paths_and_chains(self):
+        store = _store()
+        assert len(store.paths) == len(CHAINS)
+        # Full chains: 1-2-3, 4-2-3-5, 1-2-1; pairs: 1-2, 2-3, 4-2, 3-5, 2-1
+        assert len(store) == 8
+
+    def test_fill_narrator_matches_legacy_subchains(self):
+        legacy = _legacy()
+        store = _store()
+        for cid, narrator in legacy.items():
+            filled = store.fill_narrator(narrator.model_copy(update={"verse_paths": None, "subchains": None}))
+            assert jsonable_encoder(filled) == jsonable_encoder(narrator)
+
+    def test_store_groups_match_narrator_groups(self):
+        groups = collect_store_chains(_store())
+        assert groups == collect_shared_chains(_legacy())
+        assert set(groups) == {"1-2-3", "4-2-3-5"}
+        relations = build_verse_relations(groups)
+        assert relations["/books/al-amali:1:1"] == {"/books/al-kafi:1:1:1", "/books/al-kafi:1:1:2"}
+
+    def test_repeated_narrator_counts_verse_once(self):
+        store = _store()
+        verse_ids = store.narrator_verses[1]
+        assert len(verse_ids) == len(set(verse_ids)) == 4
@@ -0,0 +1,112 @@
+"""Tests for the pipeline completion index."""
+
+import json
+import os
+
+from app.pipeline_cli.completion_index import CompletionIndex
+
+
+def _make_tree(tmp_path):
+    content_dir = tmp_path / "corpus"
+    responses = content_dir / "responses"
+    quarantine = content_dir / "quarantine"
+    stats = content_dir / "stats"
+    for d in (responses, quarantine, stats):
+        d.mkdir(parents=True)
+    (responses / "al-kafi_1_1_1_1.json").write_text("{}", encoding="utf-8")
+    (responses / "al-kafi_1_1_1_2.json").write_text("{}", encoding="utf-8")
+    (responses / "al-amali_1_1.json").write_text("{}", encoding="utf-8")
+    (quarantine / "al-kafi_1_1_1_3.json").write_text(
+        json.dumps({"verse_id": "al-kafi_1_1_1_3", "error": "boom"}), encoding="utf-8")
+    (stats / "al-kafi_1_1_1_1.stats.json").write_text("{}", encoding="utf-8")
+    return str(responses)
+
+
+class TestCompletionIndex:
+
+    def test_scan(self, tmp_path):
+        index = CompletionIndex.scan(_make_tree(tmp_path))
+        assert index.is_complete("al-kafi_1_1_1_1")
+        assert not index.is_complete("al-kafi_1_1_1_3")
+        assert index.is_quarantined("al-kafi_1_1_1_3")
+        assert index.has_stats("al-kafi_1_1_1_1")
+        assert not index.has_stats("al-kafi_1_1_1_2")
+        assert index.counts_by_book() == {"al-kafi": 2, "al-amali": 1}
+
+    def test_scan_missing_dirs(self, tmp_path):
+        index = CompletionIndex.scan(str(tmp_path / "nope" / "responses"))
+        assert index.complete == set()
+        assert index.quarantined == set()
+
+    def test_persisted_snapshot_reused_until_dir_changes(self, tmp_path):
+        responses_dir = _make_tree(tmp_path)
+        CompletionIndex.load_or_scan(responses_dir, persist=True)
+        assert os.path.exists(CompletionIndex.index_path(responses_dir))
+
+        loaded = CompletionIndex.load(responses_dir)
+        assert loaded is not None
+        assert loaded.is_complete("al-amali_1_1")
+
+        # Adding a file changes the directory mtime and invalidates the snapshot
+        new_file = os.path.join(responses_dir, "al-amali_1_2.json")
+        with open(new_file, "w", encoding="utf-8") as f:
+            f.write("{}")
+        st = os.stat(responses_dir)
+        os.utime(responses_dir, (st.st_atime, st.st_mtime + 10))
+        assert CompletionIndex.load(responses_dir) is None
+        assert CompletionIndex.load_or_scan(responses_dir).is_complete("al-amali_1_2")
+
+    def test_save_keeps_scan_time_mtimes(self, tmp_path):
+        responses_dir = _make_tree(tmp_path)
+        index = CompletionIndex.load_or_scan(responses_dir, persist=True)
+
+        # Another process writes a response after the scan; saving the
+        # (unaware) index must not make it look fresh.
+        with open(os.path.join(responses_dir, "al-kafi_2.json"), "w", encoding="utf-8") as f:
+            f.write("{}")
+        st = os.stat(responses_dir)
+        os.utime(responses_dir, (st.st_atime, st.st_mtime + 10))
+        index.save()
+        assert CompletionIndex.load(responses_dir) is None
+        assert CompletionIndex.load_or_scan(responses_dir).is_complete("al-kafi_2")
+
+    def test_rescan_drops_deleted_responses(self, tmp_path):
+        responses_dir = _make_tree(tmp_path)
+        CompletionIndex.load_or_scan(responses_dir, persist=True)
+        os.remove(os.path.join(responses_dir, "al-amali_1_1.json"))
+        st = os.stat(responses_dir)
+        os.utime(responses_dir, (st.st_atime, st.st_mtime + 10))
+        CompletionIndex.scan(responses_dir).save()
+        loaded = CompletionIndex.load(responses_dir)
+        assert loaded is not None
+        assert not loaded.is_complete("al-amali_1_1")
+
+    def test_mark_updates(self, tmp_path):
+        index = CompletionIndex.scan(_make_tree(tmp_path))
+        index.mark_complete("al-kafi_2_1_1_1")
+        index.mark_quarantined("al-kafi_2_1_1_2")
+        assert index.is_complete("al-kafi_2_1_1_1")
+        assert index.is_quarantined("al-kafi_2_1_1_2")
+
+
+class TestBuildQueueWithIndex:
+
+    def test_build_queue_filters_complete_and_quarantined(self, tmp_path):
+        from app.pipeline_cli.pipeline import build_queue
+        responses_dir = _make_tree(tmp_path)
+        paths = [
+            "/books/al-kafi:1:1:1:1",
+            "/books/al-kafi:1:1:1:2",
+            "/books/al-kafi:1:1:1:3",
+            "/books/al-kafi:1:1:1:4",
+        ]
+        assert build_queue(paths, responses_dir) == ["/books/al-kafi:1:1:1:4"]
+        assert build_queue(paths, responses_dir, attempt_quarantined=True) == [
+            "/books/al-kafi:1:1:1:3", "/books/al-kafi:1:1:1:4",
+        ]
+
+    def test_status_counts_use_index(self, tmp_path):
+        from app.pipeline_cli.pipeline_status import _count_responses
+        resp = _count_responses(_make_tree(tmp_path))
+        assert resp["total"] == 3
+        assert resp["by_book"]["al-kafi"] == 2
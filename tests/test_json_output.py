@@ -0,0 +1,116 @@
+"""Tests for the shared JSON output serializer (app/json_output.py)."""
+
+import gzip
+import json
+
+import pytest
+
+from app import json_output
+from app.json_output import OutputSizeStats, dumps, output_stats, write_json
+from app.lib_db import write_file
+
+DOC = {
+    "index": "test:1",
+    "kind": "verse_detail",
+    "data": {"verse": {"text": ["مُحَمَّدُ بْنُ يَحْيَى"], "path": "/books/test:1"}, "z": 1, "a": [1, 2]},
+}
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    monkeypatch.delenv("JSON_OUTPUT_PROFILE", raising=False)
+    monkeypatch.delenv("JSON_PRECOMPRESS", raising=False)
+    output_stats.reset()
+    yield
+    output_stats.reset()
+
+
+class TestProfiles:
+    def test_pretty_matches_historical_format(self):
+        assert dumps(DOC) == json.dumps(DOC, ensure_ascii=False, indent=2, sort_keys=True)
+
+    def test_compact_is_smaller_and_equivalent(self, monkeypatch):
+        pretty = dumps(DOC)
+        monkeypatch.setenv("JSON_OUTPUT_PROFILE", "compact")
+        compact = dumps(DOC)
+        assert "\n" not in compact
+        assert len(compact) < len(pretty)
+        assert json.loads(compact) == json.loads(pretty)
+        assert compact.index('"a"') < compact.index('"z"')
+
+    def test_explicit_profile_overrides_env(self, monkeypatch):
+        monkeypatch.setenv("JSON_OUTPUT_PROFILE", "compact")
+        assert "\n" in dumps(DOC, profile="pretty")
+
+    def test_unknown_settings_rejected(self, monkeypatch):
+        monkeypatch.setenv("JSON_OUTPUT_PROFILE", "tiny")
+        with pytest.raises(ValueError):
+            dumps(DOC)
+        monkeypatch.setenv("JSON_OUTPUT_PROFILE", "compact")
+        monkeypatch.setenv("JSON_PRECOMPRESS", "zstd")
+        with pytest.raises(ValueError):
+            json_output.get_precompress()
+
+
+class TestWriteJson:
+    def test_gz_sibling_and_stale_cleanup(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "1.json")
+        monkeypatch.setenv("JSON_PRECOMPRESS", "gz")
+        size = write_json(path, DOC)
+        with open(path, "rb") as f:
+            data = f.read()
+        assert size == len(data)
+        with gzip.open(path + ".gz", "rb") as f:
+            assert f.read() == data
+
+        monkeypatch.delenv("JSON_PRECOMPRESS")
+        write_json(path, DOC)
+        assert not (tmp_path / "1.json.gz").exists()
+
+    def test_no_sibling_removal_without_siblings(self, tmp_path, monkeypatch):
+        (tmp_path / "old.json.gz").write_bytes(b"")
+        (tmp_path / "plain").mkdir()
+        removed = []
+        monkeypatch.setattr(json_output.os, "remove", removed.append)
+        for name in ("1.json", "2.json"):
+            write_json(str(tmp_path / "plain" / name), DOC)
+        assert removed == []
+
+        write_json(str(tmp_path / "1.json"), DOC)
+        assert removed == [str(tmp_path / "1.json.gz")]
+
+    def test_br_skipped_without_brotli(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(json_output, "brotli", None)
+        monkeypatch.setenv("JSON_PRECOMPRESS", "gz,br")
+        path = str(tmp_path / "1.json")
+        write_json(path, DOC)
+        assert (tmp_path / "1.json.gz").exists()
+        assert not (tmp_path / "1.json.br").exists()
+
+    def test_stats_per_kind(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("JSON_PRECOMPRESS", "gz")
+        write_json(str(tmp_path / "a.json"), DOC)
+        write_json(str(tmp_path / "b.json"), {"kind": "verse_list"})
+        write_json(str(tmp_path / "c.json"), {"x": 1})
+        write_json(str(tmp_path / "d.json"), {"ai": {}}, kind="verse_detail_lang")
+        summary = output_stats.summary()
+        assert set(summary) == {"verse_detail", "verse_list", "other", "verse_detail_lang"}
+        assert summary["verse_detail"]["files"] == 1
+        assert summary["verse_detail"]["bytes"] == (tmp_path / "a.json").stat().st_size
+        assert summary["verse_detail"]["gz_bytes"] == (tmp_path / "a.json.gz").stat().st_size
+        assert summary["verse_detail"]["br_bytes"] == 0
+
+    def test_stats_accumulate(self):
+        stats = OutputSizeStats()
+        stats.record("verse_list", 10, gz=4)
+        stats.record("verse_list", 5)
+        assert stats.summary() == {"verse_list": {"files": 2, "bytes": 15, "gz_bytes": 4, "br_bytes": 0}}
+
+
+class TestWriteFileProfile:
+    def test_write_file_uses_configured_profile(self, temp_destination_dir, monkeypatch):
+        monkeypatch.setenv("JSON_OUTPUT_PROFILE", "compact")
+        result = write_file("/books/test:1", {"index": "test:1", "kind": "verse_list", "data": {"a": None, "b": 1}})
+        with open(result.id, encoding="utf-8") as f:
+            assert f.read() == '{"data":{"b":1},"index":"test:1","kind":"verse_list"}'
+        assert output_stats.summary()["verse_list"]["files"] == 1
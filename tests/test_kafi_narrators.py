@@ -798,3 +798,123 @@ class TestProcessingReportIntegration:
         process_chapter(chapter, narrator_index, narrators, report)
 
         assert report.narrations_without_narrators == 1
+
+
+class _StubRegistry:
+    """Registry stand-in: narrator N is named ``nN``."""
+    narrator_count = 5
+
+    def get_name_ar(self, cid):
+        return f"n{cid}"
+
+    def get_name_en(self, cid):
+        return None
+
+
+def _stub_link(hadith, registry, use_undiacritized=False):
+    # Verse text "1 2 3 ..." encodes the chain directly
+    return [int(x) for x in hadith.text[0].split()[:-1]]
+
+
+def _write_complete_book(slug, chains):
+    from fastapi.encoders import jsonable_encoder
+    from app.lib_db import write_file
+    book = Chapter()
+    book.part_type = PartType.Book
+    book.path = f"/books/{slug}"
+    book.titles = {"en": slug}
+    book.crumbs = []
+    chapter = Chapter()
+    chapter.part_type = PartType.Chapter
+    chapter.path = f"/books/{slug}:1"
+    chapter.titles = {"en": "Chapter 1"}
+    chapter.crumbs = []
+    chapter.verses = []
+    for i, chain in enumerate(chains, start=1):
+        v = Verse()
+        v.part_type = PartType.Hadith
+        v.path = f"/books/{slug}:1:{i}"
+        v.index = i
+        v.local_index = i
+        v.text = [" ".join(str(n) for n in chain) + " text"]
+        chapter.verses.append(v)
+    book.chapters = [chapter]
+    write_file(f"/books/complete/{slug}", jsonable_encoder(book))
+
+
+class TestProcessAllNarratorsMapReduce:
+    """Serial and multi-process narrator processing must write the same files."""
+
+    def _run(self, tmp_path, monkeypatch, workers):
+        import app.kafi_narrators as kn
+        dest = tmp_path / f"dest{workers}"
+        dest.mkdir()
+        monkeypatch.setenv("DESTINATION_DIR", str(dest) + "/")
+        monkeypatch.setattr(kn, "NarratorRegistry", _StubRegistry)
+        monkeypatch.setattr(kn, "link_verse_narrators", _stub_link)
+        monkeypatch.setattr(kn, "_probe_chain_extraction", lambda registry: True)
+        monkeypatch.setattr(kn, "generate_featured_narrators", lambda: None)
+        _write_complete_book("al-kafi", [[1, 2, 3], [1, 2, 3], [2, 4]])
+        _write_complete_book("al-amali", [[1, 2, 3], [5], []])
+        report = ProcessingReport()
+        kn.process_all_narrators(report, workers=workers)
+        assert report.narrations_without_narrators == 1
+        files = {}
+        for path in sorted(dest.rglob("*.json")):
+            files[str(path.relative_to(dest))] = path.read_text(encoding="utf-8")
+        return files
+
+    def test_parallel_matches_serial(self, tmp_path, monkeypatch):
+        import json
+        import multiprocessing
+        import pytest
+        if "fork" not in multiprocessing.get_all_start_methods():
+            pytest.skip("relies on fork-inherited monkeypatches")
+        serial = self._run(tmp_path, monkeypatch, 1)
+        parallel = self._run(tmp_path, monkeypatch, 2)
+        assert serial == parallel
+
+        n1 = json.loads(serial["people/narrators/1.json"])["data"]
+        assert n1["verse_paths"] == ["/books/al-amali:1:1", "/books/al-kafi:1:1", "/books/al-kafi:1:2"]
+        assert n1["subchains"]["1-2-3"]["verse_paths"] == n1["verse_paths"]
+        # Chain 1-2-3 is shared by 3 verses → Shared Chain relations across books
+        kafi = json.loads(serial["books/complete/al-kafi.json"])
+        first = kafi["chapters"][0]["verses"][0]
+        assert first["relations"]["Shared Chain"] == ["/books/al-amali:1:1", "/books/al-kafi:1:2"]
+
+    def test_worker_returns_report_and_writes_once(self, tmp_path, monkeypatch):
+        import app.kafi_narrators as kn
+        from app.lib_db import load_json
+        monkeypatch.setenv("DESTINATION_DIR", str(tmp_path) + "/")
+        monkeypatch.setattr(kn, "link_verse_narrators", _stub_link)
+        monkeypatch.setattr(kn, "_worker_registry", _StubRegistry())
+        _write_complete_book("al-amali", [[1, 2], []])
+
+        def link_and_flag(book, registry, report, chains, use_undiacritized=False):
+            if book.path == "/books/al-amali":  # the recursion re-enters per chapter
+                report.add_sequence_error("al-amali:1 out of order")
+            _link_book_chains(book, registry, report, chains, use_undiacritized)
+
+        _link_book_chains = kn._link_book_chains
+        monkeypatch.setattr(kn, "_link_book_chains", link_and_flag)
+        writes = []
+        write_file = kn.write_file
+        monkeypatch.setattr(kn, "write_file", lambda path, obj: writes.append(path) or write_file(path, obj))
+
+        book_slug, book, chains, report = kn._link_book_task("al-amali")
+        assert book is None
+        assert chains == [("/books/al-amali:1:1", [1, 2]), ("/books/al-amali:1:2", [])]
+        assert report.sequence_errors == ["al-amali:1 out of order"]
+        assert report.narrations_without_narrators == 1
+        assert writes == []
+
+        kn._save_book_task(("al-amali", None, {"/books/al-amali:1:1": {"/books/al-kafi:1:1"}}))
+        assert writes == ["/books/complete/al-amali"]
+        verse = load_json("/books/complete/al-amali")["chapters"][0]["verses"][0]
+        assert verse["relations"]["Shared Chain"] == ["/books/al-kafi:1:1"]
+
+        merged = ProcessingReport()
+        merged.merge(report)
+        merged.merge(report)
+        assert merged.narrations_without_narrators == 2
+        assert len(merged.sequence_errors) == 2
@@ -518,6 +518,78 @@ class TestInsertVerseDetails:
         assert verse_json["kind"] == "verse_detail"
 
 
+class TestTranslationBundles:
+    """Bundled books keep default translations inline, the rest per chapter."""
+
+    def _quran_chapter(self):
+        chapter = Chapter()
+        chapter.part_type = PartType.Chapter
+        chapter.path = "/books/quran:1"
+        chapter.titles = {"en": "The Opening"}
+        chapter.verse_translations = ["en.qarai", "en.sahih", "fa.makarem"]
+        chapter.default_verse_translation_ids = {"en": "en.qarai", "fa": "fa.makarem"}
+        chapter.verses = []
+        for i in range(1, 3):
+            v = Verse()
+            v.part_type = PartType.Verse
+            v.path = f"/books/quran:1:{i}"
+            v.local_index = i
+            v.text = [f"ayah {i}"]
+            v.translations = {"en.qarai": [f"qarai {i}"], "en.sahih": [f"sahih {i}"], "fa.makarem": [f"makarem {i}"]}
+            chapter.verses.append(v)
+        return chapter
+
+    def test_unbundled_by_default(self, temp_destination_dir, monkeypatch):
+        monkeypatch.delenv("TRANSLATION_BUNDLE_BOOKS", raising=False)
+        insert_verse_details(self._quran_chapter())
+        data = load_json("/books/quran:1:1")["data"]
+        assert set(data["verse"]["translations"]) == {"en.qarai", "en.sahih", "fa.makarem"}
+        assert "translation_bundle" not in data
+
+    def test_bundled_book(self, temp_destination_dir, monkeypatch):
+        monkeypatch.setenv("TRANSLATION_BUNDLE_BOOKS", "quran")
+        insert_verse_details(self._quran_chapter())
+
+        data = load_json("/books/quran:1:2")["data"]
+        assert data["verse"]["translations"] == {"en.qarai": ["qarai 2"], "fa.makarem": ["makarem 2"]}
+        assert data["verse_translations"] == ["en.qarai", "en.sahih", "fa.makarem"]
+        assert data["translation_bundle"] == "/books/quran:1/translations"
+
+        bundle = load_json("/books/quran:1/translations/en.sahih")
+        assert bundle["kind"] == "verse_translations"
+        assert bundle["data"]["translation_id"] == "en.sahih"
+        assert bundle["data"]["verses"] == {"/books/quran:1:1": ["sahih 1"], "/books/quran:1:2": ["sahih 2"]}
+        assert not os.path.exists(get_dest_path("/books/quran:1/translations/en.qarai"))
+
+    def test_books_walkers_skip_bundles(self, temp_destination_dir, monkeypatch):
+        from pathlib import Path
+
+        from app.ai_content_merger import merge_ai_into_file
+        from app.ai_pipeline import generate_corpus_manifest
+        from app.validate_data import ValidationReport, check_narrator_references
+
+        monkeypatch.setenv("TRANSLATION_BUNDLE_BOOKS", "quran")
+        insert_verse_details(self._quran_chapter())
+        write_file("/books/quran:2", {"index": "quran:2", "kind": "verse_list", "data": {
+            "verses": [{"path": "/books/quran:2:1", "narrator_chain": {"parts": [
+                {"kind": "narrator", "path": "/people/narrators/7"}]}}]}})
+        write_file("/people/narrators/7", {"kind": "person_content", "data": {}})
+        bundle_file = get_dest_path("/books/quran:1/translations/en.sahih")
+        with open(bundle_file, encoding="utf-8") as f:
+            before = f.read()
+
+        manifest = generate_corpus_manifest(data_dir=str(temp_destination_dir))
+        assert manifest["verses"] == [{"path": "/books/quran:2:1", "book": "quran"}]
+
+        assert merge_ai_into_file(bundle_file, {"/books/quran:1:1": {}}) == 0
+        with open(bundle_file, encoding="utf-8") as f:
+            assert f.read() == before
+
+        report = ValidationReport()
+        check_narrator_references(Path(temp_destination_dir), report, verbose=False)
+        assert not report.errors
+
+
 class TestShellifyCompleteBooks:
     """Test conversion of complete book files to shell format."""
 
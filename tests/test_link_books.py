@@ -384,6 +384,31 @@ class TestPatchModularFile:
         result = json.loads(dest_file.read_text(encoding="utf-8"))
         assert result["data"]["verse"]["relations"] == {"Mentions": ["/books/quran:2:3"]}
 
+    def test_patch_keeps_bundled_verse_detail_trimmed(self, tmp_path, monkeypatch):
+        """Bundled verse_details keep only their inline translations after patching."""
+        verse_detail = {
+            "index": "quran:1:1",
+            "kind": "verse_detail",
+            "data": {
+                "verse": {"path": "/books/quran:1:1", "translations": {"en.qarai": ["q"]}},
+                "translation_bundle": "/books/quran:1/translations",
+                "verse_translations": ["en.qarai", "en.sahih"],
+            }
+        }
+        dest_file = tmp_path / "1.json"
+        dest_file.write_text(json.dumps(verse_detail), encoding="utf-8")
+        monkeypatch.setattr("app.link_books.get_dest_path", lambda p: str(dest_file))
+
+        updates = {"/books/quran:1:1": {
+            "relations": {"Quoted In": ["/books/al-kafi:1:1:1:1"]},
+            "translations": {"en.qarai": ["q2"], "en.sahih": ["s"]},
+        }}
+        assert _patch_modular_file("/books/quran:1:1", updates) == 1
+
+        verse = json.loads(dest_file.read_text(encoding="utf-8"))["data"]["verse"]
+        assert verse["translations"] == {"en.qarai": ["q2"]}
+        assert verse["relations"] == {"Quoted In": ["/books/al-kafi:1:1:1:1"]}
+
     def test_returns_zero_for_missing_file(self, monkeypatch):
         monkeypatch.setattr("app.link_books.get_dest_path", lambda p: "/nonexistent/path.json")
         assert _patch_modular_file("/books/fake:1", {}) == 0
@@ -3,6 +3,7 @@
 import asyncio
 import json
 import os
+import time
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -424,6 +425,35 @@ class TestArchiveRawResponse:
             archive_raw_response(str(tmp_path), "v1", "phase3", "x")
 
 
+    def test_segments_backend(self, tmp_path, monkeypatch):
+        from app.pipeline_cli.openai_backend import archive_raw_response, read_raw_response
+        monkeypatch.setenv("RAW_ARCHIVE_BACKEND", "segments")
+        archive_raw_response(str(tmp_path), "v1", "phase3", "first")
+        archive_raw_response(str(tmp_path), "v1", "phase3", "second")
+        assert not list(tmp_path.glob("*.raw.txt"))
+        assert read_raw_response(str(tmp_path), "v1", "phase3") == "second"
+
+    def test_read_raw_response_prefers_file(self, tmp_path, monkeypatch):
+        from app.pipeline_cli.openai_backend import archive_raw_response, read_raw_response
+        monkeypatch.setenv("RAW_ARCHIVE_BACKEND", "segments")
+        archive_raw_response(str(tmp_path), "v1", "", "archived")
+        monkeypatch.setenv("RAW_ARCHIVE_BACKEND", "files")
+        assert read_raw_response(str(tmp_path), "v1") == "archived"
+        archive_raw_response(str(tmp_path), "v1", "", "newer file")
+        assert read_raw_response(str(tmp_path), "v1") == "newer file"
+        assert read_raw_response(str(tmp_path), "v2") is None
+
+    def test_read_raw_response_prefers_newer_segment_entry(self, tmp_path, monkeypatch):
+        from app.pipeline_cli.openai_backend import archive_raw_response, read_raw_response
+        monkeypatch.setenv("RAW_ARCHIVE_BACKEND", "files")
+        archive_raw_response(str(tmp_path), "v1", "phase1", "old file")
+        old = time.time() - 3600
+        os.utime(tmp_path / "v1.phase1.raw.txt", (old, old))
+        monkeypatch.setenv("RAW_ARCHIVE_BACKEND", "segments")
+        archive_raw_response(str(tmp_path), "v1", "phase1", "retry in segments")
+        assert read_raw_response(str(tmp_path), "v1", "phase1") == "retry in segments"
+
+
 class TestCapOutputTokens:
     """Per-model max-output cap, to avoid 400 errors from old gpt-4.1 family
     where max_tokens > 32768 is rejected even though our default is 40000."""
@@ -171,6 +171,17 @@ class TestBatchSubmitValidation:
 class TestHandleBatchCommand:
     """Tests for CLI routing."""
 
+    def test_download_uses_postprocess_workers(self):
+        from app.pipeline_cli.openai_batch import handle_batch_command
+        args = MagicMock()
+        args.subcommand = "download"
+        args.responses_dir = "/tmp/responses"
+        args.workers = 5
+        args.postprocess_workers = 1
+        with patch("app.pipeline_cli.openai_batch.batch_download") as download:
+            handle_batch_command(args)
+        assert download.call_args.kwargs["workers"] == 1
+
     def test_unknown_subcommand_shows_help(self, capsys):
         from app.pipeline_cli.openai_batch import handle_batch_command
         args = MagicMock()
@@ -216,3 +227,116 @@ class TestHandleBatchCommand:
             assert "batch_test123" in captured.out
             assert "gpt-4.1-mini" in captured.out
             assert "50" in captured.out
+
+
+def _output_line(custom_id: str, content: str = "{}", status_code: int = 200) -> str:
+    return json.dumps({
+        "custom_id": custom_id,
+        "response": {"status_code": status_code, "body": {
+            "usage": {"prompt_tokens": 100, "completion_tokens": 50},
+            "choices": [{"message": {"content": content}}],
+        }},
+    })
+
+
+def _plan_record(custom_id: str, verse_path: str) -> dict:
+    return {
+        "custom_id": custom_id,
+        "verse_path": verse_path,
+        "verse_id": verse_path.replace("/books/", "").replace(":", "_"),
+        "mode": "single",
+        "word_count": 3,
+        "request": {"verse_path": verse_path, "arabic_text": "قَالَ"},
+    }
+
+
+class TestStreamingPostprocess:
+    """Tests for the streamed, resumable download postprocess."""
+
+    def test_plan_record_round_trip(self):
+        from app.ai_pipeline import PipelineRequest
+        from app.pipeline_cli.openai_batch import _plan_from_record, _plan_record
+        from app.pipeline_cli.verse_processor import VersePlan
+        plan = VersePlan(
+            verse_path="/books/test:1", verse_id="test_1", mode="single",
+            request=PipelineRequest(verse_path="/books/test:1", arabic_text="قَالَ", hadith_number=1),
+            system_prompt="system", user_message="user", work_dir="w", word_count=1,
+        )
+        record = json.loads(json.dumps(_plan_record("gen-test_1", plan)))
+        rebuilt = _plan_from_record(record, "other", "gpt-4.1-mini")
+        assert rebuilt.request == plan.request
+        assert (rebuilt.verse_id, rebuilt.work_dir, rebuilt.backend) == ("test_1", "other", "openai")
+
+    def test_stream_file_to_disk(self, tmp_path):
+        from app.pipeline_cli.openai_batch import _stream_file_to_disk
+        response = MagicMock()
+        response.iter_bytes.return_value = iter([b"line1\n", b"line2\n"])
+        client = MagicMock()
+        client.files.with_streaming_response.content.return_value.__enter__.return_value = response
+        path = str(tmp_path / "out.jsonl")
+        assert _stream_file_to_disk(client, "file-1", path) == 12
+        assert (tmp_path / "out.jsonl").read_bytes() == b"line1\nline2\n"
+        assert not (tmp_path / "out.jsonl.part").exists()
+
+    def test_resumes_from_cursor_with_saved_plans(self, tmp_path, monkeypatch):
+        from app.pipeline_cli import openai_batch, verse_processor
+        from app.pipeline_cli.verse_processor import VerseResult
+
+        batch_dir = str(tmp_path / "batches")
+        responses_dir = str(tmp_path / "responses")
+        os.makedirs(batch_dir)
+        output_path = str(tmp_path / "output.jsonl")
+        ids = [f"gen-test_{n}" for n in range(1, 6)]
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(_output_line(cid) for cid in ids) + "\n\n")
+        plans = {cid: _plan_record(cid, f"/books/test:{n}") for n, cid in enumerate(ids, 1)}
+
+        seen = []
+        crash = {"test_4"}
+
+        def fake_postprocess(plan, raw_response, **kwargs):
+            if plan.verse_id in crash:
+                crash.clear()
+                raise RuntimeError("crash")
+            seen.append(plan.verse_id)
+            status = "needs_fix" if plan.verse_id == "test_2" else "pass"
+            return VerseResult(verse_id=plan.verse_id, status=status)
+
+        def no_prepare(*args, **kwargs):
+            raise AssertionError("saved plans must be reused")
+
+        monkeypatch.setattr(verse_processor, "postprocess_verse", fake_postprocess)
+        monkeypatch.setattr(verse_processor, "prepare_verse", no_prepare)
+        monkeypatch.setattr(openai_batch, "CURSOR_SAVE_EVERY", 1)
+        settings = {"model": "gpt-4.1-mini", "data_dir": "", "use_v3": False,
+                    "responses_dir": responses_dir, "batch_dir": batch_dir}
+
+        cursor = openai_batch._load_cursor(batch_dir, "file-1")
+        with pytest.raises(RuntimeError):
+            openai_batch._postprocess_output(output_path, cursor, plans, {}, settings, batch_dir)
+        saved = openai_batch._load_cursor(batch_dir, "file-1")
+        assert saved["next_line"] == 3
+        assert (saved["passed"], saved["needs_fix"]) == (2, 1)
+
+        openai_batch._postprocess_output(output_path, saved, plans, {}, settings, batch_dir)
+        assert seen == ["test_1", "test_2", "test_3", "test_4", "test_5"]
+        final = openai_batch._load_cursor(batch_dir, "file-1")
+        assert final["results"] == 5
+        assert (final["passed"], final["needs_fix"], final["errors"]) == (4, 1, 0)
+        assert final["total_input_tokens"] == 500
+        assert list(final["fix_candidates"]) == ["gen-test_2"]
+        # A different output file starts from scratch
+        assert openai_batch._load_cursor(batch_dir, "file-2")["next_line"] == 0
+
+    def test_unknown_custom_id_counts_as_error(self, tmp_path):
+        from app.pipeline_cli import openai_batch
+        batch_dir = str(tmp_path)
+        output_path = str(tmp_path / "output.jsonl")
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(_output_line("gen-missing") + "\n" + _output_line("gen-x", status_code=500) + "\n")
+        settings = {"model": "gpt-4.1-mini", "data_dir": "", "use_v3": False,
+                    "responses_dir": str(tmp_path / "responses"), "batch_dir": batch_dir}
+        cursor = openai_batch._new_cursor("file-1")
+        openai_batch._postprocess_output(output_path, cursor, {}, {"gen-x": "/books/test:1"},
+                                         settings, batch_dir)
+        assert (cursor["results"], cursor["errors"], cursor["next_line"]) == (2, 2, 2)
@@ -0,0 +1,105 @@
+"""Tests for the shared AsyncOpenAI client registry and connection metrics."""
+
+import asyncio
+
+import pytest
+
+from app.pipeline_cli import openai_clients
+from app.pipeline_cli.openai_clients import (
+    ConnectionMetrics,
+    client_metrics,
+    format_metrics,
+    get_client,
+)
+
+pytest.importorskip("openai")
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(openai_clients, "_pools", {})
+    monkeypatch.setattr(openai_clients, "_metrics", {})
+
+
+class TestConnectionMetrics:
+    def test_snapshot(self):
+        metrics = ConnectionMetrics()
+        metrics.record(0.5, True, connect_s=0.02)
+        for ttfb in (0.1, 0.2, 0.3):
+            metrics.record(ttfb, False)
+        snap = metrics.snapshot()
+        assert snap["requests"] == 4
+        assert snap["new_connections"] == 1
+        assert snap["reused_connections"] == 3
+        assert snap["reuse_rate"] == 0.75
+        assert snap["connect_avg_s"] == 0.02
+        assert snap["ttfb_p50_s"] == 0.3
+        assert snap["ttfb_max_s"] == 0.5
+
+    def test_empty(self):
+        snap = ConnectionMetrics().snapshot()
+        assert snap["requests"] == 0
+        assert snap["reuse_rate"] is None and snap["ttfb_p95_s"] is None
+
+    def test_trace_marks_new_connection(self):
+        state = {}
+        trace = openai_clients._trace(state)
+
+        async def main():
+            await trace("connection.connect_tcp.started", {})
+            await trace("connection.connect_tcp.complete", {})
+
+        asyncio.run(main())
+        assert "connect_start" in state and state["connect_s"] >= 0
+
+    def test_client_metrics_and_format(self):
+        openai_clients._metrics["http://spark:8000/v1"] = ConnectionMetrics()
+        openai_clients._metrics[None] = ConnectionMetrics()
+        openai_clients._metrics["http://spark:8000/v1"].record(1.0, False)
+        assert list(client_metrics()) == ["http://spark:8000/v1"]
+        assert format_metrics(client_metrics()) == [
+            "http://spark:8000/v1: 1 req, 100% reused conns, TTFB p50 1.00s p95 1.00s"]
+
+
+class TestClientRegistry:
+    def test_shared_per_endpoint_and_timeout(self):
+        async def main():
+            a = get_client("k", base_url="http://spark:8000/v1", timeout=1800.0)
+            b = get_client("k", base_url="http://spark:8000/v1", timeout=1800.0)
+            c = get_client("k", base_url="http://spark:8000/v1", timeout=60.0)
+            d = get_client("k", timeout=1800.0)
+            return a, b, c, d
+
+        a, b, c, d = asyncio.run(main())
+        assert a is b
+        assert a is not c and a is not d
+        if openai_clients.httpx is not None:
+            assert a._client is c._client  # one connection pool per endpoint
+            assert a._client is not d._client
+
+    def test_new_pool_per_event_loop(self):
+        first = asyncio.run(self._client())
+        second = asyncio.run(self._client())
+        assert first is not second
+
+    def test_close_clients(self):
+        async def main():
+            get_client("k", base_url="http://spark:8000/v1")
+            await openai_clients.close_clients()
+            return dict(openai_clients._pools)
+
+        assert asyncio.run(main()) == {}
+
+    def test_backend_uses_registry(self):
+        from app.pipeline_cli.openai_backend import _get_client
+
+        async def main():
+            return (_get_client(base_url="http://spark:8000/v1"),
+                    _get_client(base_url="http://spark:8000/v1"))
+
+        first, second = asyncio.run(main())
+        assert first is second
+
+    @staticmethod
+    async def _client():
+        return get_client("k", base_url="http://spark:8000/v1")
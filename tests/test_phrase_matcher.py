@@ -0,0 +1,48 @@
+"""Tests for app.phrase_matcher — compiled key-phrase matching."""
+
+import random
+
+from app.arabic_normalization import strip_tashkeel
+from app.phrase_matcher import PhraseMatcher
+
+
+def _naive(text, phrases):
+    stripped = strip_tashkeel(text)
+    return [
+        p for p in phrases
+        if p["phrase_ar"] in text or strip_tashkeel(p["phrase_ar"]) in stripped
+    ]
+
+
+class TestPhraseMatcher:
+
+    def test_diacritized_and_stripped_forms(self):
+        phrases = [
+            {"phrase_ar": "بِسْمِ اللَّهِ"},
+            {"phrase_ar": "بسم الله الرحمن"},
+            {"phrase_ar": "الصراط"},
+        ]
+        matcher = PhraseMatcher(phrases)
+        found = matcher.find("بِسْمِ اللَّهِ الرَّحْمَنِ الرَّحِيمِ")
+        assert found == phrases[:2]
+
+    def test_overlapping_and_nested_phrases(self):
+        phrases = [{"phrase_ar": p} for p in ("ابا", "باب", "ب", "ابابا")]
+        assert PhraseMatcher(phrases).find("ابابا") == phrases
+
+    def test_skips_invalid_entries(self):
+        matcher = PhraseMatcher([None, {"phrase_en": "x"}, {"phrase_ar": ""}, {"phrase_ar": "قال"}])
+        assert len(matcher) == 1
+        assert matcher.find("") == []
+
+    def test_matches_naive_loop(self):
+        rng = random.Random(7)
+        alphabet = "ابتسمل" + "َِّ"
+        phrases = [
+            {"phrase_ar": "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 5)))}
+            for _ in range(60)
+        ]
+        matcher = PhraseMatcher(phrases)
+        for _ in range(200):
+            text = "".join(rng.choice(alphabet + " ") for _ in range(rng.randint(1, 40)))
+            assert matcher.find(text) == _naive(text, phrases)
@@ -539,6 +539,16 @@ class TestProgrammaticEnrichOrchestrator:
         assert "key_phrases" in result
         assert len(result["key_phrases"]) == 1
 
+    def test_uses_prebuilt_phrase_matcher(self):
+        from app.phrase_matcher import PhraseMatcher
+        phrases = {"phrases": [{"phrase_ar": "عَلِيُّ بْنُ إِبْرَاهِيمَ", "phrase_en": "Ali ibn Ibrahim",
+                                "category": "well_known_saying"}]}
+        matcher = PhraseMatcher.from_dictionary(phrases)
+        with patch.object(PhraseMatcher, "from_dictionary", side_effect=AssertionError("rebuilt")):
+            result = programmatic_enrich(dict(SAMPLE_PHASE1), SAMPLE_REQUEST,
+                                         phrases_dict=phrases, phrase_matcher=matcher)
+        assert [p["phrase_en"] for p in result["key_phrases"]] == ["Ali ibn Ibrahim"]
+
     def test_merges_key_terms_into_translations(self):
         result = programmatic_enrich(
             dict(SAMPLE_PHASE1), SAMPLE_REQUEST, word_dict=SAMPLE_WORD_DICT
@@ -0,0 +1,131 @@
+"""Tests for prompt-prefix aware dispatch and per-prefix cache telemetry."""
+
+import asyncio
+
+from app.pipeline_cli.prompt_cache import (
+    PrefixCacheStats,
+    PrefixScheduler,
+    prefix_key,
+    prompt_tokens,
+)
+
+
+def _run(scheduler, requests):
+    """Start ``requests`` ((name, key) pairs) in order; return their dispatch order."""
+    order = []
+
+    async def request(name, key):
+        async with scheduler.slot(key):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    async def main():
+        await asyncio.gather(*(request(name, key) for name, key in requests))
+
+    asyncio.run(main())
+    return order
+
+
+class TestPrefixKey:
+    def test_same_prompt_same_key(self):
+        assert prefix_key("p1", "system") == prefix_key("p1", "system")
+        assert prefix_key("p1", "system").startswith("p1:")
+
+    def test_phase_and_parts_distinguish(self):
+        assert prefix_key("p1", "system") != prefix_key("p1", "system2")
+        assert prefix_key("p1", "ab", "c") != prefix_key("p1", "a", "bc")
+
+    def test_prompt_tokens_per_backend(self):
+        assert prompt_tokens("openai", 1000, 800) == 1000
+        assert prompt_tokens("claude", 200, 800, 50) == 1050
+
+
+class TestPrefixScheduler:
+    def test_warmup_runs_first_request_alone(self):
+        scheduler = PrefixScheduler(4)
+        active = []
+        peak = {}
+
+        async def request(name):
+            async with scheduler.slot("p1:x"):
+                active.append(name)
+                peak[name] = len(active)
+                await asyncio.sleep(0.01)
+                active.remove(name)
+
+        async def main():
+            await asyncio.gather(*(request(n) for n in range(6)))
+
+        asyncio.run(main())
+        assert peak[0] == 1
+        assert max(peak.values()) == 4
+
+    def test_groups_by_prefix(self):
+        requests = [(f"{k}{i}", k) for i in range(3) for k in ("a", "b")]
+        assert _run(PrefixScheduler(1, warmup=False), requests) == ["a0", "a1", "a2", "b0", "b1", "b2"]
+
+    def test_fifo_without_grouping(self):
+        requests = [(f"{k}{i}", k) for i in range(3) for k in ("a", "b")]
+        order = _run(PrefixScheduler(1, max_run=0, warmup=False), requests)
+        assert order == [name for name, _ in requests]
+
+    def test_max_run_yields_to_other_prefixes(self):
+        requests = [(f"a{i}", "a") for i in range(4)] + [("b0", "b")]
+        order = _run(PrefixScheduler(1, max_run=2, warmup=False), requests)
+        assert order == ["a0", "a1", "b0", "a2", "a3"]
+
+    def test_concurrency_limit_and_untracked_requests(self):
+        scheduler = PrefixScheduler(2)
+        active = [0]
+        peak = [0]
+
+        async def request(key):
+            cm = scheduler.slot(key) if key else scheduler
+            async with cm:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+                await asyncio.sleep(0.005)
+                active[0] -= 1
+
+        async def main():
+            await asyncio.gather(*(request(k) for k in ["a", None, "b", None, "a", "b", None]))
+
+        asyncio.run(main())
+        assert peak[0] == 2
+
+    def test_cancelled_waiter_releases_nothing(self):
+        scheduler = PrefixScheduler(1, warmup=False)
+
+        async def main():
+            done = []
+
+            async def request(name):
+                async with scheduler.slot("a"):
+                    await asyncio.sleep(0.01)
+                    done.append(name)
+
+            first = asyncio.create_task(request("first"))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(request("cancelled"))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(first, request("last"), return_exceptions=True)
+            return done
+
+        assert asyncio.run(main()) == ["first", "last"]
+        assert scheduler._free == 1
+
+
+class TestPrefixCacheStats:
+    def test_hit_rate_per_prefix(self):
+        stats = PrefixCacheStats()
+        stats.record("p1:a", 1000, 0)
+        stats.record("p1:a", 1000, 900)
+        stats.record("p4:b", 0, 0)
+        assert stats.hit_rate("p1:a") == 0.45
+        assert stats.hit_rate("p4:b") is None
+        assert stats.hit_rate("missing") is None
+        assert stats.snapshot()["p1:a"] == {"calls": 2, "prompt_tokens": 2000,
+                                            "cache_read_tokens": 900, "hit_rate": 0.45}
+        assert stats.format()[0] == "p1:a 45% (2 calls, 900/2,000 tok)"
+        assert stats.format()[1].startswith("p4:b - ")
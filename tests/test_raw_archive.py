@@ -0,0 +1,80 @@
+"""Tests for the segmented raw LLM response archive."""
+
+import gzip
+import json
+import os
+
+from app.pipeline_cli.raw_archive import (
+    INDEX_FILENAME,
+    RawArchive,
+    get_archive,
+    pack_directory,
+    parse_raw_filename,
+    raw_filename,
+)
+
+
+class TestRawFilenames:
+    def test_roundtrip(self):
+        assert raw_filename("al-kafi_1_1_1_1") == "al-kafi_1_1_1_1.raw.txt"
+        assert raw_filename("v1", "phase4.batch0") == "v1.phase4.batch0.raw.txt"
+        assert parse_raw_filename("v1.phase4.batch0.raw.txt") == ("v1", "phase4.batch0")
+        assert parse_raw_filename("v1.raw.txt") == ("v1", "")
+        assert parse_raw_filename("index.jsonl") is None
+
+
+class TestRawArchive:
+    def test_put_and_get_attempts(self, tmp_path):
+        archive = RawArchive(str(tmp_path))
+        first = archive.put("v1", "phase3", "first answer")
+        second = archive.put("v1", "phase3", "second answer")
+        assert (first["attempt"], second["attempt"]) == (1, 2)
+        assert archive.get("v1", "phase3") == "second answer"
+        assert archive.get("v1", "phase3", attempt=1) == "first answer"
+        assert archive.get("v1", "phase3", attempt=3) is None
+        assert archive.get("v1") is None
+
+    def test_identical_content_is_stored_once(self, tmp_path):
+        archive = RawArchive(str(tmp_path))
+        a = archive.put("v1", "", "same text" * 100)
+        b = archive.put("v2", "", "same text" * 100)
+        assert (a["segment"], a["offset"]) == (b["segment"], b["offset"])
+        stats = archive.stats()
+        assert stats["entries"] == 2
+        assert stats["unique_blobs"] == 1
+        assert stats["stored_bytes"] < stats["raw_bytes"]
+
+    def test_segments_rotate_and_stay_valid_gzip(self, tmp_path):
+        archive = RawArchive(str(tmp_path), max_segment_bytes=200)
+        texts = [os.urandom(120).hex() for _ in range(4)]
+        for n, text in enumerate(texts):
+            archive.put(f"v{n}", "", text)
+        segments = sorted(p for p in os.listdir(tmp_path) if p.endswith(".gz"))
+        assert len(segments) == 4
+        # a segment decompresses as a plain (multi-member) gzip file
+        assert gzip.decompress((tmp_path / segments[0]).read_bytes()).decode() == texts[0]
+
+    def test_second_instance_sees_other_writers(self, tmp_path):
+        writer = RawArchive(str(tmp_path))
+        reader = RawArchive(str(tmp_path))
+        writer.put("v1", "fix", "from another process")
+        assert reader.get("v1", "fix") == "from another process"
+        reader.put("v1", "fix", "retry")
+        assert reader.attempts("v1", "fix")[-1]["attempt"] == 2
+        lines = (tmp_path / INDEX_FILENAME).read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["suffix"] for line in lines] == ["fix", "fix"]
+
+
+class TestPackDirectory:
+    def test_packs_files_in_write_order(self, tmp_path):
+        for n, (name, text) in enumerate([("v1.raw.txt", "a"), ("v1.fix.raw.txt", "b"), ("v2.raw.txt", "a")]):
+            path = tmp_path / name
+            path.write_text(text, encoding="utf-8")
+            os.utime(path, (1000 + n, 1000 + n))
+        result = pack_directory(str(tmp_path), delete=True)
+        assert result["packed"] == 3
+        assert result["unique_blobs"] == 2
+        assert not list(tmp_path.glob("*.raw.txt"))
+        archive = get_archive(str(tmp_path))
+        assert archive.get("v1", "fix") == "b"
+        assert archive.get("v2") == "a"
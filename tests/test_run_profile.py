@@ -0,0 +1,90 @@
+"""Tests for run stage instrumentation (app/run_profile.py)."""
+
+import json
+
+import pytest
+
+from app import run_profile
+from app.lib_db import load_chapter, load_json, write_file
+from app.run_profile import RunProfiler, profiler
+
+
+@pytest.fixture(autouse=True)
+def clean_profiler(monkeypatch):
+    monkeypatch.delenv("RUN_REPORT", raising=False)
+    monkeypatch.delenv("RUN_TRACE", raising=False)
+    profiler.reset()
+    yield
+    profiler.reset()
+
+
+class TestStages:
+    def test_stage_records_time_and_nesting(self):
+        p = RunProfiler()
+        with p.stage("outer"):
+            with p.stage("inner") as inner:
+                sum(range(10000))
+        outer, inner = p.stages
+        assert (outer["name"], outer["depth"], inner["depth"]) == ("outer", 0, 1)
+        assert outer["wall_s"] >= inner["wall_s"] >= 0
+        assert inner["cpu_s"] >= 0
+        if run_profile.resource is not None:
+            assert outer["peak_rss_delta_bytes"] >= 0
+
+    def test_stage_recorded_when_it_raises(self):
+        p = RunProfiler()
+        with pytest.raises(ValueError):
+            with p.stage("boom"):
+                raise ValueError
+        assert "wall_s" in p.stages[0]
+
+    def test_no_rss_without_resource(self, monkeypatch):
+        monkeypatch.setattr(run_profile, "resource", None)
+        p = RunProfiler()
+        with p.stage("s"):
+            pass
+        assert p.stages[0]["peak_rss_delta_bytes"] is None
+        assert p.report()["peak_rss_bytes"] is None
+
+
+class TestIOHooks:
+    def test_write_file_and_loads_are_counted(self, temp_destination_dir):
+        doc = {"index": "test:1", "kind": "chapter", "data": {"path": "/books/test:1", "verses": []}}
+        with profiler.stage("write"):
+            written = write_file("/books/test:1", doc)
+        with profiler.stage("read"):
+            load_chapter("/books/test:1")
+            load_json("/books/test:1")
+        size = len(open(written.id, "rb").read())
+        write, read = profiler.stages
+        assert (write["files_written"], write["bytes_written"], write["files_read"]) == (1, size, 0)
+        assert (read["files_read"], read["bytes_read"], read["files_written"]) == (2, 2 * size, 0)
+
+
+class TestOutputs:
+    def test_finish_writes_report_and_trace(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("RUN_REPORT", str(tmp_path / "out" / "report.json"))
+        monkeypatch.setenv("RUN_TRACE", str(tmp_path / "trace.json"))
+        with profiler.stage("a"):
+            run_profile.record_write(10)
+        with profiler.stage("b"):
+            run_profile.record_read(5)
+        profiler.finish({"output": {"chapter": {"files": 1}}})
+
+        report = json.loads((tmp_path / "out" / "report.json").read_text())
+        assert [s["name"] for s in report["stages"]] == ["a", "b"]
+        assert (report["bytes_written"], report["bytes_read"]) == (10, 5)
+        assert report["output"] == {"chapter": {"files": 1}}
+
+        trace = json.loads((tmp_path / "trace.json").read_text())
+        slices = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        assert [e["name"] for e in slices] == ["a", "b"]
+        assert slices[0]["args"]["bytes_written"] == 10
+        assert slices[1]["ts"] >= slices[0]["ts"] + slices[0]["dur"]
+
+    def test_finish_writes_nothing_by_default(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        with profiler.stage("a"):
+            pass
+        assert profiler.finish()["stages"][0]["name"] == "a"
+        assert list(tmp_path.iterdir()) == []
@@ -415,6 +415,58 @@ class TestBuildBookDocs:
         assert docs == []
 
 
+class TestBuildBookDocsShellFormat:
+    """Shell chapters (verse_refs) are joined to their verse_detail files."""
+
+    @pytest.fixture
+    def shell_data_dir(self, tmp_path):
+        book_dir = tmp_path / "books" / "test-book"
+        (book_dir / "1").mkdir(parents=True)
+        shell = {
+            "kind": "verse_list",
+            "data": {
+                "path": "/books/test-book:1",
+                "titles": {"en": "Chapter One"},
+                "default_verse_translation_ids": {"en": "en.test"},
+                "verse_refs": [
+                    {"local_index": 1, "part_type": "Heading",
+                     "inline": {"part_type": "Heading", "text": ["heading"]}},
+                    {"local_index": 1, "part_type": "Hadith", "path": "/books/test-book:1:1"},
+                    {"local_index": 2, "part_type": "Hadith", "path": "/books/test-book:1:2"},
+                ],
+            },
+        }
+        (book_dir / "1.json").write_text(json.dumps(shell, ensure_ascii=False), encoding="utf-8")
+        for i, (ar, en) in enumerate([("\u0628\u0650\u0633\u0652\u0645\u0650", "In the name"),
+                                      ("\u0627\u0644\u0644\u0651\u064e\u0647\u0650", "of Allah")], start=1):
+            detail = {
+                "kind": "verse_detail",
+                "data": {
+                    "chapter_path": "/books/test-book:1",
+                    "verse": {
+                        "local_index": i,
+                        "path": f"/books/test-book:1:{i}",
+                        "text": [ar],
+                        "translations": {"en.other": ["x"], "en.test": [en]},
+                    },
+                },
+            }
+            (book_dir / "1" / f"{i}.json").write_text(json.dumps(detail, ensure_ascii=False), encoding="utf-8")
+        return str(tmp_path)
+
+    def test_joins_verse_details_in_ref_order(self, shell_data_dir):
+        docs = build_book_docs(shell_data_dir, "test-book")
+        assert [d["p"] for d in docs] == ["/books/test-book:1:1", "/books/test-book:1:2"]
+        assert docs[1]["en"] == "of Allah"
+        assert docs[1]["t"] == "Chapter One"
+        assert docs[1]["i"] == 2
+
+    def test_missing_detail_is_skipped(self, shell_data_dir):
+        os.remove(os.path.join(shell_data_dir, "books", "test-book", "1", "2.json"))
+        docs = build_book_docs(shell_data_dir, "test-book")
+        assert [d["p"] for d in docs] == ["/books/test-book:1:1"]
+
+
 # ---------------------------------------------------------------------------
 # write_search_json tests
 # ---------------------------------------------------------------------------
@@ -597,3 +649,48 @@ class TestGenerateSearchIndexes:
     def test_empty_book_produces_empty_docs(self, full_data_dir):
         results = generate_search_indexes(full_data_dir)
         assert results["al-kafi-docs.json"] == 0
+
+    def test_unchanged_books_are_skipped(self, full_data_dir, monkeypatch):
+        import app.search_index as search_index
+        generate_search_indexes(full_data_dir)
+        built = []
+        original = search_index.build_book_docs
+        monkeypatch.setattr(search_index, "build_book_docs",
+                            lambda d, slug: built.append(slug) or original(d, slug))
+
+        results = generate_search_indexes(full_data_dir)
+        assert built == []
+        assert results["quran-docs.json"] == 1
+
+        # Touching a book's file re-emits only that book
+        verse_file = os.path.join(full_data_dir, "books", "quran", "1.json")
+        with open(verse_file, "a", encoding="utf-8") as f:
+            f.write("\n")
+        generate_search_indexes(full_data_dir)
+        assert built == ["quran"]
+
+        generate_search_indexes(full_data_dir, force=True)
+        assert built == ["quran", "al-kafi", "quran"]
+
+    def test_missing_shards_rebuild_book(self, full_data_dir, monkeypatch):
+        import shutil
+        import app.search_index as search_index
+        generate_search_indexes(full_data_dir)
+        built = []
+        original = search_index.build_book_docs
+        monkeypatch.setattr(search_index, "build_book_docs",
+                            lambda d, slug: built.append(slug) or original(d, slug))
+
+        shutil.rmtree(os.path.join(full_data_dir, "index", "search", "shards", "quran"))
+        generate_search_indexes(full_data_dir)
+        assert built == ["quran"]
+        assert os.path.exists(os.path.join(full_data_dir, "index", "search", "shards", "quran", "manifest.json"))
+
+    def test_parallel_matches_serial(self, full_data_dir):
+        serial = generate_search_indexes(full_data_dir, force=True)
+        with open(os.path.join(full_data_dir, "index", "search", "quran-docs.json"), encoding="utf-8") as f:
+            serial_docs = f.read()
+        parallel = generate_search_indexes(full_data_dir, workers=2, force=True)
+        with open(os.path.join(full_data_dir, "index", "search", "quran-docs.json"), encoding="utf-8") as f:
+            assert f.read() == serial_docs
+        assert parallel == serial
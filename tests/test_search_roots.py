@@ -0,0 +1,72 @@
+"""Tests for app.search_roots — lemma/root postings from AI word analyses."""
+
+import json
+
+from app.search_index import write_search_json
+from app.search_roots import RootKeyer, build_root_indexes, lookup, verse_words
+
+# Stub morphology: surface (undiacritized) → (lex, root)
+_MORPH = {
+    "قال": ("قال", "ق.و.ل"),
+    "يقول": ("قال", "ق.و.ل"),
+    "القول": ("قول", "ق.و.ل"),
+    "الصلاة": ("صلاة", "ص.ل.و"),
+}
+
+
+class _StubAnalyzer:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, surface):
+        from app.arabic_normalization import strip_tashkeel
+        self.calls += 1
+        entry = _MORPH.get(strip_tashkeel(surface))
+        return {"lex": entry[0], "root": entry[1]} if entry else None
+
+
+def _write_response(responses_dir, name, verse_path, result):
+    (responses_dir / f"{name}.json").write_text(
+        json.dumps({"verse_path": verse_path, "result": result}, ensure_ascii=False),
+        encoding="utf-8")
+
+
+class TestVerseWords:
+    def test_word_analysis_tags_and_chunks(self):
+        assert verse_words({"word_analysis": [{"word": "قَالَ", "pos": "V"}]}) == [("قَالَ", "V")]
+        assert verse_words({"word_tags": [["قَالَ", "V"]]}) == [("قَالَ", "V")]
+        assert verse_words({"chunks": [{"arabic_text": "قَالَ الصَّلَاةُ"}]}) == [
+            ("قَالَ", None), ("الصَّلَاةُ", None)]
+
+
+class TestBuildRootIndexes:
+    def test_indexes_inflected_forms_under_lemma_and_root(self, tmp_path):
+        data_dir = str(tmp_path)
+        write_search_json(data_dir, "t-docs.json", [
+            {"p": "/books/t:1:1"}, {"p": "/books/t:1:2"}, {"p": "/books/t:1:3"},
+        ])
+        responses = tmp_path / "responses"
+        responses.mkdir()
+        _write_response(responses, "t_1_1", "/books/t:1:1",
+                        {"word_analysis": [{"word": "قَالَ", "pos": "V"}, {"word": "عَنْ", "pos": "PREP"}]})
+        _write_response(responses, "t_1_3", "/books/t:1:3",
+                        {"chunks": [{"arabic_text": "«يَقُولُ» القَوْلَ، الصَّلَاةُ"}]})
+
+        analyzer = _StubAnalyzer()
+        results = build_root_indexes(data_dir, ["t"], responses_dir=str(responses),
+                                     keyer=RootKeyer(analyzer))
+        assert results == {"t-roots.json": 2}
+        assert analyzer.calls == 4  # عن skipped as PREP; each surface analyzed once
+
+        with open(tmp_path / "index" / "search" / "t-roots.json", encoding="utf-8") as f:
+            index = json.load(f)
+        assert index["root"]["ق.و.ل"] == [0, 2]  # delta-encoded doc ids 0, 2
+        assert lookup(index, lemma="قَالَ") == [0, 2]
+        assert lookup(index, root="ق.و.ل") == [0, 2]
+        assert lookup(index, lemma="قول", root="ق.و.ل") == [2]
+        assert lookup(index, root="ص.ل.و") == [2]
+
+    def test_book_without_docs_is_skipped(self, tmp_path):
+        results = build_root_indexes(str(tmp_path), ["missing"], responses_dir=str(tmp_path),
+                                     keyer=RootKeyer(_StubAnalyzer()))
+        assert results == {}
@@ -0,0 +1,87 @@
+"""Tests for app.search_shards — sharded inverted index and query engine."""
+
+import json
+import os
+
+from app.arabic_normalization import normalize_arabic
+from app.search_index import write_search_json
+from app.search_shards import (
+    ShardIndex,
+    build_book_shards,
+    book_shard_dir,
+    delta_decode,
+    delta_encode,
+    shard_of,
+    tokenize,
+)
+
+
+DOCS = [
+    {"p": "/books/t:1:1", "ar": normalize_arabic("قَالَ رَسُولُ اللَّهِ"), "en": "The Messenger of Allah said"},
+    {"p": "/books/t:1:2", "ar": normalize_arabic("الصَّلَاةُ عَمُودُ الدِّينِ"), "en": "Prayer is the pillar of religion"},
+    {"p": "/books/t:1:3", "ar": normalize_arabic("قَالَ أَبُو عَبْدِ اللَّهِ الصَّلَاةُ"), "en": "Abu Abdillah said: prayer, prayer"},
+]
+
+
+def _build(tmp_path, terms_per_shard=4):
+    data_dir = str(tmp_path)
+    write_search_json(data_dir, "t-docs.json", DOCS)
+    manifest = build_book_shards(data_dir, "t", DOCS, terms_per_shard=terms_per_shard)
+    return data_dir, manifest
+
+
+class TestEncoding:
+    def test_delta_roundtrip(self):
+        assert delta_encode([3, 7, 8]) == [3, 4, 1]
+        assert delta_decode([3, 4, 1]) == [3, 7, 8]
+
+    def test_tokenize_normalizes_arabic_queries(self):
+        assert tokenize("الصَّلَاةُ", "ar") == tokenize(DOCS[1]["ar"], "ar")[:1]
+        assert tokenize("Prayer, PRAYER", "en") == ["prayer", "prayer"]
+
+
+class TestBuildBookShards:
+    def test_terms_land_in_their_hash_shard(self, tmp_path):
+        data_dir, manifest = _build(tmp_path)
+        meta = manifest["fields"]["en"]
+        assert meta["shards"] > 1
+        field_dir = os.path.join(book_shard_dir(data_dir, "t"), "en")
+        seen = 0
+        for n in range(meta["shards"]):
+            with open(os.path.join(field_dir, f"{n:03d}.json"), encoding="utf-8") as f:
+                for term in json.load(f)["t"]:
+                    assert shard_of(term, meta["shards"]) == n
+                    seen += 1
+        assert seen == meta["terms"]
+
+    def test_rebuild_replaces_stale_shards(self, tmp_path):
+        data_dir, _ = _build(tmp_path, terms_per_shard=1)
+        _build(tmp_path, terms_per_shard=1000)
+        assert os.listdir(os.path.join(book_shard_dir(data_dir, "t"), "ar")) == ["000.json"]
+
+
+class TestShardIndex:
+    def test_postings_and_term_frequency(self, tmp_path):
+        data_dir, _ = _build(tmp_path)
+        index = ShardIndex(data_dir, "t")
+        assert index.postings("en", "prayer") == [(1, 1), (2, 2)]
+        assert index.postings("en", "missing") == []
+
+    def test_search_all_terms_ranked(self, tmp_path):
+        data_dir, _ = _build(tmp_path)
+        index = ShardIndex(data_dir, "t")
+        assert [d for d, _ in index.search("prayer")] == [2, 1]
+        assert [d for d, _ in index.search("said prayer")] == [2]
+        assert [d for d, _ in index.search("said prayer", match_all=False)] == [2, 0, 1]
+        assert index.docs()[2]["p"] == "/books/t:1:3"
+
+    def test_arabic_query_detected_and_normalized(self, tmp_path):
+        data_dir, _ = _build(tmp_path)
+        index = ShardIndex(data_dir, "t")
+        assert [d for d, _ in index.search("قال الصلاة")] == [2]
+
+    def test_loads_only_needed_shards(self, tmp_path):
+        data_dir, manifest = _build(tmp_path)
+        index = ShardIndex(data_dir, "t")
+        index.search("prayer")
+        assert 0 < index.bytes_loaded < manifest["fields"]["en"]["bytes"]
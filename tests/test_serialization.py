@@ -0,0 +1,228 @@
+"""Equivalence of the fast serializer with the legacy encoding path.
+
+The legacy path was ``json.dumps(clean_nones(jsonable_encoder(model)),
+indent=2, sort_keys=True, ensure_ascii=False)``; ``json_output.to_jsonable``
++ ``json_output.dumpb`` must produce the same bytes.
+"""
+
+import gzip
+import json
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from app import json_output
+from app.json_output import dumpb, iter_json, prune_nones, to_jsonable, write_json, write_json_if_changed
+from app.lib_db import clean_nones
+from app.models import Chapter, Crumb, Language, PartType, Verse
+from app.models.crumb import Navigation
+from app.models.people import ChainVerses, Narrator
+from app.models.quran import NarratorChain, SpecialText
+
+
+def _legacy(obj, exclude=None, compact=False) -> bytes:
+    data = clean_nones(jsonable_encoder(obj, exclude=exclude))
+    if compact:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True)
+    return text.encode("utf-8")
+
+
+def _verse(n: int, part_type: PartType = PartType.Hadith) -> Verse:
+    verse = Verse()
+    verse.index = n
+    verse.local_index = n
+    verse.part_type = part_type
+    verse.path = f"/books/golden:1:1:{n}"
+    verse.text = ["عَلِيُّ بْنُ إِبْرَاهِيمَ عَنْ أَبِيهِ", "قَالَ \"نَعَمْ\"\t\\"]
+    verse.translations = {"en.hubeali": [f"Hadith {n} — “quoted”"], "ur.ai": []}
+    if n % 2:
+        verse.relations = {"Mentions": {"/books/quran:2:5", "/books/quran:1:1", "/books/quran:2:10"},
+                           "Narrated by": set()}
+        verse.gradings = {"majlisi": "صحيح"}
+    else:
+        verse.gradings = ["weak", "hasan"]
+    verse.narrator_chain = NarratorChain(
+        text="عَلِيُّ بْنُ إِبْرَاهِيمَ",
+        parts=[SpecialText(kind="narrator", text="عَلِيُّ", path="/people/narrators/1"),
+               SpecialText(kind="plain", text=" عَنْ ")],
+    )
+    return verse
+
+
+def _book() -> Chapter:
+    leaf = Chapter()
+    leaf.index = 1
+    leaf.local_index = 1
+    leaf.part_type = PartType.Chapter
+    leaf.path = "/books/golden:1:1"
+    leaf.titles = {Language.EN.value: "The Book of Intellect", Language.AR.value: "كِتَابُ الْعَقْلِ", "fa": None}
+    leaf.crumbs = [Crumb(titles={"en": "Golden", "ar": None}, path="/books/golden")]
+    leaf.nav = Navigation(prev=None, next="/books/golden:1:2", up="/books/golden:1")
+    leaf.verse_translations = ["en.hubeali", "ur.ai"]
+    leaf.default_verse_translation_ids = {"en": "en.hubeali"}
+    leaf.verses = [_verse(0, PartType.Heading)] + [_verse(n) for n in range(1, 6)]
+    leaf.verse_count = 5
+    leaf.order = 0
+    leaf.descriptions = {"en": ["line one", ""]}
+
+    volume = Chapter()
+    volume.index = 1
+    volume.part_type = PartType.Volume
+    volume.path = "/books/golden:1"
+    volume.titles = {"en": "Volume One"}
+    volume.chapters = [leaf]
+
+    book = Chapter()
+    book.part_type = PartType.Book
+    book.path = "/books/golden"
+    book.titles = {"en": "Golden", "ar": "ذهبي"}
+    book.author = {"en": "Test"}
+    book.chapters = [volume]
+    return book
+
+
+def _narrator() -> Narrator:
+    narrator = Narrator()
+    narrator.index = 7
+    narrator.path = "/people/narrators/7"
+    narrator.titles = {"en": None, "ar": "زُرَارَةُ"}
+    narrator.verse_paths = {"/books/golden:1:1:3", "/books/golden:1:1:1", "/books/golden:1:1:20"}
+    narrator.relations = {"narrated from": {"9", "10", "2"}}
+    chain = ChainVerses()
+    chain.narrator_ids = [7, 9]
+    chain.verse_paths = {"/books/golden:1:1:3", "/books/golden:1:1:1"}
+    narrator.subchains = {"7-9": chain}
+    narrator.verse_count = 3
+    return narrator
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    if request.param == "orjson":
+        if json_output.orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(json_output, "orjson", None)
+    return request.param
+
+
+class TestGoldenEquivalence:
+    def test_complete_book(self, encoder):
+        book = _book()
+        assert dumpb(to_jsonable(book), profile="pretty") == _legacy(book)
+        assert dumpb(to_jsonable(book), profile="compact") == _legacy(book, compact=True)
+
+    def test_complete_book_wrapped_in_dict(self, encoder):
+        book = _book()
+        wrapped = {"index": "golden", "kind": "complete_book", "data": book, "extra": None}
+        legacy = json.dumps(
+            clean_nones({"index": "golden", "kind": "complete_book", "data": jsonable_encoder(book), "extra": None}),
+            ensure_ascii=False, indent=2, sort_keys=True,
+        ).encode("utf-8")
+        assert dumpb(to_jsonable(wrapped), profile="pretty") == legacy
+
+    def test_chapter_list_nested_exclude(self, encoder):
+        book = _book()
+        exclude = {"chapters": {"__all__": {"chapters", "verses", "crumbs", "nav"}}}
+        assert dumpb(to_jsonable(book, exclude=exclude)) == _legacy(book, exclude=exclude)
+
+    def test_narrator_sorted_sets(self, encoder):
+        narrator = _narrator()
+        out = dumpb(to_jsonable(narrator))
+        assert out == _legacy(narrator)
+        assert json.loads(out)["relations"]["narrated from"] == ["10", "2", "9"]
+
+    def test_int_keys_fall_back_to_json_ordering(self, encoder):
+        data = {10: "ten", 9: "nine", "x": None}
+        assert dumpb(to_jsonable(data)) == _legacy(data)
+
+    def test_plain_floats_match(self, encoder):
+        data = {"a": 1.5, "b": [0.1, -2.25, 100.0], "c": 3.0e-3}
+        assert dumpb(data) == _legacy(data)
+
+
+class TestOrjsonFloatDifferences:
+    """Float spellings where orjson and json disagree (see json_output docstring)."""
+
+    @pytest.fixture(autouse=True)
+    def needs_orjson(self):
+        if json_output.orjson is None:
+            pytest.skip("orjson not installed")
+
+    @pytest.mark.parametrize("value, orjson_out, json_out", [
+        (1e-05, b"0.00001", b"1e-05"),
+        (1e16, b"1e16", b"1e+16"),
+        (float("nan"), b"null", b"NaN"),
+        (float("inf"), b"null", b"Infinity"),
+    ])
+    def test_differs_from_json(self, value, orjson_out, json_out, monkeypatch):
+        assert dumpb([value], profile="compact") == b"[" + orjson_out + b"]"
+        monkeypatch.setattr(json_output, "orjson", None)
+        assert dumpb([value], profile="compact") == b"[" + json_out + b"]"
+
+
+class TestPruneNones:
+    @pytest.mark.parametrize("value", [
+        {"a": None, "b": [None, 1, {"c": None, "d": [None]}], "e": {}},
+        [None, None],
+        [{"a": None}, None, [None, {"b": 0, "c": False, "d": ""}]],
+        "scalar",
+        None,
+    ])
+    def test_matches_clean_nones(self, value):
+        expected = clean_nones(value)
+        assert prune_nones(json.loads(json.dumps(value))) == expected
+
+
+class TestStreamingWriter:
+    @pytest.mark.parametrize("profile", ["pretty", "compact"])
+    def test_stream_matches_dumpb(self, encoder, profile):
+        book = _book()
+        book.chapters.append(Chapter(path="/books/golden:2", chapters=[]))
+        wrapped = {"index": "golden", "kind": "complete_book", "data": book, "x": None}
+        for obj in (book, wrapped, _narrator(), {"plain": [1, None, {"a": None}]}):
+            expected = dumpb(to_jsonable(obj), profile=profile)
+            assert b"".join(iter_json(obj, profile=profile, prune=True)) == expected
+
+    def test_plain_data_keeps_nones_unless_pruned(self):
+        doc = {"ai": {"chunks": [None, "second"]}, "lang": "fa", "path": None, "narrator": _narrator()}
+        out = json.loads(b"".join(iter_json(doc)))
+        assert out["ai"]["chunks"] == [None, "second"]
+        assert out["path"] is None
+        assert out["narrator"] == json.loads(dumpb(to_jsonable(_narrator())))
+        assert json.loads(b"".join(iter_json(doc, prune=True)))["ai"]["chunks"] == ["second"]
+
+    def test_book_is_written_in_chapter_pieces(self):
+        book = _book()
+        volume = book.chapters[0]
+        volume.chapters = [volume.chapters[0].model_copy(update={"path": f"/books/golden:1:{n}"})
+                           for n in range(1, 5)]
+        chunks = list(iter_json(book, profile="pretty"))
+        # No piece holds more than one leaf chapter's verses.
+        assert b"".join(chunks) == dumpb(to_jsonable(book), profile="pretty")
+        assert max(len(c) for c in chunks) < len(b"".join(chunks)) / 3
+
+    def test_write_json_streams_to_file_and_siblings(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("JSON_PRECOMPRESS", "gz")
+        path = tmp_path / "book.json"
+        size = write_json(str(path), _book(), kind="complete_book")
+        assert path.read_bytes() == _legacy(_book())
+        assert size == path.stat().st_size
+        assert gzip.decompress((tmp_path / "book.json.gz").read_bytes()) == path.read_bytes()
+
+    def test_write_json_if_changed_skips_identical_content(self, tmp_path, monkeypatch):
+        path = tmp_path / "verse.json"
+        doc = {"kind": "verse_detail", "data": {"verse": {"text": ["بسم الله"]}}}
+        assert write_json_if_changed(str(path), doc) == path.stat().st_size
+        assert write_json_if_changed(str(path), doc) is None
+
+        monkeypatch.setenv("JSON_PRECOMPRESS", "gz")
+        assert write_json_if_changed(str(path), doc) is not None  # sibling missing
+        assert (tmp_path / "verse.json.gz").exists()
+        assert write_json_if_changed(str(path), doc) is None
+
+        doc["data"]["verse"]["text"].append("x")
+        assert write_json_if_changed(str(path), doc) is not None
+        assert json.loads(path.read_text(encoding="utf-8")) == doc
@@ -0,0 +1,77 @@
+"""Tests for the incremental pipeline stats ledger."""
+
+import json
+import os
+
+from app.pipeline_cli.pipeline import save_verse_stats
+from app.pipeline_cli.pipeline_status import _aggregate_verse_stats
+from app.pipeline_cli.stats_ledger import StatsLedger
+
+
+def _save(stats_dir, vid, **kwargs):
+    save_verse_stats(vid, f"/books/{vid}", stats_dir, **kwargs)
+
+
+class TestStatsLedger:
+
+    def test_aggregate_matches_full_rebuild(self, tmp_path):
+        stats_dir = str(tmp_path / "stats")
+        _save(stats_dir, "a_1", status="pass", model="sonnet", gen_cost=1.0,
+              gen_output_tokens=100, content_type="narrative", warnings_high=1)
+        _save(stats_dir, "a_2", status="error", model="haiku", gen_cost=0.5)
+        _save(stats_dir, "a_3", status="fixed", model="sonnet", fix_needed=True,
+              fix_cost=0.25, fix_elapsed=3.0, content_type="narrative")
+
+        incremental = _aggregate_verse_stats(stats_dir)
+        rebuilt = _aggregate_verse_stats(stats_dir, rebuild=True)
+        assert incremental == rebuilt
+        assert incremental["count"] == 3
+        assert incremental["by_status"] == {"pass": 1, "error": 1, "fixed": 1}
+        assert incremental["by_model"] == {"sonnet": 2, "haiku": 1}
+        assert incremental["by_content_type"] == {"narrative": 2}
+        assert incremental["total_fix_cost"] == 0.25
+        assert incremental["warnings"]["high"] == 1
+
+    def test_reprocessed_verse_replaces_contribution(self, tmp_path):
+        stats_dir = str(tmp_path / "stats")
+        _save(stats_dir, "a_1", status="error", model="haiku", gen_cost=0.5)
+        first = _aggregate_verse_stats(stats_dir)
+        assert first["by_status"] == {"error": 1}
+
+        # Re-run of the same verse: snapshot exists, only the new line is folded
+        _save(stats_dir, "a_1", status="pass", model="sonnet", gen_cost=2.0)
+        second = _aggregate_verse_stats(stats_dir)
+        assert second["count"] == 1
+        assert second["by_status"] == {"pass": 1}
+        assert second["by_model"] == {"sonnet": 1}
+        assert second["total_cost"] == 2.0
+
+    def test_snapshot_offset_advances(self, tmp_path):
+        stats_dir = str(tmp_path / "stats")
+        _save(stats_dir, "a_1", status="pass")
+        ledger = StatsLedger(stats_dir)
+        ledger.aggregate()
+        with open(ledger.aggregate_path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        assert snapshot["ledger_offset"] == os.path.getsize(ledger.ledger_path)
+
+    def test_stats_written_before_ledger_are_bootstrapped(self, tmp_path):
+        stats_dir = tmp_path / "stats"
+        stats_dir.mkdir()
+        (stats_dir / "a_1.stats.json").write_text(json.dumps({
+            "status": "pass", "model": "sonnet",
+            "generation": {"cost_usd": 1.5, "output_tokens": 10, "elapsed_s": 2},
+        }), encoding="utf-8")
+        agg = _aggregate_verse_stats(str(stats_dir))
+        assert agg["count"] == 1
+        assert agg["total_cost"] == 1.5
+
+    def test_status_query_leaves_stats_dir_mtime_alone(self, tmp_path):
+        # The completion index keys its freshness on the stats/ mtime.
+        stats_dir = str(tmp_path / "stats")
+        _save(stats_dir, "a_1", status="pass")
+        os.utime(stats_dir, (1_000_000, 1_000_000))
+        _aggregate_verse_stats(stats_dir)
+        _aggregate_verse_stats(stats_dir, rebuild=True)
+        assert os.path.getmtime(stats_dir) == 1_000_000
+        assert os.listdir(stats_dir) == ["a_1.stats.json"]
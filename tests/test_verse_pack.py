@@ -0,0 +1,222 @@
+"""Tests for packed per-book verse_detail containers (app/verse_pack.py)."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from app.search_index import build_book_docs
+from app.validate_data import ValidationReport, validate_packs
+from app.verse_counts import build as build_verse_counts
+from app.verse_pack import (
+    VerseDetailSource,
+    VersePack,
+    iter_verse_details,
+    pack_book,
+    pack_path,
+    restore_packed_files,
+    unpack_book,
+    write_pack,
+)
+
+
+def _write_json(path, obj):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    book_dir = tmp_path / "books" / "test-book"
+    _write_json(str(book_dir / "1.json"), {
+        "index": "test-book:1",
+        "kind": "verse_list",
+        "data": {
+            "path": "/books/test-book:1",
+            "titles": {"en": "Chapter One"},
+            "default_verse_translation_ids": {"en": "en.test"},
+            "verse_refs": [
+                {"local_index": i, "part_type": "Hadith", "path": f"/books/test-book:1:{i}"}
+                for i in (1, 2, 10)
+            ],
+        },
+    })
+    for i in (1, 2, 10):
+        _write_json(str(book_dir / "1" / f"{i}.json"), {
+            "index": f"test-book:1:{i}",
+            "kind": "verse_detail",
+            "data": {
+                "chapter_path": "/books/test-book:1",
+                "verse": {
+                    "local_index": i,
+                    "part_type": "Hadith",
+                    "path": f"/books/test-book:1:{i}",
+                    "text": ["بِسْمِ"],
+                    "translations": {"en.test": [f"hadith {i}"]},
+                },
+            },
+        })
+    _write_json(str(book_dir / "1" / "2.ur.json"),
+                {"ai": {"summary": "x"}, "lang": "ur", "path": "/books/test-book:1:2"})
+    return str(tmp_path)
+
+
+def _snapshot(data_dir):
+    out = {}
+    books_dir = os.path.join(data_dir, "books")
+    for root, _dirs, files in os.walk(books_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                out[os.path.relpath(path, books_dir)] = f.read()
+    return out
+
+
+class TestPackRoundTrip:
+    def test_unpack_restores_files_byte_for_byte(self, data_dir):
+        before = _snapshot(data_dir)
+        stats = pack_book(data_dir, "test-book", remove_files=True)
+        assert stats == {"records": 4, "files": 4, "file_bytes": stats["file_bytes"],
+                         "pack_bytes": os.path.getsize(pack_path(data_dir, "test-book"))}
+        # Only the shell chapter is left on disk
+        assert set(_snapshot(data_dir)) == {os.path.join("test-book", "1.json")}
+
+        assert unpack_book(data_dir, "test-book") == 4
+        assert _snapshot(data_dir) == before
+
+    def test_keys_in_natural_order(self, data_dir):
+        pack_book(data_dir, "test-book")
+        with VersePack(pack_path(data_dir, "test-book")) as pack:
+            assert pack.keys() == [
+                "/books/test-book:1:1",
+                "/books/test-book:1:2",
+                "/books/test-book:1:2#ur",
+                "/books/test-book:1:10",
+            ]
+            assert pack.get("/books/test-book:1:2", "ur")["lang"] == "ur"
+            assert pack.get("/books/test-book:1:3") is None
+            assert [d["index"] for d in pack.iter_details()] == [
+                "test-book:1:1", "test-book:1:2", "test-book:1:10",
+            ]
+
+    def test_repack_keeps_records_whose_files_were_removed(self, data_dir):
+        pack_book(data_dir, "test-book", remove_files=True)
+        _write_json(os.path.join(data_dir, "books", "test-book", "1", "2.json"), {
+            "index": "test-book:1:2", "kind": "verse_detail",
+            "data": {"verse": {"path": "/books/test-book:1:2", "text": ["new"]}},
+        })
+        stats = pack_book(data_dir, "test-book")
+        assert stats["records"] == 4 and stats["files"] == 1
+        with VersePack(pack_path(data_dir, "test-book")) as pack:
+            assert pack.get("/books/test-book:1:2")["data"]["verse"]["text"] == ["new"]
+
+    def test_rejects_non_pack_file(self, tmp_path):
+        path = tmp_path / "bad.vpack"
+        path.write_bytes(b"not a pack at all, just some bytes")
+        with pytest.raises(ValueError):
+            VersePack(str(path))
+
+
+class TestReaderApi:
+    def test_iter_verse_details_same_with_and_without_pack(self, data_dir):
+        def by_index(docs):
+            return sorted(docs, key=lambda d: d["index"])
+
+        unpacked = by_index(iter_verse_details(data_dir, "test-book"))
+        pack_book(data_dir, "test-book", remove_files=True)
+        assert by_index(iter_verse_details(data_dir, "test-book")) == unpacked
+
+    def test_source_prefers_files_then_pack(self, data_dir):
+        pack_book(data_dir, "test-book", remove_files=True)
+        _write_json(os.path.join(data_dir, "books", "test-book", "1", "1.json"),
+                    {"kind": "verse_detail", "data": {"verse": {"path": "/books/test-book:1:1"}},
+                     "index": "fresh"})
+        with VerseDetailSource(data_dir, "test-book") as source:
+            assert source.load("/books/test-book:1:1")["index"] == "fresh"
+            assert source.load("/books/test-book:1:10")["index"] == "test-book:1:10"
+            assert source.load("/books/test-book:1:2", "ur")["lang"] == "ur"
+            assert source.load("/books/test-book:1:99") is None
+
+    def test_files_written_after_packing_win_in_every_reader(self, data_dir):
+        pack_book(data_dir, "test-book")
+        _write_json(os.path.join(data_dir, "books", "test-book", "1", "1.json"), {
+            "index": "test-book:1:1", "kind": "verse_detail",
+            "data": {"verse": {"local_index": 1, "part_type": "Hadith",
+                               "path": "/books/test-book:1:1", "text": ["new"],
+                               "translations": {"en.test": ["regenerated"]}}},
+        })
+        docs = list(iter_verse_details(data_dir, "test-book"))
+        assert [d["index"] for d in docs] == ["test-book:1:1", "test-book:1:2", "test-book:1:10"]
+        assert docs[0]["data"]["verse"]["text"] == ["new"]
+        with VerseDetailSource(data_dir, "test-book") as source:
+            assert source.load("/books/test-book:1:1")["data"]["verse"]["text"] == ["new"]
+        search_docs = {d["p"]: d for d in build_book_docs(data_dir, "test-book")}
+        assert search_docs["/books/test-book:1:1"]["en"] == "regenerated"
+
+    def test_search_docs_and_verse_counts_unchanged_by_packing(self, data_dir):
+        docs = build_book_docs(data_dir, "test-book")
+        counts = build_verse_counts(Path(data_dir))
+        pack_book(data_dir, "test-book", remove_files=True)
+        assert build_book_docs(data_dir, "test-book") == docs
+        assert build_verse_counts(Path(data_dir)) == counts
+
+
+class TestWritersOnRemovedPacks:
+    def test_restore_writes_missing_base_and_sisters(self, data_dir):
+        before = _snapshot(data_dir)
+        pack_book(data_dir, "test-book", remove_files=True)
+        assert restore_packed_files(data_dir, "/books/test-book:1:2") == 2
+        assert restore_packed_files(data_dir, "/books/test-book:1:2") == 0
+        assert restore_packed_files(data_dir, "/books/other-book:1:1") == 0
+        after = _snapshot(data_dir)
+        for rel in (os.path.join("test-book", "1", "2.json"), os.path.join("test-book", "1", "2.ur.json")):
+            assert after[rel] == before[rel]
+        assert os.path.join("test-book", "1", "1.json") not in after
+
+    def test_link_books_patches_removed_detail_file(self, data_dir, monkeypatch):
+        from app.link_books import _patch_modular_file
+        monkeypatch.setenv("DESTINATION_DIR", data_dir + "/")
+        pack_book(data_dir, "test-book", remove_files=True)
+        update = {"/books/test-book:1:1": {"relations": {"Mentions": ["/books/quran:1:1"]}}}
+        assert _patch_modular_file("/books/test-book:1:1", update) == 1
+        with VerseDetailSource(data_dir, "test-book") as source:
+            verse = source.load("/books/test-book:1:1")["data"]["verse"]
+        assert verse["relations"] == {"Mentions": ["/books/quran:1:1"]}
+        assert verse["text"] == ["بِسْمِ"]
+
+    def test_translation_ingest_patches_removed_detail_file(self, data_dir, monkeypatch):
+        from app.ai_translation import _ingest_chapter
+        monkeypatch.setenv("DESTINATION_DIR", data_dir + "/")
+        pack_book(data_dir, "test-book", remove_files=True)
+        updates = {"/books/test-book:1:10": {"en.new": ["new text"]}}
+        _ingest_chapter(("/books/test-book:1", updates, False))
+        with VerseDetailSource(data_dir, "test-book") as source:
+            verse = source.load("/books/test-book:1:10")["data"]["verse"]
+        assert verse["translations"] == {"en.test": ["hadith 10"], "en.new": ["new text"]}
+
+
+class TestValidatePacks:
+    def test_valid_pack(self, data_dir):
+        pack_book(data_dir, "test-book")
+        report = ValidationReport()
+        validate_packs(Path(data_dir), report)
+        assert report.files_checked == 4
+        assert report.files_valid == 4
+        assert not report.errors
+
+    def test_wrong_kind_is_reported(self, data_dir):
+        pack_book(data_dir, "test-book")
+        # Corrupt one record's kind by re-writing the pack from edited records
+        path = pack_path(data_dir, "test-book")
+        with VersePack(path) as pack:
+            records = list(pack.items())
+        records[0] = (records[0][0], json.dumps({"kind": "verse_list"}).encode("utf-8"))
+        write_pack(path, "test-book", records)
+
+        report = ValidationReport()
+        validate_packs(Path(data_dir), report)
+        assert report.files_checked == 4
+        assert report.files_valid == 3
+        assert len(report.errors) == 1
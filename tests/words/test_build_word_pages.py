@@ -0,0 +1,123 @@
+"""Tests for scripts/build_word_pages.py serial vs. parallel builds.
+
+Uses a stub builder (no CAMeL Tools / source indexes) to check that the
+multi-process map/reduce produces the same files as the serial walk.
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+import multiprocessing
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.words import morphology
+from app.words.morph_cache import MorphologyCache
+
+
+def _import_script():
+    here = Path(__file__).resolve().parents[2]
+    target = here / "scripts" / "build_word_pages.py"
+    spec = importlib.util.spec_from_file_location("_build_word_pages", str(target))
+    assert spec and spec.loader
+    mod = importlib.util.module_from_spec(spec)
+    # Registered so pool workers can unpickle the map-task functions.
+    sys.modules["_build_word_pages"] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+class _StubBuilder:
+    """Surfaces ``{lemma}{n}`` map to lemma ``{lemma}``; lemmas share roots."""
+
+    def __init__(self):
+        self.corpus_surfaces = {
+            f"{lemma}{n}": {"count": n} for lemma in "ابجده" for n in range(1, 5)
+        }
+        self.wikt_matched_lemmas = {}
+
+    def prebuilt_indexes(self):
+        return {"corpus_surfaces": self.corpus_surfaces}
+
+    def build_surface(self, surface):
+        morphology.analyze(surface)
+        lemma = surface[0]
+        return {
+            "surface": surface,
+            "slug": surface,
+            "morphology": {"lemma_slug": lemma, "pos_camel": "noun"},
+        }
+
+    def build_lemma(self, lemma, pos_hint="verb"):
+        self.wikt_matched_lemmas[lemma] = [{"word": lemma}]
+        return {
+            "slug": lemma,
+            "root": "ر.و.ت" if lemma in "ابج" else "ق.و.ل",
+            "pos": "N",
+            "pos_hint": pos_hint,
+            "frequency_in_corpus": 10,
+            "cross_references": {"qac": {"found": lemma == "ا"}},
+        }
+
+    def build_root(self, root, lemmas):
+        return {"root": root, "lemmas": lemmas}
+
+
+class _StubAnalyzer:
+    def analyze(self, surface):
+        return [{"diac": surface, "lex": surface[0], "pos": "noun"}]
+
+
+@pytest.fixture(autouse=True)
+def stub_analyzer(monkeypatch):
+    monkeypatch.setattr(morphology, "_get_analyzer", lambda: _StubAnalyzer())
+    morphology.configure_cache(None)
+    yield
+    morphology.configure_cache(None)
+
+
+def _run(mod, monkeypatch, tmp_path, workers, morph_cache=None):
+    out = tmp_path / f"out{workers}"
+    monkeypatch.setattr(mod, "load_sources", lambda: _StubBuilder())
+    monkeypatch.setattr(mod, "WORD_SOURCES", tmp_path / f"sources{workers}")
+    cache_args = ["--morph-cache", str(morph_cache)] if morph_cache else ["--no-morph-cache"]
+    monkeypatch.setattr(sys, "argv", [
+        "build_word_pages.py", "--full", "--no-snapshot", *cache_args,
+        "--out", str(out), "--workers", str(workers),
+    ])
+    mod.main()
+    files = {}
+    for path in sorted(out.rglob("*.json")):
+        files[str(path.relative_to(out))] = json.loads(path.read_text(encoding="utf-8"))
+    slim = (tmp_path / f"sources{workers}" / "sources" / "wiktextract-arabic" /
+            "wiktextract_corpus_lemmas.json").read_text(encoding="utf-8")
+    return files, slim
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="parallel test relies on fork-shared stub builder",
+)
+def test_parallel_build_matches_serial(monkeypatch, tmp_path):
+    mod = _import_script()
+    serial_files, serial_slim = _run(mod, monkeypatch, tmp_path, 1)
+    parallel_files, parallel_slim = _run(mod, monkeypatch, tmp_path, 3)
+    assert len([k for k in serial_files if k.startswith("surfaces")]) == 20
+    assert len([k for k in serial_files if k.startswith("lemmas")]) == 5
+    assert parallel_files == serial_files
+    assert parallel_slim == serial_slim
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="parallel test relies on fork-shared stub builder",
+)
+def test_parallel_workers_persist_morphology_cache(monkeypatch, tmp_path):
+    mod = _import_script()
+    path = tmp_path / "morph.sqlite"
+    _run(mod, monkeypatch, tmp_path, 3, morph_cache=path)
+    cache = MorphologyCache(str(path))
+    assert cache.count("analyze") == 20
+    cache.close()
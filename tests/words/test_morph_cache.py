@@ -0,0 +1,139 @@
+"""Tests for app.words.morph_cache and the morphology caching layer.
+
+These use a stub analyzer/generator so they run without CAMeL Tools.
+"""
+from __future__ import annotations
+
+import pytest
+
+from app.words import morph_cache, morphology
+from app.words.morph_cache import MorphologyCache, morphology_db_version
+
+
+class _StubAnalyzer:
+    def __init__(self):
+        self.calls = 0
+
+    def analyze(self, surface):
+        self.calls += 1
+        return [{"diac": surface, "lex": surface, "pos": "noun", "lex_logprob": -1.5}]
+
+
+class _StubGenerator:
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, lemma, feats):
+        self.calls += 1
+        return [{"diac": lemma + "ٌ", "pos": feats["pos"], "cas": "n"}]
+
+
+@pytest.fixture
+def stubs(monkeypatch):
+    analyzer = _StubAnalyzer()
+    generator = _StubGenerator()
+    monkeypatch.setattr(morphology, "_get_analyzer", lambda: analyzer)
+    monkeypatch.setattr(morphology, "_get_generator", lambda: generator)
+    morphology.configure_cache(None)
+    yield analyzer, generator
+    morphology.configure_cache(None)
+
+
+class TestMorphologyCache:
+    def test_roundtrip(self, tmp_path):
+        cache = MorphologyCache(str(tmp_path / "m.sqlite"), db_version="v1")
+        assert cache.get("analyze", "قال") is None
+        cache.put("analyze", "قال", [{"lex": "قال"}])
+        assert cache.get("analyze", "قال") == [{"lex": "قال"}]
+        assert cache.count("analyze") == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+        cache.close()
+
+    def test_db_version_namespaces_entries(self, tmp_path):
+        path = str(tmp_path / "m.sqlite")
+        old = MorphologyCache(path, db_version="v1")
+        old.put("analyze", "قال", [{"lex": "old"}])
+        old.close()
+        new = MorphologyCache(path, db_version="v2")
+        assert new.get("analyze", "قال") is None
+        new.close()
+
+    def test_shared_writers_commit_each_row(self, tmp_path):
+        path = str(tmp_path / "m.sqlite")
+        a = MorphologyCache(path, db_version="v1", commit_every=1)
+        b = MorphologyCache(path, db_version="v1", commit_every=1)
+        a.put("analyze", "قال", [{"lex": "a"}])
+        b.put("analyze", "كتب", [{"lex": "b"}])  # would wait on a's open batch
+        assert a.get("analyze", "كتب") == [{"lex": "b"}]
+        assert b.count("analyze") == 2
+        a.close()
+        b.close()
+
+    def test_db_version_tracks_installed_db_file(self, tmp_path, monkeypatch):
+        db_file = tmp_path / "morphology.db"
+        db_file.write_text("###DEFINES###\n", encoding="utf-8")
+        monkeypatch.setattr(morph_cache, "builtin_db_path", lambda db_name: str(db_file))
+        before = morphology_db_version()
+        assert before.startswith("calima-msa-r13/camel-tools-")
+        db_file.write_text("###DEFINES###\n###ORDER###\n", encoding="utf-8")
+        assert morphology_db_version() != before
+
+
+class TestMorphologyWithCache:
+    def test_lru_avoids_repeat_analysis(self, stubs):
+        analyzer, _ = stubs
+        morphology.analyze("كتاب")
+        morphology.analyze("كتاب")
+        assert analyzer.calls == 1
+
+    def test_returned_analyses_are_copies(self, stubs):
+        first = morphology.analyze("كتاب")
+        first[0]["lex"] = "mutated"
+        assert morphology.analyze("كتاب")[0]["lex"] == "كتاب"
+
+    def test_disk_cache_survives_new_process_state(self, stubs, tmp_path):
+        analyzer, generator = stubs
+        path = str(tmp_path / "m.sqlite")
+        morphology.configure_cache(path)
+        morphology.analyze("كتاب")
+        morphology.generate_paradigm("كتب", pos="noun")
+        # Re-configuring clears the LRU, simulating a fresh build run.
+        morphology.configure_cache(path)
+        assert morphology.analyze("كتاب")[0]["lex"] == "كتاب"
+        assert morphology.generate_paradigm("كتب", pos="noun")[0]["pos"] == "noun"
+        assert analyzer.calls == 1
+        assert generator.calls == 1
+
+    def test_best_analysis_uses_cache(self, stubs):
+        analyzer, _ = stubs
+        assert morphology.get_best_analysis("كتاب")["lex"] == "كتاب"
+        assert morphology.extract_lemma("كتاب") == "كتاب"
+        assert analyzer.calls == 1
+
+    def test_failed_analysis_is_not_cached(self, stubs, tmp_path):
+        analyzer, _ = stubs
+        morphology.configure_cache(str(tmp_path / "m.sqlite"))
+        calls = []
+
+        def flaky(surface):
+            calls.append(surface)
+            if len(calls) == 1:
+                raise ValueError("transient")
+            return [{"diac": surface, "lex": surface, "pos": "noun"}]
+
+        analyzer.analyze = flaky
+        assert morphology.analyze("كتاب") == []
+        assert morphology.analyze("كتاب")[0]["lex"] == "كتاب"
+        assert len(calls) == 2
+
+    def test_missing_camel_tools_raises(self, monkeypatch):
+        def missing():
+            raise ModuleNotFoundError("No module named 'camel_tools'")
+
+        monkeypatch.setattr(morphology, "_get_analyzer", missing)
+        monkeypatch.setattr(morphology, "_get_generator", missing)
+        morphology.configure_cache(None)
+        with pytest.raises(ModuleNotFoundError):
+            morphology.analyze("كتاب")
+        with pytest.raises(ModuleNotFoundError):
+            morphology.generate_paradigm("كتب")
@@ -0,0 +1,112 @@
+"""Tests for app.words.source_snapshot."""
+from __future__ import annotations
+
+import json
+import os
+import pickle
+
+from app.words.builders import PREBUILT_INDEX_ATTRS, WordPageBuilder
+from app.words.source_snapshot import (
+    LazyIndex,
+    compile_snapshot,
+    load_snapshot,
+    preload_indexes,
+    snapshot_is_fresh,
+)
+
+
+def _builder():
+    return WordPageBuilder(
+        corpus_surfaces={"قَالَ": {"count": 3, "paths": ["/books/a:1"]}},
+        qac_lemma_index={"قالَ": {"root": "qwl"}},
+        wiktextract_summary={"قال": {"entry_count": 2}},
+        lanes_arabic_index={"قال": ["n1"]},
+    )
+
+
+def _sources(tmp_path):
+    src = tmp_path / "corpus.json"
+    src.write_text("{}", encoding="utf-8")
+    return {"corpus": str(src), "missing": str(tmp_path / "nope.json")}
+
+
+class TestSourceSnapshot:
+    def test_roundtrip_includes_normalized_indexes(self, tmp_path):
+        original = _builder()
+        snap = str(tmp_path / "snap")
+        compile_snapshot(original, snap, _sources(tmp_path))
+
+        loaded = load_snapshot(snap)
+        for name in PREBUILT_INDEX_ATTRS:
+            assert dict(getattr(loaded, name)) == getattr(original, name), name
+        assert loaded._qac_normalized  # derived index persisted, not rebuilt
+        assert loaded._lookup_corpus_form("قال") == original._lookup_corpus_form("قال")
+
+    def test_indexes_load_lazily(self, tmp_path):
+        snap = str(tmp_path / "snap")
+        compile_snapshot(_builder(), snap, _sources(tmp_path))
+        loaded = load_snapshot(snap)
+        assert isinstance(loaded.qac_lemma_index, LazyIndex)
+        assert not loaded.qac_lemma_index.loaded
+        assert loaded.qac_lemma_index.get("قالَ") == {"root": "qwl"}
+        assert loaded.qac_lemma_index.loaded
+        assert not loaded.wiktextract_full.loaded
+
+    def test_preload_loads_every_index(self, tmp_path):
+        snap = str(tmp_path / "snap")
+        compile_snapshot(_builder(), snap, _sources(tmp_path))
+        loaded = load_snapshot(snap)
+        loaded.corpus_surfaces.get("قَالَ")
+        assert preload_indexes(loaded) == len(PREBUILT_INDEX_ATTRS) - 1
+        assert all(index.loaded for index in loaded.prebuilt_indexes().values())
+        assert preload_indexes(loaded) == 0
+        assert preload_indexes(_builder()) == 0  # plain dicts are left alone
+
+    def test_lazy_index_pickles_path_only(self, tmp_path):
+        snap = str(tmp_path / "snap")
+        compile_snapshot(_builder(), snap, _sources(tmp_path))
+        index = load_snapshot(snap).corpus_surfaces
+        assert len(index) == 1
+        clone = pickle.loads(pickle.dumps(index))
+        assert not clone.loaded
+        assert dict(clone) == dict(index)
+
+    def test_freshness(self, tmp_path):
+        snap = str(tmp_path / "snap")
+        sources = _sources(tmp_path)
+        assert not snapshot_is_fresh(snap, sources)
+        compile_snapshot(_builder(), snap, sources, options={"load_wikt_full": True})
+        assert snapshot_is_fresh(snap, sources, options={"load_wikt_full": True})
+        assert not snapshot_is_fresh(snap, sources, options={"load_wikt_full": False})
+
+        with open(sources["corpus"], "w", encoding="utf-8") as f:
+            f.write('{"changed": 1}')
+        assert not snapshot_is_fresh(snap, sources, options={"load_wikt_full": True})
+
+    def test_builder_change_is_stale(self, tmp_path, monkeypatch):
+        import app.words.source_snapshot as source_snapshot
+        snap = str(tmp_path / "snap")
+        sources = _sources(tmp_path)
+        compile_snapshot(_builder(), snap, sources)
+        assert snapshot_is_fresh(snap, sources)
+        monkeypatch.setattr(source_snapshot, "builder_fingerprint", lambda: "edited normalizer")
+        assert not snapshot_is_fresh(snap, sources)
+
+    def test_builder_fingerprint_covers_module_sources(self, tmp_path, monkeypatch):
+        import app.words.source_snapshot as source_snapshot
+        fingerprint = source_snapshot.builder_fingerprint()
+        assert fingerprint == source_snapshot.builder_fingerprint()
+        monkeypatch.setattr(source_snapshot, "BUILDER_MODULES", ("builders", "normalize"))
+        assert source_snapshot.builder_fingerprint() != fingerprint
+
+    def test_version_mismatch_is_stale(self, tmp_path):
+        snap = str(tmp_path / "snap")
+        sources = _sources(tmp_path)
+        manifest_path = compile_snapshot(_builder(), snap, sources)
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        manifest["version"] = -1
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        assert not snapshot_is_fresh(snap, sources)
+        assert os.path.exists(os.path.join(snap, "qac_normalized.pickle"))